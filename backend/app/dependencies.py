@@ -19,6 +19,7 @@ from app.services.llm_integration_service import LLMIntegrationService
 from app.services.payment_service import PaymentService
 from app.services.scoring_service import ScoringService
 from app.services.sqs_game_analysis_handler import SqsGameAnalysisHandler
+from app.services.stockfish_service import get_stockfish_service
 from app.services.stripe_service import StripeService
 from app.services.tool_creation_agent_service import ToolCreationAgentService
 from app.services.tool_service import ToolService
@@ -36,7 +37,7 @@ from shared_db.crud.game import GameDAO
 from shared_db.crud.llm_integration import LLMIntegrationDAO
 from shared_db.crud.payments import PaymentLedgerDAO
 from shared_db.crud.tool import ToolDAO
-from shared_db.db import AsyncSessionLocal
+from shared_db.db import AsyncSessionLocal, ReadOnlyAsyncSessionLocal
 from shared_db.models.agent import AgentVersion
 from shared_db.models.user import UserRole
 from shared_db.schemas.auth import TokenData
@@ -67,6 +68,21 @@ async def get_db() -> AsyncGenerator[AsyncSession]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession]:
+    """Dependency for a read-only async database session.
+
+    Served by the read replica when one is configured, otherwise by the primary. Only for
+    endpoints that never write; reads that must observe a known game version go through
+    GameService.get_game_for_read, which falls back to the primary when the replica lags.
+    """
+    async with ReadOnlyAsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
 def get_user_service() -> UserService:
     """Dependency for UserService instance."""
     return UserService(services.user_dao)
@@ -423,7 +439,7 @@ def get_chess_analysis_service(
         litellm_service=services.litellm_service,
         game_dao=services.game_dao,
         llm_integration_service=llm_integration_service,
-        stockfish_path=config.get("STOCKFISH_PATH", "stockfish"),
+        stockfish_service=get_stockfish_service(),
         analysis_depth=int(config.get("STOCKFISH_ANALYSIS_DEPTH", "15")),
         time_limit=float(config.get("STOCKFISH_ANALYSIS_TIME_LIMIT", "1.0")),
         enabled=config.get("ENABLE_CHESS_ANALYSIS", "true").lower() == "true",
@@ -13,12 +13,16 @@ from app.dependencies import get_current_user
 from app.middleware.logging_middleware import RequestLoggingMiddleware
 from app.routers import router as api_router
 from app.service_container import Services
+from app.services.stockfish_service import close_stockfish_service
+from app.tasks.event_archive_worker import start_event_archive_worker, stop_event_archive_worker
 from app.tasks.matchmaking_worker import start_matchmaking_worker, stop_matchmaking_worker
 from app.utils.fastapi_utils import install_exception_handlers
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from common.core.config_service import ConfigService, settings
 from common.core.request_context import RequestContext
 from common.logging import setup_logging
 from common.utils.utils import get_logger
+from shared_db.db import dispose_pools, pool_stats
 from shared_db.db.init_db import init_db
 from shared_db.db.populate_db import populate_db
 from shared_db.schemas.user import UserResponse
@@ -68,6 +72,10 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, Any]:
     logger.info("Starting matchmaking worker")
     await start_matchmaking_worker()
 
+    # Start event archive worker
+    logger.info("Starting event archive worker")
+    await start_event_archive_worker()
+
     # Initialize and start services
     services = Services.instance()
     await services.start()
@@ -81,9 +89,21 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, Any]:
     logger.info("Stopping matchmaking worker")
     await stop_matchmaking_worker()
 
+    # Stop event archive worker
+    logger.info("Stopping event archive worker")
+    await stop_event_archive_worker()
+
     # Stop services
     await services.stop()
 
+    # Shut down pooled Stockfish engines
+    await close_stockfish_service()
+
+    # Log final pool metrics and close database connections
+    for stats in pool_stats():
+        logger.info("Database pool stats", **stats.model_dump())
+    await dispose_pools()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -116,6 +136,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
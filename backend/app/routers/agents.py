@@ -10,7 +10,7 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_agent_service, get_agent_version_dao, get_current_user, get_db
+from app.dependencies import get_agent_service, get_agent_version_dao, get_current_user, get_db, get_read_db
 from app.schemas.agents_metadata import EnvironmentsMetadataResponse
 from app.schemas.scoring import (
     AgentProfileData,
@@ -504,7 +504,7 @@ async def compare_versions(
 @agents_router.get("/agents/{agent_id}/statistics")
 async def get_agent_statistics(
     agent_id: AgentId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     agent_service: Annotated[AgentService, Depends(get_agent_service)],
 ) -> AgentStatisticsResponse:
@@ -539,7 +539,7 @@ async def update_agent_statistics(
 @agents_router.get("/agents/{agent_id}/llm-usage/summary")
 async def get_agent_llm_usage_summary(
     agent_id: AgentId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     agent_service: Annotated[AgentService, Depends(get_agent_service)],
 ) -> AgentLLMCostSummary:
@@ -758,7 +758,7 @@ async def get_state_chat_examples(
 @agents_router.get("/agents/{agent_id}/profile")
 async def get_agent_profile(
     agent_id: AgentId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     agent_service: Annotated[AgentService, Depends(get_agent_service)],
 ) -> AgentProfileData:
@@ -785,7 +785,7 @@ async def get_agent_profile(
 @agents_router.get("/public/agents/{agent_id}")
 async def get_public_agent(
     agent_id: AgentId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     _current_user: Annotated[UserResponse, Depends(get_current_user)],
 ) -> AgentResponse:
     """Get basic public agent information (no ownership check)."""
@@ -804,7 +804,7 @@ async def get_public_agent(
 @agents_router.get("/public/agents/{agent_id}/profile")
 async def get_public_agent_profile(
     agent_id: AgentId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     _current_user: Annotated[UserResponse, Depends(get_current_user)],
 ) -> AgentProfileData:
     """Get public profile data for an agent (no personal info)."""
@@ -847,7 +847,7 @@ async def get_public_agent_profile(
 async def get_agent_game_rating(
     agent_id: AgentId,
     game_type: GameType,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     agent_service: Annotated[AgentService, Depends(get_agent_service)],
 ) -> AgentGameRating:
@@ -875,7 +875,7 @@ async def get_agent_game_rating(
 async def get_public_agent_game_rating(
     agent_id: AgentId,
     game_type: GameType,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     _current_user: Annotated[UserResponse, Depends(get_current_user)],
 ) -> AgentGameRating:
     """Get public agent rating and statistics for a specific game type."""
@@ -901,7 +901,7 @@ async def get_public_agent_game_rating(
 
 @agents_router.get("/leaderboard")
 async def get_leaderboard(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     _current_user: Annotated[UserResponse, Depends(get_current_user)],
     game_type: Annotated[GameType | None, Query(description="Filter by game type")] = None,
     limit: int = Query(default=100, le=1000),
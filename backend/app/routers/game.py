@@ -4,7 +4,7 @@ from datetime import UTC, datetime
 from typing import Annotated, Any, cast
 
 from chess_game.chess_api import ChessPlaygroundOpponent, ChessSide, ChessState
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from game_api import BaseGameConfig, BaseGameEvent, BaseGameState, GameType, ReasoningEventMixin
 from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +14,7 @@ from app.dependencies import (
     get_current_user,
     get_db,
     get_llm_integration_service,
+    get_read_db,
     get_request_context,
     get_user_service,
 )
@@ -41,12 +42,13 @@ from app.services.game_service import GameService
 from app.services.llm_integration_service import LLMIntegrationService
 from app.services.long_poll_service import LongPollService
 from app.services.user_service import UserService
+from app.utils.pagination import NEXT_CURSOR_HEADER, GameCursor
 from common.core.config_service import ConfigService
 from common.core.request_context import RequestContext
 from common.ids import AgentId, AgentVersionId, GameId, PlayerId
 from common.utils.tsid import TSID
 from common.utils.utils import get_logger
-from shared_db.db import AsyncSessionLocal
+from shared_db.db import Workload, session_factory
 from shared_db.models.game import MatchmakingStatus
 from shared_db.models.game_enums import get_game_environment_metadata
 from shared_db.schemas.user import CoinConsumeFailureReason, UserResponse
@@ -139,11 +141,12 @@ async def get_active_games(
 
 @game_router.get("/games/history")
 async def get_game_history(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
     game_type: str | None = Query(default=None),
+    cursor: str | None = Query(default=None, description="nextCursor of the previous page"),
 ) -> GameHistoryListResponse:
     """Get completed games history for the current user."""
     logger.info(f"Getting game history for user {current_user.id}")
@@ -154,8 +157,9 @@ async def get_game_history(
         user_id=current_user.id,
         only_active=False,
         limit=limit,
-        from_game_id=None,  # Simplified pagination - just use limit for now
+        from_game_id=GameCursor.decode(cursor).game_id if cursor else None,
     )
+    next_cursor = GameCursor(id=games[-1].id.number).encode() if len(games) == limit else None
 
     # Filter by game type if specified
     if game_type:
@@ -244,16 +248,18 @@ async def get_game_history(
         )
         history_games.append(game_response)
 
-    return GameHistoryListResponse(games=history_games, total=len(history_games), limit=limit, offset=offset)
+    return GameHistoryListResponse(games=history_games, total=len(history_games), limit=limit, offset=offset, next_cursor=next_cursor)
 
 
 @game_router.get("/agents/{agent_id}/games")
 async def get_agent_games(
     agent_id: AgentId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     _current_user: Annotated[UserResponse, Depends(get_current_user)],
+    response: Response,
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor header of the previous page; takes precedence over offset"),
 ) -> list[GameHistoryResponse]:
     """Get game history for a specific agent (public endpoint)."""
     logger.info(f"Getting game history for agent {agent_id}")
@@ -262,7 +268,15 @@ async def get_agent_games(
     registry = GameEnvRegistry.instance()
 
     # Get games where this agent participated
-    games = await services.game_dao.get_games_by_agent(db, agent_id=agent_id, limit=limit, offset=offset)
+    games = await services.game_dao.get_games_by_agent(
+        db,
+        agent_id=agent_id,
+        limit=limit,
+        offset=offset,
+        before_game_id=GameCursor.decode(cursor).game_id if cursor else None,
+    )
+    if len(games) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = GameCursor(id=games[-1].id.number).encode()
 
     # Convert to GameHistoryResponse format (similar to get_game_history)
     history_games: list[GameHistoryResponse] = []
@@ -325,12 +339,14 @@ async def get_agent_games(
 
 @game_router.get("/games/discover")
 async def discover_games(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
+    response: Response,
     include_active: bool = True,
     include_ended: bool = True,
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor header of the previous page; takes precedence over offset"),
 ) -> list[ActiveGameResponse]:
     """Discover public/spectatable games for watching or replay.
 
@@ -355,14 +371,18 @@ async def discover_games(
     registry = GameEnvRegistry.instance()
     allowed_types = [gt for gt in GameType if registry.get(gt).types().supports_spectators()]
 
-    # Fetch games
+    # Fetch games, resuming after the last game of the previous page when a cursor is given
+    page = GameCursor.decode(cursor) if cursor else None
     games = await services.game_dao.find_discoverable_games(
         db=db,
         statuses=statuses,
         allowed_game_types=allowed_types,
         limit=limit,
         offset=offset,
+        before=(page.started_at, page.game_id) if page else None,
     )
+    if len(games) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = GameCursor(id=games[-1].id.number, started_at=games[-1].started_at).encode()
 
     # Convert to response
     responses: list[ActiveGameResponse] = []
@@ -397,19 +417,23 @@ async def discover_games(
 @game_router.get("/games/{game_id}/events")
 async def get_game_events(
     game_id: GameId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
+    min_version: int | None = None,
 ) -> list[GameEventResponse]:
     """Get game events for replaying or spectating a game.
 
     Policy:
     - Non-participants: allowed only when the environment supports spectators (env-defined)
     - Reasoning visibility: never reveal opponent reasoning — users only see their own bots' reasoning
+
+    Args:
+        min_version: Oldest acceptable game version, e.g. the version of the state the client shows
     """
     logger.info(f"Getting game events for game {game_id} by user {current_user.id}")
 
     # Fetch game
-    game = await services.game_dao.get(db, game_id)
+    game = await game_service.get_game_for_read(db, game_id, min_version=min_version)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
@@ -686,7 +710,7 @@ async def delete_game(
 @game_router.get("/games/{game_id}")
 async def get_game_state(
     game_id: GameId,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[UserResponse, Depends(get_current_user)],
     request: Request,
     current_version: int | None = None,
@@ -706,7 +730,7 @@ async def get_game_state(
 
     # If no current_version provided, return immediately
     if current_version is None:
-        game = await services.game_dao.get(db, game_id)
+        game = await game_service.get_game_for_read(db, game_id)
         if not game:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -722,12 +746,14 @@ async def get_game_state(
     # Use a dedicated session for polling to avoid holding the request session
     lp = LongPollService()
 
-    # Create a single polling session for the entire wait loop
-    async with AsyncSessionLocal() as poll_session:
+    # Create a single polling session for the entire wait loop, from the long-poll pool (on the read replica, if any)
+    async with session_factory(Workload.LONG_POLL)() as poll_session:
 
         async def _get_version() -> int | None:
-            # Use the dedicated polling session
-            return await services.game_dao.get_version(poll_session, game_id)
+            # A lagging replica can report a version older than the client's, or no game yet;
+            # only a newer version counts as a change
+            version = await services.game_dao.get_version(poll_session, game_id)
+            return version if version is not None and version > current_version else current_version
 
         async def _cancelled() -> bool:
             return await request.is_disconnected()
@@ -741,8 +767,8 @@ async def get_game_state(
             cancel_check=_cancelled,
         )
 
-    # Either version changed or timeout reached; return current state
-    game = await services.game_dao.get(db, game_id)
+    # Either version changed or timeout reached; return current state, never older than what the client has
+    game = await game_service.get_game_for_read(db, game_id, min_version=current_version)
     if not game:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
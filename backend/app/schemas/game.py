@@ -278,6 +278,7 @@ class GameHistoryListResponse(JsonModel):
     total: int = Field(..., description="Total number of games")
     limit: int = Field(..., description="Number of games per page")
     offset: int = Field(..., description="Page offset")
+    next_cursor: str | None = Field(default=None, description="Cursor for the next page, or None on the last page")
 
 
 class GameEventResponse(JsonModel):
@@ -37,6 +37,20 @@ class GameAnalysisMessage(JsonModel):
     state_after_data: dict[str, Any] = Field(..., description="Game state after the move as dict")
 
 
+class PostGameAnalysisMessage(JsonModel):
+    """Message for analyzing a whole finished game via SQS.
+
+    Used in post-game analysis mode instead of one GameAnalysisMessage per move; the
+    move list is read from the game's events when the job runs.
+    """
+
+    game_id: GameId = Field(..., description="ID of the finished game")
+    game_type: GameType = Field(..., description="Type of game (chess, poker, etc.)")
+
+
+# Both analysis message kinds share the analysis queue
+GameAnalysisJob = GameAnalysisMessage | PostGameAnalysisMessage
+
 # Type aliases for the SQS clients
 GameTurnSqsClient = SqsClient[GameTurnMessage]
-GameAnalysisSqsClient = SqsClient[GameAnalysisMessage]
+GameAnalysisSqsClient = SqsClient[GameAnalysisJob]
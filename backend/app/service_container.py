@@ -4,18 +4,22 @@ from datetime import timedelta
 
 from game_api import GameType
 
-from app.schemas.sqs_game_messages import GameAnalysisMessage, GameAnalysisSqsClient, GameTurnMessage, GameTurnSqsClient
+from app.schemas.sqs_game_messages import GameAnalysisJob, GameAnalysisSqsClient, GameTurnMessage, GameTurnSqsClient
 from app.services.agent_execution_service import AgentExecutionService
+from app.services.agent_runner import AgentRunner
 from app.services.agent_runner_factory import AgentRunnerFactory
 from app.services.chess_analysis_service import ChessAnalysisService
 from app.services.game_env_registry import GameEnvRegistry
 from app.services.game_manager import GameManager
 from app.services.game_matching_service import GameMatchingService
 from app.services.llm_integration_service import LLMIntegrationService
+from app.services.llm_usage_recorder import LLMUsageRecorder
+from app.services.move_narrative_cache import MoveNarrativeCache
 from app.services.poker_analysis_service import PokerAnalysisService
 from app.services.scoring_service import ScoringService
 from app.services.sqs_game_analysis_handler import AnalysisServiceProtocol, SqsGameAnalysisHandler
 from app.services.sqs_game_turn_handler import SqsGameTurnHandler
+from app.services.stockfish_service import get_stockfish_service
 from common.core.aws_manager import AwsManager
 from common.core.config_service import ConfigService
 from common.core.lifecycle import Lifecycle
@@ -25,6 +29,7 @@ from common.utils.utils import cached_classmethod, get_logger
 from shared_db.crud.agent import AgentDAO, AgentStatisticsDAO, AgentVersionDAO
 from shared_db.crud.game import GameDAO
 from shared_db.crud.llm_integration import LLMIntegrationDAO
+from shared_db.crud.llm_usage import LLMUsageDAO
 from shared_db.crud.tool import ToolDAO
 from shared_db.crud.user import UserDAO
 
@@ -41,8 +46,10 @@ class Services(Lifecycle):
     agent_statistics_dao: AgentStatisticsDAO
     tool_dao: ToolDAO
     llm_integration_dao: LLMIntegrationDAO
+    llm_usage_dao: LLMUsageDAO
     user_dao: UserDAO
 
+    llm_usage_recorder: LLMUsageRecorder | None
     litellm_service: LiteLLMService
     llm_integration_service: LLMIntegrationService
     chess_analysis_service: ChessAnalysisService
@@ -74,9 +81,11 @@ class Services(Lifecycle):
         self.tool_dao = self._create_tool_dao()
         self.user_dao = self._create_user_dao()
         self.llm_integration_dao = self._create_llm_integration_dao()
+        self.llm_usage_dao = self._create_llm_usage_dao()
 
         # Initialize LLM services
-        self.litellm_service = self._create_litellm_service()
+        self.llm_usage_recorder = self._create_llm_usage_recorder(llm_usage_dao=self.llm_usage_dao, config_service=self.config_service)
+        self.litellm_service = self._create_litellm_service(llm_usage_recorder=self.llm_usage_recorder)
         self.llm_integration_service = self._create_llm_integration_service(litellm_service=self.litellm_service, llm_integration_dao=self.llm_integration_dao)
 
         # Initialize game-specific analysis services
@@ -93,7 +102,7 @@ class Services(Lifecycle):
         self.scoring_service = self._create_scoring_service(
             agent_dao=self.agent_dao, agent_statistics_dao=self.agent_statistics_dao, game_dao=self.game_dao, user_dao=self.user_dao
         )
-        self.agent_execution_service = self._create_agent_execution_service(litellm_service=self.litellm_service)
+        self.agent_execution_service = self._create_agent_execution_service(litellm_service=self.litellm_service, config_service=self.config_service)
 
         # Initialize SQS services
         self.game_turn_sqs_client = self._create_game_turn_sqs_client(aws_manager=self.aws_manager, config_service=self.config_service)
@@ -103,16 +112,20 @@ class Services(Lifecycle):
         self.sqs_game_analysis_handler = self._create_sqs_game_analysis_handler(
             sqs_client=self.game_analysis_sqs_client,
             game_dao=self.game_dao,
+            config_service=self.config_service,
             analysis_services={
                 GameType.CHESS: self.chess_analysis_service,
                 GameType.TEXAS_HOLDEM: self.poker_analysis_service,
             },
         )
 
+        self.agent_runner = self._create_agent_runner(agent_execution_service=self.agent_execution_service, llm_usage_recorder=self.llm_usage_recorder)
+
         # Now create game_manager
         self.game_manager = self._create_game_manager(
             game_env_registry=self.game_env_registry,
             agent_execution_service=self.agent_execution_service,
+            agent_runner=self.agent_runner,
             game_dao=self.game_dao,
             agent_version_dao=self.agent_version_dao,
             agent_statistics_dao=self.agent_statistics_dao,
@@ -138,8 +151,14 @@ class Services(Lifecycle):
         await self.aws_manager.start()
         await self.game_turn_sqs_client.start()
         await self.game_analysis_sqs_client.start()
+        await self.agent_runner.start()
+        if self.llm_usage_recorder:
+            await self.llm_usage_recorder.start()
 
     async def _stop(self) -> None:
+        await self.agent_runner.stop()
+        if self.llm_usage_recorder:
+            await self.llm_usage_recorder.stop()
         await self.game_analysis_sqs_client.stop()
         await self.game_turn_sqs_client.stop()
         await self.aws_manager.stop()
@@ -172,8 +191,22 @@ class Services(Lifecycle):
     def _create_llm_integration_dao(self) -> LLMIntegrationDAO:
         return LLMIntegrationDAO()
 
-    def _create_litellm_service(self) -> LiteLLMService:
-        return LiteLLMService()
+    def _create_llm_usage_dao(self) -> LLMUsageDAO:
+        return LLMUsageDAO()
+
+    def _create_llm_usage_recorder(self, llm_usage_dao: LLMUsageDAO, config_service: ConfigService) -> LLMUsageRecorder | None:
+        if str(config_service.get("llm.usage.enabled", "true")).lower() != "true":
+            return None
+        return LLMUsageRecorder(
+            llm_usage_dao=llm_usage_dao,
+            flush_interval_ms=int(config_service.get("llm.usage.flush_interval_ms", 1000)),
+            batch_rows=int(config_service.get("llm.usage.batch_rows", 200)),
+            max_buffered_rows=int(config_service.get("llm.usage.max_buffered_rows", 10000)),
+            compression_level=int(config_service.get("llm.usage.zstd_level", 3)),
+        )
+
+    def _create_litellm_service(self, llm_usage_recorder: LLMUsageRecorder | None) -> LiteLLMService:
+        return LiteLLMService(usage_sink=llm_usage_recorder.record if llm_usage_recorder else None)
 
     def _create_llm_integration_service(self, litellm_service: LiteLLMService, llm_integration_dao: LLMIntegrationDAO) -> LLMIntegrationService:
         return LLMIntegrationService(llm_integration_dao=llm_integration_dao, litellm_service=litellm_service)
@@ -181,19 +214,24 @@ class Services(Lifecycle):
     def _create_chess_analysis_service(
         self, litellm_service: LiteLLMService, game_dao: GameDAO, llm_integration_service: LLMIntegrationService, config_service: ConfigService
     ) -> ChessAnalysisService:
-        stockfish_path = config_service.get("chess.stockfish_path", "stockfish")
         analysis_depth = config_service.get("chess.stockfish_analysis_depth", 15)
         time_limit = config_service.get("chess.stockfish_analysis_time_limit", 1.0)
         enabled = config_service.get("chess.enable_chess_analysis", True)
+        narrative_batch_size = config_service.get("chess.analysis_narrative_batch_size", 8)
+        narrative_locale = config_service.get("chess.analysis_narrative_locale", "en")
+        narrative_cache_size = config_service.get("chess.analysis_narrative_cache_size", 5000)
 
         return ChessAnalysisService(
             litellm_service=litellm_service,
             game_dao=game_dao,
             llm_integration_service=llm_integration_service,
-            stockfish_path=stockfish_path,
+            stockfish_service=get_stockfish_service(),
             analysis_depth=analysis_depth,
             time_limit=time_limit,
             enabled=enabled,
+            narrative_batch_size=narrative_batch_size,
+            narrative_cache=MoveNarrativeCache(max_size=int(narrative_cache_size)),
+            narrative_locale=narrative_locale,
         )
 
     def _create_poker_analysis_service(self, config_service: ConfigService) -> PokerAnalysisService:
@@ -214,13 +252,17 @@ class Services(Lifecycle):
     def _create_scoring_service(self, agent_dao: AgentDAO, agent_statistics_dao: AgentStatisticsDAO, game_dao: GameDAO, user_dao: UserDAO) -> ScoringService:
         return ScoringService(agent_dao=agent_dao, agent_statistics_dao=agent_statistics_dao, game_dao=game_dao, user_dao=user_dao)
 
-    def _create_agent_execution_service(self, litellm_service: LiteLLMService) -> AgentExecutionService:
-        return AgentExecutionService(litellm_service=litellm_service)
+    def _create_agent_execution_service(self, litellm_service: LiteLLMService, config_service: ConfigService) -> AgentExecutionService:
+        return AgentExecutionService.from_config(litellm_service, config_service)
+
+    def _create_agent_runner(self, agent_execution_service: AgentExecutionService, llm_usage_recorder: LLMUsageRecorder | None) -> AgentRunner:
+        return AgentRunnerFactory.create_runner(agent_execution_service, usage_sink=llm_usage_recorder.record if llm_usage_recorder else None)
 
     def _create_game_manager(
         self,
         game_env_registry: GameEnvRegistry,
         agent_execution_service: AgentExecutionService,
+        agent_runner: AgentRunner,
         game_dao: GameDAO,
         agent_version_dao: AgentVersionDAO,
         agent_statistics_dao: AgentStatisticsDAO,
@@ -229,8 +271,6 @@ class Services(Lifecycle):
         scoring_service: ScoringService,
         sqs_game_analysis_handler: SqsGameAnalysisHandler,
     ) -> GameManager:
-        agent_runner = AgentRunnerFactory.create_runner(agent_execution_service)
-
         return GameManager(
             registry=game_env_registry,
             agent_execution_service=agent_execution_service,
@@ -304,11 +344,15 @@ class Services(Lifecycle):
             visibility_timeout=timedelta(minutes=5),  # 5 minutes for analysis processing
             wait_time=timedelta(seconds=20),
             max_messages=10,
+            # A long post-game job must not hold back live move analysis received after it
+            max_in_flight=int(config_service.get("sqs.game_analysis_max_in_flight", 10)),
+            # Post-game jobs can outlast the visibility timeout; keep them from being redelivered mid-run
+            extend_visibility=True,
         )
 
-        return SqsClient[GameAnalysisMessage](
+        return SqsClient[GameAnalysisJob](
             aws_manager=aws_manager,
-            sqs_message_type=SqsMessage[GameAnalysisMessage],
+            sqs_message_type=SqsMessage[GameAnalysisJob],
             config=sqs_config,
             poll_handler=None,  # Poll handler will be registered by SqsGameAnalysisHandler
         )
@@ -317,6 +361,7 @@ class Services(Lifecycle):
         self,
         sqs_client: GameAnalysisSqsClient,
         game_dao: GameDAO,
+        config_service: ConfigService,
         analysis_services: dict[GameType, AnalysisServiceProtocol],
     ) -> SqsGameAnalysisHandler:
         """Create SQS game analysis handler and register all analysis services.
@@ -324,6 +369,7 @@ class Services(Lifecycle):
         Args:
             sqs_client: SQS client for game analysis messages
             game_dao: Game DAO for database access
+            config_service: Configuration service (selects live or post-game analysis mode)
             analysis_services: Dict mapping game types to their analysis services
 
         Returns:
@@ -332,6 +378,7 @@ class Services(Lifecycle):
         handler = SqsGameAnalysisHandler(
             sqs_client=sqs_client,
             game_dao=game_dao,
+            analysis_mode=config_service.get("analysis.mode", "live"),
         )
         # Register all game-specific analysis services
         for game_type, service in analysis_services.items():
@@ -1,21 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import json
-import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from typing import Any, cast
 
 from api.agentcore_api import AgentExecutionContext, Message
-from game_api import BaseGameStateView, BasePlayerPossibleMoves, GameType, GenericGameEnvTypes, ToolCall
-from pydantic import Field
+from game_api import BaseAgentDecision, BaseGameStateView, BasePlayerPossibleMoves, GameType, GenericGameEnvTypes, ToolCall
+from pydantic import Field, ValidationError
 
-from common.core.app_error import Errors
-from common.core.litellm_schemas import ChatMessage, MessageRole
+from common.core.app_error import AppException, Errors
+from common.core.config_service import ConfigService
+from common.core.litellm_schemas import ChatMessage, LLMFallback, MessageRole
 from common.core.litellm_service import LiteLLMService
 from common.model_config import ModelConfigFactory
 from common.types import AgentReasoning, ExecutedToolCall
 from common.utils.json_model import JsonModel
 from common.utils.msgspec import encode_json_str
-from common.utils.utils import get_logger, is_dict, is_list
+from common.utils.partial_json import MalformedJsonError, PartialJsonObject
+from common.utils.prompt_template import compile_prompt_template, get_field
+from common.utils.utils import get_logger
 from shared_db.models.tool import ToolValidationStatus
 from shared_db.schemas.agent import AgentVersionResponse
 from shared_db.schemas.llm_integration import LLMIntegrationWithKey, LLMModelType
@@ -23,6 +29,17 @@ from shared_db.schemas.tool import ToolResponse
 
 logger = get_logger()
 
+_FAILURE_FEEDBACK_PREFIX = "SYSTEM FEEDBACK: The previous move attempt failed with error: "
+_FAILURE_FEEDBACK_SUFFIX = ". Please analyze the error and provide a valid move or tool call."
+_EARLIER_FAILURES_PREFIX = "SYSTEM FEEDBACK: Earlier attempts this turn failed (oldest first), do not repeat them: "
+_TOOL_RESULT_PREFIX = "Tool '"
+# Rough chars-per-token ratio for budgeting the in-turn history
+_CHARS_PER_TOKEN = 4
+_MAX_SUMMARY_ERROR_CHARS = 300
+_MAX_OLD_TOOL_RESULT_CHARS = 500
+# Marks the start of a ${{...}} variable in agent-authored prompt text
+_TEMPLATE_VARIABLE_START = "${{"
+
 
 class AgentExecutionResult(JsonModel):
     """Result of agent execution including move, exit decision, and optional chat message."""
@@ -34,17 +51,57 @@ class AgentExecutionResult(JsonModel):
     tool_calls: list[ExecutedToolCall] = Field(default_factory=list, description="List of tool calls made during decision making")
 
 
+class SystemPrompt(JsonModel):
+    """System prompt split into a cacheable prefix and the per-turn remainder."""
+
+    stable_prefix: str = Field(..., description="Part of the prompt that is identical across turns of the same agent version")
+    volatile_suffix: str = Field(..., description="Part of the prompt rendered from the current game state")
+
+
 class AgentExecutionService:
-    """Stateless service for executing agent decisions.
+    """Service for executing agent decisions.
 
-    This service does not maintain any state or database connections.
-    All data must be provided via method parameters.
+    This service does not maintain any game state or database connections.
+    All data must be provided via method parameters; the only state kept is a
+    bounded cache of rendered prompt prefixes.
     """
 
     _litellm_service: LiteLLMService
 
-    def __init__(self, litellm_service: LiteLLMService) -> None:
+    def __init__(
+        self,
+        litellm_service: LiteLLMService,
+        prompt_prefix_cache_size: int = 256,
+        stream_decisions: bool = False,
+        early_commit_grace_s: float = 2.0,
+        history_token_budget: int = 24000,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            litellm_service: Service used for all LLM calls
+            prompt_prefix_cache_size: Number of rendered prompt prefixes to keep
+            stream_decisions: Stream decisions and commit a validated move before the whole response has arrived
+            early_commit_grace_s: How long a streamed move waits for the rest of the decision (the chat message) before it is committed
+            history_token_budget: Approximate token budget for the messages of a single attempt
+        """
         self._litellm_service = litellm_service
+        self._prompt_prefix_cache_size = max(1, prompt_prefix_cache_size)
+        self._prompt_prefix_cache: OrderedDict[tuple[Any, ...], str] = OrderedDict()
+        self._stream_decisions = stream_decisions
+        self._early_commit_grace_s = early_commit_grace_s
+        self._history_token_budget = history_token_budget
+
+    @classmethod
+    def from_config(cls, litellm_service: LiteLLMService, config_service: ConfigService) -> AgentExecutionService:
+        """Create the service with the ``agents.*`` settings, wherever agents are executed."""
+        return cls(
+            litellm_service=litellm_service,
+            prompt_prefix_cache_size=int(config_service.get("agents.prompt_prefix_cache_size", 256)),
+            stream_decisions=str(config_service.get("agents.streaming.enabled", "false")).lower() == "true",
+            early_commit_grace_s=float(config_service.get("agents.streaming.early_commit_grace_s", 2.0)),
+            history_token_budget=int(config_service.get("agents.history_token_budget", 24000)),
+        )
 
     async def execute(
         self,
@@ -55,6 +112,7 @@ class AgentExecutionService:
         possible_moves: BasePlayerPossibleMoves | None,
         llm_integration: LLMIntegrationWithKey,
         tools: list[ToolResponse],
+        fallback_llm_integration: LLMIntegrationWithKey | None = None,
     ) -> AgentExecutionResult:
         """Execute agent decision with tool call loop.
 
@@ -66,6 +124,7 @@ class AgentExecutionService:
             possible_moves: Possible moves for the agent
             llm_integration: LLM integration to use (already fetched by caller)
             tools: List of validated tools available to the agent (already fetched by caller)
+            fallback_llm_integration: Integration for the agent's fast provider; slow calls are hedged to it when given
         """
 
         # Resolve provider and model
@@ -80,13 +139,21 @@ class AgentExecutionService:
         else:
             model_enum = llm_integration.selected_model
 
+        fallback = self._resolve_fallback(agent, fallback_llm_integration)
+
         # Convert context messages to ChatMessage format for internal use
         chat_messages: list[ChatMessage] = self._convert_to_chat_messages(context.messages)
 
         # Initialize system prompt if not already set
         if not chat_messages:
             system_prompt = self._prepare_prompt(agent, types, state_view, possible_moves, tools)
-            chat_messages = [ChatMessage(role=MessageRole.SYSTEM, content=system_prompt)]
+            chat_messages = [
+                ChatMessage(
+                    role=MessageRole.SYSTEM,
+                    content=system_prompt.stable_prefix + system_prompt.volatile_suffix,
+                    cacheable_prefix_length=len(system_prompt.stable_prefix),
+                )
+            ]
 
         # Track all tool calls made during this execution
         executed_tool_calls: list[ExecutedToolCall] = []
@@ -98,24 +165,19 @@ class AgentExecutionService:
             # Handle previous failure if it exists in context
             if context.failure:
                 # Format failure as clear error feedback, not game state
-                failure_message = f"SYSTEM FEEDBACK: The previous move attempt failed with error: {context.failure}. Please analyze the error and provide a valid move or tool call."
+                failure_message = f"{_FAILURE_FEEDBACK_PREFIX}{context.failure}{_FAILURE_FEEDBACK_SUFFIX}"
                 chat_messages.append(ChatMessage(role=MessageRole.USER, content=failure_message))
                 context.failure = None
 
+            chat_messages = self._compact_history(chat_messages)
+
             try:
-                response = await self._litellm_service.chat_completion(
-                    provider=llm_integration.provider,
-                    model=model_enum,
-                    messages=chat_messages,
-                    api_key=llm_integration.api_key,
-                    output_type=types.agent_decision_type(),
-                )
+                decision, committed_early = await self._request_decision(llm_integration, model_enum, chat_messages, types, possible_moves, fallback)
 
                 # Check if response content is None - log and retry
-                if response.content is None:
+                if decision is None:
                     raise Errors.Agent.INVALID_OUTPUT.create("You returned an empty response")
 
-                decision = response.content
                 if not decision.reasoning:
                     raise Errors.Agent.INVALID_OUTPUT.create("Reasoning is required for moves")
                 chat_messages.append(ChatMessage(role=MessageRole.ASSISTANT, content=decision.to_json()))
@@ -162,13 +224,13 @@ class AgentExecutionService:
                     chat_messages.append(
                         ChatMessage(
                             role=MessageRole.USER,
-                            content=f"Tool '{decision.tool_call.tool_name}' result: {encode_json_str(tool_result.result)}",
+                            content=f"{_TOOL_RESULT_PREFIX}{decision.tool_call.tool_name}' result: {encode_json_str(tool_result.result)}",
                         )
                     )
                     # Continue loop to ask agent again after tool execution
                 elif decision.move:
-                    # Validate that chat_message is provided for moves
-                    if not decision.chat_message:
+                    # Validate that chat_message is provided for moves (an early-committed move may not have it yet)
+                    if not decision.chat_message and not committed_early:
                         raise Errors.Agent.INVALID_OUTPUT.create("Chat message is required when making a move")
 
                     logger.info(f"Agent returned final move: {decision.move}")
@@ -190,12 +252,229 @@ class AgentExecutionService:
                 if context.attempts >= context.max_attempts:
                     raise
 
+                # The provider's circuit is open: retrying now would only fail again, so give up the turn quickly
+                if AppException.is_(e, Errors.Llm.PROVIDER_UNAVAILABLE):
+                    context.messages = self._convert_from_chat_messages(chat_messages)
+                    raise
+
                 context.failure = str(e)
 
         # Update context with final messages before raising
         context.messages = self._convert_from_chat_messages(chat_messages)
         raise Errors.Agent.MAX_ITERATIONS_EXCEEDED.create()
 
+    async def _request_decision(
+        self,
+        llm_integration: LLMIntegrationWithKey,
+        model: LLMModelType,
+        chat_messages: list[ChatMessage],
+        types: type[GenericGameEnvTypes],
+        possible_moves: BasePlayerPossibleMoves | None,
+        fallback: LLMFallback | None,
+    ) -> tuple[BaseAgentDecision[Any] | None, bool]:
+        """Ask the model for its next decision; returns the decision and whether a move was committed early."""
+        # Hedged requests race two complete responses, so they are never streamed
+        if self._stream_decisions and fallback is None:
+            return await self._stream_decision(llm_integration, model, chat_messages, types, possible_moves)
+
+        response = await self._litellm_service.chat_completion(
+            provider=llm_integration.provider,
+            model=model,
+            messages=chat_messages,
+            api_key=llm_integration.api_key,
+            output_type=types.agent_decision_type(),
+            fallback=fallback,
+        )
+        return response.content, False
+
+    async def _stream_decision(
+        self,
+        llm_integration: LLMIntegrationWithKey,
+        model: LLMModelType,
+        chat_messages: list[ChatMessage],
+        types: type[GenericGameEnvTypes],
+        possible_moves: BasePlayerPossibleMoves | None,
+    ) -> tuple[BaseAgentDecision[Any] | None, bool]:
+        """Stream the decision through an incremental parser.
+
+        The stream is aborted as soon as the move is not one of the possible moves. Once a valid
+        move is complete, the rest of the decision (normally only the chat message) gets
+        ``early_commit_grace_s`` to finish; after that the move is committed with whatever chat text
+        has arrived. Output the incremental parser rejects is read to the end and repaired the same
+        way as a non-streamed response.
+        """
+        decision_type = types.agent_decision_type()
+        keys = {name: field.alias or name for name, field in decision_type.model_fields.items()}
+        partial = PartialJsonObject()
+        received: list[str] = []
+        malformed = False
+        commit_deadline: float | None = None
+
+        stream = self._litellm_service.stream_chat_completion(
+            provider=llm_integration.provider,
+            model=model,
+            messages=chat_messages,
+            api_key=llm_integration.api_key,
+            output_type=decision_type,
+        )
+        try:
+            while not partial.complete:
+                timeout = None if commit_deadline is None else max(0.0, commit_deadline - time.monotonic())
+                try:
+                    chunk = await asyncio.wait_for(anext(stream), timeout)
+                except StopAsyncIteration:
+                    if commit_deadline is not None:
+                        # The stream ended early (e.g. a replayed early commit) after a valid move
+                        return self._early_decision(decision_type, partial, keys), True
+                    break
+                except TimeoutError:
+                    return self._early_decision(decision_type, partial, keys), True
+
+                received.append(chunk)
+                if malformed:
+                    continue
+                try:
+                    completed = partial.feed(chunk)
+                except MalformedJsonError as e:
+                    logger.info("Streamed decision is not incrementally parseable, reading it to the end for repair", error=str(e))
+                    malformed = True
+                    continue
+
+                if keys["move"] in completed and self._check_streamed_move(partial, keys, types, possible_moves):
+                    commit_deadline = time.monotonic() + self._early_commit_grace_s
+        finally:
+            await stream.aclose()
+
+        content = "".join(received)
+        if not content.strip():
+            return None, False
+        if partial.object_text is not None:
+            try:
+                return decision_type.model_validate_json(partial.object_text), False
+            except ValidationError:
+                pass
+        # Same extraction and repair as a non-streamed response
+        return self._litellm_service.parse_json_output(content, decision_type, model), False
+
+    def _early_decision(self, decision_type: type[BaseAgentDecision[Any]], partial: PartialJsonObject, keys: dict[str, str]) -> BaseAgentDecision[Any]:
+        """Decision from a validated move and whatever reasoning and chat text have arrived."""
+        logger.info("Committing streamed move before the decision finished", pending_fields=[k for k in keys.values() if k not in partial.fields])
+        chat_key = keys["chat_message"]
+        early = {
+            keys["reasoning"]: partial.value(keys["reasoning"]),
+            keys["move"]: partial.value(keys["move"]),
+            chat_key: partial.value(chat_key) or partial.pending_string(chat_key),
+        }
+        return decision_type.model_validate(early)
+
+    def _check_streamed_move(
+        self, partial: PartialJsonObject, keys: dict[str, str], types: type[GenericGameEnvTypes], possible_moves: BasePlayerPossibleMoves | None
+    ) -> bool:
+        """Validate a move as soon as it has been streamed; True if the decision can be committed on it."""
+        raw_move = partial.value(keys["move"])
+        if raw_move is None or partial.value(keys["tool_call"]) or partial.value(keys["exit"]):
+            return False
+
+        try:
+            move = types.player_move_type().model_validate(raw_move)
+        except (ValidationError, AppException) as e:
+            raise Errors.Agent.INVALID_OUTPUT.create(f"Invalid move {raw_move}: {e}") from e
+        if possible_moves is not None and not possible_moves.allows(move):
+            raise Errors.Agent.INVALID_OUTPUT.create(f"Move {raw_move} is not one of the possible moves")
+        return bool(partial.value(keys["reasoning"]))
+
+    def _compact_history(self, chat_messages: list[ChatMessage]) -> list[ChatMessage]:
+        """Keep the in-turn conversation from growing with every retry.
+
+        The system prompt and the most recent failed attempt are kept verbatim. Earlier failed
+        attempts (the rejected response plus its error feedback) are collapsed into one message
+        with a short structured summary per attempt. If the conversation is still over the token
+        budget, older tool results are truncated and then the oldest messages are dropped.
+        """
+        feedback_indexes = [i for i, msg in enumerate(chat_messages) if msg.role == MessageRole.USER and msg.content.startswith(_FAILURE_FEEDBACK_PREFIX)]
+        summaries: list[dict[str, Any]] = []
+        removed: set[int] = set()
+        for i in feedback_indexes[:-1]:
+            failed_response = chat_messages[i - 1] if i > 0 and chat_messages[i - 1].role == MessageRole.ASSISTANT else None
+            summaries.append(self._summarize_failure(failed_response, chat_messages[i]))
+            removed.update({i - 1, i} if failed_response else {i})
+
+        compacted: list[ChatMessage] = []
+        previous_summaries: list[dict[str, Any]] = []
+        summary_position: int | None = None
+        for i, msg in enumerate(chat_messages):
+            if msg.role == MessageRole.USER and msg.content.startswith(_EARLIER_FAILURES_PREFIX):
+                previous_summaries = json.loads(msg.content.removeprefix(_EARLIER_FAILURES_PREFIX))
+                summary_position = len(compacted) if summary_position is None else summary_position
+            elif i in removed:
+                summary_position = len(compacted) if summary_position is None else summary_position
+            else:
+                compacted.append(msg)
+
+        if summary_position is not None:
+            content = _EARLIER_FAILURES_PREFIX + json.dumps(previous_summaries + summaries)
+            compacted.insert(summary_position, ChatMessage(role=MessageRole.USER, content=content))
+
+        return self._fit_history_to_budget(compacted)
+
+    def _summarize_failure(self, failed_response: ChatMessage | None, feedback: ChatMessage) -> dict[str, Any]:
+        """One-line record of a failed attempt: what the agent tried and why it was rejected."""
+        error = feedback.content.removeprefix(_FAILURE_FEEDBACK_PREFIX).removesuffix(_FAILURE_FEEDBACK_SUFFIX)
+        summary: dict[str, Any] = {"error": error[:_MAX_SUMMARY_ERROR_CHARS]}
+        if failed_response is None:
+            return summary
+
+        try:
+            decision = json.loads(failed_response.content)
+        except json.JSONDecodeError:
+            decision = None
+        if not isinstance(decision, dict):
+            summary["response"] = failed_response.content[:_MAX_SUMMARY_ERROR_CHARS]
+        elif decision.get("toolCall"):
+            summary["toolCall"] = decision["toolCall"].get("toolName")
+        elif decision.get("move"):
+            summary["move"] = decision["move"]
+        elif decision.get("exit"):
+            summary["exit"] = True
+        return summary
+
+    def _fit_history_to_budget(self, chat_messages: list[ChatMessage]) -> list[ChatMessage]:
+        """Trim older tool results, then drop the oldest messages, until the budget is met.
+
+        The system prompt and the last two messages are never removed.
+        """
+        budget_chars = self._history_token_budget * _CHARS_PER_TOKEN
+        total_chars = sum(len(msg.content) for msg in chat_messages)
+        if total_chars <= budget_chars:
+            return chat_messages
+
+        messages = list(chat_messages)
+        protected_tail = len(messages) - 2
+        for i in range(len(messages)):
+            if total_chars <= budget_chars:
+                return messages
+            msg = messages[i]
+            if 0 < i < protected_tail and msg.content.startswith(_TOOL_RESULT_PREFIX) and len(msg.content) > _MAX_OLD_TOOL_RESULT_CHARS:
+                truncated = msg.content[:_MAX_OLD_TOOL_RESULT_CHARS] + " ... [truncated]"
+                total_chars -= len(msg.content) - len(truncated)
+                messages[i] = ChatMessage(role=msg.role, content=truncated)
+
+        first = 1 if messages and messages[0].role == MessageRole.SYSTEM else 0
+        while total_chars > budget_chars and len(messages) - first > 2:
+            total_chars -= len(messages.pop(first).content)
+        return messages
+
+    def _resolve_fallback(self, agent: AgentVersionResponse, fallback_llm_integration: LLMIntegrationWithKey | None) -> LLMFallback | None:
+        """Hedge target: the agent's fast provider/model on the given integration, if it is valid."""
+        if fallback_llm_integration is None:
+            return None
+
+        model = agent.fast_llm_model or fallback_llm_integration.selected_model
+        if not ModelConfigFactory.validate_provider_model(fallback_llm_integration.provider, model):
+            logger.warning("Ignoring invalid fallback model", provider=fallback_llm_integration.provider, model=model)
+            return None
+        return LLMFallback(provider=fallback_llm_integration.provider, model=cast(LLMModelType, model), api_key=fallback_llm_integration.api_key)
+
     def _convert_to_chat_messages(self, messages: list[Message]) -> list[ChatMessage]:
         """Convert API Message objects to ChatMessage objects for LiteLLM."""
         chat_messages: list[ChatMessage] = []
@@ -205,12 +484,12 @@ class AgentExecutionService:
             except ValueError:
                 # Default to USER if role is not recognized
                 role = MessageRole.USER
-            chat_messages.append(ChatMessage(role=role, content=msg.content))
+            chat_messages.append(ChatMessage(role=role, content=msg.content, cacheable_prefix_length=msg.cacheable_prefix_length))
         return chat_messages
 
     def _convert_from_chat_messages(self, chat_messages: list[ChatMessage]) -> list[Message]:
         """Convert ChatMessage objects back to API Message objects."""
-        return [Message(role=msg.role.value, content=msg.content) for msg in chat_messages]
+        return [Message(role=msg.role.value, content=msg.content, cacheable_prefix_length=msg.cacheable_prefix_length) for msg in chat_messages]
 
     def _prepare_prompt(
         self,
@@ -219,11 +498,62 @@ class AgentExecutionService:
         state_view: BaseGameStateView,
         possible_moves: BasePlayerPossibleMoves | None,
         tools: list[ToolResponse],
-    ) -> str:
-        # Inject prompt sections (tools, output schema, input/output type schemas)
-        system_prompt_with_sections = self._inject_prompt_sections(agent=agent, types=types, tools=tools)
+    ) -> SystemPrompt:
+        """Build the system prompt as a stable prefix followed by the per-turn suffix.
 
-        # Extract chat history from events
+        Everything that does not depend on the game state (tool catalog, schemas, game docs,
+        untemplated conversation and exit instructions, and the agent instructions up to the first
+        template variable) goes first so providers can reuse their cached prefix between turns.
+        Conversation and exit instructions that use template variables are rendered into the suffix.
+        """
+        variable_start = agent.system_prompt.find(_TEMPLATE_VARIABLE_START)
+        split_at = len(agent.system_prompt) if variable_start == -1 else variable_start
+        instructions_head, instructions_tail = agent.system_prompt[:split_at], agent.system_prompt[split_at:]
+        conversation_instructions, templated_conversation_instructions = self._split_templated(agent.conversation_instructions)
+        exit_criteria, templated_exit_criteria = self._split_templated(agent.exit_criteria)
+
+        stable_prefix = self._get_prompt_prefix(
+            agent, types, tools, instructions_head, conversation_instructions=conversation_instructions, exit_criteria=exit_criteria
+        )
+        if not (instructions_tail or templated_conversation_instructions or templated_exit_criteria):
+            return SystemPrompt(stable_prefix=stable_prefix, volatile_suffix="")
+
+        # Templates are compiled once per distinct text and rendered against the player view
+        resolver = self._prompt_variable_resolver(state_view, possible_moves)
+
+        def render(template: str | None) -> str | None:
+            return compile_prompt_template(template).render(resolver) if template else None
+
+        volatile_suffix = render(instructions_tail) or ""
+        templated_sections = self._instruction_sections(render(templated_conversation_instructions), render(templated_exit_criteria))
+        if templated_sections:
+            volatile_suffix += "\n" + "\n".join(templated_sections)
+        return SystemPrompt(stable_prefix=stable_prefix, volatile_suffix=volatile_suffix)
+
+    @staticmethod
+    def _split_templated(text: str | None) -> tuple[str | None, str | None]:
+        """Return ``(text, None)`` for static text and ``(None, text)`` for text with template variables."""
+        if text and _TEMPLATE_VARIABLE_START in text:
+            return None, text
+        return text, None
+
+    def _prompt_variable_resolver(self, state_view: BaseGameStateView, possible_moves: BasePlayerPossibleMoves | None) -> Callable[[str], Any]:
+        """Resolve the first segment of a template variable without serializing the whole state."""
+
+        def resolve_root(name: str) -> Any:
+            if name == "state":
+                # Special case: the whole player view state as JSON
+                return json.dumps(self._state_for_prompt(state_view, possible_moves), indent=2)
+            if name == "chatHistory":
+                return self._chat_history(state_view)
+            if name == "possibleMoves":
+                return possible_moves
+            return get_field(state_view, name)
+
+        return resolve_root
+
+    def _chat_history(self, state_view: BaseGameStateView) -> list[dict[str, Any]]:
+        """Extract chat history from events."""
         chat_history: list[dict[str, Any]] = []
         for event in state_view.events:
             event_dict = event.to_dict(mode="json")
@@ -235,21 +565,62 @@ class AgentExecutionService:
                         "timestamp": event_dict.get("timestamp"),
                     }
                 )
+        return chat_history
 
-        # Apply variable substitution to the FINAL system prompt (including injected sections)
+    def _state_for_prompt(self, state_view: BaseGameStateView, possible_moves: BasePlayerPossibleMoves | None) -> dict[str, Any]:
         state_for_prompt = {
             **state_view.to_dict(mode="json"),
             "events": [e.to_dict(mode="json") for e in state_view.events],
-            "chatHistory": chat_history,
+            "chatHistory": self._chat_history(state_view),
         }
 
         state_for_prompt["possibleMoves"] = possible_moves.to_dict(mode="json") if possible_moves else None
+        return state_for_prompt
 
-        system_prompt = self._substitute_variables(system_prompt_with_sections, state_for_prompt)
+    def _get_prompt_prefix(
+        self,
+        agent: AgentVersionResponse,
+        types: type[GenericGameEnvTypes],
+        tools: list[ToolResponse],
+        instructions_head: str,
+        *,
+        conversation_instructions: str | None,
+        exit_criteria: str | None,
+    ) -> str:
+        """Return the stable prompt prefix, rendering it once per agent version, game and tool set."""
+        key = (
+            agent.id,
+            types.type(),
+            tuple((tool.id, tool.updated_at) for tool in tools),
+            instructions_head,
+            conversation_instructions,
+            exit_criteria,
+        )
+        prefix = self._prompt_prefix_cache.get(key)
+        if prefix is not None:
+            self._prompt_prefix_cache.move_to_end(key)
+            return prefix
+
+        prefix = self._build_prompt_prefix(types, tools, instructions_head, conversation_instructions, exit_criteria)
+        self._prompt_prefix_cache[key] = prefix
+        while len(self._prompt_prefix_cache) > self._prompt_prefix_cache_size:
+            self._prompt_prefix_cache.popitem(last=False)
+        return prefix
+
+    def _build_prompt_prefix(
+        self,
+        types: type[GenericGameEnvTypes],
+        tools: list[ToolResponse],
+        instructions_head: str,
+        conversation_instructions: str | None,
+        exit_criteria: str | None,
+    ) -> str:
+        # Inject prompt sections (tools, output schema)
+        prompt_sections = self._inject_prompt_sections(types=types, tools=tools)
 
         # Inject per-game MOVE SCHEMA, and for Chess also inject POSSIBLE_MOVES_EXAMPLES
         move_schema = types.player_move_type().model_json_schema()
-        sections: list[str] = [system_prompt, "\n[MOVE SCHEMA]\n", json.dumps(move_schema, indent=2)]
+        sections: list[str] = [prompt_sections, "\n[MOVE SCHEMA]\n", json.dumps(move_schema, indent=2)]
 
         # For Chess: provide examples and board indexing documentation
         if types.type() == GameType.CHESS:
@@ -317,85 +688,40 @@ Example possibleMoves format:
             }
             sections += ["\n[POSSIBLE_MOVES_EXAMPLES]\n", encode_json_str(examples)]
 
+        sections += self._instruction_sections(conversation_instructions, exit_criteria)
+
+        # Agent instructions come last; only the part before the first template variable is stable
+        sections.append("\n[AGENT INSTRUCTIONS]")
+        sections.append(instructions_head)
+
+        return "\n".join(sections)
+
+    def _instruction_sections(self, conversation_instructions: str | None, exit_criteria: str | None) -> list[str]:
+        """Build the conversation instructions and exit criteria sections (empty when not set)."""
+        sections: list[str] = []
+
         # Add conversation instructions if present
-        if agent.conversation_instructions:
+        if conversation_instructions:
             sections.append("\n[CONVERSATION INSTRUCTIONS]")
-            sections.append(agent.conversation_instructions)
+            sections.append(conversation_instructions)
             sections.append("\nYou can communicate with other agents using the 'chat_message' field in your response.")
             sections.append("Use this to share your thoughts, strategies, or coordinate with other players.")
 
         # Add exit criteria if present
-        if agent.exit_criteria:
+        if exit_criteria:
             sections.append("\n[EXIT CRITERIA]")
-            sections.append(agent.exit_criteria)
-
-        return "\n".join(sections)
-
-    def _substitute_variables(self, template: str, player_view_state: dict[str, Any]) -> str:
-        def replace_variable(match: re.Match[str]) -> str:
-            var_path = match.group(1)
-
-            # Special case: if variable path is exactly "state", return player view state as JSON
-            if var_path == "state":
-                return json.dumps(player_view_state, indent=2)
-
-            # For all other paths, use the existing player view logic
-            value = self._get_nested_value(player_view_state, var_path)
-            return str(value) if value is not None else f"${{{var_path}}}"
-
-        # Replace ${{variable.path}} with actual values
-        pattern = r"\$\{\{([^}]+)\}\}"
-        return re.sub(pattern, replace_variable, template)
-
-    def _get_nested_value(
-        self,
-        data: dict[str, Any],
-        path: str,
-    ) -> Any:
-        """Get nested value from dictionary using dot notation.
-
-        Args:
-            data: Dictionary to search
-            path: Dot-separated path (e.g., "player.chips")
-
-        Returns:
-            Value at path or None if not found
-        """
-        keys = path.split(".")
-        value = data
-
-        for key in keys:
-            # Handle array indexing
-            if "[" in key and "]" in key:
-                base_key, index_str = key.split("[")
-                index = int(index_str.rstrip("]"))
-
-                if is_dict(value) and base_key in value:
-                    value = value[base_key]
-                    if is_list(value) and 0 <= index < len(value):
-                        value = value[index]
-                    else:
-                        return None
-                else:
-                    return None
-            elif is_dict(value) and key in value:
-                value = value[key]
-            else:
-                return None
+            sections.append(exit_criteria)
 
-        return value
+        return sections
 
-    def _inject_prompt_sections(self, agent: AgentVersionResponse, types: type[GenericGameEnvTypes], tools: list[ToolResponse]) -> str:
-        """Inject tools catalog, output schema, and type schemas into the system prompt.
+    def _inject_prompt_sections(self, types: type[GenericGameEnvTypes], tools: list[ToolResponse]) -> str:
+        """Build the tools catalog and output schema sections of the system prompt.
 
-        The final system prompt will include:
-        - Core prompt (with substituted variables)
+        The sections include:
         - Tools catalog: name, description, and parameters (if available)
         - Output JSON schema (AgentDecision)
-        - Input and Output type schemas
         """
         sections: list[str] = []
-        sections.append(agent.system_prompt)
 
         # 1) Tools catalog from tool_ids with parameter descriptions
         if tools:
@@ -410,7 +736,7 @@ Example possibleMoves format:
                 tool_lines.append("  </parameters>")
                 tool_lines.append("</tool>")
 
-            sections.append("\n[TOOLS]\n" + "\n".join(tool_lines))
+            sections.append("[TOOLS]\n" + "\n".join(tool_lines))
             sections.append("\n⚠️ CRITICAL: Choose EXACTLY ONE action per response:")
             sections.append("  1. Call a tool (set 'tool_call' field, leave 'move' and 'exit' as null)")
             sections.append("  2. Make a final move (set 'move' field, leave 'tool_call' and 'exit' as null)")
@@ -434,7 +760,7 @@ Example possibleMoves format:
                 "• If the tool has parameters, ALWAYS provide required parameters - check tool requirements carefully! Do NOT send empty parameters {}."
             )
         else:
-            sections.append("\n[NO TOOLS AVAILABLE]")
+            sections.append("[NO TOOLS AVAILABLE]")
             sections.append("You do not have access to any tools for this decision.")
             sections.append("You must make your move directly using the 'move' field in your response.")
             sections.append("Do NOT attempt to call any tools - they will fail and waste iterations.")
@@ -8,6 +8,7 @@ from game_api import GameType
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.game_env_registry import GameEnvRegistry
+from common.utils.prompt_template import compile_prompt_template
 from common.utils.template_substitution import substitute_template_variables
 from common.utils.utils import get_logger
 from shared_db.crud.tool import ToolDAO
@@ -56,9 +57,8 @@ class AgentPromptService:
         """
         logger.info(f"Validating prompt for environment {environment}")
 
-        # Extract variables from prompt
-        pattern = r"\$\{\{([^}]+)\}\}"
-        variables = re.findall(pattern, prompt)
+        # Compile the prompt once; the render plan is cached for execution-time rendering
+        variables = compile_prompt_template(prompt).variables
 
         # Check if prompt contains output format (which is not allowed)
         forbidden_patterns = [
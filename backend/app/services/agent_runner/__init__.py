@@ -7,13 +7,24 @@ from abc import ABC, abstractmethod
 from api.agentcore_api import AgentExecutionContext, AgentExecutionResult
 from game_api import BaseGameStateView, BasePlayerPossibleMoves, GameType
 
+from common.core.lifecycle import Lifecycle
 from shared_db.schemas.agent import AgentVersionResponse
 from shared_db.schemas.llm_integration import LLMIntegrationWithKey
 from shared_db.schemas.tool import ToolResponse
 
 
-class AgentRunner(ABC):
-    """Abstract base class for agent execution strategies."""
+class AgentRunner(Lifecycle, ABC):
+    """Abstract base class for agent execution strategies.
+
+    Runners that talk to a remote service hold their connections for the lifetime of the
+    runner: they are opened on start (or on first use) and closed on stop.
+    """
+
+    async def _start(self) -> None:
+        pass
+
+    async def _stop(self) -> None:
+        pass
 
     @abstractmethod
     async def invoke_agent(
@@ -27,6 +38,7 @@ class AgentRunner(ABC):
         execution_context: AgentExecutionContext,
         max_retries: int = 3,
         timeout_seconds: int = 300,
+        fallback_llm_integration: LLMIntegrationWithKey | None = None,
     ) -> tuple[AgentExecutionResult, AgentExecutionContext]:
         """Invoke an agent and return the result. All data is provided by the caller, AgentRunner is stateless.
 
@@ -41,6 +53,7 @@ class AgentRunner(ABC):
             execution_context: Execution context for retry logic
             max_retries: Maximum number of retries
             timeout_seconds: Timeout in seconds
+            fallback_llm_integration: Integration for the agent's fast provider, used to hedge slow LLM calls
 
         Returns:
             Tuple of (AgentExecutionResult with move data and reasoning, updated AgentExecutionContext)
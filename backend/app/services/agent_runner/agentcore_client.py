@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-from typing import override
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Any, override
 
 from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
@@ -13,24 +14,71 @@ from game_api import BaseGameStateView, BasePlayerPossibleMoves, GameType
 
 from app.services.agent_runner import AgentRunner
 from common.core.config_service import ConfigService
+from common.core.llm_usage_scope import LLMUsageScope, LLMUsageSink
+from common.utils.msgspec import decode_json, encode_json
 from common.utils.utils import get_logger
 from shared_db.schemas.agent import AgentVersionResponse
 from shared_db.schemas.llm_integration import LLMIntegrationWithKey
 from shared_db.schemas.tool import ToolResponse
 
+if TYPE_CHECKING:
+    from aiobotocore.client import AioBaseClient
+
 logger = get_logger()
 
 
 class AgentCoreClient(AgentRunner):
-    """Production AgentCore client that uses AWS AgentCore service."""
+    """Production AgentCore client that uses AWS AgentCore service.
+
+    A single bedrock-agentcore client (and its connection pool) is shared by all invocations.
+    The current LLMUsageScope is sent with each invocation, and the usage the runtime reports
+    back is handed to ``usage_sink``.
+    """
 
-    def __init__(self, config_service: ConfigService) -> None:
+    def __init__(self, config_service: ConfigService, usage_sink: LLMUsageSink | None = None) -> None:
+        super().__init__()
+        self._usage_sink = usage_sink
         self.runtime_arn = config_service.get("agentcore.runtime_arn")
         self.region = config_service.get("aws.region", "us-east-1")
+        self._max_connections = int(config_service.get("agentcore.max_connections", 50))
+        self._read_timeout_s = int(config_service.get("agentcore.read_timeout_s", 300))
 
         if not self.runtime_arn:
             raise ValueError("AGENTCORE_RUNTIME_ARN must be configured for AgentCoreClient")
 
+        self._session = get_session()
+        self._exit_stack = AsyncExitStack()
+        self._client: AioBaseClient | None = None
+        self._start_lock = asyncio.Lock()
+
+    @override
+    async def _start(self) -> None:
+        config = AioConfig(
+            read_timeout=self._read_timeout_s,
+            connect_timeout=30,
+            retries={"max_attempts": 0},  # We handle retries ourselves
+            max_pool_connections=self._max_connections,
+            tcp_keepalive=True,
+        )
+        self._client = await self._exit_stack.enter_async_context(
+            self._session.create_client("bedrock-agentcore", region_name=self.region, config=config)  # type: ignore
+        )
+
+    @override
+    async def _stop(self) -> None:
+        self._client = None
+        await self._exit_stack.aclose()
+        self._exit_stack = AsyncExitStack()
+
+    async def _get_client(self) -> Any:
+        """The shared client, created on first use if the runner was not started explicitly."""
+        if self._client is None:
+            async with self._start_lock:
+                await self.start()
+        if self._client is None:
+            raise RuntimeError("AgentCoreClient is not running")
+        return self._client
+
     @override
     async def invoke_agent(
         self,
@@ -43,6 +91,7 @@ class AgentCoreClient(AgentRunner):
         execution_context: AgentExecutionContext,
         max_retries: int = 3,
         timeout_seconds: int = 300,
+        fallback_llm_integration: LLMIntegrationWithKey | None = None,
     ) -> tuple[AgentExecutionResult, AgentExecutionContext]:
         """Invoke agent through AWS Bedrock AgentCore service.
 
@@ -59,6 +108,7 @@ class AgentCoreClient(AgentRunner):
             execution_context: Execution context for retry logic
             max_retries: Maximum number of retries
             timeout_seconds: Timeout in seconds
+            fallback_llm_integration: Integration for the agent's fast provider, used to hedge slow LLM calls
 
         Returns:
             Tuple of (AgentExecutionResult with move data and reasoning, updated AgentExecutionContext)
@@ -69,17 +119,21 @@ class AgentCoreClient(AgentRunner):
             agent=agent,
             tools=tools,
             llm_integration=llm_integration,
+            fallback_llm_integration=fallback_llm_integration,
             game_type=game_type,
             game_state=game_state.to_dict(mode="json"),
             possible_moves=possible_moves.to_dict(mode="json") if possible_moves else None,
             execution_context=execution_context,
+            usage_scope=LLMUsageScope.get_or_none(),
         )
 
+        # Encoded once and reused by every retry
+        payload = encode_json(request)
         last_exception = None
 
         for attempt in range(max_retries + 1):
             try:
-                result = await self._invoke(request, timeout_seconds)
+                result = await self._invoke(payload, timeout_seconds)
                 logger.info(f"AgentCore invocation successful on attempt {attempt + 1}")
                 return result
 
@@ -109,23 +163,19 @@ class AgentCoreClient(AgentRunner):
         logger.error(f"AgentCore invocation failed after {max_retries + 1} attempts")
         raise last_exception or RuntimeError("AgentCore invocation failed")
 
-    async def _invoke(self, request: AgentCoreInvocationRequest, timeout_seconds: int) -> tuple[AgentExecutionResult, AgentExecutionContext]:
+    async def _invoke(self, payload: bytes, timeout_seconds: int) -> tuple[AgentExecutionResult, AgentExecutionContext]:
         """Invoke agent via AWS AgentCore service."""
-        session = get_session()
-
-        # Configure aiobotocore for timeout
-        config = AioConfig(
-            read_timeout=timeout_seconds,
-            connect_timeout=30,
-            retries={"max_attempts": 0},  # We handle retries ourselves
-        )
-
-        async with session.create_client(  # type: ignore
-            "bedrock-agentcore", region_name=self.region, config=config
-        ) as client:
-            response = await client.invoke_agent_runtime(agentRuntimeArn=self.runtime_arn, payload=request.to_json(), qualifier="DEFAULT")
-            response_data = AgentCoreInvocationResponse.model_validate_json(await response["response"].read())
-            if response_data.result:
-                return response_data.result, response_data.result.execution_context
-            else:
-                raise RuntimeError(f"Agent execution failed: {response_data.error}")
+        client = await self._get_client()
+
+        # The client's read timeout is shared, so the per-call timeout is enforced here
+        async with asyncio.timeout(timeout_seconds):
+            response = await client.invoke_agent_runtime(agentRuntimeArn=self.runtime_arn, payload=payload, qualifier="DEFAULT")
+            # Validated from a python dict so ids in the reported usage are parsed into TSIDs
+            response_data = AgentCoreInvocationResponse.model_validate(decode_json(await response["response"].read()))
+        if self._usage_sink is not None:
+            for usage in response_data.llm_usage:
+                self._usage_sink(usage)
+        if response_data.result:
+            return response_data.result, response_data.result.execution_context
+        else:
+            raise RuntimeError(f"Agent execution failed: {response_data.error}")
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import nullcontext
+from contextvars import ContextVar
 from typing import Any
 
 from api.agentcore_api import AgentCoreInvocationRequest, AgentCoreInvocationResponse, AgentExecutionResult
@@ -10,15 +12,27 @@ from bedrock_agentcore import BedrockAgentCoreApp
 
 from app.services.agent_execution_service import AgentExecutionService
 from app.services.game_env_registry import GameEnvRegistry
+from common.core.config_service import ConfigService
 from common.core.litellm_service import LiteLLMService
-from common.utils.utils import get_logger
+from common.utils.utils import get_logger, use_context_var
+from shared_db.schemas.llm_usage import LLMUsageCreate
 
 logger = get_logger()
 
 app = BedrockAgentCoreApp()
 
-litellm_service = LiteLLMService()
-agent_execution_service = AgentExecutionService(litellm_service)
+# Usage of the LLM calls made by the current invocation; returned to the caller, which records it
+_invocation_usage: ContextVar[list[LLMUsageCreate]] = ContextVar("agentcore_invocation_usage")
+
+
+def _collect_usage(usage: LLMUsageCreate) -> None:
+    collected = _invocation_usage.get(None)
+    if collected is not None:
+        collected.append(usage)
+
+
+litellm_service = LiteLLMService(usage_sink=_collect_usage)
+agent_execution_service = AgentExecutionService.from_config(litellm_service, ConfigService())
 
 registry = GameEnvRegistry.instance()
 
@@ -26,6 +40,7 @@ registry = GameEnvRegistry.instance()
 @app.entrypoint  # type: ignore
 async def execute_agent(payload: str | dict[str, Any]) -> dict[str, Any]:
     """AgentCore entrypoint for agent execution."""
+    llm_usage: list[LLMUsageCreate] = []
 
     try:
         request = AgentCoreInvocationRequest.model_validate_json(payload) if isinstance(payload, str) else AgentCoreInvocationRequest.model_validate(payload)
@@ -50,17 +65,19 @@ async def execute_agent(payload: str | dict[str, Any]) -> dict[str, Any]:
         if possible_moves:
             possible_moves_obj = types.possible_moves_type().model_validate(possible_moves)
 
-        # Execute agent
+        # Execute agent, billing its LLM calls to the caller's scope
         start_time = asyncio.get_event_loop().time()
-        service_result = await agent_execution_service.execute(
-            context=context,
-            agent=agent,
-            types=types,
-            state_view=state_view,
-            possible_moves=possible_moves_obj,
-            llm_integration=llm_integration,
-            tools=tools,
-        )
+        with use_context_var(_invocation_usage, llm_usage), request.usage_scope.use() if request.usage_scope else nullcontext():
+            service_result = await agent_execution_service.execute(
+                context=context,
+                agent=agent,
+                types=types,
+                state_view=state_view,
+                possible_moves=possible_moves_obj,
+                llm_integration=llm_integration,
+                tools=tools,
+                fallback_llm_integration=request.fallback_llm_integration,
+            )
         execution_time_ms = int((asyncio.get_event_loop().time() - start_time) * 1000)
 
         # Create result object (API version)
@@ -71,13 +88,14 @@ async def execute_agent(payload: str | dict[str, Any]) -> dict[str, Any]:
             chat_message=service_result.chat_message,
             tool_calls=service_result.tool_calls,
             execution_time_ms=execution_time_ms,
-            tokens_used=None,  # Can be added later if needed
+            tokens_used=sum(usage.total_tokens for usage in llm_usage) if llm_usage else None,
             execution_context=context,
         )
 
         return AgentCoreInvocationResponse(
             result=api_result,
             execution_time_ms=execution_time_ms,
+            llm_usage=llm_usage,
         ).to_dict(mode="json")
 
     except Exception as e:
@@ -86,6 +104,7 @@ async def execute_agent(payload: str | dict[str, Any]) -> dict[str, Any]:
 
         return AgentCoreInvocationResponse(
             error=error_msg,
+            llm_usage=llm_usage,
         ).to_dict(mode="json")
 
 
@@ -22,6 +22,7 @@ class DirectAgentRunner(AgentRunner):
     """Direct agent runner that calls the execution service directly without HTTP."""
 
     def __init__(self, agent_execution_service: AgentExecutionService) -> None:
+        super().__init__()
         self._agent_execution_service = agent_execution_service
 
     @override
@@ -36,6 +37,7 @@ class DirectAgentRunner(AgentRunner):
         execution_context: AgentExecutionContext,
         max_retries: int = 3,
         timeout_seconds: int = 300,
+        fallback_llm_integration: LLMIntegrationWithKey | None = None,
     ) -> tuple[AgentExecutionResult, AgentExecutionContext]:
         """Invoke agent directly through the execution service.
 
@@ -52,6 +54,7 @@ class DirectAgentRunner(AgentRunner):
             execution_context: Execution context for retry logic
             max_retries: Maximum number of retries (not used in direct execution)
             timeout_seconds: Timeout in seconds (not used in direct execution)
+            fallback_llm_integration: Integration for the agent's fast provider, used to hedge slow LLM calls
 
         Returns:
             Tuple of (AgentExecutionResult with move data and reasoning, updated AgentExecutionContext)
@@ -71,6 +74,7 @@ class DirectAgentRunner(AgentRunner):
             possible_moves=possible_moves,
             llm_integration=llm_integration,
             tools=tools,
+            fallback_llm_integration=fallback_llm_integration,
         )
 
         # Return the result as AgentExecutionResult (API version)
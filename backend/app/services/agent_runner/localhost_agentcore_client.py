@@ -12,6 +12,8 @@ from game_api import BaseGameStateView, BasePlayerPossibleMoves, GameType
 
 from app.services.agent_runner import AgentRunner
 from common.core.config_service import ConfigService
+from common.core.llm_usage_scope import LLMUsageScope, LLMUsageSink
+from common.utils.msgspec import decode_json, encode_json
 from common.utils.utils import get_logger
 from shared_db.schemas.agent import AgentVersionResponse
 from shared_db.schemas.llm_integration import LLMIntegrationWithKey
@@ -24,15 +26,49 @@ class LocalHostAgentCoreClient(AgentRunner):
     """AgentCore client for local testing with custom endpoint URL.
 
     All data is provided by the caller (GameManager) - no database access.
-    Sends all data over HTTP to the local AgentCore server.
+    Sends all data over HTTP to the local AgentCore server, over a keep-alive
+    connection pool shared by all invocations. The current LLMUsageScope is sent
+    along, and the usage the server reports back is handed to ``usage_sink``.
     """
 
-    def __init__(self, config_service: ConfigService) -> None:
+    def __init__(self, config_service: ConfigService, usage_sink: LLMUsageSink | None = None) -> None:
+        super().__init__()
+        self._usage_sink = usage_sink
         self.endpoint_url = config_service.get("agentcore.endpoint_url")
+        self._max_connections = int(config_service.get("agentcore.max_connections", 50))
+        self._keepalive_timeout_s = float(config_service.get("agentcore.keepalive_timeout_s", 60))
 
         if not self.endpoint_url:
             raise ValueError("AGENTCORE_ENDPOINT_URL must be configured for LocalHostAgentCoreClient")
 
+        self._invoke_url = urljoin(self.endpoint_url.rstrip("/") + "/", "invocations")
+        self._session: aiohttp.ClientSession | None = None
+        self._start_lock = asyncio.Lock()
+
+    @override
+    async def _start(self) -> None:
+        connector = aiohttp.TCPConnector(
+            limit=self._max_connections,
+            limit_per_host=self._max_connections,
+            keepalive_timeout=self._keepalive_timeout_s,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, headers={"Content-Type": "application/json"})
+
+    @override
+    async def _stop(self) -> None:
+        session, self._session = self._session, None
+        if session:
+            await session.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use if the runner was not started explicitly."""
+        if self._session is None:
+            async with self._start_lock:
+                await self.start()
+        if self._session is None:
+            raise RuntimeError("LocalHostAgentCoreClient is not running")
+        return self._session
+
     @override
     async def invoke_agent(
         self,
@@ -45,6 +81,7 @@ class LocalHostAgentCoreClient(AgentRunner):
         execution_context: AgentExecutionContext,
         max_retries: int = 3,
         timeout_seconds: int = 300,
+        fallback_llm_integration: LLMIntegrationWithKey | None = None,
     ) -> tuple[AgentExecutionResult, AgentExecutionContext]:
         """Invoke agent through local AgentCore service via HTTP.
 
@@ -61,6 +98,7 @@ class LocalHostAgentCoreClient(AgentRunner):
             execution_context: Execution context for retry logic
             max_retries: Maximum number of retries
             timeout_seconds: Timeout in seconds
+            fallback_llm_integration: Integration for the agent's fast provider, used to hedge slow LLM calls
 
         Returns:
             Tuple of (AgentExecutionResult with move data and reasoning, updated AgentExecutionContext)
@@ -71,17 +109,21 @@ class LocalHostAgentCoreClient(AgentRunner):
             agent=agent,
             tools=tools,
             llm_integration=llm_integration,
+            fallback_llm_integration=fallback_llm_integration,
             game_type=game_type,
             game_state=game_state.to_dict(mode="json"),
             possible_moves=possible_moves.to_dict(mode="json") if possible_moves else None,
             execution_context=execution_context,
+            usage_scope=LLMUsageScope.get_or_none(),
         )
 
+        # Encoded once and reused by every retry
+        payload = encode_json(request)
         last_exception = None
 
         for attempt in range(max_retries + 1):
             try:
-                result = await self._invoke(request, timeout_seconds)
+                result = await self._invoke(payload, timeout_seconds)
                 logger.info(f"AgentCore invocation successful on attempt {attempt + 1}")
                 return result
 
@@ -98,24 +140,20 @@ class LocalHostAgentCoreClient(AgentRunner):
         logger.error(f"AgentCore invocation failed after {max_retries + 1} attempts")
         raise last_exception or RuntimeError("AgentCore invocation failed")
 
-    async def _invoke(self, request: AgentCoreInvocationRequest, timeout_seconds: int) -> tuple[AgentExecutionResult, AgentExecutionContext]:
+    async def _invoke(self, payload: bytes, timeout_seconds: int) -> tuple[AgentExecutionResult, AgentExecutionContext]:
         """Invoke agent via custom HTTP endpoint (e.g., localhost)."""
-        # Parse the custom endpoint URL
-        endpoint_url = self.endpoint_url.rstrip("/")
-        invoke_url = urljoin(endpoint_url + "/", "invocations")
-
-        # Configure timeout
-        timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        session = await self._get_session()
 
-        async with (
-            aiohttp.ClientSession(timeout=timeout) as session,
-            session.post(invoke_url, json=request.to_json(), headers={"Content-Type": "application/json"}) as response,
-        ):
+        async with session.post(self._invoke_url, data=payload, timeout=aiohttp.ClientTimeout(total=timeout_seconds)) as response:
             if response.status != 200:
                 error_text = await response.text()
                 raise RuntimeError(f"HTTP {response.status}: {error_text}")
 
-            response_data = AgentCoreInvocationResponse.model_validate_json(await response.text())
+            # Validated from a python dict so ids in the reported usage are parsed into TSIDs
+            response_data = AgentCoreInvocationResponse.model_validate(decode_json(await response.read()))
+            if self._usage_sink is not None:
+                for usage in response_data.llm_usage:
+                    self._usage_sink(usage)
 
             if response_data.result:
                 return response_data.result, response_data.result.execution_context
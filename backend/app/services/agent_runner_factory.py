@@ -12,6 +12,7 @@ from app.services.agent_runner.direct_agent_runner import DirectAgentRunner
 from app.services.agent_runner.localhost_agentcore_client import LocalHostAgentCoreClient
 from common.core.config_service import ConfigService
 from common.core.deployment import Deployment
+from common.core.llm_usage_scope import LLMUsageSink
 from common.utils.utils import get_logger
 
 logger = get_logger()
@@ -31,18 +32,22 @@ class AgentRunnerFactory(Protocol):
     """Protocol for AgentRunner factory."""
 
     @staticmethod
-    def create_runner(agent_execution_service: AgentExecutionService) -> AgentRunner:
-        """Create an AgentRunner instance based on environment and configuration."""
+    def create_runner(agent_execution_service: AgentExecutionService, usage_sink: LLMUsageSink | None = None) -> AgentRunner:
+        """Create an AgentRunner instance based on environment and configuration.
+
+        ``usage_sink`` receives the LLM usage that remote runners report back; the direct runner's
+        calls are recorded by the execution service's own LiteLLMService.
+        """
         # Local environments support multiple runner types
         runner = config_service.get("agent_runner", AgentRunnerType.DIRECT).lower()
         if runner == AgentRunnerType.DIRECT:
             return DirectAgentRunner(agent_execution_service)
         elif runner == AgentRunnerType.LOCALHOST:
-            return LocalHostAgentCoreClient(config_service)
+            return LocalHostAgentCoreClient(config_service, usage_sink=usage_sink)
         elif runner == AgentRunnerType.AGENTCORE:
-            return AgentCoreClient(config_service)
+            return AgentCoreClient(config_service, usage_sink=usage_sink)
         elif Deployment.is_cloud():
             # Cloud environments (AWS) use AgentCore
-            return AgentCoreClient(config_service)
+            return AgentCoreClient(config_service, usage_sink=usage_sink)
         else:
             raise ValueError(f"Invalid agent runner: {runner}. Supported types: {[t.value for t in AgentRunnerType]}")
@@ -16,11 +16,13 @@ from app.services.game_schema_helper import build_player_view_schema
 from app.services.llm_integration_service import LLMIntegrationService
 from common.core.litellm_schemas import ChatMessage, LiteLLMConfig, MessageRole
 from common.core.litellm_service import LiteLLMService
+from common.core.llm_usage_scope import LLMUsageScope
 from common.core.logging_service import get_logger
 from common.enums import LLMProvider
 from common.ids import AgentId, PlayerId, TestScenarioId, UserId
 from common.utils.tsid import TSID
 from shared_db.crud.agent import AgentDAO, AgentVersionDAO, TestScenarioDAO
+from shared_db.models.llm_enums import LLMUsageScenario
 from shared_db.schemas.agent import (
     AgentTestJsonResult,
     StateGenerationRequest,
@@ -559,14 +561,15 @@ class AgentTestService:
             )
 
             model_used = version.slow_llm_model or slow_integration.selected_model
-            llm_response = await self.llm_service.chat_completion(
-                provider=LLMProvider(slow_integration.provider),
-                model=cast(Any, model_used),
-                messages=messages,
-                api_key=slow_integration.api_key,
-                output_type=str,
-                config=config,
-            )
+            with LLMUsageScope(scenario=LLMUsageScenario.STATE_GENERATION, user_id=user_id, agent_version_id=version.id).use():
+                llm_response = await self.llm_service.chat_completion(
+                    provider=LLMProvider(slow_integration.provider),
+                    model=cast(Any, model_used),
+                    messages=messages,
+                    api_key=slow_integration.api_key,
+                    output_type=str,
+                    config=config,
+                )
 
             # Parse and validate the response
             try:
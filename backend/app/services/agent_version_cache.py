@@ -0,0 +1,92 @@
+"""Process-wide cache of agent versions and their tools.
+
+Every turn attempt needs the acting agent's version, its validated tools and the opponent's
+version. Version-defining fields never change once a version exists (edits create a new
+version), so bundles are cached by version id. Configuration fields and tool code can still be
+edited in place; those paths invalidate explicitly, and a TTL bounds staleness across workers.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.core.config_service import config_service
+from common.ids import AgentVersionId, ToolId
+from common.utils import JsonModel
+from shared_db.crud.agent import AgentVersionDAO
+from shared_db.crud.tool import ToolDAO
+from shared_db.models.tool import ToolValidationStatus
+from shared_db.schemas.agent import AgentVersionResponse
+from shared_db.schemas.tool import ToolResponse
+
+
+class AgentVersionBundle(JsonModel):
+    """An agent version together with the tools it may call."""
+
+    agent: AgentVersionResponse
+    tools: list[ToolResponse]
+
+
+class AgentVersionCache:
+    """LRU of agent version bundles keyed by version id."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of versions kept in memory.
+            ttl_seconds: How long a bundle is served before it is reloaded.
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[AgentVersionId, tuple[float, AgentVersionBundle]] = OrderedDict()
+
+    async def get(self, db: AsyncSession, version_id: AgentVersionId, agent_version_dao: AgentVersionDAO, tool_dao: ToolDAO) -> AgentVersionBundle | None:
+        """Bundle for a version, loading it on a miss; None if the version does not exist."""
+        cached = self._entries.get(version_id)
+        if cached is not None and cached[0] > time.monotonic():
+            self._entries.move_to_end(version_id)
+            return cached[1]
+
+        agent = await agent_version_dao.get(db, id=version_id)
+        if agent is None:
+            self._entries.pop(version_id, None)
+            return None
+
+        tools = await tool_dao.get_by_ids(db, tool_ids=agent.tool_ids) if agent.tool_ids else []
+        bundle = AgentVersionBundle(agent=agent, tools=[t for t in tools if t.validation_status == ToolValidationStatus.VALID])
+        self._entries[version_id] = (time.monotonic() + self.ttl_seconds, bundle)
+        self._entries.move_to_end(version_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return bundle
+
+    def invalidate(self, version_id: AgentVersionId) -> None:
+        """Drop a version after its configuration was edited."""
+        self._entries.pop(version_id, None)
+
+    def invalidate_tool(self, tool_id: ToolId) -> None:
+        """Drop every version that references an edited or deleted tool."""
+        for version_id in [vid for vid, (_, bundle) in self._entries.items() if tool_id in (bundle.agent.tool_ids or [])]:
+            del self._entries[version_id]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Singleton instance shared by the game manager and the services that edit versions and tools
+_agent_version_cache: AgentVersionCache | None = None
+
+
+def get_agent_version_cache() -> AgentVersionCache:
+    """Get or create the singleton agent version cache."""
+    global _agent_version_cache
+    if _agent_version_cache is None:
+        _agent_version_cache = AgentVersionCache(
+            max_size=int(config_service.get("agents.version_cache_size", 1024)),
+            ttl_seconds=float(config_service.get("agents.version_cache_ttl_s", 300)),
+        )
+    return _agent_version_cache
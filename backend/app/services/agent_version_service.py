@@ -2,6 +2,7 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.agent_version_cache import get_agent_version_cache
 from common.core.app_error import Errors
 from common.core.guardrails_service import GuardrailSource, GuardrailsService, GuardrailType
 from common.ids import AgentId, AgentVersionId, UserId
@@ -257,7 +258,9 @@ class AgentVersionService:
             return await self.agent_version_dao.create(db, obj_in=new_version_data, agent_id=agent_id, user_id=user_id)
         else:
             # Just update configuration fields using DAO
-            return await self.agent_version_dao.update_by_id(db, id=version_id, obj_in=version_in)
+            updated = await self.agent_version_dao.update_by_id(db, id=version_id, obj_in=version_in)
+            get_agent_version_cache().invalidate(version_id)
+            return updated
 
     async def activate_version(
         self,
@@ -1,16 +1,17 @@
 """Chess move analysis service using Stockfish and LLM."""
 
-import asyncio
+from itertools import batched
 from typing import cast
 
 import chess
-import chess.engine
-from chess_game.chess_api import ChessState, MoveAnalysisEvent
+from chess_game.chess_api import ChessState, MoveAnalysisEvent, MovePlayedEvent
 from game_api import BaseGameState
 from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.llm_integration_service import LLMIntegrationService
+from app.services.move_narrative_cache import MoveNarrativeCache, eval_bucket
+from app.services.stockfish_service import StockfishService, get_stockfish_service
 from common.core.litellm_schemas import ChatMessage, MessageRole
 from common.core.litellm_service import LiteLLMConfig, LiteLLMService
 from common.enums import LLMProvider
@@ -18,6 +19,7 @@ from common.ids import GameId, PlayerId, UserId
 from common.utils import JsonModel
 from common.utils.utils import get_logger
 from shared_db.crud.game import GameDAO
+from shared_db.crud.move_narrative import MoveNarrativeKey
 from shared_db.models.llm_enums import get_default_model_for_provider
 from shared_db.schemas.llm_integration import LLMIntegrationWithKey
 
@@ -44,26 +46,67 @@ class MoveQualityClassification(JsonModel):
     is_good: bool = Field(default=False, description="Good move that improves position")
 
 
+class MoveNarrative(JsonModel):
+    """Narrative for one move of a grouped narrative request."""
+
+    index: int = Field(..., description="1-based index of the move in the request")
+    narrative: str = Field(..., description="2-3 sentence commentary on the move")
+
+
+class MoveNarrativeBatch(JsonModel):
+    """Structured output of a grouped narrative request."""
+
+    narratives: list[MoveNarrative] = Field(default_factory=list)
+
+
+class NarrativeRequest(JsonModel):
+    """A move to describe, with the position it was played from and its engine analysis."""
+
+    fen_before: str
+    move_san: str
+    analysis: StockfishAnalysisResult
+
+
+class GamePly(JsonModel):
+    """A move of a finished game, replayed from its move events."""
+
+    turn: int
+    player_id: PlayerId
+    move_san: str
+    fen_before: str
+    fen_after: str
+
+
 class ChessAnalysisService:
-    """Service for analyzing chess moves using Stockfish and LLM."""
+    """Service for analyzing chess moves using Stockfish and LLM.
+
+    Engine searches go through the shared StockfishService, so positions already evaluated
+    in other games (typically openings) are served from the position-evaluation cache.
+    """
 
     def __init__(
         self,
         litellm_service: LiteLLMService,
         game_dao: GameDAO,
         llm_integration_service: LLMIntegrationService,
-        stockfish_path: str = "stockfish",
+        stockfish_service: StockfishService | None = None,
         analysis_depth: int = 15,
         time_limit: float = 1.0,
         enabled: bool = True,
+        narrative_batch_size: int = 8,
+        narrative_cache: MoveNarrativeCache | None = None,
+        narrative_locale: str = "en",
     ) -> None:
         self.litellm_service = litellm_service
         self.game_dao = game_dao
         self.llm_integration_service = llm_integration_service
-        self.stockfish_path = stockfish_path
+        self.stockfish_service = stockfish_service or get_stockfish_service()
         self.analysis_depth = analysis_depth
         self.time_limit = time_limit
         self.enabled = enabled
+        self.narrative_batch_size = max(1, narrative_batch_size)
+        self.narrative_cache = narrative_cache
+        self.narrative_locale = narrative_locale
 
     async def analyze_move(
         self,
@@ -101,19 +144,9 @@ class ChessAnalysisService:
                 logger.warning(f"Game {game_id} not found, skipping analysis")
                 return
 
-            integration: LLMIntegrationWithKey | None = None
-            try:
-                integration_response = await self.llm_integration_service.get_user_default_integration(db, requesting_user_id)
-                if integration_response:
-                    integration = await self.llm_integration_service.get_integration_for_use(db, integration_response.id)
-            except Exception:
-                logger.exception(
-                    "Failed to load user LLM integration",
-                    extra={"user_id": str(requesting_user_id)},
-                )
-
-            if integration is None:
-                logger.warning(f"No LLM integration found for user {requesting_user_id}, using fallback")
+            integration = await self._load_integration(db, requesting_user_id)
+            # Release the connection while the engine and the LLM work
+            await db.commit()
 
             logger.info(
                 "Starting chess move analysis",
@@ -124,43 +157,30 @@ class ChessAnalysisService:
                 },
             )
 
-            # Run Stockfish analysis in thread pool (CPU-bound)
-            analysis = await asyncio.to_thread(
-                self._run_stockfish_analysis,
+            analysis = await self._run_stockfish_analysis(
                 fen_before=state_before_chess.fen,
                 fen_after=state_after_chess.fen,
             )
 
-            # Generate narrative using LLM
-            narrative = await self._generate_narrative(
-                analysis=analysis,
-                move_san=move_san,
+            # Generate narrative using LLM (or reuse a cached one for the same position and move)
+            [narrative] = await self._generate_narratives(
+                db=db,
+                moves=[NarrativeRequest(fen_before=state_before_chess.fen, move_san=move_san, analysis=analysis)],
                 integration=integration,
                 requesting_user_id=requesting_user_id,
             )
 
-            # Classify move quality
             classification = self._classify_move(analysis)
-
-            # Create analysis event
-            event = MoveAnalysisEvent(
-                turn=round_number,
-                round_number=round_number,
-                player_id=player_id,
-                move_san=move_san,
-                evaluation_cp=analysis.score_cp,
-                evaluation_mate=analysis.score_mate,
-                best_move_san=analysis.best_move_san,
-                narrative=narrative,
-                is_blunder=classification.is_blunder,
-                is_mistake=classification.is_mistake,
-                is_inaccuracy=classification.is_inaccuracy,
-                is_brilliant=classification.is_brilliant,
-                is_good=classification.is_good,
-            )
-
-            # Store in database and bump version to notify long-polling clients
-            await self.game_dao.add_events_without_bumping_version(db, game_id, [event])
+            event = self._build_analysis_event(round_number, player_id, move_san, analysis, narrative)
+
+            # Store in database exactly once per move (idempotent via the analysis index)
+            stored = await self.game_dao.add_move_analysis(db, game_id, round_number, event)
+            if not stored:
+                logger.info(
+                    "Chess move analysis already stored by another worker, skipping",
+                    extra={"game_id": str(game_id), "round_number": round_number},
+                )
+                return
 
             logger.info(
                 "Chess move analysis completed and stored",
@@ -180,54 +200,158 @@ class ChessAnalysisService:
             )
             raise
 
-    def _run_stockfish_analysis(self, fen_before: str, fen_after: str) -> StockfishAnalysisResult:
-        """Run Stockfish analysis (blocking, should be called in thread pool)."""
+    async def analyze_game(self, db: AsyncSession, game_id: GameId) -> None:
+        """Analyze every not-yet-analyzed move of a finished game and store the analysis events.
+
+        Positions go through the shared engine pool and evaluation cache, so each position is
+        searched at most once (a move's "after" position is the next move's "before" position).
+        Narratives are generated in groups of ``narrative_batch_size`` moves per LLM call, and
+        each group is committed as soon as it is stored so a redelivered job resumes where it stopped.
+
+        Args:
+            db: Database session
+            game_id: Game ID
+        """
+        if not self.enabled:
+            logger.info("Chess analysis disabled, skipping")
+            return
+
+        requesting_user_id = await self.game_dao.get_requesting_user_id(db, game_id)
+        if requesting_user_id is None:
+            logger.warning(f"Game {game_id} not found, skipping analysis")
+            return
+
+        plies = await self._load_game_plies(db, game_id)
+        analyzed = await self.game_dao.get_analyzed_move_numbers(db, game_id)
+        pending = [ply for ply in plies if ply.turn not in analyzed]
+        if not pending:
+            logger.info("No moves left to analyze", extra={"game_id": str(game_id), "move_count": len(plies)})
+            return
+
+        integration = await self._load_integration(db, requesting_user_id)
+        # Release the connection while the engine and the LLM work
+        await db.commit()
+
+        logger.info("Starting post-game chess analysis", extra={"game_id": str(game_id), "pending_moves": len(pending)})
+
+        stored_count = 0
+        for group in batched(pending, self.narrative_batch_size, strict=False):
+            analyses: list[StockfishAnalysisResult] = []
+            for ply in group:
+                analyses.append(await self._run_stockfish_analysis(fen_before=ply.fen_before, fen_after=ply.fen_after))
+
+            narratives = await self._generate_narratives(
+                db=db,
+                moves=[NarrativeRequest(fen_before=ply.fen_before, move_san=ply.move_san, analysis=analysis) for ply, analysis in zip(group, analyses, strict=True)],
+                integration=integration,
+                requesting_user_id=requesting_user_id,
+            )
+
+            for ply, analysis, narrative in zip(group, analyses, narratives, strict=True):
+                event = self._build_analysis_event(ply.turn, ply.player_id, ply.move_san, analysis, narrative)
+                if await self.game_dao.add_move_analysis(db, game_id, ply.turn, event):
+                    stored_count += 1
+            await db.commit()
+
+        logger.info(
+            "Post-game chess analysis completed",
+            extra={"game_id": str(game_id), "stored_moves": stored_count, "pending_moves": len(pending)},
+        )
+
+    async def _load_game_plies(self, db: AsyncSession, game_id: GameId) -> list[GamePly]:
+        """Replay a game's move events from the standard starting position."""
+        move_events = await self.game_dao.get_events_by_type(db, game_id, MovePlayedEvent.__name__)
+        moves = sorted((MovePlayedEvent.model_validate(event.data) for event in move_events), key=lambda move: move.turn)
+
+        board = chess.Board()
+        plies: list[GamePly] = []
+        for move_event in moves:
+            move = chess.Move.from_uci(f"{move_event.from_square}{move_event.to_square}{move_event.promotion or ''}")
+            if move not in board.legal_moves:
+                # Games started from a custom position cannot be replayed from their move list
+                logger.warning(
+                    "Move list does not replay from the standard starting position, skipping post-game analysis",
+                    extra={"game_id": str(game_id), "turn": move_event.turn},
+                )
+                return []
+
+            fen_before = board.fen()
+            move_san = board.san(move)
+            board.push(move)
+            plies.append(GamePly(turn=move_event.turn, player_id=move_event.player_id, move_san=move_san, fen_before=fen_before, fen_after=board.fen()))
+
+        return plies
+
+    async def _load_integration(self, db: AsyncSession, requesting_user_id: UserId) -> LLMIntegrationWithKey | None:
+        """Load the requesting user's default LLM integration (None means template narratives)."""
+        integration: LLMIntegrationWithKey | None = None
+        try:
+            integration_response = await self.llm_integration_service.get_user_default_integration(db, requesting_user_id)
+            if integration_response:
+                integration = await self.llm_integration_service.get_integration_for_use(db, integration_response.id)
+        except Exception:
+            logger.exception(
+                "Failed to load user LLM integration",
+                extra={"user_id": str(requesting_user_id)},
+            )
+
+        if integration is None:
+            logger.warning(f"No LLM integration found for user {requesting_user_id}, using fallback")
+
+        return integration
+
+    def _build_analysis_event(
+        self, round_number: int, player_id: PlayerId, move_san: str, analysis: StockfishAnalysisResult, narrative: str
+    ) -> MoveAnalysisEvent:
+        """Create the analysis event for a move."""
+        classification = self._classify_move(analysis)
+        return MoveAnalysisEvent(
+            turn=round_number,
+            round_number=round_number,
+            player_id=player_id,
+            move_san=move_san,
+            evaluation_cp=analysis.score_cp,
+            evaluation_mate=analysis.score_mate,
+            best_move_san=analysis.best_move_san,
+            narrative=narrative,
+            is_blunder=classification.is_blunder,
+            is_mistake=classification.is_mistake,
+            is_inaccuracy=classification.is_inaccuracy,
+            is_brilliant=classification.is_brilliant,
+            is_good=classification.is_good,
+        )
+
+    async def _run_stockfish_analysis(self, fen_before: str, fen_after: str) -> StockfishAnalysisResult:
+        """Evaluate the positions before and after the move (cached positions skip the engine).
+
+        Cache lookups and stores run in short sessions of their own. A position the engine could not
+        score keeps a None score, and the evaluation change is then left unset.
+        """
         try:
-            # Create board from FEN
             board_before = chess.Board(fen_before)
             board_after = chess.Board(fen_after)
 
-            # Initialize Stockfish engine
-            with chess.engine.SimpleEngine.popen_uci(self.stockfish_path) as engine:
-                # Analyze position before move
-                info_before = engine.analyse(
-                    board_before,
-                    chess.engine.Limit(depth=self.analysis_depth, time=self.time_limit),
-                )
+            # The best move comes from the principal variation of the "before" search
+            info_before = await self.stockfish_service.analyze_position(board_before, time_limit=self.time_limit, depth=self.analysis_depth)
+            info_after = await self.stockfish_service.analyze_position(board_after, time_limit=self.time_limit, depth=self.analysis_depth)
 
-                # Analyze position after move
-                info_after = engine.analyse(
-                    board_after,
-                    chess.engine.Limit(depth=self.analysis_depth, time=self.time_limit),
-                )
+            # Convert scores to centipawns (from perspective of side to move)
+            score_before_cp = self._score_to_cp(info_before["evaluation"], board_before.turn)
+            score_after_cp = self._score_to_cp(info_after["evaluation"], board_after.turn)
+            evaluation_change: int | None = None
+            if score_after_cp is not None and score_before_cp is not None:
+                evaluation_change = score_after_cp - score_before_cp
 
-                # Get best move from before position
-                result = engine.play(
-                    board_before,
-                    chess.engine.Limit(depth=self.analysis_depth, time=self.time_limit),
-                )
-                best_move = result.move
-
-                # Extract scores
-                score_before = info_before.get("score")
-                score_after = info_after.get("score")
-
-                # Convert scores to centipawns (from perspective of side to move)
-                score_before_cp = self._score_to_cp(score_before, board_before.turn)
-                score_after_cp = self._score_to_cp(score_after, board_after.turn)
-
-                # Calculate evaluation change (only if both scores are available)
-                evaluation_change: int | None = None
-                if score_after_cp is not None and score_before_cp is not None:
-                    evaluation_change = score_after_cp - score_before_cp
-
-                return StockfishAnalysisResult(
-                    score_cp=score_after_cp,
-                    score_mate=self._extract_mate_score(score_after),
-                    score_before_cp=score_before_cp,
-                    evaluation_change=evaluation_change,
-                    best_move_san=board_before.san(best_move) if best_move else None,
-                )
+            best_move_uci = info_before.get("best_move")
+            best_move = chess.Move.from_uci(best_move_uci) if best_move_uci else None
+
+            return StockfishAnalysisResult(
+                score_cp=score_after_cp,
+                score_mate=info_after.get("mate"),
+                score_before_cp=score_before_cp,
+                evaluation_change=evaluation_change,
+                best_move_san=board_before.san(best_move) if best_move else None,
+            )
 
         except Exception:
             logger.exception("Stockfish analysis failed")
@@ -239,55 +363,63 @@ class ChessAnalysisService:
                 best_move_san=None,
             )
 
-    def _score_to_cp(self, score: chess.engine.PovScore | None, turn: bool) -> int | None:
-        """Convert Stockfish score to centipawns from perspective of side to move."""
-        if score is None:
-            return None
-
-        # Get score relative to white
-        white_score = score.white()
-
-        # If it's a mate score, convert to large centipawn value
-        if white_score.is_mate():
-            mate_in = white_score.mate()
-            if mate_in is None:
-                return None
-            # Positive mate = white wins, negative = black wins
-            # Convert to large centipawn value (10000 per mate)
-            cp_value = 10000 if mate_in > 0 else -10000
-        else:
-            cp_value = white_score.score()
-            if cp_value is None:
-                return None
-
-        # Flip sign if it's black's turn
-        return cp_value if turn == chess.WHITE else -cp_value
-
-    def _extract_mate_score(self, score: chess.engine.PovScore | None) -> int | None:
-        """Extract mate-in-N value from score."""
-        if score is None:
+    def _score_to_cp(self, white_cp: int | None, turn: bool) -> int | None:
+        """Convert a White-relative centipawn score to the perspective of the side to move."""
+        if white_cp is None:
             return None
+        return white_cp if turn == chess.WHITE else -white_cp
 
-        white_score = score.white()
-        if white_score.is_mate():
-            return white_score.mate()
-
-        return None
-
-    async def _generate_narrative(
+    async def _generate_narratives(
         self,
-        analysis: StockfishAnalysisResult,
-        move_san: str,
+        db: AsyncSession,
+        moves: list[NarrativeRequest],
         integration: LLMIntegrationWithKey | None,
         requesting_user_id: UserId,
-    ) -> str:
-        """Generate human-readable narrative using LLM (fast model, 500 tokens max)."""
-        try:
-            if not integration:
-                return self._generate_fallback_narrative(analysis, move_san)
+    ) -> list[str]:
+        """Generate narratives for one or more moves of a game.
+
+        Cached narratives are reused; the remaining moves are described in a single LLM call
+        (structured output when there are several). Moves the LLM could not describe get
+        template narratives, which are not cached. New narratives are stored through ``db``
+        and committed by the caller; nothing is read through it, so the caller's connection
+        stays released during the LLM call.
+        """
+        keys = [
+            MoveNarrativeCache.key(move.fen_before, move.move_san, eval_bucket(move.analysis.score_cp, move.analysis.evaluation_change, move.analysis.score_mate), self.narrative_locale)
+            for move in moves
+        ]
+        narratives: list[str | None] = [None] * len(moves)
+        if self.narrative_cache is not None:
+            cached = await self.narrative_cache.get_many(keys)
+            narratives = [cached.get(key) for key in keys]
+
+        missing = [index for index, narrative in enumerate(narratives) if narrative is None]
+        if missing and integration:
+            missing_moves = [moves[index] for index in missing]
+            if len(missing_moves) == 1:
+                generated = [await self._request_narrative(missing_moves[0], integration, requesting_user_id)]
+            else:
+                generated = await self._request_grouped_narratives(missing_moves, integration, requesting_user_id)
+
+            new_narratives: dict[MoveNarrativeKey, str] = {}
+            for index, narrative in zip(missing, generated, strict=True):
+                if narrative:
+                    narratives[index] = narrative
+                    new_narratives[keys[index]] = narrative
+            if self.narrative_cache is not None and new_narratives:
+                await self.narrative_cache.put_many(db, new_narratives)
+
+        logger.info(
+            "Move narratives generated",
+            extra={"move_count": len(moves), "cache_hits": len(moves) - len(missing), "llm_requested": len(missing) if integration else 0},
+        )
+        return [narrative or self._generate_fallback_narrative(move.analysis, move.move_san) for move, narrative in zip(moves, narratives, strict=True)]
 
+    async def _request_narrative(self, move: NarrativeRequest, integration: LLMIntegrationWithKey, requesting_user_id: UserId) -> str | None:
+        """Generate human-readable narrative using LLM (fast model, 500 tokens max); None on failure."""
+        try:
             # Build prompt
-            prompt = self._build_analysis_prompt(analysis, move_san)
+            prompt = self._build_analysis_prompt(move.analysis, move.move_san)
 
             # Use FAST model for quick analysis
             fast_model = get_default_model_for_provider(LLMProvider(integration.provider))
@@ -311,13 +443,70 @@ class ChessAnalysisService:
             # Handle None or empty content
             if not response.content:
                 logger.warning("LLM returned empty content for analysis narrative", extra={"user_id": requesting_user_id})
-                return self._generate_fallback_narrative(analysis, move_san)
+                return None
 
             return response.content.strip()
 
         except Exception:
             logger.exception("Failed to generate analysis narrative", extra={"user_id": requesting_user_id})
-            return self._generate_fallback_narrative(analysis, move_san)
+            return None
+
+    async def _request_grouped_narratives(
+        self, moves: list[NarrativeRequest], integration: LLMIntegrationWithKey, requesting_user_id: UserId
+    ) -> list[str | None]:
+        """Generate narratives for several moves with a single structured-output LLM call.
+
+        Moves the model leaves out (or the whole group, on failure) come back as None.
+        """
+        narratives: list[str | None] = [None] * len(moves)
+        try:
+            response = await self.litellm_service.chat_completion(
+                provider=LLMProvider(integration.provider),
+                model=get_default_model_for_provider(LLMProvider(integration.provider)),
+                messages=[ChatMessage(role=MessageRole.USER, content=self._build_grouped_analysis_prompt(moves))],
+                api_key=integration.api_key,
+                output_type=MoveNarrativeBatch,
+                # Same per-move budget as single narratives
+                config=LiteLLMConfig(max_tokens=200 * len(moves), temperature=0.7),
+            )
+        except Exception:
+            logger.exception("Failed to generate grouped analysis narratives", extra={"user_id": requesting_user_id, "move_count": len(moves)})
+            return narratives
+
+        if response.content:
+            for item in response.content.narratives:
+                if 1 <= item.index <= len(moves) and item.narrative.strip():
+                    narratives[item.index - 1] = item.narrative.strip()
+        return narratives
+
+    def _locale_instruction(self) -> str:
+        """Prompt line selecting the narrative language (English needs none)."""
+        if self.narrative_locale == "en":
+            return ""
+        return f"Write the commentary in the language for locale '{self.narrative_locale}'.\n"
+
+    def _build_grouped_analysis_prompt(self, moves: list[NarrativeRequest]) -> str:
+        """Build a prompt asking for one short narrative per move, returned as JSON."""
+        prompt = "You are a chess commentator. For EACH move below, write 2-3 SHORT sentences (max 100 words).\n\n"
+
+        for index, move in enumerate(moves, start=1):
+            move_san, analysis = move.move_san, move.analysis
+            prompt += f"Move {index}: {move_san}"
+            if analysis.score_cp is not None:
+                prompt += f" | evaluation: {analysis.score_cp / 100:.2f} pawns"
+            if analysis.evaluation_change is not None:
+                prompt += f" | change: {analysis.evaluation_change / 100:+.2f} pawns"
+            if analysis.best_move_san and analysis.best_move_san != move_san:
+                prompt += f" | best move was: {analysis.best_move_san}"
+            prompt += "\n"
+
+        prompt += "\nBe concise and engaging. Classify each move (blunder/mistake/inaccuracy/good/brilliant) and explain why briefly.\n"
+        prompt += self._locale_instruction()
+        prompt += """Respond with JSON only, in this exact format:
+{"narratives": [{"index": 1, "narrative": "..."}, {"index": 2, "narrative": "..."}]}
+"""
+
+        return prompt
 
     def _build_analysis_prompt(self, analysis: StockfishAnalysisResult, move_san: str) -> str:
         """Build engaging prompt for LLM - optimized for concise output."""
@@ -343,6 +532,7 @@ Move played: {move_san}
 Be concise and engaging. Classify the move (blunder/mistake/inaccuracy/good/brilliant) and explain why briefly.
 Example: "Nf3 is a solid developing move (+0.15). However, e4 would have been stronger (+0.50), seizing more central space. This is a minor inaccuracy."
 """
+        prompt += self._locale_instruction()
 
         return prompt
 
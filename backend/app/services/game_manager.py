@@ -3,7 +3,7 @@
 import asyncio
 import contextlib
 from collections.abc import AsyncGenerator
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, cast
 
 from api.agentcore_api import AgentExecutionContext
@@ -27,11 +27,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.scoring import GameRatingUpdateRequest
 from app.services.agent_execution_service import AgentExecutionService
 from app.services.agent_runner import AgentRunner
+from app.services.agent_version_cache import AgentVersionBundle, AgentVersionCache, get_agent_version_cache
 from app.services.game_env_registry import GameEnvRegistry
 from app.services.llm_integration_service import LLMIntegrationService
 from app.services.scoring_service import ScoringService
 from app.services.stockfish_agent_executor import execute_brain_bot_move
 from common.core.app_error import Errors, should_retry_exception
+from common.core.config_service import config_service
+from common.core.llm_usage_scope import LLMUsageScope
 from common.ids import AgentId, AgentVersionId, GameId, PlayerId, RequestId, UserId
 from common.types import AgentReasoning
 from common.utils.tsid import TSID
@@ -39,15 +42,13 @@ from common.utils.utils import get_logger, get_now
 from shared_db.crud.agent import AgentStatisticsDAO, AgentVersionDAO
 from shared_db.crud.game import GameDAO
 from shared_db.crud.tool import ToolDAO
+from shared_db.db import lease_engine
+from shared_db.db.leases import GameLeases, game_leases_for
 from shared_db.models.game import Game, GamePlayer, MatchmakingStatus
-from shared_db.models.tool import ToolValidationStatus
-from shared_db.schemas.agent import AgentVersionResponse
+from shared_db.models.llm_enums import LLMUsageScenario
 
 logger = get_logger()
 
-GAME_PROCESSING_TIMEOUT = timedelta(minutes=4)
-HEARTBEAT_TIMEOUT = timedelta(minutes=3)
-
 
 class GameManager:
     """This is the main orchestrator that handles game state transitions,
@@ -65,6 +66,7 @@ class GameManager:
     _agent_runner: AgentRunner
     _scoring_service: ScoringService
     _sqs_game_analysis_handler: GameAnalysisHandler
+    _agent_version_cache: AgentVersionCache
 
     def __init__(
         self,
@@ -78,6 +80,8 @@ class GameManager:
         agent_runner: AgentRunner,
         scoring_service: ScoringService,
         sqs_game_analysis_handler: GameAnalysisHandler,
+        agent_version_cache: AgentVersionCache | None = None,
+        game_leases: GameLeases | None = None,
     ) -> None:
         self._registry = registry
         self._agent_execution_service = agent_execution_service
@@ -89,6 +93,31 @@ class GameManager:
         self._agent_runner = agent_runner
         self._scoring_service = scoring_service
         self._sqs_game_analysis_handler = sqs_game_analysis_handler
+        self._agent_version_cache = agent_version_cache or get_agent_version_cache()
+        self._game_leases = game_leases or game_leases_for(lease_engine)
+
+    async def on_game_finished(
+        self,
+        db: AsyncSession,
+        game: Game,
+        state: BaseGameState,
+        env_type: type[GenericGameEnv],
+    ) -> None:
+        """Run the side effects of a game finishing: rating updates and post-game analysis.
+
+        Args:
+            db: Database session
+            game: Game object
+            state: Final game state
+            env_type: Game environment type
+        """
+        await self.update_ratings_for_finished_game(db, game, state, env_type)
+
+        try:
+            await self._sqs_game_analysis_handler.queue_game_analysis(game_id=game.id, game_type=game.game_type)
+        except Exception:
+            # Analysis is best-effort and must never fail game completion
+            logger.exception(f"Failed to queue post-game analysis for game {game.id}", extra={"game_id": str(game.id)})
 
     async def update_ratings_for_finished_game(
         self,
@@ -704,7 +733,7 @@ class GameManager:
         """
         logger.info(f"Processing turn for game {game_id}{' with move override' if move_override else ''}")
 
-        async with self._set_game_processing(db, request_id, game_id, turn) as game:
+        async with self._set_game_processing(db, game_id, turn) as game:
             env_type = self._registry.get(game.game_type)
 
             state = env_type.types().state_type().model_validate(game.state)
@@ -744,8 +773,8 @@ class GameManager:
                         await self._game_dao.update_game(db, game)
                         await self._game_dao.add_events(db, game.id, event_collector.get_events())
 
-                        # Update agent ratings for timeout game
-                        await self.update_ratings_for_finished_game(db, game, state, env_type)
+                        # Update agent ratings and queue analysis for timeout game
+                        await self.on_game_finished(db, game, state, env_type)
 
                         await self._game_dao.set_leave_time_for_game(db, game_id)
                         return state, event_collector.get_events()
@@ -759,8 +788,8 @@ class GameManager:
             if not current_game_player:
                 raise Errors.Generic.INTERNAL_ERROR.create(message=f"Game player not found for player_id: {state.current_player_id}")
 
-            agent = await self._agent_version_dao.get(db, id=current_game_player.agent_version_id)
-            if not agent:
+            bundle = await self._agent_version_cache.get(db, current_game_player.agent_version_id, self._agent_version_dao, self._tool_dao)
+            if not bundle:
                 raise Errors.Agent.NOT_FOUND.create(message=f"Agent version not found: {current_game_player.agent_version_id}")
 
             # Use move override if provided, otherwise ask agent to provide a move
@@ -796,7 +825,7 @@ class GameManager:
                     env=env,
                     state=state,
                     event_collector=event_collector,
-                    agent=agent,
+                    bundle=bundle,
                     player_view=player_view,
                     possible_moves=possible_moves,
                     game_id=game_id,
@@ -815,8 +844,8 @@ class GameManager:
 
             # If the game is now finished, set leave_time for all participants and update ratings
             if state.is_finished:
-                # Update agent ratings using the scoring service
-                await self.update_ratings_for_finished_game(db, game, state, env_type)
+                # Update agent ratings and queue post-game analysis
+                await self.on_game_finished(db, game, state, env_type)
 
                 await self._game_dao.set_leave_time_for_game(db, game_id)
                 logger.info(f"Game {game_id} finished - set leave_time for all participants and updated status")
@@ -834,7 +863,7 @@ class GameManager:
     ) -> tuple[BaseGameState, list[BaseGameEvent]]:
         """Finalize a game because the current player ran out of time."""
 
-        async with self._set_game_processing(db, request_id, game_id, expected_turn=None) as game:
+        async with self._set_game_processing(db, game_id, expected_turn=None) as game:
             if not game:
                 raise Errors.Game.NOT_FOUND.create(details={"game_id": game_id})
 
@@ -930,7 +959,7 @@ class GameManager:
             if event_collector.get_events():
                 await self._game_dao.add_events(db, game.id, event_collector.get_events())
 
-            await self.update_ratings_for_finished_game(db, game, state, env_type)
+            await self.on_game_finished(db, game, state, env_type)
             await self._game_dao.set_leave_time_for_game(db, game_id)
 
             logger.info(
@@ -943,13 +972,35 @@ class GameManager:
 
             return state, event_collector.get_events()
 
+    async def _get_opponent_rating(self, db: AsyncSession, env: GenericGameEnv, state: BaseGameState, game: Game) -> int | None:
+        """Rating of the first opponent that has one for this game type, or None."""
+        try:
+            # Find opponent player and get their rating from the players list
+            current_game_type = env.types().type()
+            for gp in game.game_players:
+                if gp.id != state.current_player_id:
+                    # Get opponent's agent version to extract agent_id
+                    opponent_bundle = await self._agent_version_cache.get(db, gp.agent_version_id, self._agent_version_dao, self._tool_dao)
+                    if opponent_bundle:
+                        # Get statistics using the agent_id from the version
+                        statistics_response = await self._agent_statistics_dao.get_by_agent(db, opponent_bundle.agent.agent_id)
+                        if statistics_response:
+                            from shared_db.models.agent import AgentStatisticsData
+
+                            statistics_data = AgentStatisticsData.model_validate(statistics_response.statistics)
+                            if current_game_type in statistics_data.game_ratings:
+                                return int(statistics_data.game_ratings[current_game_type].rating)
+        except Exception as e:
+            logger.warning(f"Failed to get opponent rating for adaptive difficulty: {e}")
+        return None
+
     async def _apply_agent_move(
         self,
         db: AsyncSession,
         env: GenericGameEnv,
         state: BaseGameState,
         event_collector: EventCollector[Any],
-        agent: AgentVersionResponse,
+        bundle: AgentVersionBundle,
         player_view: BaseGameStateView,
         possible_moves: BasePlayerPossibleMoves | None,
         game_id: GameId,
@@ -959,10 +1010,7 @@ class GameManager:
         """Get move from agent with timeout-based retry logic."""
         context = AgentExecutionContext(max_attempts=10)
         timeout_seconds = 300  # 5 minutes
-
-        # Fetch tools for the agent
-        tools = await self._tool_dao.get_by_ids(db, tool_ids=agent.tool_ids) if agent.tool_ids else []
-        tools = [t for t in tools if t.validation_status == ToolValidationStatus.VALID]
+        agent, tools = bundle.agent, bundle.tools
 
         # Fetch LLM integration for the requesting user
         is_fast_mode = False  # Could be passed as parameter if needed
@@ -973,6 +1021,19 @@ class GameManager:
                 f"No LLM integration configured for provider '{provider}' for this user. Please configure a default LLM integration before creating games."
             )
 
+        # Optional hedge target: the agent's fast provider/model, on the user's integration for that provider
+        fallback_llm_integration = None
+        if str(config_service.get("llm.hedging.enabled", "false")).lower() == "true" and (agent.fast_llm_provider, agent.fast_llm_model) != (
+            agent.slow_llm_provider,
+            agent.slow_llm_model,
+        ):
+            fallback_llm_integration = await self._llm_integration_service.get_user_integration_by_provider_with_key(
+                db, user_id=requesting_user_id, provider=agent.fast_llm_provider
+            )
+
+        # Opponent's rating for adaptive difficulty (generic for all game types); it cannot change within a turn
+        opponent_rating = await self._get_opponent_rating(db, env, state, game)
+
         async def _attempt_agent_execution() -> None:
             while context.attempts < context.max_attempts:
                 # Check for chess timeout before each attempt
@@ -990,28 +1051,6 @@ class GameManager:
                 try:
                     logger.info(f"Agent execution attempt {context.attempts}/{context.max_attempts}")
 
-                    # Get opponent's rating for adaptive difficulty (generic for all game types)
-                    opponent_rating = None
-                    try:
-                        # Find opponent player and get their rating from the players list
-                        current_game_type = env.types().type()
-                        for gp in game.game_players:
-                            if gp.id != state.current_player_id:
-                                # Get opponent's agent version to extract agent_id
-                                opponent_agent = await self._agent_version_dao.get(db, gp.agent_version_id)
-                                if opponent_agent:
-                                    # Get statistics using the agent_id from the version
-                                    statistics_response = await self._agent_statistics_dao.get_by_agent(db, opponent_agent.agent_id)
-                                    if statistics_response:
-                                        from shared_db.models.agent import AgentStatisticsData
-
-                                        statistics_data = AgentStatisticsData.model_validate(statistics_response.statistics)
-                                        if current_game_type in statistics_data.game_ratings:
-                                            opponent_rating = int(statistics_data.game_ratings[current_game_type].rating)
-                                            break
-                    except Exception as e:
-                        logger.warning(f"Failed to get opponent rating for adaptive difficulty: {e}")
-
                     # Check if this is the Brain bot and use Stockfish instead of LLM (chess-specific)
                     if env.types().type() == GameType.CHESS:
                         # Try to execute with Stockfish if this is the Brain bot
@@ -1021,6 +1060,7 @@ class GameManager:
                                 game_state=player_view,
                                 possible_moves=possible_moves,
                                 opponent_rating=opponent_rating,
+                                db=db,
                             )
 
                             if stockfish_result is not None:
@@ -1094,35 +1134,39 @@ class GameManager:
                                 cause=e,
                             )
 
-                    # Normal LLM-based agent execution
-                    # For playground games, always use direct execution (not AgentCore)
-                    if game.is_playground:
-                        from app.services.agent_runner.direct_agent_runner import DirectAgentRunner
-
-                        direct_runner = DirectAgentRunner(self._agent_execution_service)
-                        result, updated_context = await direct_runner.invoke_agent(
-                            agent=agent,
-                            tools=tools,
-                            llm_integration=llm_integration,
-                            game_type=env.types().type(),
-                            game_state=player_view,
-                            possible_moves=possible_moves,
-                            execution_context=context,
-                            max_retries=2,  # Client-side retries
-                            timeout_seconds=timeout_seconds,
-                        )
-                    else:
-                        result, updated_context = await self._agent_runner.invoke_agent(
-                            agent=agent,
-                            tools=tools,
-                            llm_integration=llm_integration,
-                            game_type=env.types().type(),
-                            game_state=player_view,
-                            possible_moves=possible_moves,
-                            execution_context=context,
-                            max_retries=2,  # Client-side retries
-                            timeout_seconds=timeout_seconds,
-                        )
+                    # Normal LLM-based agent execution, billed to the requesting user whose integration pays for it
+                    usage_scope = LLMUsageScope(scenario=LLMUsageScenario.AGENT_MOVE, user_id=requesting_user_id, agent_version_id=agent.id, game_id=game_id)
+                    with usage_scope.use():
+                        # For playground games, always use direct execution (not AgentCore)
+                        if game.is_playground:
+                            from app.services.agent_runner.direct_agent_runner import DirectAgentRunner
+
+                            direct_runner = DirectAgentRunner(self._agent_execution_service)
+                            result, updated_context = await direct_runner.invoke_agent(
+                                agent=agent,
+                                tools=tools,
+                                llm_integration=llm_integration,
+                                game_type=env.types().type(),
+                                game_state=player_view,
+                                possible_moves=possible_moves,
+                                execution_context=context,
+                                max_retries=2,  # Client-side retries
+                                timeout_seconds=timeout_seconds,
+                                fallback_llm_integration=fallback_llm_integration,
+                            )
+                        else:
+                            result, updated_context = await self._agent_runner.invoke_agent(
+                                agent=agent,
+                                tools=tools,
+                                llm_integration=llm_integration,
+                                game_type=env.types().type(),
+                                game_state=player_view,
+                                possible_moves=possible_moves,
+                                execution_context=context,
+                                max_retries=2,  # Client-side retries
+                                timeout_seconds=timeout_seconds,
+                                fallback_llm_integration=fallback_llm_integration,
+                            )
 
                     # Update the context with the returned one to preserve conversation history
                     context.messages = updated_context.messages
@@ -1337,30 +1381,19 @@ class GameManager:
     async def _set_game_processing(
         self,
         db: AsyncSession,
-        request_id: RequestId,
         game_id: GameId,
         expected_turn: int | None,
     ) -> AsyncGenerator[Game]:
-        """Async context manager for game processing locks.
+        """Async context manager holding the game's processing lease.
 
-        Ensures processing lock is always released, even on exceptions.
+        Commits the turn's changes before the lease is released, and rolls them back on exceptions.
+        The lease is always released, even on exceptions.
         """
-        game: Game | None = None
-        try:
-            game = await self._game_dao.start_processing(
-                db,
-                request_id,
-                game_id,
-                processing_timeout=GAME_PROCESSING_TIMEOUT,
-                heartbeat_timeout=HEARTBEAT_TIMEOUT,
-                expected_turn=expected_turn,
-            )
-            yield game
-        except Exception:
-            await db.rollback()
-            raise
-        finally:
-            # Release the processing lock
-            if game:
-                await self._game_dao.finish_processing(db, request_id, game_id)
-                await db.commit()
+        async with self._game_leases.hold(game_id):
+            try:
+                game = await self._game_dao.get_for_processing(db, game_id, expected_turn=expected_turn)
+                yield game
+            except Exception:
+                await db.rollback()
+                raise
+            await db.commit()
@@ -18,7 +18,7 @@ from common.utils.utils import get_logger, get_now
 from shared_db.crud.agent import AgentVersionDAO
 from shared_db.crud.game import GameDAO, JoinResult
 from shared_db.crud.user import UserDAO
-from shared_db.db import AsyncSessionLocal
+from shared_db.db import Workload, session_factory
 from shared_db.models.game import Game, MatchmakingStatus
 from shared_db.models.game_enums import get_game_environment_metadata
 from shared_db.schemas.user import CoinConsumeFailureReason
@@ -310,7 +310,7 @@ class GameMatchingService:
                     raise _asyncio.CancelledError()
 
                 # Create a new session for this poll iteration
-                async with AsyncSessionLocal() as db:
+                async with session_factory(Workload.LONG_POLL)() as db:
                     user_games = await self.game_dao.get_games_by_user(
                         db=db,
                         user_id=user_id,
@@ -899,8 +899,8 @@ class GameMatchingService:
         await self.game_dao.update_game(db, game)
         await self.game_dao.set_status(db, game.id, MatchmakingStatus.FINISHED)
 
-        # Update agent ratings for forfeit game
-        await self.game_manager.update_ratings_for_finished_game(db, game, state, type(env))
+        # Update agent ratings and queue post-game analysis for forfeit game
+        await self.game_manager.on_game_finished(db, game, state, type(env))
 
         # Set leave_time for all remaining players
         await self.game_dao.set_leave_time_for_game(db, game.id)
@@ -14,7 +14,7 @@ from chess_game.chess_api import ChessConfig, ChessEvent, ChessPlaygroundOpponen
 from chess_game.chess_scoring import ChessScoring
 from game_api import BaseGameConfig, BaseGameEvent, BaseGameState, GameScoring, GameType, ReasoningEventMixin
 from pydantic import TypeAdapter
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from texas_holdem.texas_holdem_api import TexasHoldemConfig, TexasHoldemEvent, TexasHoldemState
 from texas_holdem.texas_holdem_scoring import TexasHoldemScoring
 
@@ -22,6 +22,7 @@ from app.schemas.game import GameStateResponse, PlayerInfo
 from common.ids import AgentVersionId, GameId, PlayerId, UserId
 from common.utils.utils import get_logger
 from shared_db.crud.game import GameDAO
+from shared_db.db import AsyncSessionLocal
 from shared_db.models.game import Game
 from shared_db.schemas.agent import AgentStatisticsData
 
@@ -41,13 +42,15 @@ def _get_scoring_class_for_game_type(game_type: GameType) -> type[GameScoring]:
 class GameService:
     """Service for game-related business logic and data transformation."""
 
-    def __init__(self, game_dao: GameDAO):
+    def __init__(self, game_dao: GameDAO, primary_sessions: async_sessionmaker[AsyncSession] = AsyncSessionLocal):
         """Initialize the game service.
 
         Args:
             game_dao: DAO for game database operations
+            primary_sessions: Session factory for the primary, used when the read replica lags
         """
         self._game_dao = game_dao
+        self._primary_sessions = primary_sessions
 
     @staticmethod
     def parse_game_state(game: Game) -> BaseGameState:
@@ -267,6 +270,28 @@ class GameService:
             for gp in game_players_list
         ]
 
+    async def get_game_for_read(self, read_db: AsyncSession, game_id: GameId, min_version: int | None = None) -> Game | None:
+        """Load a game through a read-only (replica) session with bounded staleness.
+
+        The replica is trusted only if it already has the game at ``min_version`` or later,
+        typically the version the client has already seen. Otherwise, or when the replica
+        does not have the game yet, the game is re-read from the primary.
+
+        Args:
+            read_db: Read-only database session
+            game_id: Game ID to fetch
+            min_version: Oldest acceptable game version
+
+        Returns:
+            The game, or None if it does not exist on the primary either
+        """
+        game = await self._game_dao.get(read_db, game_id)
+        if game is not None and (min_version is None or game.version >= min_version):
+            return game
+        logger.debug("Replica behind for game, reading from primary", game_id=game_id, min_version=min_version, replica_version=game.version if game else None)
+        async with self._primary_sessions() as primary_db:
+            return await self._game_dao.get(primary_db, game_id)
+
     async def get_game_state_response(
         self,
         db: AsyncSession,
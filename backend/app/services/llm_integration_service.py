@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.utils.encryption import decrypt_api_key, encrypt_api_key
 from common.core.app_error import Errors
+from common.core.config_service import config_service
 from common.core.litellm_service import LiteLLMService
 from common.enums import LLMProvider
 from common.exceptions import ModelValidationError
@@ -55,20 +56,64 @@ class SystemProviderConfig(JsonModel):
     priority: int = Field(..., description="Priority order for default selection (lower is higher priority)")
 
 
+class IntegrationKeyCache:
+    """Short-lived cache of users' integrations with decrypted API keys, keyed by (user, provider).
+
+    Saves a query and a Fernet decrypt on every agent turn. Changes made through this process
+    invalidate the user's entries immediately; the TTL bounds how long other workers can serve a
+    replaced key.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[tuple[UserId, LLMProvider], tuple[float, LLMIntegrationWithKey]] = {}
+
+    def get(self, user_id: UserId, provider: LLMProvider) -> LLMIntegrationWithKey | None:
+        cached = self._entries.get((user_id, provider))
+        if cached is None or cached[0] <= time.monotonic():
+            return None
+        return cached[1].model_copy()
+
+    def put(self, user_id: UserId, provider: LLMProvider, integration: LLMIntegrationWithKey) -> None:
+        if self.ttl_seconds > 0:
+            self._entries[(user_id, provider)] = (time.monotonic() + self.ttl_seconds, integration.model_copy())
+
+    def invalidate_user(self, user_id: UserId) -> None:
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Singleton instance; LLMIntegrationService itself is created per request
+_integration_key_cache: IntegrationKeyCache | None = None
+
+
+def get_integration_key_cache() -> IntegrationKeyCache:
+    """Get or create the singleton integration key cache."""
+    global _integration_key_cache
+    if _integration_key_cache is None:
+        _integration_key_cache = IntegrationKeyCache(ttl_seconds=float(config_service.get("llm.integration_key_cache_ttl_s", 60)))
+    return _integration_key_cache
+
+
 class LLMIntegrationService:
     """Service layer for LLM integration operations.
     Handles business logic and coordinates between routers and DAOs.
     """
 
-    def __init__(self, llm_integration_dao: LLMIntegrationDAO, litellm_service: LiteLLMService) -> None:
+    def __init__(self, llm_integration_dao: LLMIntegrationDAO, litellm_service: LiteLLMService, key_cache: IntegrationKeyCache | None = None) -> None:
         """Initialize LLMIntegrationService with DAO dependency.
 
         Args:
             llm_integration_dao: LLMIntegrationDAO instance for database operations
             litellm_service: Optional LiteLLM service for API testing
+            key_cache: Cache of decrypted integrations (defaults to the process-wide one)
         """
         self.llm_integration_dao = llm_integration_dao
         self._litellm_service = litellm_service
+        self._key_cache = key_cache or get_integration_key_cache()
 
     async def get_user_integrations(
         self,
@@ -176,10 +221,16 @@ class LLMIntegrationService:
         provider: LLMProvider,
     ) -> LLMIntegrationWithKey | None:
         """Get the user's integration for a provider with decrypted API key."""
+        cached = self._key_cache.get(user_id, provider)
+        if cached is not None:
+            return cached
+
         integration = await self.get_user_integration_by_provider(db, user_id, provider)
         if not integration:
             return None
-        return await self.get_integration_for_use(db, integration.id)
+        integration_with_key = await self.get_integration_for_use(db, integration.id)
+        self._key_cache.put(user_id, provider, integration_with_key)
+        return integration_with_key
 
     async def create_integration(
         self,
@@ -234,6 +285,7 @@ class LLMIntegrationService:
 
             logger.info("Creating integration in database")
             result = await self.llm_integration_dao.create_with_user(db, obj_in=integration_data, user_id=user_id)
+            self._key_cache.invalidate_user(user_id)
             logger.info(f"Successfully created integration with ID: {result.id}")
             return result
 
@@ -279,7 +331,9 @@ class LLMIntegrationService:
         if integration_update.api_key:
             update_data.api_key = encrypt_api_key(integration_update.api_key)
 
-        return await self.llm_integration_dao.update_by_id(db, integration_id, user_id, update_data)
+        updated = await self.llm_integration_dao.update_by_id(db, integration_id, user_id, update_data)
+        self._key_cache.invalidate_user(user_id)
+        return updated
 
     async def set_default_integration(
         self,
@@ -298,7 +352,9 @@ class LLMIntegrationService:
             Updated LLMIntegrationResponse if successful, None if not found
         """
         logger.info(f"Setting LLM integration {integration_id} as default for user {user_id}")
-        return await self.llm_integration_dao.set_as_default(db, integration_id, user_id)
+        updated = await self.llm_integration_dao.set_as_default(db, integration_id, user_id)
+        self._key_cache.invalidate_user(user_id)
+        return updated
 
     async def delete_integration(
         self,
@@ -317,7 +373,9 @@ class LLMIntegrationService:
             True if deleted, False if not found
         """
         logger.info(f"Deleting LLM integration {integration_id} for user {user_id}")
-        return await self.llm_integration_dao.delete_by_id(db, integration_id, user_id)
+        deleted = await self.llm_integration_dao.delete_by_id(db, integration_id, user_id)
+        self._key_cache.invalidate_user(user_id)
+        return deleted
 
     async def get_integration_for_use(self, db: AsyncSession, integration_id: LLMIntegrationId) -> LLMIntegrationWithKey:
         """Get integration with decrypted API key for use.
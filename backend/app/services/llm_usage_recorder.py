@@ -0,0 +1,131 @@
+"""Write-behind buffer for LLM usage records."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+
+from prometheus_client import Counter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from common.utils.utils import get_logger
+from shared_db.crud.llm_usage import LLMUsageDAO
+from shared_db.db import Workload, session_factory
+from shared_db.schemas.llm_usage import LLMUsageCreate
+
+logger = get_logger()
+
+llm_usage_dropped = Counter("llm_usage_dropped", "LLM usage records dropped because the write-behind buffer was full")
+
+
+class LLMUsageRecorder:
+    """Collects LLM usage in memory and writes it in batches, off the request path.
+
+    ``record`` only appends to a buffer, so it is safe to call inline after every LLM call
+    (including inside a turn). A background task writes the buffer with multi-row inserts every
+    ``flush_interval_ms``, or as soon as ``batch_rows`` records are waiting. If the database is
+    unavailable, records stay buffered up to ``max_buffered_rows``; beyond that the oldest are dropped.
+    """
+
+    def __init__(
+        self,
+        llm_usage_dao: LLMUsageDAO,
+        sessions: async_sessionmaker[AsyncSession] | None = None,
+        flush_interval_ms: int = 1000,
+        batch_rows: int = 200,
+        max_buffered_rows: int = 10000,
+        compression_level: int = 3,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            llm_usage_dao: DAO used to write the batches
+            sessions: Session factory for the writes (background workload pool if omitted)
+            flush_interval_ms: Longest time a record waits in the buffer while the recorder runs
+            batch_rows: Buffered records that trigger an early flush; also the size of each INSERT
+            max_buffered_rows: Records kept while writes are failing before the oldest are dropped
+            compression_level: zstd level for newly stored prompt and response bodies
+        """
+        self._llm_usage_dao = llm_usage_dao
+        self._sessions = sessions or session_factory(Workload.BACKGROUND)
+        self._flush_interval_s = flush_interval_ms / 1000
+        self._batch_rows = max(1, batch_rows)
+        self._max_buffered_rows = max(self._batch_rows, max_buffered_rows)
+        self._compression_level = compression_level
+        self._buffer: list[LLMUsageCreate] = []
+        self._batch_ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def record(self, usage: LLMUsageCreate) -> None:
+        """Buffer a usage record; never blocks or touches the database."""
+        self._buffer.append(usage)
+        self._trim()
+        if len(self._buffer) >= self._batch_rows:
+            self._batch_ready.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write whatever is still buffered.
+
+        The task is asked to finish rather than cancelled, so a batch being written is not
+        interrupted halfway.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._buffer:
+            logger.warning("LLM usage records lost at shutdown", count=len(self._buffer))
+
+    async def flush(self) -> int:
+        """Write the buffered records; returns how many were written."""
+        async with self._flush_lock:
+            written = 0
+            while self._buffer:
+                batch = self._buffer[: self._batch_rows]
+                del self._buffer[: len(batch)]
+                try:
+                    async with self._sessions() as db:
+                        _ = await self._llm_usage_dao.create_many(db, batch, self._compression_level)
+                        await db.commit()
+                except Exception:
+                    logger.exception("Failed to write LLM usage batch, keeping it buffered", count=len(batch))
+                    self._buffer[:0] = batch
+                    self._trim()
+                    break
+                except BaseException:
+                    # Cancelled mid-write: put the batch back so a later flush still has it
+                    self._buffer[:0] = batch
+                    raise
+                written += len(batch)
+            return written
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            with suppress(TimeoutError):
+                _ = await asyncio.wait_for(self._batch_ready.wait(), self._flush_interval_s)
+            self._batch_ready.clear()
+            written = await self.flush()
+            if self._buffer and written == 0:
+                # Writes are failing; wait a full interval rather than retrying on every new record
+                with suppress(TimeoutError):
+                    _ = await asyncio.wait_for(self._stopping.wait(), self._flush_interval_s)
+
+    def _trim(self) -> None:
+        overflow = len(self._buffer) - self._max_buffered_rows
+        if overflow > 0:
+            del self._buffer[:overflow]
+            llm_usage_dropped.inc(overflow)
+            logger.warning("LLM usage buffer full, dropped oldest records", count=overflow)
@@ -0,0 +1,93 @@
+"""Shared cache of LLM move narratives.
+
+The same move from the same position with a similar evaluation gets the same commentary,
+so narratives are cached by (normalized FEN, move, evaluation bucket, locale). Lookups hit
+an in-process LRU first and fall back to the ``move_narratives`` table.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import chess
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.utils.utils import get_logger
+from shared_db.crud.move_narrative import MoveNarrativeDAO, MoveNarrativeKey
+from shared_db.db import Workload, session_factory
+
+logger = get_logger()
+
+# Narratives quote evaluations to two decimals; a quarter pawn keeps the quoted numbers close
+_EVAL_BUCKET_CP = 25
+
+
+def eval_bucket(score_cp: int | None, evaluation_change: int | None, score_mate: int | None) -> str:
+    """Coarse bucket of a move's evaluation, evaluation change and mate distance."""
+
+    def bucket(value: int | None) -> str:
+        return "na" if value is None else str(round(value / _EVAL_BUCKET_CP))
+
+    mate = "" if score_mate is None else f":m{score_mate}"
+    return f"{bucket(score_cp)}:{bucket(evaluation_change)}{mate}"
+
+
+class MoveNarrativeCache:
+    """In-memory LRU in front of the persistent move-narrative table.
+
+    Lookups run in a short background session of their own, so callers do not hold a
+    connection while the LLM describes the misses. Stores go through the caller's session,
+    so narratives are committed together with the analysis events that use them.
+    """
+
+    def __init__(self, max_size: int = 5_000, dao: MoveNarrativeDAO | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of narratives kept in memory.
+            dao: DAO used for the persistent layer.
+        """
+        self.max_size = max(1, max_size)
+        self._dao = dao or MoveNarrativeDAO()
+        self._entries: OrderedDict[MoveNarrativeKey, str] = OrderedDict()
+
+    @staticmethod
+    def key(fen_before: str, move_san: str, bucket: str, locale: str) -> MoveNarrativeKey:
+        """Cache key; the position is the normalized FEN (no move clocks)."""
+        return (chess.Board(fen_before).epd(), move_san, bucket, locale)
+
+    async def get_many(self, keys: list[MoveNarrativeKey]) -> dict[MoveNarrativeKey, str]:
+        """Look up several narratives; database errors are treated as misses."""
+        found: dict[MoveNarrativeKey, str] = {}
+        for key in keys:
+            narrative = self._entries.get(key)
+            if narrative is not None:
+                self._entries.move_to_end(key)
+                found[key] = narrative
+
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            return found
+
+        try:
+            async with session_factory(Workload.BACKGROUND)() as db:
+                stored = await self._dao.get_many(db, missing)
+        except Exception as e:
+            logger.warning("Move narrative lookup failed", operation="move_narrative_cache", error=str(e))
+            return found
+
+        for key, narrative in stored.items():
+            self._remember(key, narrative)
+        return found | stored
+
+    async def put_many(self, db: AsyncSession, narratives: dict[MoveNarrativeKey, str]) -> None:
+        """Store narratives; they are persisted when the caller commits."""
+        for key, narrative in narratives.items():
+            self._remember(key, narrative)
+        await self._dao.save_many(db, narratives)
+
+    def _remember(self, key: MoveNarrativeKey, narrative: str) -> None:
+        self._entries[key] = narrative
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -86,3 +86,16 @@ class PokerAnalysisService:
         # 6. Opponent modeling based on previous actions
         # 7. Bluff detection heuristics
         # 8. ICM (Independent Chip Model) considerations for tournaments
+
+    async def analyze_game(self, db: AsyncSession, game_id: GameId) -> None:
+        """Analyze a finished poker game (placeholder, see analyze_move).
+
+        Args:
+            db: Database session
+            game_id: Game ID
+        """
+        if not self.enabled:
+            logger.debug("Poker analysis disabled, skipping")
+            return
+
+        logger.info("Poker post-game analysis requested (not yet implemented)", extra={"game_id": str(game_id)})
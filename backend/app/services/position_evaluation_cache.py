@@ -0,0 +1,152 @@
+"""Shared cache of engine evaluations for chess positions.
+
+Many games pass through the same opening positions, so engine results are cached by
+(normalized FEN, engine configuration). Lookups hit an in-process LRU first and fall back
+to the ``position_evaluations`` table, which is shared by every worker.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import chess
+from pydantic import Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.core.config_service import config_service
+from common.utils import JsonModel
+from common.utils.utils import get_logger
+from shared_db.crud.position_evaluation import PositionEvaluationDAO
+from shared_db.db import Workload, session_factory
+
+logger = get_logger()
+
+
+class CachedEvaluation(JsonModel):
+    """Engine result for a position, independent of the game it was reached in."""
+
+    evaluation: int = Field(description="Evaluation in centipawns from White's point of view (mate folded to +/-10000)")
+    mate: int | None = Field(default=None, description="Mate in N from White's point of view")
+    best_move: str | None = Field(default=None, description="Best move in UCI notation")
+    depth: int = Field(description="Search depth reached")
+
+
+class PositionEvaluationCache:
+    """In-memory LRU in front of the persistent position-evaluation table."""
+
+    def __init__(self, max_size: int = 10_000, persistent: bool = True, dao: PositionEvaluationDAO | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of positions kept in memory.
+            persistent: Whether to read through to and write to the database.
+            dao: DAO used for the persistent layer.
+        """
+        self.max_size = max(1, max_size)
+        self.persistent = persistent
+        self._dao = dao or PositionEvaluationDAO()
+        self._entries: OrderedDict[tuple[str, str], CachedEvaluation] = OrderedDict()
+
+    @staticmethod
+    def position_key(board: chess.Board) -> str:
+        """Normalized FEN: placement, side to move, castling and legal en passant, without move clocks."""
+        return board.epd()
+
+    @staticmethod
+    def engine_config(depth: int, time_limit: float | None) -> str:
+        """Key identifying the search limits an evaluation was produced with."""
+        return f"d{depth}" if time_limit is None else f"d{depth}:t{time_limit:g}"
+
+    async def get(self, board: chess.Board, engine_config: str, db: AsyncSession | None = None) -> CachedEvaluation | None:
+        """Look up a position; database errors are treated as a miss.
+
+        Args:
+            board: Position to look up
+            engine_config: Search limits the evaluation must have been produced with
+            db: Caller's session to read through; a background session is opened if omitted
+        """
+        key = (self.position_key(board), engine_config)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            return cached
+
+        if not self.persistent:
+            return None
+
+        try:
+            if db is None:
+                async with session_factory(Workload.BACKGROUND)() as own_db:
+                    row = await self._dao.get(own_db, key[0], engine_config)
+            else:
+                row = await self._dao.get(db, key[0], engine_config)
+        except Exception as e:
+            logger.warning("Position evaluation lookup failed", operation="position_eval_cache", error=str(e))
+            return None
+
+        if row is None:
+            return None
+
+        cached = CachedEvaluation(evaluation=row.evaluation_cp, mate=row.mate, best_move=row.best_move_uci, depth=row.depth)
+        self._remember(key, cached)
+        return cached
+
+    async def put(self, board: chess.Board, engine_config: str, evaluation: CachedEvaluation, db: AsyncSession | None = None) -> None:
+        """Store a position's evaluation; database errors are logged and ignored.
+
+        Args:
+            board: Evaluated position
+            engine_config: Search limits the evaluation was produced with
+            evaluation: Engine result to store
+            db: Caller's session; the row is written in a savepoint and committed with the caller's
+                transaction. A background session is opened and committed if omitted.
+        """
+        key = (self.position_key(board), engine_config)
+        self._remember(key, evaluation)
+
+        if not self.persistent:
+            return
+
+        try:
+            if db is None:
+                async with session_factory(Workload.BACKGROUND)() as own_db:
+                    await self._save(own_db, key, evaluation)
+                    await own_db.commit()
+            else:
+                # A savepoint keeps a failed write from aborting the caller's transaction
+                async with db.begin_nested():
+                    await self._save(db, key, evaluation)
+        except Exception as e:
+            logger.warning("Position evaluation store failed", operation="position_eval_cache", error=str(e))
+
+    async def _save(self, db: AsyncSession, key: tuple[str, str], evaluation: CachedEvaluation) -> None:
+        await self._dao.save(
+            db,
+            position_key=key[0],
+            engine_config=key[1],
+            evaluation_cp=evaluation.evaluation,
+            mate=evaluation.mate,
+            best_move_uci=evaluation.best_move,
+            depth=evaluation.depth,
+        )
+
+    def _remember(self, key: tuple[str, str], evaluation: CachedEvaluation) -> None:
+        self._entries[key] = evaluation
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+# Singleton instance shared by the brain bot and move analysis
+_position_evaluation_cache: PositionEvaluationCache | None = None
+
+
+def get_position_evaluation_cache() -> PositionEvaluationCache:
+    """Get or create the singleton position-evaluation cache."""
+    global _position_evaluation_cache
+    if _position_evaluation_cache is None:
+        _position_evaluation_cache = PositionEvaluationCache(
+            max_size=int(config_service.get("chess.eval_cache_size", 10_000)),
+            persistent=bool(config_service.get("chess.eval_cache_persistent", True)),
+        )
+    return _position_evaluation_cache
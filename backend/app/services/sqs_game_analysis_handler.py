@@ -2,22 +2,26 @@
 
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Literal, Protocol
 
-from game_api import BaseGameEvent, BaseGameState, GameType
-from pydantic import TypeAdapter
+from game_api import BaseGameState, GameType
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.sqs_game_messages import GameAnalysisMessage, GameAnalysisSqsClient
+from app.schemas.sqs_game_messages import GameAnalysisJob, GameAnalysisMessage, GameAnalysisSqsClient, PostGameAnalysisMessage
 from app.services.game_env_registry import GameEnvRegistry
+from common.core.app_error import Errors
 from common.core.request_context import RequestContext
 from common.ids import GameId, PlayerId
 from common.utils.utils import get_logger
 from shared_db.crud.game import GameDAO
-from shared_db.db import AsyncSessionLocal
+from shared_db.db import Workload, session_factory
+from shared_db.models.game import MatchmakingStatus
 
 logger = get_logger(__name__)
 
+# "live" analyzes each move as it is played; "post_game" analyzes the whole game once it finishes
+AnalysisMode = Literal["live", "post_game"]
+
 
 class AnalysisServiceProtocol(Protocol):
     """Protocol for game-specific analysis services."""
@@ -35,6 +39,10 @@ class AnalysisServiceProtocol(Protocol):
         """Analyze a move for a specific game type."""
         ...
 
+    async def analyze_game(self, db: AsyncSession, game_id: GameId) -> None:
+        """Analyze every not-yet-analyzed move of a finished game."""
+        ...
+
 
 class SqsGameAnalysisHandler:
     """Handles SQS game analysis messages for different game types.
@@ -42,20 +50,29 @@ class SqsGameAnalysisHandler:
     This handler processes move analysis requests from the SQS queue,
     checks for existing analysis to prevent duplicates, and delegates
     to registered game-specific analysis services.
+
+    In post-game mode, per-move requests are dropped and a single job is queued when a
+    game finishes, so the two kinds of work never compete: a deployment runs one mode or the
+    other. The analysis queue is polled with a dispatch lane, so one long post-game job does
+    not hold back the jobs received with it, and each job's visibility is extended until it
+    finishes.
     """
 
     _sqs_client: GameAnalysisSqsClient
     _game_dao: GameDAO
     _analysis_services: dict[GameType, AnalysisServiceProtocol]
+    _analysis_mode: AnalysisMode
 
     def __init__(
         self,
         sqs_client: GameAnalysisSqsClient,
         game_dao: GameDAO,
+        analysis_mode: AnalysisMode = "live",
     ) -> None:
         self._sqs_client = sqs_client
         self._game_dao = game_dao
         self._analysis_services = {}
+        self._analysis_mode = analysis_mode
 
         # Register the handler with the SQS client
         self._sqs_client.register_poll_handler(self._handle_game_analysis)
@@ -64,14 +81,48 @@ class SqsGameAnalysisHandler:
         """Register an analysis service for a specific game type."""
         self._analysis_services[game_type] = service
 
-    async def _handle_game_analysis(self, message: GameAnalysisMessage, request_context: RequestContext) -> None:
+    async def _handle_game_analysis(self, message: GameAnalysisJob, request_context: RequestContext) -> None:
         """Handle a game analysis message from SQS.
 
         Args:
-            message: The analysis message containing game state and move info
+            message: The analysis message (single move or whole finished game)
             request_context: The request context for logging and tracing
         """
-        async with AsyncSessionLocal() as db:
+        if isinstance(message, PostGameAnalysisMessage):
+            await self._handle_post_game_analysis(message)
+        else:
+            await self._handle_move_analysis(message)
+
+    async def _handle_post_game_analysis(self, message: PostGameAnalysisMessage) -> None:
+        """Analyze a whole finished game; progress is committed by the analysis service as it goes."""
+        service = self._analysis_services.get(message.game_type)
+        if not service:
+            logger.info(f"No analysis service registered for game type {message.game_type}")
+            return
+
+        async with session_factory(Workload.BACKGROUND)() as db:
+            try:
+                # The job is queued inside the transaction that finishes the game; wait for it to commit
+                status = await self._game_dao.get_status(db, message.game_id)
+                if status is None:
+                    logger.warning(f"Game {message.game_id} not found, skipping post-game analysis")
+                    return
+                if status != MatchmakingStatus.FINISHED:
+                    raise Errors.Game.NOT_FINISHED.create(details={"game_id": message.game_id})
+
+                logger.info(f"Processing post-game analysis for game {message.game_id}")
+                await service.analyze_game(db=db, game_id=message.game_id)
+                await db.commit()
+                logger.info(f"Post-game analysis completed for game {message.game_id}")
+
+            except Exception:
+                await db.rollback()
+                logger.exception(f"Error processing post-game analysis for game {message.game_id}")
+                raise
+
+    async def _handle_move_analysis(self, message: GameAnalysisMessage) -> None:
+        """Analyze a single move as soon as it is played."""
+        async with session_factory(Workload.BACKGROUND)() as db:
             try:
                 logger.info(f"Processing game analysis for game {message.game_id}, round {message.round_number}, move {message.move_san}")
 
@@ -104,6 +155,9 @@ class SqsGameAnalysisHandler:
     ) -> bool:
         """Check if analysis already exists for this game and round.
 
+        Uses the (game_id, move_number) analysis index, so the cost is a single indexed
+        lookup regardless of how many events the game has.
+
         Args:
             db: Database session
             game_id: The game ID
@@ -112,24 +166,7 @@ class SqsGameAnalysisHandler:
         Returns:
             True if analysis exists, False otherwise
         """
-        # Get the game type and events using DAO methods
-        game_type = await self._game_dao.get_game_type(db=db, game_id=game_id)
-        if not game_type:
-            logger.warning(f"Game {game_id} not found")
-            return False
-
-        events = await self._game_dao.get_events(db=db, game_id=game_id)
-
-        # Check if any event for this round is a Move Analysis event using typed parsing
-        registry = GameEnvRegistry.instance()
-        env_cls = registry.get(game_type)
-        event_union = env_cls.types().event_type()
-        adapter = TypeAdapter(event_union)
-
-        def _is_analysis_for_round(ev: BaseGameEvent, target_round: int) -> bool:
-            return env_cls.types().is_analysis_event(ev) and ev.turn == target_round
-
-        return any(_is_analysis_for_round(adapter.validate_python(e.data or {}), round_number) for e in events)
+        return await self._game_dao.has_move_analysis(db=db, game_id=game_id, move_number=round_number)
 
     async def _handle_analysis(
         self,
@@ -188,6 +225,10 @@ class SqsGameAnalysisHandler:
             state_before: Game state before the move
             state_after: Game state after the move
         """
+        if self._analysis_mode == "post_game":
+            # The whole game is analyzed once it finishes (see queue_game_analysis)
+            return
+
         message = GameAnalysisMessage(
             game_id=game_id,
             game_type=game_type,
@@ -200,3 +241,16 @@ class SqsGameAnalysisHandler:
 
         await self._sqs_client.send(message)
         logger.info(f"Queued analysis for game {game_id}, round {round_number}, move {move_san}")
+
+    async def queue_game_analysis(self, game_id: GameId, game_type: GameType) -> None:
+        """Queue analysis of a whole finished game to SQS (post-game mode only).
+
+        Args:
+            game_id: The finished game's ID
+            game_type: The type of game
+        """
+        if self._analysis_mode != "post_game":
+            return
+
+        await self._sqs_client.send(PostGameAnalysisMessage(game_id=game_id, game_type=game_type))
+        logger.info(f"Queued post-game analysis for game {game_id}")
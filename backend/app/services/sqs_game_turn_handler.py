@@ -8,7 +8,7 @@ from common.core.app_error import Errors
 from common.core.request_context import RequestContext
 from common.ids import GameId, PlayerId
 from common.utils.utils import get_logger
-from shared_db.db import AsyncSessionLocal
+from shared_db.db import Workload, session_factory
 
 logger = get_logger()
 
@@ -35,7 +35,7 @@ class SqsGameTurnHandler:
 
     async def _handle_game_turn(self, message: GameTurnMessage, request_context: RequestContext) -> None:
         # Get database session
-        async with AsyncSessionLocal() as db:
+        async with session_factory(Workload.TURN_WORKER)() as db:
             try:
                 # Process the turn through GameManager
                 logger.info(f"Processing game turn for game {message.game_id}, player {message.player_id}, turn {message.turn}")
@@ -1,13 +1,14 @@
 """Stockfish-based agent execution service for the Brain bot."""
 
-from typing import Literal, cast
+from typing import Any, Literal, cast
 
 import chess
 from chess_game.chess_api import ChessMoveData, ChessStateView
 from game_api import BaseGameStateView, BasePlayerPossibleMoves
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.agent_execution_service import AgentExecutionResult
-from app.services.stockfish_service import StockfishService
+from app.services.stockfish_service import StockfishService, get_stockfish_service
 from common.core.app_error import Errors
 from common.ids import AgentId
 from common.types import AgentReasoning
@@ -34,6 +35,7 @@ class StockfishAgentExecutor:
         game_state: BaseGameStateView,
         possible_moves: BasePlayerPossibleMoves | None,
         opponent_rating: int | None = None,
+        db: AsyncSession | None = None,
     ) -> AgentExecutionResult:
         """Execute a move using Stockfish engine for the Brain bot.
 
@@ -42,6 +44,7 @@ class StockfishAgentExecutor:
             game_state: Current game state view
             possible_moves: Legal moves for the current position (not used by Stockfish)
             opponent_rating: Opponent's chess rating for adaptive difficulty
+            db: Caller's session, reused for the position-evaluation cache lookup
 
         Returns:
             AgentExecutionResult with the Stockfish move
@@ -62,8 +65,9 @@ class StockfishAgentExecutor:
             stockfish_elo = self._stockfish_service.get_adaptive_elo(opponent_rating=opponent_rating)
             logger.info(f"Using adaptive Stockfish ELO: {stockfish_elo}")
 
-            # Get best move from Stockfish
-            best_move_uci = self._stockfish_service.get_move_from_fen(fen, elo_rating=stockfish_elo)
+            # Get best move and its evaluation from a single async Stockfish search
+            stockfish_result = await self._stockfish_service.get_best_move(board, elo_rating=stockfish_elo, db=db)
+            best_move_uci = stockfish_result.get("best_move")
             if not best_move_uci:
                 logger.warning("Stockfish returned no move - game may be over")
                 return AgentExecutionResult(
@@ -87,8 +91,8 @@ class StockfishAgentExecutor:
                 if promo_symbol in {"q", "r", "b", "n"}:
                     promotion = cast(Literal["q", "r", "b", "n"], promo_symbol)
 
-            # Generate simple reasoning based on Stockfish analysis (no LLM)
-            reasoning = self._generate_simple_reasoning(fen, best_move_uci, stockfish_elo)
+            # Generate simple reasoning from the same search (no LLM, no second engine call)
+            reasoning = self._generate_simple_reasoning(stockfish_result, best_move_uci, stockfish_elo)
 
             move_data = ChessMoveData(
                 from_square=best_move_uci[:2],
@@ -171,11 +175,11 @@ class StockfishAgentExecutor:
 
         return f"{board_fen} {active_color} {castling} {en_passant} {halfmove_clock} {fullmove_number}"
 
-    def _generate_simple_reasoning(self, fen: str, move: str, elo: int) -> AgentReasoning:
+    def _generate_simple_reasoning(self, move_data: dict[str, Any], move: str, elo: int) -> AgentReasoning:
         """Generate simple reasoning based on Stockfish analysis (no LLM).
 
         Args:
-            fen: FEN string before the move
+            move_data: Result of the Stockfish search that produced the move
             move: Move in UCI notation
             elo: ELO rating used for analysis
 
@@ -183,10 +187,6 @@ class StockfishAgentExecutor:
             Simple reasoning with Stockfish evaluation
         """
         try:
-            # Get basic Stockfish analysis
-            board = chess.Board(fen)
-            move_data = self._stockfish_service.get_best_move(board, elo_rating=elo, time_limit=0.5)
-
             evaluation = move_data.get("evaluation", "N/A")
             confidence = move_data.get("confidence", 0)
 
@@ -209,8 +209,7 @@ def get_stockfish_executor() -> StockfishAgentExecutor:
     """Get global Stockfish executor instance."""
     global _stockfish_executor
     if _stockfish_executor is None:
-        stockfish_service = StockfishService()
-        _stockfish_executor = StockfishAgentExecutor(stockfish_service)
+        _stockfish_executor = StockfishAgentExecutor(get_stockfish_service())
     return _stockfish_executor
 
 
@@ -233,6 +232,7 @@ async def execute_brain_bot_move(
     game_state: BaseGameStateView,
     possible_moves: BasePlayerPossibleMoves | None,
     opponent_rating: int | None = None,
+    db: AsyncSession | None = None,
 ) -> AgentExecutionResult | None:
     """Execute a move for the Brain bot using Stockfish.
 
@@ -247,4 +247,5 @@ async def execute_brain_bot_move(
         game_state=game_state,
         possible_moves=possible_moves,
         opponent_rating=opponent_rating,
+        db=db,
     )
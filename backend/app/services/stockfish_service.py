@@ -10,74 +10,167 @@ providing a unified interface for:
 
 from __future__ import annotations
 
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from typing import Any, Literal
 
 import chess
 import chess.engine
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.position_evaluation_cache import CachedEvaluation, PositionEvaluationCache, get_position_evaluation_cache
+from common.core.config_service import config_service
 from common.utils.utils import get_logger
 
 logger = get_logger()
 
+# Extra wall-clock allowance on top of the engine's own time limit before a search is considered hung
+_ENGINE_TIMEOUT_GRACE_SECONDS = 2.0
+_ENGINE_INIT_TIMEOUT_SECONDS = 10.0
+
 
 class StockfishService:
-    """Unified Stockfish service for chess engine operations."""
+    """Unified Stockfish service for chess engine operations.
+
+    Engines are driven through the asyncio UCI protocol so searches never block the event loop.
+    A small pool of engine processes is kept alive and reused; concurrent searches beyond the
+    pool size wait for an engine to become free.
+
+    When an evaluation cache is configured, it is consulted before every search and filled
+    with every search that reached the requested depth.
+    """
 
-    def __init__(self, stockfish_path: str | None = None):
+    def __init__(self, stockfish_path: str | None = None, max_concurrency: int = 2, evaluation_cache: PositionEvaluationCache | None = None):
         """Initialize Stockfish service.
 
         Args:
             stockfish_path: Path to Stockfish executable. If None, assumes 'stockfish' is in PATH.
+            max_concurrency: Maximum number of engine processes (and therefore concurrent searches).
+            evaluation_cache: Shared position-evaluation cache; None disables caching.
         """
         self.stockfish_path = stockfish_path or "stockfish"
-        self._engine: chess.engine.SimpleEngine | None = None
-        self._is_initialized = False
-
-    def _ensure_engine(self) -> None:
-        """Ensure Stockfish engine is initialized."""
-        if not self._is_initialized:
+        self.max_concurrency = max(1, max_concurrency)
+        self.evaluation_cache = evaluation_cache
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._idle_engines: list[chess.engine.UciProtocol] = []
+        self._transports: dict[int, asyncio.SubprocessTransport] = {}
+
+    async def _open_engine(self) -> chess.engine.UciProtocol:
+        """Start a new Stockfish process speaking UCI over asyncio pipes."""
+        try:
+            transport, engine = await asyncio.wait_for(chess.engine.popen_uci(self.stockfish_path), timeout=_ENGINE_INIT_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.exception(
+                "Failed to initialize Stockfish engine",
+                operation="stockfish_init",
+                error=str(e),
+            )
+            raise RuntimeError(f"Stockfish engine initialization failed: {e}")
+
+        self._transports[id(engine)] = transport
+        logger.info(
+            "Stockfish engine initialized successfully",
+            operation="stockfish_init",
+            stockfish_path=self.stockfish_path,
+            pool_size=len(self._transports),
+        )
+        return engine
+
+    async def _discard_engine(self, engine: chess.engine.UciProtocol) -> None:
+        """Terminate an engine that is broken or hung; it will not be returned to the pool."""
+        transport = self._transports.pop(id(engine), None)
+        try:
+            await asyncio.wait_for(engine.quit(), timeout=1.0)
+        except Exception:
+            if transport is not None:
+                transport.close()
+
+    @asynccontextmanager
+    async def _engine(self) -> AsyncGenerator[chess.engine.UciProtocol]:
+        """Borrow an engine from the pool, bounded by the concurrency semaphore."""
+        async with self._semaphore:
+            engine = self._idle_engines.pop() if self._idle_engines else await self._open_engine()
+            healthy = False
             try:
-                self._engine = chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
-                self._is_initialized = True
-                logger.info(
-                    "Stockfish engine initialized successfully",
-                    operation="stockfish_init",
-                    stockfish_path=self.stockfish_path,
-                )
-            except Exception as e:
-                logger.exception(
-                    "Failed to initialize Stockfish engine",
-                    operation="stockfish_init",
-                    error=str(e),
-                )
-                raise RuntimeError(f"Stockfish engine initialization failed: {e}")
-
-    def close(self) -> None:
-        """Close the Stockfish engine."""
-        if self._engine:
+                yield engine
+                healthy = True
+            finally:
+                if healthy and not engine.returncode.done():
+                    self._idle_engines.append(engine)
+                else:
+                    await self._discard_engine(engine)
+
+    async def close(self) -> None:
+        """Close all pooled Stockfish engines."""
+        engines = list(self._idle_engines)
+        self._idle_engines.clear()
+        for engine in engines:
             try:
-                self._engine.quit()
-                self._engine = None
-                self._is_initialized = False
-                logger.info("Stockfish engine closed", operation="stockfish_close")
+                await self._discard_engine(engine)
             except Exception as e:
                 logger.warning(
                     "Error closing Stockfish engine",
                     operation="stockfish_close",
                     error=str(e),
                 )
-
-    def get_best_move(
-        self, board: chess.Board, elo_rating: int = 1200, time_limit: float = 1.0, depth: int = 15, analysis_mode: Literal["move", "analysis"] = "move"
+        if engines:
+            logger.info("Stockfish engines closed", operation="stockfish_close", count=len(engines))
+
+    @staticmethod
+    def _call_timeout(limit: chess.engine.Limit) -> float | None:
+        """Wall-clock timeout for a single engine call derived from its search limit."""
+        if limit.time is None:
+            return None
+        return limit.time + _ENGINE_TIMEOUT_GRACE_SECONDS
+
+    async def _cached_evaluation(self, board: chess.Board, depth: int, time_limit: float, db: AsyncSession | None) -> CachedEvaluation | None:
+        """Look up a previous search of this position with the same limits."""
+        if self.evaluation_cache is None:
+            return None
+        return await self.evaluation_cache.get(board, self.evaluation_cache.engine_config(depth, time_limit), db)
+
+    async def _cache_evaluation(
+        self, board: chess.Board, depth: int, time_limit: float, info: dict[str, Any], best_move: str | None, *, db: AsyncSession | None
+    ) -> None:
+        """Remember a search result, unless it has no score or was cut short before reaching the requested depth."""
+        evaluation = self._extract_score_cp(info)
+        if self.evaluation_cache is None or evaluation is None:
+            return
+        reached_depth = info.get("depth", 0)
+        mate = self._extract_mate_score(info)
+        if reached_depth < depth and mate is None:
+            return
+        await self.evaluation_cache.put(
+            board,
+            self.evaluation_cache.engine_config(depth, time_limit),
+            CachedEvaluation(evaluation=evaluation, mate=mate, best_move=best_move, depth=reached_depth),
+            db,
+        )
+
+    async def get_best_move(
+        self,
+        board: chess.Board,
+        elo_rating: int = 1200,
+        time_limit: float = 1.0,
+        depth: int = 15,
+        analysis_mode: Literal["move", "analysis"] = "move",
+        *,
+        db: AsyncSession | None = None,
     ) -> dict[str, Any]:
         """Get the best move from Stockfish engine.
 
+        The evaluation is taken from the same search that produced the move, so a single
+        engine call yields both.
+
         Args:
             board: Current chess board position
             elo_rating: Target ELO rating for difficulty adjustment
             time_limit: Time limit for engine analysis in seconds
             depth: Search depth for analysis
             analysis_mode: Mode of operation ("move" or "analysis")
+            db: Caller's session for the evaluation cache (a background session is used if omitted)
 
         Returns:
             Dictionary containing:
@@ -89,59 +182,46 @@ class StockfishService:
             - time: Analysis time in milliseconds
             - skill_level: Calculated skill level (0-20)
         """
-        self._ensure_engine()
-        if not self._engine:
-            raise RuntimeError("Stockfish engine not available")
-
-        try:
-            # Configure engine parameters
-            if analysis_mode == "move":
-                limit = chess.engine.Limit(time=time_limit, depth=depth)
-            else:
-                limit = chess.engine.Limit(time=time_limit, depth=depth)
+        skill_level = self._calculate_skill_level(elo_rating)
 
+        cached = await self._cached_evaluation(board, depth, time_limit, db)
+        if cached is not None and cached.best_move is not None:
             logger.info(
-                f"Requesting {analysis_mode} from Stockfish",
+                f"Stockfish {analysis_mode} served from evaluation cache",
                 operation="stockfish_move",
-                elo_rating=elo_rating,
-                depth=depth,
-                time_limit=time_limit,
-                fen=board.fen(),
+                best_move=cached.best_move,
+                evaluation=cached.evaluation,
+                depth=cached.depth,
             )
-
-            # Get best move from Stockfish
-            result = self._engine.play(board, limit)
-
-            # Get position evaluation
-            info = self._engine.analyse(board, limit)
-            evaluation = self._extract_evaluation(info)
-
-            # Calculate confidence based on evaluation and skill level
-            skill_level = self._calculate_skill_level(elo_rating)
-            confidence = self._calculate_confidence(evaluation, skill_level)
-
-            move_data = {
-                "best_move": result.move.uci(),
-                "confidence": confidence,
-                "evaluation": evaluation,
-                "depth": info.get("depth", 0),
-                "nodes": info.get("nodes", 0),
-                "time": info.get("time", 0.0),
+            return {
+                "best_move": cached.best_move,
+                "confidence": self._calculate_confidence(cached.evaluation, skill_level),
+                "evaluation": cached.evaluation,
+                "depth": cached.depth,
+                "nodes": 0,
+                "time": 0.0,
                 "skill_level": skill_level,
                 "analysis_mode": analysis_mode,
             }
 
-            logger.info(
-                f"Stockfish {analysis_mode} completed",
-                operation="stockfish_move",
-                best_move=move_data["best_move"],
-                evaluation=move_data["evaluation"],
-                depth=move_data["depth"],
-                confidence=move_data["confidence"],
-            )
+        limit = chess.engine.Limit(time=time_limit, depth=depth)
 
-            return move_data
+        logger.info(
+            f"Requesting {analysis_mode} from Stockfish",
+            operation="stockfish_move",
+            elo_rating=elo_rating,
+            depth=depth,
+            time_limit=time_limit,
+            fen=board.fen(),
+        )
 
+        start = time.perf_counter()
+        try:
+            async with self._engine() as engine:
+                result = await asyncio.wait_for(
+                    engine.play(board, limit, info=chess.engine.INFO_BASIC | chess.engine.INFO_SCORE),
+                    timeout=self._call_timeout(limit),
+                )
         except Exception as e:
             logger.exception(
                 f"Error getting {analysis_mode} from Stockfish",
@@ -151,36 +231,66 @@ class StockfishService:
             )
             raise RuntimeError(f"Stockfish {analysis_mode} failed: {e}")
 
-    def analyze_position(self, board: chess.Board, time_limit: float = 1.0, depth: int = 15) -> dict[str, Any]:
+        info = dict(result.info)
+        evaluation = self._extract_evaluation(info)
+        await self._cache_evaluation(board, depth, time_limit, info, result.move.uci() if result.move else None, db=db)
+
+        # Calculate confidence based on evaluation and skill level
+        confidence = self._calculate_confidence(evaluation, skill_level)
+
+        move_data = {
+            "best_move": result.move.uci() if result.move else None,
+            "confidence": confidence,
+            "evaluation": evaluation,
+            "depth": info.get("depth", 0),
+            "nodes": info.get("nodes", 0),
+            "time": info.get("time", 0.0),
+            "skill_level": skill_level,
+            "analysis_mode": analysis_mode,
+        }
+
+        logger.info(
+            f"Stockfish {analysis_mode} completed",
+            operation="stockfish_move",
+            best_move=move_data["best_move"],
+            evaluation=move_data["evaluation"],
+            depth=move_data["depth"],
+            confidence=move_data["confidence"],
+            elapsed=time.perf_counter() - start,
+        )
+
+        return move_data
+
+    async def analyze_position(self, board: chess.Board, time_limit: float = 1.0, depth: int = 15, db: AsyncSession | None = None) -> dict[str, Any]:
         """Analyze the current position using Stockfish.
 
         Args:
             board: Current chess board position
             time_limit: Time limit for analysis in seconds
             depth: Search depth for analysis
+            db: Caller's session for the evaluation cache (a background session is used if omitted)
 
         Returns:
-            Dictionary containing position analysis data
+            Dictionary containing position analysis data; ``evaluation`` is None if the search
+            produced no score
         """
-        self._ensure_engine()
-        if not self._engine:
-            raise RuntimeError("Stockfish engine not available")
-
-        try:
-            limit = chess.engine.Limit(time_limit=time_limit, depth=depth)
-            info = self._engine.analyse(board, limit)
-
+        cached = await self._cached_evaluation(board, depth, time_limit, db)
+        if cached is not None:
             return {
-                "evaluation": self._extract_evaluation(info),
-                "depth": info.get("depth", 0),
-                "nodes": info.get("nodes", 0),
-                "time": info.get("time", 0.0),
-                "pv": info.get("pv", []),
-                "mate": self._extract_mate_score(info),
-                "best_move": None,
+                "evaluation": cached.evaluation,
+                "depth": cached.depth,
+                "nodes": 0,
+                "time": 0.0,
+                "pv": [chess.Move.from_uci(cached.best_move)] if cached.best_move else [],
+                "mate": cached.mate,
+                "best_move": cached.best_move,
                 "variation": None,
             }
 
+        limit = chess.engine.Limit(time=time_limit, depth=depth)
+        try:
+            async with self._engine() as engine:
+                info = dict(await asyncio.wait_for(engine.analyse(board, limit), timeout=self._call_timeout(limit)))
         except Exception as e:
             logger.exception(
                 "Error analyzing position with Stockfish",
@@ -190,6 +300,19 @@ class StockfishService:
             )
             raise RuntimeError(f"Stockfish position analysis failed: {e}")
 
+        pv: list[chess.Move] = info.get("pv", [])
+        await self._cache_evaluation(board, depth, time_limit, info, pv[0].uci() if pv else None, db=db)
+        return {
+            "evaluation": self._extract_score_cp(info),
+            "depth": info.get("depth", 0),
+            "nodes": info.get("nodes", 0),
+            "time": info.get("time", 0.0),
+            "pv": pv,
+            "mate": self._extract_mate_score(info),
+            "best_move": pv[0].uci() if pv else None,
+            "variation": None,
+        }
+
     def _extract_evaluation(self, info: dict[str, Any]) -> int:
         """Extract evaluation from Stockfish analysis info.
 
@@ -197,23 +320,23 @@ class StockfishService:
             info: Stockfish analysis info dictionary
 
         Returns:
-            Evaluation in centipawns (positive = white advantage, negative = black advantage)
+            Evaluation in centipawns (positive = white advantage, negative = black advantage), 0 without a score
         """
-        if "score" in info:
-            score = info["score"]
-            white_score = score.white()
-            if white_score.is_mate():
-                mate_in = white_score.mate()
-                if mate_in is None:
-                    return 0
-                # Convert mate scores to large centipawn values
-                cp_value = 10000 if mate_in > 0 else -10000
-            else:
-                cp_value = white_score.score()
-                if cp_value is None:
-                    return 0
-            return cp_value
-        return 0
+        evaluation = self._extract_score_cp(info)
+        return 0 if evaluation is None else evaluation
+
+    def _extract_score_cp(self, info: dict[str, Any]) -> int | None:
+        """Extract the White-relative centipawn score (mate folded to +/-10000), or None without a score."""
+        if "score" not in info:
+            return None
+        white_score = info["score"].white()
+        if white_score.is_mate():
+            mate_in = white_score.mate()
+            if mate_in is None:
+                return None
+            # Convert mate scores to large centipawn values
+            return 10000 if mate_in > 0 else -10000
+        return white_score.score()
 
     def _extract_mate_score(self, info: dict[str, Any]) -> int | None:
         """Extract mate-in-N value from score.
@@ -300,7 +423,7 @@ class StockfishService:
         # Clamp to reasonable range
         return max(800, min(2000, adaptive_elo))
 
-    def get_move_from_fen(self, fen: str, elo_rating: int = 1200, time_limit: float = 1.0) -> str:
+    async def get_move_from_fen(self, fen: str, elo_rating: int = 1200, time_limit: float = 1.0) -> str:
         """Get the best move from a FEN position.
 
         Args:
@@ -312,10 +435,10 @@ class StockfishService:
             Best move in UCI notation (e.g., "e2e4")
         """
         board = chess.Board(fen)
-        move_data = self.get_best_move(board, elo_rating, time_limit)
+        move_data = await self.get_best_move(board, elo_rating, time_limit)
         return move_data["best_move"]
 
-    def get_move_analysis(
+    async def get_move_analysis(
         self,
         fen: str,
         move: str,
@@ -334,37 +457,37 @@ class StockfishService:
         board = chess.Board(fen)
 
         # Get position evaluation before move
-        before_analysis = self.analyze_position(board, time_limit=0.5)
+        before_analysis = await self.analyze_position(board, time_limit=0.5)
 
         # Apply the move and analyze after
         try:
             chess_move = chess.Move.from_uci(move)
             if chess_move in board.legal_moves:
                 board.push(chess_move)
-                after_analysis = self.analyze_position(board, time_limit=0.5)
+                after_analysis = await self.analyze_position(board, time_limit=0.5)
             else:
                 return {"error": "Illegal move"}
         except ValueError:
             return {"error": "Invalid move format"}
 
         # Calculate evaluation change
-        eval_before = before_analysis.get("evaluation", 0)
-        eval_after = after_analysis.get("evaluation", 0)
+        eval_before = before_analysis.get("evaluation") or 0
+        eval_after = after_analysis.get("evaluation") or 0
 
         return {
             "evaluation": eval_after,
             "evaluation_change": eval_after - eval_before,
-            "best_move": self.get_best_move(board, elo, time_limit=0.5)["best_move"],
+            "best_move": after_analysis.get("best_move"),
             "variations": [move] if board.pseudo_legal_moves else [],
         }
 
-    def __enter__(self) -> StockfishService:
-        """Context manager entry."""
+    async def __aenter__(self) -> StockfishService:
+        """Async context manager entry."""
         return self
 
-    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Context manager exit."""
-        self.close()
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit."""
+        await self.close()
 
 
 # Singleton instance for application-wide use
@@ -375,13 +498,17 @@ def get_stockfish_service() -> StockfishService:
     """Get or create the singleton Stockfish service instance."""
     global _stockfish_service
     if _stockfish_service is None:
-        _stockfish_service = StockfishService()
+        _stockfish_service = StockfishService(
+            stockfish_path=config_service.get("chess.stockfish_path", "stockfish"),
+            max_concurrency=int(config_service.get("chess.stockfish_max_concurrency", 2)),
+            evaluation_cache=get_position_evaluation_cache(),
+        )
     return _stockfish_service
 
 
-def close_stockfish_service() -> None:
+async def close_stockfish_service() -> None:
     """Close the singleton Stockfish service."""
     global _stockfish_service
     if _stockfish_service:
-        _stockfish_service.close()
+        await _stockfish_service.close()
         _stockfish_service = None
@@ -2,6 +2,7 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.agent_version_cache import get_agent_version_cache
 from common.ids import ToolId, UserId
 from common.utils.utils import get_logger
 from shared_db.crud.tool import ToolDAO
@@ -119,6 +120,7 @@ class ToolService:
             tool_id=tool_id,
             obj_in=tool_in,
         )
+        get_agent_version_cache().invalidate_tool(tool_id)
         if updated is None:
             logger.warning(f"Tool {tool_id} not found for user {user_id}")
         return updated
@@ -152,7 +154,9 @@ class ToolService:
         validation_status: ToolValidationStatus,
     ) -> ToolStatusResponse | None:
         """Set the validation status for a tool owned by the user."""
-        return await self.tool_dao.update_status_by_user_and_id(db, user_id=user_id, tool_id=tool_id, validation_status=validation_status)
+        updated = await self.tool_dao.update_status_by_user_and_id(db, user_id=user_id, tool_id=tool_id, validation_status=validation_status)
+        get_agent_version_cache().invalidate_tool(tool_id)
+        return updated
 
     async def delete_tool(
         self,
@@ -173,7 +177,9 @@ class ToolService:
             # Delegate detachment to DAO layer
             _ = await self.tool_dao.detach_from_user_agents(db, user_id=user_id, tool_id=tool_id)
 
-        return await self.tool_dao.delete_by_user_and_id(db, user_id=user_id, tool_id=tool_id)
+        deleted = await self.tool_dao.delete_by_user_and_id(db, user_id=user_id, tool_id=tool_id)
+        get_agent_version_cache().invalidate_tool(tool_id)
+        return deleted
 
     async def clone_tool(
         self,
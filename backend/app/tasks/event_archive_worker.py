@@ -0,0 +1,122 @@
+"""Background worker that archives the events of long-finished games."""
+
+import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+
+from app.service_container import Services
+from common.core.config_service import config_service
+from common.core.request_context import RequestContext
+from common.utils.utils import get_logger
+from shared_db.db import Workload, session_factory
+
+logger = get_logger()
+
+
+class EventArchiveWorker:
+    """Background worker that moves finished games' events out of the hot events table."""
+
+    def __init__(self, check_interval_seconds: float = 3600, archive_after_days: float = 30, batch_size: int = 100) -> None:
+        """Initialize the event archive worker.
+
+        Args:
+            check_interval_seconds: How often to look for games to archive
+            archive_after_days: Days since a game's last update before its events are archived
+            batch_size: Games archived per transaction
+        """
+        self.check_interval_seconds = check_interval_seconds
+        self.archive_after_days = archive_after_days
+        self.batch_size = batch_size
+        self.task: asyncio.Task[None] | None = None
+        self.running = False
+
+    async def start(self) -> None:
+        """Start the background worker."""
+        if self.running:
+            logger.warning("Event archive worker already running")
+            return
+
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+        logger.info("Event archive worker started", check_interval=self.check_interval_seconds, archive_after_days=self.archive_after_days)
+
+    async def stop(self) -> None:
+        """Stop the background worker."""
+        if not self.running:
+            return
+
+        self.running = False
+        if self.task:
+            _ = self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+
+        logger.info("Event archive worker stopped")
+
+    async def _run(self) -> None:
+        """Main worker loop."""
+        while self.running:
+            with RequestContext.context():
+                try:
+                    await self._archive_finished_games()
+                except Exception as e:
+                    logger.exception("Error in event archive worker", exc_info=e)
+
+            await asyncio.sleep(self.check_interval_seconds)
+
+    async def _archive_finished_games(self) -> None:
+        """Archive batches until no eligible game is left."""
+        cutoff_time = datetime.now(UTC) - timedelta(days=self.archive_after_days)
+        game_dao = Services.instance().game_dao
+        while self.running:
+            async with session_factory(Workload.BACKGROUND)() as db:
+                try:
+                    archived = await game_dao.archive_finished_game_events(db, cutoff_time, limit=self.batch_size)
+                    await db.commit()
+                except Exception:
+                    logger.exception("Error archiving game events")
+                    await db.rollback()
+                    raise
+            if archived < self.batch_size:
+                return
+
+
+class EventArchiveWorkerManager:
+    """Manager for the event archive worker singleton."""
+
+    def __init__(self) -> None:
+        """Initialize the worker manager."""
+        self._worker: EventArchiveWorker | None = None
+
+    async def start(self) -> None:
+        """Start the event archive worker if archival is enabled."""
+        if str(config_service.get("games.archive.enabled", "true")).lower() != "true":
+            logger.info("Event archive worker disabled")
+            return
+        if self._worker is None:
+            self._worker = EventArchiveWorker(
+                check_interval_seconds=float(config_service.get("games.archive.interval_s", 3600)),
+                archive_after_days=float(config_service.get("games.archive.after_days", 30)),
+                batch_size=int(config_service.get("games.archive.batch_size", 100)),
+            )
+        await self._worker.start()
+
+    async def stop(self) -> None:
+        """Stop the event archive worker."""
+        if self._worker:
+            await self._worker.stop()
+
+
+# Singleton instance
+_manager = EventArchiveWorkerManager()
+
+
+async def start_event_archive_worker() -> None:
+    """Start the global event archive worker."""
+    await _manager.start()
+
+
+async def stop_event_archive_worker() -> None:
+    """Stop the global event archive worker."""
+    await _manager.stop()
@@ -7,7 +7,7 @@ from datetime import UTC, datetime, timedelta
 from app.service_container import Services
 from common.core.request_context import RequestContext
 from common.utils.utils import get_logger
-from shared_db.db import AsyncSessionLocal
+from shared_db.db import Workload, session_factory
 
 logger = get_logger()
 
@@ -66,7 +66,7 @@ class MatchmakingWorker:
 
     async def _process_timeouts(self) -> None:
         """Process timed out games."""
-        async with AsyncSessionLocal() as db:
+        async with session_factory(Workload.BACKGROUND)() as db:
             try:
                 services = Services.instance()
 
@@ -92,7 +92,7 @@ class MatchmakingWorker:
 
     async def _cleanup_old_games(self) -> None:
         """Clean up old WAITING games that are stuck (older than 10 minutes)."""
-        async with AsyncSessionLocal() as db:
+        async with session_factory(Workload.BACKGROUND)() as db:
             try:
                 game_dao = Services.instance().game_dao
 
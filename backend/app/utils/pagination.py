@@ -0,0 +1,41 @@
+"""Opaque cursors for keyset-paginated game listings."""
+
+import base64
+import binascii
+from datetime import datetime
+
+from pydantic import ValidationError
+
+from common.core.app_error import Errors
+from common.ids import GameId
+from common.utils import JsonModel
+from common.utils.tsid import TSID
+
+# Response header carrying the cursor of the next page for endpoints that return bare lists
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class GameCursor(JsonModel):
+    """Position of the last game of a page, in the listing's sort order."""
+
+    id: int
+    started_at: datetime | None = None
+
+    @property
+    def game_id(self) -> GameId:
+        return GameId(TSID(self.id))
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.to_json().encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "GameCursor":
+        """Parse a cursor returned by a previous page.
+
+        Raises:
+            AppException: Errors.Generic.INVALID_INPUT if the cursor is malformed
+        """
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except (binascii.Error, ValueError, ValidationError) as e:
+            raise Errors.Generic.INVALID_INPUT.create("Invalid pagination cursor", details={"cursor": cursor}) from e
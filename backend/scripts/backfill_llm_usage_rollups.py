@@ -0,0 +1,54 @@
+"""Rebuild the daily LLM usage rollups from the raw llm_usage rows.
+
+Run once after deploying the rollups to cover history, or for a range of days to repair them.
+Each day is rebuilt in its own transaction and rebuilding is idempotent, so the script can be
+re-run or interrupted safely.
+
+Usage:
+    python scripts/backfill_llm_usage_rollups.py [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+# Add backend to path so we can import from app
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import func, select
+
+from shared_db.crud.llm_usage import LLMUsageDAO
+from shared_db.db import Workload, session_factory
+from shared_db.models.llm_usage import LLMUsage
+
+
+async def backfill(start: date | None, end: date | None) -> None:
+    dao = LLMUsageDAO()
+    sessions = session_factory(Workload.BACKGROUND)
+    if start is None:
+        async with sessions() as db:
+            first_call = await db.scalar(select(func.min(LLMUsage.created_at)))
+        if first_call is None:
+            print("No LLM usage recorded yet")
+            return
+        start = first_call.astimezone(UTC).date()
+    end = end or datetime.now(UTC).date()
+
+    day = start
+    while day <= end:
+        async with sessions() as db:
+            rollups = await dao.rebuild_daily_rollups(db, day)
+            await db.commit()
+        print(f"{day}: {rollups} rollup rows")
+        day += timedelta(days=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="First day to rebuild (default: day of the oldest usage row)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last day to rebuild (default: today, UTC)")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.start, args.end))
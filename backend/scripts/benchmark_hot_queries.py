@@ -0,0 +1,98 @@
+"""Compare per-call overhead of the hot DAO queries built per call with select() and as prebuilt statements.
+
+Runs against in-memory SQLite with trivial data, so the difference between the columns is the
+Python side: statement construction, cache key generation and compilation. (GameDAO.get also
+checks the event archive, which the select() baseline does not.)
+
+Usage:
+    python scripts/benchmark_hot_queries.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+# Add backend to path so we can import from app
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from game_api import GameType
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from common.ids import GameId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.game import GameDAO
+from shared_db.crud.user import UserDAO
+from shared_db.db import Base
+from shared_db.models.agent import Agent, AgentVersion
+from shared_db.models.game import Game, GamePlayer
+from shared_db.models.user import User
+
+
+async def _time_per_call(fn: Callable[[], Awaitable[Any]], iterations: int) -> float:
+    for _ in range(min(iterations, 100)):
+        await fn()  # warm the statement caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def _plain_get_version(db: AsyncSession, game_id: GameId) -> int | None:
+    return (await db.execute(select(Game.version).filter(Game.id == game_id))).scalar_one_or_none()
+
+
+async def _plain_get(db: AsyncSession, game_id: GameId) -> Game | None:
+    query = (
+        select(Game)
+        .options(
+            selectinload(Game.game_players).joinedload(GamePlayer.agent_version).joinedload(AgentVersion.agent).joinedload(Agent.statistics),
+            selectinload(Game.game_players).joinedload(GamePlayer.user),
+            selectinload(Game.events),
+        )
+        .filter(Game.id == game_id)
+    )
+    return (await db.execute(query)).scalar_one_or_none()
+
+
+async def _plain_get_user(db: AsyncSession, cognito_sub: str) -> User | None:
+    return (await db.execute(select(User).where(User.cognito_sub == cognito_sub))).scalar_one_or_none()
+
+
+async def main(iterations: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    game_dao, user_dao = GameDAO(), UserDAO()
+    game_id = GameId(TSID.create())
+    async with async_sessionmaker(engine, expire_on_commit=False, autoflush=False)() as db:
+        db.add(Game(id=game_id, game_type=GameType.CHESS, state={}, config={}, requesting_user_id=UserId(TSID.create())))
+        await db.commit()
+
+        cases: list[tuple[str, Callable[[], Awaitable[Any]], Callable[[], Awaitable[Any]]]] = [
+            ("GameDAO.get_version", lambda: _plain_get_version(db, game_id), lambda: game_dao.get_version(db, game_id)),
+            ("GameDAO.get", lambda: _plain_get(db, game_id), lambda: game_dao.get(db, game_id)),
+            ("UserDAO.get_by_cognito_sub", lambda: _plain_get_user(db, "missing"), lambda: user_dao.get_by_cognito_sub(db, "missing")),
+        ]
+
+        print(f"{'query':<28} {'select() us':>12} {'prebuilt us':>12} {'speedup':>8}")
+        for name, per_call, prebuilt in cases:
+            per_call_us = await _time_per_call(per_call, iterations)
+            prebuilt_us = await _time_per_call(prebuilt, iterations)
+            print(f"{name:<28} {per_call_us:>12.1f} {prebuilt_us:>12.1f} {per_call_us / prebuilt_us:>7.2f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
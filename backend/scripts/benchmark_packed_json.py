@@ -0,0 +1,78 @@
+"""Compare stored size and decode time of game states in plain JSON and the packed codec.
+
+Usage:
+    python scripts/benchmark_packed_json.py [--moves N] [--iterations N]
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Add backend to path so we can import from app
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from chess_game.chess_api import ChessConfig, ChessMoveData, ChessState
+from chess_game.chess_env import ChessEnv
+from game_api import EventCollector, PlayerMove
+from texas_holdem.texas_holdem_api import TexasHoldemConfig
+from texas_holdem.texas_holdem_env import TexasHoldemEnv
+
+from common.utils.msgspec import decode_json, encode_json
+from common.utils.tsid import TSID
+from shared_db.types.packed_json import pack_json, unpack_json
+
+
+def _chess_state(moves: int) -> ChessState:
+    env = ChessEnv(ChessConfig(disable_timers=True), None)  # type: ignore[arg-type]
+    state = env.new_game(TSID.create(), EventCollector())
+    for name in ("White", "Black"):
+        env.join_player(state, TSID.create(), EventCollector(), TSID.create(), name)
+    for _ in range(moves):
+        possible = env.calc_possible_moves(state, state.current_player_id)
+        if state.is_finished or not possible or not possible.possible_moves:
+            break
+        move = possible.possible_moves[len(possible.possible_moves) // 2]
+        data = ChessMoveData(from_square=move.from_square, to_square=move.to_square, promotion=move.promotion[0] if move.promotion else None)
+        env.apply_move(state, PlayerMove(player_id=state.current_player_id, data=data), EventCollector())
+    return state
+
+
+def _holdem_state() -> Any:
+    config = TexasHoldemConfig(small_blind=5, big_blind=10, starting_chips=1000, min_players=2, max_players=5)
+    env = TexasHoldemEnv(config, None)  # type: ignore[arg-type]
+    return env.new_game(TSID.create(), EventCollector())
+
+
+def _time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def benchmark(name: str, value: dict[str, Any], iterations: int) -> None:
+    plain = encode_json(value)
+    packed = encode_json(pack_json(value))
+    assert unpack_json(decode_json(packed)) == decode_json(plain)
+
+    plain_us = _time_per_call(lambda: decode_json(plain), iterations)
+    packed_us = _time_per_call(lambda: unpack_json(decode_json(packed)), iterations)
+    print(f"{name:<12} json {len(plain):>7} B {plain_us:>8.1f} us | packed {len(packed):>7} B {packed_us:>8.1f} us | {len(plain) / len(packed):.1f}x smaller")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--moves", type=int, default=40, help="Chess plies to play before measuring")
+    parser.add_argument("--iterations", type=int, default=2000, help="Decode iterations per format")
+    args = parser.parse_args()
+
+    benchmark("chess", _chess_state(args.moves).model_dump(mode="json", by_alias=True), args.iterations)
+    benchmark("texas", _holdem_state().model_dump(mode="json", by_alias=True), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Shared fixtures for the DAO unit tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from shared_db.db import Base
+
+
+async def _session(engine: AsyncEngine) -> AsyncGenerator[AsyncSession]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False, autoflush=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db() -> AsyncGenerator[AsyncSession]:
+    """Session on a fresh in-memory SQLite database with every table created."""
+    async for session in _session(create_async_engine("sqlite+aiosqlite:///:memory:")):
+        yield session
+
+
+@pytest_asyncio.fixture
+async def fk_db() -> AsyncGenerator[AsyncSession]:
+    """Like ``db``, with foreign keys enforced as on PostgreSQL (SQLite ignores them by default)."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enforce_foreign_keys(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    async for session in _session(engine):
+        yield session
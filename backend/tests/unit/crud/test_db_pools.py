@@ -0,0 +1,55 @@
+"""Unit tests for the per-workload connection pools."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from shared_db.db.pools import DbPools, Workload
+
+
+@pytest.mark.asyncio
+async def test_each_workload_has_its_own_instrumented_pool(tmp_path: Path) -> None:
+    pools = DbPools.create(f"sqlite+aiosqlite:///{tmp_path / 'pools.db'}")
+    try:
+        workloads = [workload for workload in Workload if workload is not Workload.READ_ONLY]
+        assert len({id(pools.engine(workload)) for workload in workloads}) == len(workloads)
+
+        async with pools.sessions(Workload.LONG_POLL)() as db:
+            await db.execute(text("SELECT 1"))
+        # Recreating the pool (as dispose() does) keeps its counters
+        await pools.engine(Workload.LONG_POLL).dispose()
+
+        stats = {s.workload: s for s in pools.stats()}
+        assert stats[Workload.LONG_POLL].checkouts == 1
+        assert stats[Workload.LONG_POLL].checked_out == 0
+        assert stats[Workload.LONG_POLL].total_checkout_s > 0
+        assert stats[Workload.API].checkouts == 0
+    finally:
+        await pools.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_only_pool_is_the_api_pool_unless_a_replica_is_given(tmp_path: Path) -> None:
+    url, replica_url = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    pools = DbPools.create(url)
+    try:
+        assert pools.engine(Workload.READ_ONLY) is pools.engine(Workload.API)
+        assert [s.workload for s in pools.stats()].count(Workload.API) == 1
+        assert Workload.READ_ONLY not in {s.workload for s in pools.stats()}
+    finally:
+        await pools.dispose()
+
+    pools = DbPools.create(url, urls={Workload.READ_ONLY: replica_url})
+    try:
+        async with pools.sessions(Workload.READ_ONLY)() as db:
+            await db.execute(text("SELECT 1"))
+
+        assert str(pools.engine(Workload.READ_ONLY).url) == replica_url
+        stats = {s.workload: s for s in pools.stats()}
+        assert stats[Workload.READ_ONLY].checkouts == 1
+        assert stats[Workload.API].checkouts == 0
+    finally:
+        await pools.dispose()
@@ -0,0 +1,31 @@
+"""Unit tests for bulk appends of game events."""
+
+from __future__ import annotations
+
+import pytest
+from chess_game.chess_api import MoveAnalysisEvent
+from game_api import GameType
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.ids import GameId, PlayerId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.game import GameDAO
+from shared_db.models.game import Game
+
+
+@pytest.mark.asyncio
+async def test_events_are_appended_in_order_with_one_insert(db: AsyncSession) -> None:
+    dao = GameDAO()
+    game_id = GameId(TSID.create())
+    # Not flushed yet: the bulk insert must not outrun the game row it references
+    db.add(Game(id=game_id, game_type=GameType.CHESS, state={}, config={}, requesting_user_id=UserId(TSID.create())))
+
+    player_id = PlayerId(TSID.create())
+    events = [MoveAnalysisEvent(turn=turn, round_number=turn, player_id=player_id, move_san=san, narrative="") for turn, san in enumerate(["e4", "Nf3", "Bb5"])]
+    await dao.add_events(db, game_id, events)
+    await dao.add_events_without_bumping_version(db, game_id, [])
+    await db.commit()
+
+    stored = await dao.get_events(db, game_id)
+    assert [row.type for row in stored] == ["MoveAnalysisEvent"] * 3
+    assert [row.data["moveSan"] for row in stored] == ["e4", "Nf3", "Bb5"]
@@ -0,0 +1,42 @@
+"""Unit tests for GameDAO move-analysis deduplication."""
+
+from __future__ import annotations
+
+import pytest
+from chess_game.chess_api import MoveAnalysisEvent
+from game_api import GameType
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.ids import GameId, PlayerId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.game import GameDAO
+from shared_db.models.game import Game, GameEvent
+
+
+async def _create_game(db: AsyncSession) -> GameId:
+    game_id = GameId(TSID.create())
+    db.add(Game(id=game_id, game_type=GameType.CHESS, state={}, config={}, requesting_user_id=UserId(TSID.create())))
+    await db.flush()
+    return game_id
+
+
+def _analysis_event(turn: int) -> MoveAnalysisEvent:
+    return MoveAnalysisEvent(turn=turn, round_number=turn, player_id=PlayerId(TSID.create()), move_san="e4", narrative="Solid.")
+
+
+@pytest.mark.asyncio
+async def test_add_move_analysis_is_idempotent(db: AsyncSession) -> None:
+    dao = GameDAO()
+    game_id = await _create_game(db)
+
+    assert await dao.has_move_analysis(db, game_id, 2) is False
+    assert await dao.add_move_analysis(db, game_id, 2, _analysis_event(2)) is True
+    assert await dao.add_move_analysis(db, game_id, 2, _analysis_event(2)) is False
+    await db.commit()
+
+    assert await dao.has_move_analysis(db, game_id, 2) is True
+    assert await dao.has_move_analysis(db, game_id, 3) is False
+
+    event_count = await db.scalar(select(func.count(GameEvent.id)).where(GameEvent.game_id == game_id))
+    assert event_count == 1
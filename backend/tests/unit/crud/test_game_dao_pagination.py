@@ -0,0 +1,59 @@
+"""Unit tests for keyset pagination of game listings."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from game_api import GameType
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.pagination import GameCursor
+from common.core.app_error import AppException
+from common.ids import GameId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.game import GameDAO
+from shared_db.models.game import Game, MatchmakingStatus
+
+
+@pytest.mark.asyncio
+async def test_discoverable_games_pages_cover_every_game_once(db: AsyncSession) -> None:
+    dao = GameDAO()
+    user_id = UserId(TSID.create())
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    # Ties on started_at and never-started games are the cases offset-free paging has to get right
+    started = [start, start, start + timedelta(minutes=1), None, None, start + timedelta(minutes=2)]
+    for started_at in started:
+        db.add(
+            Game(
+                id=GameId(TSID.create()),
+                game_type=GameType.CHESS,
+                state={},
+                config={},
+                requesting_user_id=user_id,
+                matchmaking_status=MatchmakingStatus.FINISHED,
+                started_at=started_at,
+            )
+        )
+    await db.commit()
+
+    seen: list[GameId] = []
+    cursor: str | None = None
+    while True:
+        page = GameCursor.decode(cursor) if cursor else None
+        games = await dao.find_discoverable_games(
+            db, [MatchmakingStatus.FINISHED], [GameType.CHESS], limit=2, before=(page.started_at, page.game_id) if page else None
+        )
+        seen += [game.id for game in games]
+        if len(games) < 2:
+            break
+        cursor = GameCursor(id=games[-1].id.number, started_at=games[-1].started_at).encode()
+
+    everything = await dao.find_discoverable_games(db, [MatchmakingStatus.FINISHED], [GameType.CHESS], limit=100)
+    assert seen == [game.id for game in everything]
+    assert len(seen) == len(started)
+
+
+def test_malformed_cursor_is_rejected() -> None:
+    with pytest.raises(AppException):
+        GameCursor.decode("not-a-cursor")
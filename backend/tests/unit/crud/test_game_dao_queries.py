@@ -0,0 +1,41 @@
+"""Unit tests for the prebuilt hot-path game queries."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from game_api import GameType
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.ids import GameId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.game import GameDAO
+from shared_db.models.game import Game, MatchmakingStatus
+
+
+@pytest.mark.asyncio
+async def test_prebuilt_statements_bind_per_call_values(db: AsyncSession) -> None:
+    dao = GameDAO()
+    now = datetime.now(UTC)
+    games = [
+        Game(
+            id=GameId(TSID.create()),
+            game_type=GameType.CHESS,
+            state={},
+            config={},
+            requesting_user_id=UserId(TSID.create()),
+            version=version,
+            matchmaking_status=MatchmakingStatus.WAITING,
+            waiting_deadline=now + timedelta(minutes=minutes),
+        )
+        for version, minutes in ((1, -5), (2, 5))
+    ]
+    db.add_all(games)
+    await db.commit()
+
+    assert [await dao.get_version(db, game.id) for game in games] == [1, 2]
+    assert await dao.get_version(db, GameId(TSID.create())) is None
+    assert (await dao.get(db, games[1].id, version=2)) is games[1]
+    assert await dao.get(db, games[1].id, version=1) is None
+    assert [game.id for game in await dao.find_timed_out_games(db)] == [games[0].id]
@@ -0,0 +1,79 @@
+"""Unit tests for archiving finished games' events."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from chess_game.chess_api import MoveAnalysisEvent
+from game_api import GameType
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.ids import GameId, PlayerId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.game import GameDAO
+from shared_db.models.game import Game, GameEvent, MatchmakingStatus
+
+
+def _events(*moves: str) -> list[MoveAnalysisEvent]:
+    player_id = PlayerId(TSID.create())
+    return [MoveAnalysisEvent(turn=turn, round_number=turn, player_id=player_id, move_san=san, narrative="") for turn, san in enumerate(moves)]
+
+
+async def _finished_game(db: AsyncSession) -> GameId:
+    game_id = GameId(TSID.create())
+    user_id = UserId(TSID.create())
+    db.add(Game(id=game_id, game_type=GameType.CHESS, state={}, config={}, requesting_user_id=user_id, matchmaking_status=MatchmakingStatus.FINISHED))
+    return game_id
+
+
+@pytest.mark.asyncio
+async def test_archived_events_are_read_back_transparently(db: AsyncSession) -> None:
+    dao = GameDAO()
+    game_id = await _finished_game(db)
+    await dao.add_events(db, game_id, _events("e4", "e5"))
+    await db.commit()
+    cutoff = datetime.now(UTC) + timedelta(days=1)
+
+    assert await dao.archive_finished_game_events(db, cutoff) == 1
+    await db.commit()
+    assert await db.scalar(select(func.count(GameEvent.id))) == 0
+
+    # A late event lands in the hot table and is merged with the archive on read and on the next run
+    await dao.add_events(db, game_id, _events("Nf3"))
+    await db.commit()
+    db.expunge_all()
+
+    game = await dao.get(db, game_id)
+    assert game is not None
+    assert [event.data["moveSan"] for event in game.events] == ["e4", "e5", "Nf3"]
+    assert [event.data["moveSan"] for event in await dao.get_events_by_type(db, game_id, "MoveAnalysisEvent")] == ["e4", "e5", "Nf3"]
+
+    assert await dao.archive_finished_game_events(db, cutoff) == 1
+    await db.commit()
+    assert [event.data["moveSan"] for event in await dao.get_events(db, game_id)] == ["e4", "e5", "Nf3"]
+    assert await dao.archive_finished_game_events(db, cutoff) == 0
+
+
+@pytest.mark.asyncio
+async def test_events_written_after_the_read_are_not_deleted(db: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    dao = GameDAO()
+    game_id = await _finished_game(db)
+    await dao.add_events(db, game_id, _events("e4"))
+    await db.commit()
+
+    flush = db.flush
+
+    async def flush_with_late_event() -> None:
+        # Stands in for an event committed by another worker between the read and the delete
+        monkeypatch.setattr(db, "flush", flush)
+        await dao.add_events(db, game_id, _events("e5"))
+        await flush()
+
+    monkeypatch.setattr(db, "flush", flush_with_late_event)
+    assert await dao.archive_finished_game_events(db, datetime.now(UTC) + timedelta(days=1)) == 1
+    await db.commit()
+
+    assert [event.data["moveSan"] for event in await db.scalars(select(GameEvent))] == ["e5"]
+    assert [event.data["moveSan"] for event in await dao.get_events(db, game_id)] == ["e4", "e5"]
@@ -0,0 +1,31 @@
+"""Unit tests for per-game processing leases."""
+
+from __future__ import annotations
+
+import pytest
+
+from common.core.app_error import AppException, Errors
+from common.ids import GameId
+from common.utils.tsid import TSID
+from shared_db.db.leases import InProcessGameLeases
+
+
+@pytest.mark.asyncio
+async def test_in_process_lease_is_exclusive_and_released_on_error() -> None:
+    leases = InProcessGameLeases()
+    game_id = GameId(TSID.create())
+
+    with pytest.raises(RuntimeError):
+        async with leases.hold(game_id):
+            with pytest.raises(AppException) as exc_info:
+                async with leases.hold(game_id):
+                    pass
+            assert exc_info.value.details.code == Errors.Game.ALREADY_PROCESSING.code
+
+            # Other games are unaffected
+            async with leases.hold(GameId(TSID.create())):
+                pass
+            raise RuntimeError("turn failed")
+
+    async with leases.hold(game_id):
+        pass
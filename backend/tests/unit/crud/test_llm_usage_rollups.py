@@ -0,0 +1,115 @@
+"""Unit tests for the daily LLM usage rollups behind the cost summaries."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.ids import AgentId, AgentVersionId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.llm_usage import LLMUsageDAO
+from shared_db.models.agent import Agent, AgentVersion
+from shared_db.models.llm_enums import LLMUsageScenario
+from shared_db.models.llm_usage import LLMUsage, LLMUsageDailyRollup
+from shared_db.models.user import User
+from shared_db.schemas.llm_usage import LLMUsageCreate
+
+
+def _usage(user_id: UserId, scenario: LLMUsageScenario, model: str, cost: float, agent_version_id: AgentVersionId | None = None) -> LLMUsageCreate:
+    return LLMUsageCreate(
+        user_id=user_id,
+        agent_version_id=agent_version_id,
+        scenario=scenario,
+        provider="openai",
+        model_used=model,
+        cost_usd=cost,
+        input_tokens=90,
+        output_tokens=10,
+        total_tokens=100,
+        execution_time_ms=200,
+        input_prompt="prompt",
+        output_response="response",
+    )
+
+
+@pytest.mark.asyncio
+async def test_summaries_are_answered_from_rollups_and_rebuildable(db: AsyncSession) -> None:
+    dao = LLMUsageDAO()
+    user_id, agent_id = UserId(TSID.create()), AgentId(TSID.create())
+    versions = [AgentVersionId(TSID.create()), AgentVersionId(TSID.create())]
+    for number, version_id in enumerate(versions, 1):
+        db.add(
+            AgentVersion(
+                id=version_id,
+                agent_id=agent_id,
+                user_id=user_id,
+                version_number=number,
+                system_prompt="",
+                slow_llm_provider="openai",
+                fast_llm_provider="openai",
+            )
+        )
+    await db.flush()
+
+    move = LLMUsageScenario.AGENT_MOVE
+    _ = await dao.create_many(db, [_usage(user_id, move, "gpt-4o", 0.25, versions[0]), _usage(user_id, move, "gpt-4o", 0.25, versions[0])])
+    _ = await dao.create_many(db, [_usage(user_id, move, "gpt-4o-mini", 0.5, versions[1]), _usage(user_id, LLMUsageScenario.TOOL_GENERATION, "gpt-4o", 1.0)])
+    await db.commit()
+
+    async def summaries() -> tuple[object, ...]:
+        return (
+            await dao.get_agent_cost_summary(db, agent_id),
+            await dao.get_cost_summary(db, user_id=user_id),
+            await dao.get_stats(db, agent_version_id=versions[0]),
+        )
+
+    agent_summary, user_summary, version_stats = await summaries()
+    assert (agent_summary.total_calls, agent_summary.total_cost, agent_summary.avg_cost_per_call) == (3, 1.0, pytest.approx(1 / 3))
+    assert agent_summary.by_scenario == [{"scenario": "agent_move", "count": 3, "total_cost": 1.0, "total_tokens": 300}]
+    assert (user_summary.overall_stats.total_calls, user_summary.overall_stats.total_cost_usd) == (4, 2.0)
+    assert {entry.scenario: entry.stats.total_calls for entry in user_summary.by_scenario} == {move: 3, LLMUsageScenario.TOOL_GENERATION: 1}
+    assert {entry.model_used: entry.stats.total_cost_usd for entry in user_summary.by_model} == {"gpt-4o": 1.5, "gpt-4o-mini": 0.5}
+    assert (version_stats.total_calls, version_stats.average_execution_time_ms) == (2, 200.0)
+
+    # Rebuilding the day from the raw rows reproduces the incrementally maintained rollups
+    _ = await db.execute(delete(LLMUsageDailyRollup))
+    assert await dao.rebuild_daily_rollups(db, datetime.now(UTC).date()) == 3
+    await db.commit()
+    assert await summaries() == (agent_summary, user_summary, version_stats)
+
+
+@pytest.mark.asyncio
+async def test_buffered_usage_keeps_the_time_of_the_call(db: AsyncSession) -> None:
+    dao = LLMUsageDAO()
+    # Made just before midnight, written by the recorder after it
+    called_at = datetime.combine(datetime.now(UTC).date(), datetime.min.time(), tzinfo=UTC) - timedelta(seconds=1)
+    usage = _usage(UserId(TSID.create()), LLMUsageScenario.AGENT_MOVE, "gpt-4o", 0.25).model_copy(update={"created_at": called_at})
+
+    [usage_id] = await dao.create_many(db, [usage])
+    await db.commit()
+
+    assert (await db.get_one(LLMUsage, usage_id)).created_at == called_at
+    assert list(await db.scalars(select(LLMUsageDailyRollup.day))) == [called_at.date()]
+
+
+@pytest.mark.asyncio
+async def test_versions_with_rolled_up_usage_can_be_deleted(fk_db: AsyncSession) -> None:
+    dao = LLMUsageDAO()
+    user = User(id=UserId(TSID.create()), username="player", email="player@example.com")
+    agent = Agent(user=user, name="Agent", game_environment="chess")
+    version = AgentVersion(agent=agent, user_id=user.id, version_number=1, system_prompt="", slow_llm_provider="openai", fast_llm_provider="openai")
+    fk_db.add(version)
+    await fk_db.flush()
+    _ = await dao.create_many(fk_db, [_usage(user.id, LLMUsageScenario.AGENT_MOVE, "gpt-4o", 0.25, version.id)])
+    await fk_db.commit()
+
+    # As AgentVersionDAO.create does with the oldest of more than 10 versions
+    await fk_db.delete(version)
+    await fk_db.commit()
+
+    # The usage loses its version; the rollups keep counting it against the agent
+    assert await fk_db.scalar(select(LLMUsage.agent_version_id)) is None
+    assert (await dao.get_agent_cost_summary(fk_db, agent.id)).total_cost == 0.25
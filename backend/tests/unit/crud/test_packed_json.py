@@ -0,0 +1,47 @@
+"""Unit tests for the msgpack+zstd JSON column codec."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from pydantic import BaseModel
+
+from shared_db.types.packed_json import CODEC_MSGPACK_ZSTD_V1, CODEC_TAG, PackedJSON, unpack_json
+from shared_db.types.pydantic_column import PydanticType
+
+STATE = {"board": [[{"type": "pawn", "color": "white"}] * 8] * 8, "sideToMove": "white", "updatedAt": datetime(2025, 1, 1, tzinfo=UTC)}
+
+
+def test_packed_values_decode_to_what_the_json_column_returned() -> None:
+    column = PackedJSON(enabled=True, min_bytes=0)
+
+    stored = column.process_bind_param(STATE, None)
+
+    assert stored[CODEC_TAG] == CODEC_MSGPACK_ZSTD_V1
+    # Datetimes come back as the ISO strings plain JSON would have stored
+    assert column.process_result_value(stored, None) == {**STATE, "updatedAt": "2025-01-01T00:00:00Z"}
+
+
+def test_legacy_and_small_values_stay_plain_json() -> None:
+    column = PackedJSON(enabled=True, min_bytes=512)
+
+    assert column.process_bind_param({"turn": 1}, None) == {"turn": 1}
+    assert column.process_result_value({"turn": 1}, None) == {"turn": 1}
+    assert PackedJSON(enabled=False).process_bind_param(STATE, None) is STATE
+
+    with pytest.raises(ValueError, match="Unknown JSON column codec"):
+        unpack_json({CODEC_TAG: "brotli/9", "data": ""})
+
+
+class Turn(BaseModel):
+    turn: int
+
+
+def test_packed_pydantic_columns_honour_min_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("shared_db.types.pydantic_column.packed_json_enabled", lambda: True)
+
+    assert PydanticType(Turn, packed=True, min_bytes=512).process_bind_param(Turn(turn=1), None) == {"turn": 1}
+    stored = PydanticType(Turn, packed=True, min_bytes=0, level=19).process_bind_param(Turn(turn=1), None)
+    assert stored[CODEC_TAG] == CODEC_MSGPACK_ZSTD_V1
+    assert PydanticType(Turn, packed=True).process_result_value(stored, None) == Turn(turn=1)
@@ -0,0 +1,49 @@
+"""Unit tests for compaction of the in-turn agent conversation."""
+
+import json
+
+from app.services.agent_execution_service import AgentExecutionService
+from common.core.litellm_schemas import ChatMessage, MessageRole
+from common.core.litellm_service import LiteLLMService
+
+
+def _feedback(error: str) -> ChatMessage:
+    content = f"SYSTEM FEEDBACK: The previous move attempt failed with error: {error}. Please analyze the error and provide a valid move or tool call."
+    return ChatMessage(role=MessageRole.USER, content=content)
+
+
+def _move(action: str) -> ChatMessage:
+    return ChatMessage(role=MessageRole.ASSISTANT, content=json.dumps({"reasoning": "r" * 2000, "move": {"action": action}}))
+
+
+def test_earlier_failed_attempts_collapse_into_summaries() -> None:
+    service = AgentExecutionService(LiteLLMService())
+    system = ChatMessage(role=MessageRole.SYSTEM, content="prompt")
+    messages = [system, _move("check"), _feedback("Cannot check"), _move("raise"), _feedback("Raise requires an amount"), _move("bet"), _feedback("Unknown")]
+
+    compacted = service._compact_history(messages)
+
+    assert compacted[0] is system
+    assert compacted[-2:] == messages[-2:]
+    summary = compacted[1].content
+    assert json.loads(summary[summary.index("[") :]) == [
+        {"error": "Cannot check", "move": {"action": "check"}},
+        {"error": "Raise requires an amount", "move": {"action": "raise"}},
+    ]
+
+    # A later compaction extends the existing summary instead of nesting it
+    compacted = service._compact_history([*compacted, _move("call"), _feedback("Not your turn")])
+    assert len(compacted) == 4
+    assert [entry["error"] for entry in json.loads(compacted[1].content[compacted[1].content.index("[") :])] == ["Cannot check", "Raise requires an amount", "Unknown"]
+
+
+def test_history_is_trimmed_to_the_token_budget() -> None:
+    service = AgentExecutionService(LiteLLMService(), history_token_budget=1000)
+    tool_result = ChatMessage(role=MessageRole.USER, content="Tool 'odds' result: " + "x" * 5000)
+    messages = [ChatMessage(role=MessageRole.SYSTEM, content="prompt"), _move("call"), tool_result, _move("call"), tool_result]
+
+    compacted = service._compact_history(messages)
+
+    assert compacted[0].role == MessageRole.SYSTEM
+    assert compacted[-1] is tool_result
+    assert sum(len(msg.content) for msg in compacted[:-1]) < 4000
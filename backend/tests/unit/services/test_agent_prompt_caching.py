@@ -0,0 +1,88 @@
+"""Unit tests for prompt-prefix caching and precompiled templates of agent system prompts."""
+
+from typing import Any
+
+from chess_game.chess_api import ChessStateView
+from chess_game.chess_env import ChessEnvTypes
+
+from app.services.agent_execution_service import AgentExecutionService
+from common.core.litellm_schemas import ChatMessage, MessageRole
+from common.core.litellm_service import LiteLLMService
+from common.utils.prompt_template import compile_prompt_template
+from shared_db.schemas.agent import AgentVersionResponse
+
+
+def _agent(**overrides: Any) -> AgentVersionResponse:
+    fields: dict[str, Any] = {"id": 1, "system_prompt": "Play solid chess.", "conversation_instructions": None, "exit_criteria": None}
+    return AgentVersionResponse.model_construct(**(fields | overrides))
+
+
+def test_prompt_prefix_is_rendered_once_per_agent_version() -> None:
+    service = AgentExecutionService(LiteLLMService(), prompt_prefix_cache_size=1)
+    prefix = service._get_prompt_prefix(_agent(), ChessEnvTypes, [], "Play solid chess.", conversation_instructions=None, exit_criteria=None)
+
+    assert prefix.endswith("[AGENT INSTRUCTIONS]\nPlay solid chess.")
+    assert service._get_prompt_prefix(_agent(), ChessEnvTypes, [], "Play solid chess.", conversation_instructions=None, exit_criteria=None) is prefix
+
+    # A different version evicts the only entry
+    service._get_prompt_prefix(_agent(id=2), ChessEnvTypes, [], "Play solid chess.", conversation_instructions=None, exit_criteria=None)
+    assert service._get_prompt_prefix(_agent(), ChessEnvTypes, [], "Play solid chess.", conversation_instructions=None, exit_criteria=None) is not prefix
+
+
+def test_cache_breakpoint_only_sent_to_providers_that_need_it() -> None:
+    service = LiteLLMService()
+    message = ChatMessage(role=MessageRole.SYSTEM, content="stable|volatile", cacheable_prefix_length=len("stable|"))
+    messages = service._prepare_messages([message, ChatMessage(role=MessageRole.USER, content="go")])
+
+    anthropic = service._build_request_params("anthropic/claude-sonnet-4-5", messages, api_key="key")
+    assert anthropic["messages"][0]["content"] == [
+        {"type": "text", "text": "stable|", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "volatile"},
+    ]
+
+    openai = service._build_request_params("gpt-4o", messages, api_key="key")
+    assert openai["messages"][0]["content"] == "stable|volatile"
+
+
+def _view() -> ChessStateView:
+    return ChessStateView.model_validate(
+        {
+            "board": {"e1": {"type": "king", "color": "white"}},
+            "sideToMove": "white",
+            "castlingRights": {},
+            "halfmoveClock": 0,
+            "fullmoveNumber": 3,
+            "players": [1, 2],
+            "capturedPieces": {"white": ["pawn"], "black": []},
+        }
+    )
+
+
+def test_templated_conversation_and_exit_instructions_are_rendered_after_the_prefix() -> None:
+    service = AgentExecutionService(LiteLLMService())
+    agent = _agent(conversation_instructions="Greet on move ${{fullmoveNumber}}.", exit_criteria="Resign when down a queen.")
+
+    prompt = service._prepare_prompt(agent, ChessEnvTypes, _view(), None, [])
+
+    assert "[EXIT CRITERIA]\nResign when down a queen." in prompt.stable_prefix
+    assert "CONVERSATION INSTRUCTIONS" not in prompt.stable_prefix
+    assert prompt.volatile_suffix.startswith("\n\n[CONVERSATION INSTRUCTIONS]\nGreet on move 3.")
+
+    # The cacheable prefix survives the round trip through the execution context
+    message = ChatMessage(role=MessageRole.SYSTEM, content=prompt.stable_prefix + prompt.volatile_suffix, cacheable_prefix_length=len(prompt.stable_prefix))
+    assert service._convert_to_chat_messages(service._convert_from_chat_messages([message])) == [message]
+
+
+def test_instruction_template_renders_against_player_view() -> None:
+    view = _view()
+    template = compile_prompt_template(
+        "Move ${{fullmoveNumber}} (${{side_to_move}}), king ${{board.e1.type}}, captured ${{capturedPieces.white[0]}}, "
+        "opponent ${{players[1]}}, rights ${{castlingRights}}, unknown ${{enPassantSquare}}"
+    )
+    assert compile_prompt_template(template_text := "Move ${{fullmoveNumber}}") is compile_prompt_template(template_text)
+
+    resolve_root = AgentExecutionService(LiteLLMService())._prompt_variable_resolver(view, possible_moves=None)
+    view_json = view.to_dict(mode="json")
+    assert template.render(resolve_root) == (
+        f"Move 3 (white), king king, captured pawn, opponent {view_json['players'][1]}, rights {view_json['castlingRights']}, unknown ${{enPassantSquare}}"
+    )
@@ -0,0 +1,88 @@
+"""Unit tests for streamed agent decisions with early move commit."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from texas_holdem.texas_holdem_api import TexasHoldemAction, TexasHoldemMoveData, TexasHoldemPossibleMove, TexasHoldemPossibleMoves
+from texas_holdem.texas_holdem_env import TexasHoldemEnvTypes
+
+from app.services.agent_execution_service import AgentExecutionService
+from common.core.app_error import AppException, Errors
+from common.core.litellm_service import LiteLLMService
+from common.enums import LLMProvider
+from common.utils.partial_json import MalformedJsonError, PartialJsonObject
+from shared_db.schemas.llm_integration import LLMIntegrationWithKey
+
+POSSIBLE_MOVES = TexasHoldemPossibleMoves(
+    possible_moves=[TexasHoldemPossibleMove(action=TexasHoldemAction.FOLD), TexasHoldemPossibleMove(action=TexasHoldemAction.CALL)]
+)
+
+
+class StreamingLLM(LiteLLMService):
+    """Streams fixed chunks, stalling after the last one until cancelled."""
+
+    def __init__(self, chunks: list[str], stall: bool = True) -> None:
+        super().__init__()
+        self.chunks = chunks
+        self.stall = stall
+        self.closed = False
+
+    async def stream_chat_completion(self, *args: Any, **kwargs: Any) -> AsyncGenerator[str]:
+        try:
+            for chunk in self.chunks:
+                yield chunk
+            if self.stall:
+                await asyncio.sleep(60)
+        finally:
+            self.closed = True
+
+
+async def _stream(chunks: list[str], stall: bool = True) -> tuple[Any, bool, StreamingLLM]:
+    llm = StreamingLLM(chunks, stall)
+    service = AgentExecutionService(llm, stream_decisions=True, early_commit_grace_s=0.05)
+    integration = LLMIntegrationWithKey.model_construct(provider=LLMProvider.OPENAI, api_key="sk-test")
+    decision, committed_early = await service._stream_decision(integration, "gpt-5-mini", [], TexasHoldemEnvTypes, POSSIBLE_MOVES)
+    return decision, committed_early, llm
+
+
+def test_partial_json_reports_fields_as_they_complete() -> None:
+    partial = PartialJsonObject()
+    assert partial.feed('```json\n{"reasoning": "pot odds {good}", "move": {"action"') == ["reasoning"]
+    assert partial.feed(': "call"}, "chatMessage": "I c\\u00e1') == ["move"]
+    assert partial.pending_string("chatMessage") == "I cá"
+    assert partial.feed('ll"}\n```') == ["chatMessage"]
+    assert partial.complete and partial.value("move") == {"action": "call"}
+
+    with pytest.raises(MalformedJsonError):
+        PartialJsonObject().feed('{"move": None')
+
+
+@pytest.mark.asyncio
+async def test_valid_move_is_committed_without_waiting_for_the_chat_message() -> None:
+    decision, committed_early, llm = await _stream(['{"reasoning": "Cheap to call.", "move": {"action": "call"}', ', "chatMessage": "Let', "'s see"])
+
+    assert committed_early
+    assert decision.move == TexasHoldemMoveData(action=TexasHoldemAction.CALL)
+    assert decision.chat_message == "Let's see"
+    assert llm.closed
+
+
+@pytest.mark.asyncio
+async def test_move_outside_possible_moves_aborts_the_stream() -> None:
+    with pytest.raises(AppException) as exc_info:
+        await _stream(['{"reasoning": "Bluff.", "move": {"action": "raise", "amount": 500}}'])
+
+    assert AppException.is_(exc_info.value, Errors.Agent.INVALID_OUTPUT)
+    assert "not one of the possible moves" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_slightly_malformed_stream_is_repaired_like_a_non_streamed_response() -> None:
+    content = "{'reasoning': 'Cheap to call.', 'move': {'action': 'call'}, 'chatMessage': 'Call.'}"
+    decision, committed_early, _ = await _stream([content[:30], content[30:]], stall=False)
+
+    assert not committed_early
+    assert decision == LiteLLMService().parse_json_output(content, TexasHoldemEnvTypes.agent_decision_type(), "gpt-5-mini")
+    assert decision.move == TexasHoldemMoveData(action=TexasHoldemAction.CALL)
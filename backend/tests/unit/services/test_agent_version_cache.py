@@ -0,0 +1,81 @@
+"""Unit tests for the cross-turn agent version and integration key caches."""
+
+from typing import Any
+
+import pytest
+
+from app.services.agent_version_cache import AgentVersionCache
+from app.services.llm_integration_service import IntegrationKeyCache, LLMIntegrationService
+from common.enums import LLMProvider
+from common.ids import AgentVersionId, LLMIntegrationId, ToolId, UserId
+from shared_db.models.tool import ToolValidationStatus
+from shared_db.schemas.agent import AgentVersionResponse
+from shared_db.schemas.llm_integration import LLMIntegrationResponse, LLMIntegrationWithKey
+from shared_db.schemas.tool import ToolResponse
+
+VERSION_ID = AgentVersionId(1)
+TOOL_ID = ToolId(2)
+USER_ID = UserId(3)
+
+
+class CountingDAO:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def get(self, db: Any, id: AgentVersionId) -> AgentVersionResponse:
+        self.calls += 1
+        return AgentVersionResponse.model_construct(id=id, tool_ids=[TOOL_ID])
+
+    async def get_by_ids(self, db: Any, tool_ids: list[ToolId]) -> list[ToolResponse]:
+        self.calls += 1
+        return [ToolResponse.model_construct(id=TOOL_ID, validation_status=ToolValidationStatus.VALID)]
+
+
+class IntegrationDAO:
+    def __init__(self) -> None:
+        self.api_key = "encrypted-1"
+        self.calls = 0
+
+    async def get_by_user_and_provider(self, db: Any, user_id: UserId, provider: LLMProvider) -> LLMIntegrationResponse:
+        return LLMIntegrationResponse.model_construct(id=LLMIntegrationId(4))
+
+    async def get_with_decrypted_key(self, db: Any, integration_id: LLMIntegrationId) -> LLMIntegrationWithKey:
+        self.calls += 1
+        return LLMIntegrationWithKey.model_construct(id=integration_id, provider=LLMProvider.OPENAI, api_key=self.api_key)
+
+    async def delete_by_id(self, db: Any, integration_id: LLMIntegrationId, user_id: UserId) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_bundles_are_loaded_once_until_a_tool_changes() -> None:
+    cache = AgentVersionCache()
+    dao = CountingDAO()
+
+    first = await cache.get(None, VERSION_ID, dao, dao)  # type: ignore
+    second = await cache.get(None, VERSION_ID, dao, dao)  # type: ignore
+    assert first is second
+    assert first is not None and [t.id for t in first.tools] == [TOOL_ID]
+    assert dao.calls == 2
+
+    cache.invalidate_tool(TOOL_ID)
+    await cache.get(None, VERSION_ID, dao, dao)  # type: ignore
+    assert dao.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_decrypted_keys_are_cached_until_the_integration_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.services.llm_integration_service.decrypt_api_key", lambda key: key.replace("encrypted", "sk"))
+    dao = IntegrationDAO()
+    service = LLMIntegrationService(dao, None, key_cache=IntegrationKeyCache(ttl_seconds=60))  # type: ignore
+
+    for _ in range(2):
+        integration = await service.get_user_integration_by_provider_with_key(None, USER_ID, LLMProvider.OPENAI)  # type: ignore
+        assert integration is not None and integration.api_key == "sk-1"
+    assert dao.calls == 1
+
+    dao.api_key = "encrypted-2"
+    await service.delete_integration(None, LLMIntegrationId(4), USER_ID)  # type: ignore
+    integration = await service.get_user_integration_by_provider_with_key(None, USER_ID, LLMProvider.OPENAI)  # type: ignore
+    assert integration is not None and integration.api_key == "sk-2"
+    assert dao.calls == 2
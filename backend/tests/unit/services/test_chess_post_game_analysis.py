@@ -0,0 +1,124 @@
+"""Unit tests for ChessAnalysisService.analyze_game (post-game analysis mode)."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import chess
+import pytest
+from chess_game.chess_api import MovePlayedEvent
+
+from app.services.chess_analysis_service import ChessAnalysisService, MoveNarrative, MoveNarrativeBatch, NarrativeRequest, StockfishAnalysisResult
+from app.services.move_narrative_cache import MoveNarrativeCache
+from common.core.litellm_service import LiteLLMResponse
+from common.ids import GameId, PlayerId, UserId
+from common.utils.tsid import TSID
+
+
+def _move_events(moves: list[tuple[str, str]]) -> list[MagicMock]:
+    white, black = PlayerId(TSID.create()), PlayerId(TSID.create())
+    events = []
+    for turn, (from_square, to_square) in enumerate(moves, start=1):
+        event = MovePlayedEvent(turn=turn, player_id=white if turn % 2 else black, from_square=from_square, to_square=to_square)
+        events.append(MagicMock(data=event.to_dict(mode="json")))
+    return events
+
+
+def _service(game_dao: MagicMock, stockfish_service: MagicMock) -> ChessAnalysisService:
+    llm_integration_service = MagicMock()
+    llm_integration_service.get_user_default_integration = AsyncMock(return_value=None)
+    return ChessAnalysisService(
+        litellm_service=MagicMock(),
+        game_dao=game_dao,
+        llm_integration_service=llm_integration_service,
+        stockfish_service=stockfish_service,
+        narrative_batch_size=2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_analyze_game_skips_analyzed_moves_and_releases_the_session_during_engine_work() -> None:
+    calls: list[str] = []
+    game_dao = MagicMock()
+    game_dao.get_requesting_user_id = AsyncMock(return_value=UserId(TSID.create()))
+    game_dao.get_events_by_type = AsyncMock(return_value=_move_events([("e2", "e4"), ("e7", "e5"), ("g1", "f3")]))
+    game_dao.get_analyzed_move_numbers = AsyncMock(return_value={1})
+    game_dao.add_move_analysis = AsyncMock(side_effect=lambda *_: calls.append("store") or True)
+
+    async def analyze_position(board: Any, time_limit: float, depth: int) -> dict[str, Any]:
+        calls.append("engine")
+        return {"evaluation": 30, "mate": None, "best_move": next(iter(board.legal_moves)).uci()}
+
+    stockfish_service = MagicMock()
+    stockfish_service.analyze_position = AsyncMock(side_effect=analyze_position)
+    db = AsyncMock()
+    db.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+
+    await _service(game_dao, stockfish_service).analyze_game(db, GameId(TSID.create()))
+
+    stored_turns = [call.args[2] for call in game_dao.add_move_analysis.await_args_list]
+    stored_sans = [call.args[3].move_san for call in game_dao.add_move_analysis.await_args_list]
+    assert stored_turns == [2, 3]
+    assert stored_sans == ["e5", "Nf3"]
+    # The job's session is committed before the engine runs and only used again to store the group;
+    # the engine's cache lookups open short sessions of their own
+    assert calls == ["commit", "engine", "engine", "engine", "engine", "store", "store", "commit"]
+    assert all("db" not in call.kwargs for call in stockfish_service.analyze_position.await_args_list)
+
+
+@pytest.mark.asyncio
+async def test_missing_engine_score_leaves_evaluation_unset() -> None:
+    stockfish_service = MagicMock()
+    stockfish_service.analyze_position = AsyncMock(side_effect=[{"evaluation": 30, "mate": None, "best_move": "e2e4"}, {"evaluation": None, "mate": None}])
+    service = _service(MagicMock(), stockfish_service)
+
+    analysis = await service._run_stockfish_analysis(fen_before=chess.STARTING_FEN, fen_after=chess.Board("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1").fen())
+
+    assert (analysis.score_before_cp, analysis.score_cp, analysis.evaluation_change, analysis.best_move_san) == (30, None, None, "e4")
+
+
+@pytest.mark.asyncio
+async def test_analyze_game_skips_games_from_custom_positions() -> None:
+    game_dao = MagicMock()
+    game_dao.get_requesting_user_id = AsyncMock(return_value=UserId(TSID.create()))
+    # e2e5 is not a legal first move from the standard position
+    game_dao.get_events_by_type = AsyncMock(return_value=_move_events([("e2", "e5")]))
+    game_dao.get_analyzed_move_numbers = AsyncMock(return_value=set())
+    game_dao.add_move_analysis = AsyncMock(return_value=True)
+    stockfish_service = MagicMock()
+    stockfish_service.analyze_position = AsyncMock()
+
+    await _service(game_dao, stockfish_service).analyze_game(AsyncMock(), GameId(TSID.create()))
+
+    stockfish_service.analyze_position.assert_not_awaited()
+    game_dao.add_move_analysis.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_grouped_narratives_reuse_cached_text_and_cache_new_text() -> None:
+    dao = MagicMock()
+    dao.get_many = AsyncMock(return_value={})
+    dao.save_many = AsyncMock()
+    cache = MoveNarrativeCache(dao=dao)
+    service = _service(MagicMock(), MagicMock())
+    service.narrative_cache = cache
+    service.litellm_service.chat_completion = AsyncMock(
+        return_value=LiteLLMResponse[MoveNarrativeBatch].model_construct(
+            content=MoveNarrativeBatch(narratives=[MoveNarrative(index=1, narrative="Central."), MoveNarrative(index=2, narrative="Symmetric.")])
+        )
+    )
+    integration = MagicMock(provider="openai", api_key="key")
+    analysis = StockfishAnalysisResult(score_cp=30, evaluation_change=0)
+    moves = [
+        NarrativeRequest(fen_before="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", move_san="e4", analysis=analysis),
+        NarrativeRequest(fen_before="rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1", move_san="e5", analysis=analysis),
+    ]
+
+    assert await service._generate_narratives(AsyncMock(), moves, integration, UserId(TSID.create())) == ["Central.", "Symmetric."]
+    assert len(dao.save_many.await_args.args[1]) == 2
+
+    # Second game through the same line: served from the in-memory layer, no LLM call
+    service.litellm_service.chat_completion.reset_mock()
+    assert await service._generate_narratives(AsyncMock(), moves, integration, UserId(TSID.create())) == ["Central.", "Symmetric."]
+    service.litellm_service.chat_completion.assert_not_awaited()
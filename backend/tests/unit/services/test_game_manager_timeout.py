@@ -13,6 +13,7 @@ from app.services.game_manager import GameManager
 from common.core.app_error import AppException, Errors
 from common.ids import AgentVersionId, GameId, PlayerId, RequestId, UserId
 from common.utils.tsid import TSID
+from shared_db.db.leases import InProcessGameLeases
 from shared_db.models.game import Game, GamePlayer, MatchmakingStatus
 
 
@@ -83,7 +84,7 @@ class FakeChessEnv:
         return FakeChessEnvTypes
 
     @classmethod
-    def create(cls, config: ChessConfig) -> "FakeChessEnv":
+    def create(cls, config: ChessConfig, _analysis_handler: object = None) -> "FakeChessEnv":
         return cls(config)
 
     def check_timeout(self, state: ChessState, event_collector: EventCollector[BaseGameEvent]) -> bool:
@@ -162,32 +163,35 @@ def _build_game(remaining_ms_current: int) -> tuple[Game, PlayerId, PlayerId, Us
 def _build_manager(game: Game, registry: MagicMock) -> tuple[GameManager, MagicMock, AsyncMock]:
     agent_execution_service = MagicMock()
     game_dao = MagicMock()
-    game_dao.start_processing = AsyncMock(return_value=game)
-    game_dao.finish_processing = AsyncMock(return_value=None)
-    game_dao.set_state = AsyncMock(return_value=None)
+    game_dao.get_for_processing = AsyncMock(return_value=game)
+    game_dao.update_game = AsyncMock(return_value=None)
     game_dao.add_events = AsyncMock(return_value=None)
     game_dao.set_leave_time_for_game = AsyncMock(return_value=None)
-    game_dao.set_status = AsyncMock(return_value=None)
 
     agent_version_dao = MagicMock()
+    agent_statistics_dao = MagicMock()
     tool_dao = MagicMock()
     llm_integration_service = MagicMock()
     agent_runner = MagicMock()
     scoring_service = MagicMock()
+    sqs_game_analysis_handler = MagicMock()
 
     manager = GameManager(
         registry=registry,
         agent_execution_service=agent_execution_service,
         game_dao=game_dao,
         agent_version_dao=agent_version_dao,
+        agent_statistics_dao=agent_statistics_dao,
         tool_dao=tool_dao,
         llm_integration_service=llm_integration_service,
         agent_runner=agent_runner,
         scoring_service=scoring_service,
+        sqs_game_analysis_handler=sqs_game_analysis_handler,
+        game_leases=InProcessGameLeases(),
     )
-    rating_mock = AsyncMock(return_value=None)
-    manager._update_ratings_for_finished_game = rating_mock  # type: ignore[method-assign]
-    return manager, game_dao, rating_mock
+    on_finished_mock = AsyncMock(return_value=None)
+    manager.on_game_finished = on_finished_mock  # type: ignore[method-assign]
+    return manager, game_dao, on_finished_mock
 
 
 @pytest.mark.asyncio
@@ -196,7 +200,7 @@ async def test_finalize_timeout_marks_game_finished() -> None:
     registry.get.return_value = FakeChessEnv
 
     game, current_pid, other_pid, requesting_user = _build_game(remaining_ms_current=0)
-    manager, game_dao, rating_mock = _build_manager(game, registry)
+    manager, game_dao, on_finished_mock = _build_manager(game, registry)
 
     db = MagicMock()
     db.commit = AsyncMock(return_value=None)
@@ -216,13 +220,12 @@ async def test_finalize_timeout_marks_game_finished() -> None:
     assert result_state.draw_reason == DrawReason.TIME
     assert events == []
 
-    assert game_dao.set_state.await_count == 1
+    game_dao.update_game.assert_awaited_once_with(db, game)
+    assert game.matchmaking_status == MatchmakingStatus.FINISHED
     game_dao.set_leave_time_for_game.assert_awaited_once_with(db, game.id)
-    game_dao.set_status.assert_awaited_once_with(db, game.id, MatchmakingStatus.FINISHED)
     game_dao.add_events.assert_not_awaited()
-    game_dao.finish_processing.assert_awaited_once()
     db.commit.assert_awaited_once()
-    rating_mock.assert_awaited_once()
+    on_finished_mock.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -231,7 +234,7 @@ async def test_finalize_timeout_rejects_when_time_remaining() -> None:
     registry.get.return_value = FakeChessEnv
 
     game, current_pid, _other_pid, requesting_user = _build_game(remaining_ms_current=5000)
-    manager, game_dao, rating_mock = _build_manager(game, registry)
+    manager, game_dao, on_finished_mock = _build_manager(game, registry)
 
     db = MagicMock()
     db.commit = AsyncMock(return_value=None)
@@ -249,10 +252,9 @@ async def test_finalize_timeout_rejects_when_time_remaining() -> None:
     assert exc_info.value.details.code == Errors.Generic.INVALID_INPUT.code
     assert exc_info.value.details.scope == Errors.Generic.INVALID_INPUT.scope
 
-    game_dao.set_state.assert_not_called()
+    game_dao.update_game.assert_not_called()
     game_dao.add_events.assert_not_called()
     game_dao.set_leave_time_for_game.assert_not_called()
-    game_dao.set_status.assert_not_called()
-    game_dao.finish_processing.assert_awaited_once()
-    db.commit.assert_awaited_once()
-    rating_mock.assert_not_called()
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_awaited()
+    on_finished_mock.assert_not_called()
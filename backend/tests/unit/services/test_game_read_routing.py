@@ -0,0 +1,61 @@
+"""Unit tests for bounded-staleness game reads from the read replica."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from game_api import GameType
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.services.game_service import GameService
+from common.ids import GameId, UserId
+from common.utils.tsid import TSID
+from shared_db.crud.game import GameDAO
+from shared_db.db import Base
+from shared_db.models.game import Game
+
+
+async def _sessions() -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+
+@pytest_asyncio.fixture
+async def primary_and_replica() -> AsyncGenerator[tuple[async_sessionmaker[AsyncSession], async_sessionmaker[AsyncSession]]]:
+    primary, replica = await _sessions(), await _sessions()
+    yield primary, replica
+    for sessions in (primary, replica):
+        await sessions.kw["bind"].dispose()
+
+
+async def _add_game(sessions: async_sessionmaker[AsyncSession], game_id: GameId, version: int) -> None:
+    async with sessions() as db:
+        db.add(Game(id=game_id, game_type=GameType.CHESS, state={}, config={}, requesting_user_id=UserId(TSID.create()), version=version))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(
+    primary_and_replica: tuple[async_sessionmaker[AsyncSession], async_sessionmaker[AsyncSession]],
+) -> None:
+    primary, replica = primary_and_replica
+    service = GameService(GameDAO(), primary_sessions=primary)
+    game_id, new_game_id = GameId(TSID.create()), GameId(TSID.create())
+    await _add_game(primary, game_id, version=3)
+    await _add_game(replica, game_id, version=2)
+    await _add_game(primary, new_game_id, version=0)
+
+    async with replica() as read_db:
+        fresh_enough = await service.get_game_for_read(read_db, game_id, min_version=2)
+        behind = await service.get_game_for_read(read_db, game_id, min_version=3)
+        not_replicated = await service.get_game_for_read(read_db, new_game_id)
+        missing = await service.get_game_for_read(read_db, GameId(TSID.create()))
+
+    assert fresh_enough is not None and fresh_enough.version == 2
+    assert behind is not None and behind.version == 3
+    assert not_replicated is not None and not_replicated.id == new_game_id
+    assert missing is None
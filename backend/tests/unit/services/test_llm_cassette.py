@@ -0,0 +1,79 @@
+"""Unit tests for LLM record/replay cassettes."""
+
+from pathlib import Path
+from typing import Any
+
+import litellm
+import pytest
+
+from common.core import litellm_service as litellm_service_module
+from common.core.app_error import AppException, Errors
+from common.core.litellm_schemas import ChatMessage, MessageRole
+from common.core.litellm_service import LiteLLMService
+from common.core.llm_cassette import CassetteMode, CassetteSettings, LLMCassette
+from common.enums import LLMProvider
+from shared_db.models.llm_enums import OpenAIModel
+
+
+def _service(tmp_path: Path, mode: CassetteMode) -> LiteLLMService:
+    return LiteLLMService(cassette=LLMCassette(CassetteSettings(mode=mode, path=str(tmp_path))))
+
+
+@pytest.mark.asyncio
+async def test_recorded_completions_replay_without_the_provider(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def live_acompletion(**params: Any) -> Any:
+        return litellm.ModelResponse(
+            choices=[{"index": 0, "message": {"role": "assistant", "content": "e2e4"}, "finish_reason": "stop"}],
+            model=params["model"],
+            usage={"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        )
+
+    messages = [ChatMessage(role=MessageRole.USER, content="Your move")]
+    monkeypatch.setattr(litellm_service_module, "acompletion", live_acompletion)
+    recorded = await _service(tmp_path, CassetteMode.RECORD).chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-live", output_type=str)
+
+    async def offline_acompletion(**params: Any) -> Any:
+        raise AssertionError("replay must not reach the provider")
+
+    monkeypatch.setattr(litellm_service_module, "acompletion", offline_acompletion)
+    replay = _service(tmp_path, CassetteMode.REPLAY)
+    # Credentials are not part of the key
+    replayed = await replay.chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-other", output_type=str)
+    assert replayed.content == recorded.content == "e2e4"
+    assert replayed.usage == recorded.usage
+
+    streamed = [chunk async for chunk in replay.stream_chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-other")]
+    assert "".join(streamed) == "e2e4"
+
+    with pytest.raises(AppException) as exc_info:
+        await replay.chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, [ChatMessage(role=MessageRole.USER, content="New prompt")], api_key="", output_type=str)
+    assert AppException.is_(exc_info.value, Errors.Llm.CASSETTE_MISS)
+
+
+def test_lognormal_latency_is_deterministic_for_a_seed() -> None:
+    settings = CassetteSettings(mode=CassetteMode.REPLAY, latency_mean_s=2.0, latency_stddev_s=0.5, seed=7)
+    samples = [LLMCassette(settings)._sample_lognormal() for _ in range(2)]
+
+    assert samples[0] == samples[1]
+    assert 0 < samples[0] < 10
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_early_by_the_consumer_is_still_recorded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def chunks() -> Any:
+        for text in ('{"move": "e2e4"', ', "chatMessage": "Open', 'ing."}'):
+            yield litellm.ModelResponseStream(choices=[{"index": 0, "delta": {"content": text}}])
+
+    async def streaming_acompletion(**params: Any) -> Any:
+        return chunks()
+
+    messages = [ChatMessage(role=MessageRole.USER, content="Your move")]
+    monkeypatch.setattr(litellm_service_module, "acompletion", streaming_acompletion)
+    stream = _service(tmp_path, CassetteMode.RECORD).stream_chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-live")
+    # Early commit: the consumer stops after the move
+    assert await anext(stream) == '{"move": "e2e4"'
+    await stream.aclose()
+
+    replay = _service(tmp_path, CassetteMode.REPLAY)
+    streamed = [chunk async for chunk in replay.stream_chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-other")]
+    assert "".join(streamed) == '{"move": "e2e4"'
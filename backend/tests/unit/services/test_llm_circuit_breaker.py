@@ -0,0 +1,98 @@
+"""Unit tests for LLM circuit breaking and hedged requests."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from common.core import litellm_service as litellm_service_module
+from common.core.app_error import AppException, Errors
+from common.core.litellm_schemas import ChatMessage, MessageRole
+from common.core.litellm_service import LiteLLMService
+from common.core.llm_circuit_breaker import CircuitBreakerSettings, CircuitState, LLMCircuitBreakers
+from common.enums import LLMProvider
+
+
+class ProviderDown(Exception):
+    status_code = 503
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_provider_failures_and_fails_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    async def failing_acompletion(**params: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        raise ProviderDown("upstream unavailable")
+
+    monkeypatch.setattr(litellm_service_module, "acompletion", failing_acompletion)
+    breakers = LLMCircuitBreakers(CircuitBreakerSettings(window_size=4, min_calls=4, open_duration_s=60))
+    service = LiteLLMService(circuit_breakers=breakers)
+    messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+
+    for _ in range(4):
+        with pytest.raises(ProviderDown):
+            await service.chat_completion(LLMProvider.OPENAI, "gpt-4o", messages, api_key="sk-test", output_type=str)
+    assert breakers.get("openai", "gpt-4o").state == CircuitState.OPEN
+
+    with pytest.raises(AppException) as exc_info:
+        await service.chat_completion(LLMProvider.OPENAI, "gpt-4o", messages, api_key="sk-test", output_type=str)
+    assert AppException.is_(exc_info.value, Errors.Llm.PROVIDER_UNAVAILABLE)
+    assert calls == 4
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_first_response_wins() -> None:
+    service = LiteLLMService()
+    primary_cancelled = asyncio.Event()
+
+    async def slow_primary() -> Any:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+        return "primary"
+
+    async def fast_fallback() -> Any:
+        return "fallback"
+
+    result = await service._hedged_completion(slow_primary, fast_fallback, hedge_delay=0.01, provider=LLMProvider.OPENAI, model="gpt-4o")
+
+    assert result == "fallback"
+    await asyncio.sleep(0)  # let the loser observe its cancellation
+    assert primary_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_is_not_taken_while_waiting_for_a_limiter_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def failing_acompletion(**params: Any) -> Any:
+        raise ProviderDown("upstream unavailable")
+
+    monkeypatch.setattr(litellm_service_module, "acompletion", failing_acompletion)
+    breakers = LLMCircuitBreakers(CircuitBreakerSettings(window_size=1, min_calls=1, open_duration_s=0))
+    service = LiteLLMService(circuit_breakers=breakers)
+    messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+    with pytest.raises(ProviderDown):
+        await service.chat_completion(LLMProvider.OPENAI, "gpt-4o", messages, api_key="sk-test", output_type=str)
+    breaker = breakers.get("openai", "gpt-4o")
+    assert breaker.state == CircuitState.OPEN
+
+    class BlockedLimiter:
+        @contextlib.asynccontextmanager
+        async def slot(self, _estimated_tokens: int) -> AsyncIterator[None]:
+            await asyncio.Event().wait()
+            yield
+
+    monkeypatch.setattr(service, "_get_limiter", lambda *_args: BlockedLimiter())
+    call = asyncio.create_task(service.chat_completion(LLMProvider.OPENAI, "gpt-4o", messages, api_key="sk-test", output_type=str))
+    await asyncio.sleep(0.01)
+    _ = call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    # The cancelled call never reached the provider, so the probe is still available
+    assert breaker.allow_request()
@@ -0,0 +1,60 @@
+"""Unit tests for the shared LLM rate limiter."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from common.core import litellm_service as litellm_service_module
+from common.core.litellm_service import LiteLLMService
+from common.core.llm_rate_limiter import LLMRateLimiter, RateLimitSettings
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_per_key_and_model() -> None:
+    limiter = LLMRateLimiter(RateLimitSettings(max_concurrency=2)).get("openai", "gpt-4o", "sk-test")
+    active = 0
+    peak = 0
+
+    async def call() -> None:
+        nonlocal active, peak
+        async with limiter.slot(estimated_tokens=10):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert limiter.stats().requests == 6
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_call_backs_off_and_is_requeued(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakeRateLimitError(Exception):
+        status_code = 429
+        headers = {"retry-after-ms": "10"}
+
+    calls = 0
+
+    async def fake_acompletion(**params: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise FakeRateLimitError("slow down")
+        return SimpleNamespace(usage=SimpleNamespace(total_tokens=42))
+
+    monkeypatch.setattr(litellm_service_module, "acompletion", fake_acompletion)
+    rate_limiter = LLMRateLimiter(RateLimitSettings(max_concurrency=8, tokens_per_minute=10_000))
+    service = LiteLLMService(rate_limiter=rate_limiter, max_throttle_retries=1)
+    limiter = rate_limiter.get("openai", "gpt-4o", "sk-test")
+
+    response = await service._limited_completion(limiter, {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]})
+
+    assert response.usage.total_tokens == 42
+    stats = limiter.stats()
+    assert calls == 2
+    assert stats.throttled == 1
+    assert stats.concurrency_limit == 4
@@ -0,0 +1,70 @@
+"""Unit tests for native structured output in LiteLLMService."""
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from common.core import litellm_service as litellm_service_module
+from common.core.litellm_schemas import ChatMessage, MessageRole
+from common.core.litellm_service import LiteLLMService
+from common.enums import LLMProvider
+from common.utils import JsonModel
+from shared_db.models.llm_enums import OpenAIModel
+
+
+class Decision(JsonModel):
+    move: str
+    chat_message: str | None = None
+
+
+class SchemaRejected(Exception):
+    status_code = 400
+
+
+def _response(content: str) -> Any:
+    message = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], model=OpenAIModel.FAST, usage=None)
+
+
+@pytest.mark.asyncio
+async def test_decision_schema_is_sent_as_response_format(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent: list[dict[str, Any]] = []
+
+    async def fake_acompletion(**params: Any) -> Any:
+        sent.append(params)
+        return _response('{"move": "e2e4", "chatMessage": "hi"}')
+
+    monkeypatch.setattr(litellm_service_module, "acompletion", fake_acompletion)
+    service = LiteLLMService()
+    messages = [ChatMessage(role=MessageRole.USER, content="move")]
+
+    response = await service.chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-test", output_type=Decision)
+
+    assert response.content == Decision(move="e2e4", chat_message="hi")
+    response_format = sent[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "Decision"
+    assert response_format["json_schema"]["schema"] == Decision.model_json_schema()
+
+
+@pytest.mark.asyncio
+async def test_rejected_schema_falls_back_to_repaired_json(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent: list[dict[str, Any]] = []
+
+    async def fake_acompletion(**params: Any) -> Any:
+        sent.append(params)
+        if "response_format" in params:
+            raise SchemaRejected("response_format not supported")
+        return _response('Sure! ```json\n{"move": "e2e4"}\n```')
+
+    monkeypatch.setattr(litellm_service_module, "acompletion", fake_acompletion)
+    service = LiteLLMService()
+    messages = [ChatMessage(role=MessageRole.USER, content="move")]
+
+    for _ in range(2):
+        response = await service.chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-test", output_type=Decision)
+        assert response.content == Decision(move="e2e4")
+
+    # Only the first request carried the schema; the model is remembered as unsupported afterwards
+    assert ["response_format" in params for params in sent] == [True, False, False]
@@ -0,0 +1,185 @@
+"""Unit tests for LLM usage capture and its write-behind recorder."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+from typing import Any
+
+import litellm
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.services.llm_usage_recorder import LLMUsageRecorder
+from common.core import litellm_service as litellm_service_module
+from common.core.app_error import AppException, Errors
+from common.core.litellm_schemas import ChatMessage, MessageRole
+from common.core.litellm_service import LiteLLMService
+from common.core.llm_usage_scope import LLMUsageScope
+from common.enums import LLMProvider
+from common.ids import AgentVersionId, GameId, UserId
+from common.utils import JsonModel
+from common.utils.tsid import TSID
+from shared_db.crud.llm_usage import LLMUsageDAO
+from shared_db.db import Base
+from shared_db.models.llm_enums import LLMUsageScenario, OpenAIModel
+from shared_db.models.llm_usage import LLMUsage, LLMUsageContent
+from shared_db.schemas.llm_usage import LLMUsageCreate
+
+SYSTEM_PREFIX = "You are a chess agent. " * 50
+
+
+class Move(JsonModel):
+    move: str
+
+
+@pytest_asyncio.fixture
+async def sessions() -> AsyncGenerator[async_sessionmaker[AsyncSession]]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    await engine.dispose()
+
+
+def _usage(user_id: UserId, turn: int) -> LLMUsageCreate:
+    return LLMUsageCreate(
+        user_id=user_id,
+        agent_version_id=AgentVersionId(TSID.create()),
+        scenario=LLMUsageScenario.AGENT_MOVE,
+        model_used="gpt-4o-mini",
+        cost_usd=0.001,
+        input_tokens=100,
+        output_tokens=10,
+        total_tokens=110,
+        execution_time_ms=250,
+        input_prompt=[SYSTEM_PREFIX, f"Turn {turn}\n\n"],
+        output_response=f'{{"move": "{turn}"}}',
+    )
+
+
+@pytest.mark.asyncio
+async def test_completions_are_recorded_only_inside_a_scope(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_acompletion(**_params: Any) -> Any:
+        message = SimpleNamespace(content="e2e4", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], model=OpenAIModel.FAST, usage=None)
+
+    monkeypatch.setattr(litellm_service_module, "acompletion", fake_acompletion)
+    recorded: list[LLMUsageCreate] = []
+    service = LiteLLMService(usage_sink=recorded.append)
+    messages = [
+        ChatMessage(role=MessageRole.SYSTEM, content=SYSTEM_PREFIX + "Board: start", cacheable_prefix_length=len(SYSTEM_PREFIX)),
+        ChatMessage(role=MessageRole.USER, content="Your move"),
+    ]
+
+    _ = await service.chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-test", output_type=str)
+    assert recorded == []
+
+    scope = LLMUsageScope(scenario=LLMUsageScenario.AGENT_MOVE, user_id=UserId(TSID.create()), game_id=GameId(TSID.create()))
+    with scope.use():
+        _ = await service.chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-test", output_type=str)
+
+    [usage] = recorded
+    assert (usage.user_id, usage.game_id, usage.model_used, usage.output_response) == (scope.user_id, scope.game_id, str(OpenAIModel.FAST), "e2e4")
+    # The stable prefix is its own segment, so it is stored once across turns
+    assert usage.input_prompt == [f"[system]\n{SYSTEM_PREFIX}", "Board: start\n\n", "[user]\nYour move\n\n"]
+
+
+@pytest.mark.asyncio
+async def test_recorder_writes_batches_and_stores_repeated_bodies_once(sessions: async_sessionmaker[AsyncSession]) -> None:
+    dao = LLMUsageDAO()
+    recorder = LLMUsageRecorder(dao, sessions=sessions, batch_rows=2)
+    user_id = UserId(TSID.create())
+    for turn in range(3):
+        recorder.record(_usage(user_id, turn))
+
+    assert await recorder.flush() == 3
+    assert recorder.pending == 0
+
+    async with sessions() as db:
+        usage_ids = (await db.execute(select(LLMUsage.id).order_by(LLMUsage.id))).scalars().all()
+        # One shared system prompt, plus a turn segment and a response per call
+        assert await db.scalar(select(func.count()).select_from(LLMUsageContent)) == 1 + 3 + 3
+
+        recorder.record(_usage(user_id, 0))
+        assert await recorder.flush() == 1
+        assert await db.scalar(select(func.count()).select_from(LLMUsageContent)) == 7
+
+        usage = await dao.get(db, usage_ids[1])
+    assert usage is not None
+    assert usage.input_prompt == SYSTEM_PREFIX + "Turn 1\n\n"
+    assert usage.output_response == '{"move": "1"}'
+
+
+@pytest.mark.asyncio
+async def test_unparseable_and_abandoned_calls_are_still_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def unparseable_acompletion(**_params: Any) -> Any:
+        message = SimpleNamespace(content="I think e4 is best", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], model=OpenAIModel.FAST, usage=None)
+
+    async def chunks() -> Any:
+        for text in ('{"move": "e2e4"', ', "chatMessage": "Open', 'ing."}'):
+            yield litellm.ModelResponseStream(choices=[{"index": 0, "delta": {"content": text}}])
+
+    async def streaming_acompletion(**_params: Any) -> Any:
+        return chunks()
+
+    recorded: list[LLMUsageCreate] = []
+    service = LiteLLMService(usage_sink=recorded.append)
+    messages = [ChatMessage(role=MessageRole.USER, content="Your move")]
+    scope = LLMUsageScope(scenario=LLMUsageScenario.AGENT_MOVE, user_id=UserId(TSID.create()))
+
+    with scope.use():
+        monkeypatch.setattr(litellm_service_module, "acompletion", unparseable_acompletion)
+        with pytest.raises(AppException) as exc_info:
+            _ = await service.chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-test", output_type=Move)
+        assert exc_info.value.details.code == Errors.Agent.INVALID_OUTPUT.code
+
+        monkeypatch.setattr(litellm_service_module, "acompletion", streaming_acompletion)
+        stream = service.stream_chat_completion(LLMProvider.OPENAI, OpenAIModel.FAST, messages, api_key="sk-test")
+        # Early commit: the consumer stops after the move
+        assert await anext(stream) == '{"move": "e2e4"'
+        await stream.aclose()
+
+    assert [usage.output_response for usage in recorded] == ["I think e4 is best", '{"move": "e2e4"']
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_a_batch_being_written(sessions: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch) -> None:
+    writing, release = asyncio.Event(), asyncio.Event()
+    written: list[LLMUsageCreate] = []
+
+    async def slow_create_many(_db: AsyncSession, batch: list[LLMUsageCreate], _level: int) -> None:
+        writing.set()
+        await release.wait()
+        written.extend(batch)
+
+    dao = LLMUsageDAO()
+    monkeypatch.setattr(dao, "create_many", slow_create_many)
+    recorder = LLMUsageRecorder(dao, sessions=sessions, batch_rows=1)
+    await recorder.start()
+    user_id = UserId(TSID.create())
+    recorder.record(_usage(user_id, 0))
+    _ = await writing.wait()
+
+    stopping = asyncio.create_task(recorder.stop())
+    await asyncio.sleep(0)
+    release.set()
+    await stopping
+
+    assert len(written) == 1
+    assert recorder.pending == 0
+
+    # A flush cancelled mid-write keeps its batch buffered
+    writing.clear()
+    release.clear()
+    recorder.record(_usage(user_id, 1))
+    flushing = asyncio.create_task(recorder.flush())
+    _ = await writing.wait()
+    _ = flushing.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flushing
+    assert recorder.pending == 1
@@ -0,0 +1,95 @@
+"""Unit tests for connection reuse and usage reporting in the localhost AgentCore client."""
+
+from typing import Any
+
+import pytest
+from aiohttp import web
+from api.agentcore_api import AgentCoreInvocationResponse, AgentExecutionContext, AgentExecutionResult
+
+from app.services.agent_runner.localhost_agentcore_client import LocalHostAgentCoreClient
+from common.ids import UserId
+from common.utils.msgspec import encode_json
+from common.utils.tsid import TSID
+from shared_db.models.llm_enums import LLMUsageScenario
+from shared_db.schemas.llm_usage import LLMUsageCreate
+
+
+class StaticConfig:
+    def __init__(self, values: dict[str, Any]) -> None:
+        self.values = values
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+
+@pytest.mark.asyncio
+async def test_invocations_share_one_keep_alive_connection() -> None:
+    bodies: list[Any] = []
+    peers: list[Any] = []
+
+    async def invocations(request: web.Request) -> web.Response:
+        bodies.append(await request.json())
+        peers.append(request.transport.get_extra_info("peername") if request.transport else None)
+        result = AgentExecutionResult(reasoning="ok", execution_context=AgentExecutionContext())
+        return web.Response(body=AgentCoreInvocationResponse(result=result).to_json(), content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/invocations", invocations)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore
+
+    client = LocalHostAgentCoreClient(StaticConfig({"agentcore.endpoint_url": f"http://127.0.0.1:{port}"}))  # type: ignore
+    try:
+        for _ in range(2):
+            result, _context = await client._invoke(encode_json({"gameType": "chess"}), timeout_seconds=5)
+            assert result.reasoning == "ok"
+    finally:
+        await client.stop()
+        await runner.cleanup()
+
+    # The body is the JSON object itself, not a JSON-encoded string of it
+    assert bodies == [{"gameType": "chess"}, {"gameType": "chess"}]
+    assert peers[0] == peers[1]
+    assert client._session is None
+
+
+@pytest.mark.asyncio
+async def test_reported_usage_is_recorded_even_when_execution_failed() -> None:
+    usage = LLMUsageCreate(
+        user_id=UserId(TSID.create()),
+        scenario=LLMUsageScenario.AGENT_MOVE,
+        model_used="gpt-4o-mini",
+        cost_usd=0.001,
+        input_tokens=100,
+        output_tokens=10,
+        total_tokens=110,
+        execution_time_ms=250,
+        input_prompt=["[user]\nYour move\n\n"],
+        output_response="I think e4 is best",
+    )
+
+    async def invocations(_request: web.Request) -> web.Response:
+        response = AgentCoreInvocationResponse(error="Agent execution failed: invalid output", llm_usage=[usage])
+        return web.Response(body=response.to_json(), content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/invocations", invocations)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore
+
+    recorded: list[LLMUsageCreate] = []
+    client = LocalHostAgentCoreClient(StaticConfig({"agentcore.endpoint_url": f"http://127.0.0.1:{port}"}), usage_sink=recorded.append)  # type: ignore
+    try:
+        with pytest.raises(RuntimeError, match="invalid output"):
+            _ = await client._invoke(encode_json({"gameType": "chess"}), timeout_seconds=5)
+    finally:
+        await client.stop()
+        await runner.cleanup()
+
+    assert recorded == [usage]
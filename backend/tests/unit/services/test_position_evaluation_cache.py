@@ -0,0 +1,39 @@
+"""Unit tests for the in-memory layer of the position-evaluation cache."""
+
+import chess
+import pytest
+
+from app.services.position_evaluation_cache import CachedEvaluation, PositionEvaluationCache
+
+
+@pytest.mark.asyncio
+async def test_position_key_ignores_move_clocks() -> None:
+    cache = PositionEvaluationCache(persistent=False)
+    board = chess.Board()
+    config = cache.engine_config(depth=15, time_limit=1.0)
+    await cache.put(board, config, CachedEvaluation(evaluation=30, best_move="e2e4", depth=15))
+
+    # Same position reached via a knight shuffle: different clocks, same normalized FEN
+    for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+        board.push_uci(uci)
+
+    cached = await cache.get(board, config)
+    assert cached is not None and cached.best_move == "e2e4"
+    assert await cache.get(board, cache.engine_config(depth=20, time_limit=1.0)) is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_position_is_evicted() -> None:
+    cache = PositionEvaluationCache(max_size=2, persistent=False)
+    config = cache.engine_config(depth=15, time_limit=None)
+    boards = [chess.Board(), chess.Board(), chess.Board()]
+    boards[1].push_uci("e2e4")
+    boards[2].push_uci("d2d4")
+
+    await cache.put(boards[0], config, CachedEvaluation(evaluation=30, depth=15))
+    await cache.put(boards[1], config, CachedEvaluation(evaluation=40, depth=15))
+    assert await cache.get(boards[0], config) is not None
+    await cache.put(boards[2], config, CachedEvaluation(evaluation=35, depth=15))
+
+    assert await cache.get(boards[0], config) is not None
+    assert await cache.get(boards[1], config) is None
@@ -0,0 +1,119 @@
+"""Unit tests for SqsClient's concurrent dispatch lane and visibility extension."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from common.core import sqs_client as sqs_client_module
+from common.core.request_context import RequestContext
+from common.core.sqs_client import SqsClient, SqsClientConfig, SqsMessage
+from common.ids import SqsMessageId
+from common.utils import TSID, JsonModel
+
+
+class Job(JsonModel):
+    name: str
+
+
+def _raw_message(name: str) -> dict[str, Any]:
+    message = SqsMessage[Job](id=SqsMessageId(TSID.create()), request_context=RequestContext(), payload=Job(name=name))
+    return {"Body": message.to_json(), "ReceiptHandle": name}
+
+
+@pytest.mark.asyncio
+async def test_slow_message_does_not_hold_back_later_messages_and_stays_invisible() -> None:
+    batches = [[_raw_message("slow")], [_raw_message("fast")]]
+
+    async def receive_message(**_params: Any) -> dict[str, Any]:
+        if batches:
+            return {"Messages": batches.pop(0)}
+        await asyncio.sleep(0.01)
+        return {}
+
+    sqs = SimpleNamespace(receive_message=receive_message, change_message_visibility=AsyncMock(), delete_message=AsyncMock())
+    config = SqsClientConfig(name="test", queue_url="queue", visibility_timeout=timedelta(milliseconds=20), max_in_flight=2, extend_visibility=True)
+    client = SqsClient[Job](aws_manager=SimpleNamespace(sqs_client=sqs), sqs_message_type=SqsMessage[Job], config=config)  # pyright: ignore[reportArgumentType]
+
+    release_slow = asyncio.Event()
+    handled: list[str] = []
+
+    async def handler(job: Job, _request_context: RequestContext) -> None:
+        if job.name == "slow":
+            await release_slow.wait()
+        handled.append(job.name)
+
+    client._is_running = True
+    poller = asyncio.create_task(client.poll_and_dispatch(handler, max_in_flight=2))
+    for _ in range(100):
+        if handled and sqs.change_message_visibility.await_count:
+            break
+        await asyncio.sleep(0.01)
+
+    # The fast message finished while the slow one was still running, and the slow one was kept invisible
+    assert handled == ["fast"]
+    assert {call.kwargs["ReceiptHandle"] for call in sqs.change_message_visibility.await_args_list} == {"slow"}
+
+    release_slow.set()
+    for _ in range(100):
+        if len(handled) == 2:
+            break
+        await asyncio.sleep(0.01)
+    client._is_running = False
+    await poller
+
+    assert handled == ["fast", "slow"]
+    assert sqs.delete_message.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_receive_error_does_not_cancel_running_handlers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sqs_client_module, "_RECEIVE_RETRY_DELAY", timedelta(0))
+    responses: list[dict[str, Any] | Exception] = [
+        {"Messages": [_raw_message("slow")]},
+        RuntimeError("ReceiveMessage failed"),
+        {"Messages": [_raw_message("fast")]},
+    ]
+
+    async def receive_message(**_params: Any) -> dict[str, Any]:
+        if responses:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        await asyncio.sleep(0.01)
+        return {}
+
+    sqs = SimpleNamespace(receive_message=receive_message, change_message_visibility=AsyncMock(), delete_message=AsyncMock())
+    config = SqsClientConfig(name="test", queue_url="queue", max_in_flight=2)
+    client = SqsClient[Job](aws_manager=SimpleNamespace(sqs_client=sqs), sqs_message_type=SqsMessage[Job], config=config)  # pyright: ignore[reportArgumentType]
+
+    release_slow = asyncio.Event()
+    handled: list[str] = []
+
+    async def handler(job: Job, _request_context: RequestContext) -> None:
+        if job.name == "slow":
+            await release_slow.wait()
+        handled.append(job.name)
+
+    client._is_running = True
+    poller = asyncio.create_task(client.poll_and_dispatch(handler, max_in_flight=2))
+    for _ in range(100):
+        if handled:
+            break
+        await asyncio.sleep(0.01)
+    release_slow.set()
+    for _ in range(100):
+        if len(handled) == 2:
+            break
+        await asyncio.sleep(0.01)
+    client._is_running = False
+    await poller
+
+    # The slow handler survived the failed receive and finished after the next message
+    assert handled == ["fast", "slow"]
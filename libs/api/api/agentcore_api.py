@@ -7,10 +7,12 @@ from typing import Any
 from game_api import GameType
 from pydantic import Field
 
+from common.core.llm_usage_scope import LLMUsageScope
 from common.types import AgentReasoning, ExecutedToolCall
 from common.utils.json_model import JsonModel
 from shared_db.schemas.agent import AgentVersionResponse
 from shared_db.schemas.llm_integration import LLMIntegrationWithKey
+from shared_db.schemas.llm_usage import LLMUsageCreate
 from shared_db.schemas.tool import ToolResponse
 
 
@@ -19,6 +21,8 @@ class Message(JsonModel):
 
     role: str
     content: str
+    # Length of the leading part of content that providers may cache (see ChatMessage)
+    cacheable_prefix_length: int = 0
 
 
 class AgentCoreInvocationRequest(JsonModel):
@@ -31,18 +35,25 @@ class AgentCoreInvocationRequest(JsonModel):
     agent: AgentVersionResponse  # Full agent data
     tools: list[ToolResponse]  # List of tools available to the agent
     llm_integration: LLMIntegrationWithKey  # LLM integration with API key
+    fallback_llm_integration: LLMIntegrationWithKey | None = None  # Integration to hedge slow LLM calls to
     game_type: GameType
     game_state: dict[str, Any]  # dict since it's game-specific
     possible_moves: dict[str, Any] | None = None  # dict since it's game-specific
     execution_context: AgentExecutionContext
+    usage_scope: LLMUsageScope | None = None  # Who the agent's LLM calls are billed to; unrecorded if omitted
 
 
 class AgentCoreInvocationResponse(JsonModel):
-    """Response model for AgentCore agent invocation."""
+    """Response model for AgentCore agent invocation.
+
+    The handler cannot write usage records itself, so the usage of the invocation's LLM calls
+    is returned (also when execution failed) for the caller to record.
+    """
 
     result: AgentExecutionResult | None = None
     error: str | None = None
     execution_time_ms: int | None = None
+    llm_usage: list[LLMUsageCreate] = Field(default_factory=list)
 
 
 class AgentExecutionResult(JsonModel):
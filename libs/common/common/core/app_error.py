@@ -90,6 +90,7 @@ class Errors:
         NOT_FOUND = ErrorConfig(scope="game", code="not_found", default_message="Game not found", http_status=404)
         NOT_PLAYER_MOVE = ErrorConfig(scope="game", code="not_player_move", default_message="Not player's move")
         ALREADY_FINISHED = ErrorConfig(scope="game", code="already_finished", default_message="Game already finished", http_status=409)
+        NOT_FINISHED = ErrorConfig(scope="game", code="not_finished", default_message="Game not finished yet", http_status=409, retryable=True)
         ALREADY_IN_QUEUE = ErrorConfig(scope="game", code="already_in_queue", default_message="Agent already in matchmaking queue", http_status=409)
         PLAYER_NOT_IN_GAME = ErrorConfig(scope="game", code="player_not_in_game", default_message="Player not in game", http_status=404)
         TURN_ADVANCEMENT_CONFLICT = ErrorConfig(
@@ -98,6 +99,10 @@ class Errors:
 
     class Llm:
         NOT_FOUND = ErrorConfig(scope="llm", code="not_found", default_message="LLM not found", http_status=404)
+        PROVIDER_UNAVAILABLE = ErrorConfig(
+            scope="llm", code="provider_unavailable", default_message="LLM provider is temporarily unavailable", http_status=503, send_notification=False
+        )
+        CASSETTE_MISS = ErrorConfig(scope="llm", code="cassette_miss", default_message="No recorded LLM response for this request", send_notification=False)
 
     class Agent:
         NOT_FOUND = ErrorConfig(scope="agent", code="not_found", default_message="Agent not found", http_status=404)
@@ -366,6 +366,14 @@ class ConfigService:
 
         return f"postgresql://{username}:{password}@{host}:{port}/{name}"
 
+    def get_replica_database_url(self) -> str | None:
+        """Get the URL of the read replica, or None when reads should go to the primary.
+        Priority:
+        1. DATABASE_REPLICA_URL environment variable
+        2. database.replica_url from config / secrets
+        """
+        return os.getenv("DATABASE_REPLICA_URL") or self.get("database.replica_url") or None
+
     def get_secret_key(self) -> str:
         """Get the secret key for JWT tokens and other security features"""
         return self.get("security.secret_key", "your_secret_key_here")
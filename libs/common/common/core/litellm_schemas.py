@@ -6,6 +6,7 @@ from typing import Literal, Protocol
 
 from pydantic import BaseModel, Field
 
+from common.enums import LLMProvider
 from shared_db.models.llm_enums import LLMModelType
 
 
@@ -81,6 +82,19 @@ class ChatMessage:
 
     role: MessageRole
     content: str
+    # Length of the leading part of content that is identical across requests (0 = nothing cacheable).
+    # Providers with explicit prompt caching get a cache breakpoint at this offset.
+    cacheable_prefix_length: int = 0
+
+
+@dataclass
+class LLMFallback:
+    """Alternative provider/model a slow request may be hedged to (usually another of the user's integrations)."""
+
+    provider: LLMProvider
+    model: LLMModelType
+    api_key: str
+    aws_credentials: dict[str, str] | None = None
 
 
 @dataclass
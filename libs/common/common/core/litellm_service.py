@@ -1,13 +1,18 @@
+import asyncio
+import copy
 import json
 import re
-from collections.abc import AsyncGenerator, Callable
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from typing import Any, cast, overload
 
-from litellm import acompletion
+from litellm import acompletion, cost_per_token, supports_response_schema, token_counter
 from litellm.cost_calculator import completion_cost
+from prometheus_client import Counter
 from pydantic import ValidationError
 
-from common.core.app_error import Errors
+from common.core.app_error import AppException, Errors
+from common.core.config_service import config_service
 from common.core.litellm_schemas import (
     ChatMessage,
     FinishReason,
@@ -18,22 +23,35 @@ from common.core.litellm_schemas import (
     LiteLLMResponseProtocol,
     LiteLLMStreamChunkProtocol,
     LiteLLMToolCallProtocol,
+    LLMFallback,
     MessageRole,
     TokenUsage,
     ToolCallResponse,
     ToolCallType,
 )
+from common.core.llm_cassette import CassetteMode, LLMCassette
+from common.core.llm_circuit_breaker import CircuitBreaker, LLMCircuitBreakers
+from common.core.llm_rate_limiter import LLMRateLimiter, ProviderRateLimiter
+from common.core.llm_usage_scope import LLMUsageScope, LLMUsageSink
 from common.enums import LLMProvider
 from common.model_config import ModelConfigFactory
 from common.utils.json_model import TJsonModel
-from common.utils.utils import get_logger
+from common.utils.utils import get_logger, get_now
 from shared_db.schemas.llm_integration import LLMModelType
+from shared_db.schemas.llm_usage import LLMUsageCreate
 
-LiteLLMMessage = dict[str, str]
+LiteLLMMessage = dict[str, Any]
 LiteLLMParams = dict[str, Any]
 
 logger = get_logger()
 
+llm_hedged_requests = Counter("llm_hedged_requests", "LLM requests hedged to a fallback model", ["provider", "model"])
+llm_json_repairs = Counter("llm_json_repairs", "Structured LLM responses that needed JSON extraction/repair before validating", ["model"])
+
+_SCHEMA_NAME_PATTERN = re.compile(r"[^a-zA-Z0-9_-]")
+# Size of the chunks a replayed completion is streamed in
+_REPLAY_CHUNK_CHARS = 16
+
 
 class LiteLLMService:
     """Service for unified LLM provider interactions using LiteLLM.
@@ -45,8 +63,136 @@ class LiteLLMService:
     with the LLM service factory pattern.
     """
 
-    def __init__(self) -> None:
-        pass
+    def __init__(
+        self,
+        rate_limiter: LLMRateLimiter | None = None,
+        max_throttle_retries: int | None = None,
+        circuit_breakers: LLMCircuitBreakers | None = None,
+        hedge_delay_s: float | None = None,
+        cassette: LLMCassette | None = None,
+        usage_sink: LLMUsageSink | None = None,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            rate_limiter: Limiter shared by all calls of this service (created from config if omitted)
+            max_throttle_retries: How many times a rate-limited call is re-queued before the error is raised
+            circuit_breakers: Per (provider, model) breakers (created from config if omitted)
+            hedge_delay_s: Delay before a hedged request is sent while the primary model has no p95 latency yet
+            cassette: Record/replay store for completions (from llm.cassette.* config if omitted; off by default)
+            usage_sink: Receives the usage of every provider call made inside an LLMUsageScope (nothing is recorded if omitted)
+        """
+        self._rate_limiter = rate_limiter or LLMRateLimiter()
+        self._max_throttle_retries = (
+            max_throttle_retries if max_throttle_retries is not None else int(config_service.get("llm.rate_limit.max_throttle_retries", 2))
+        )
+        self._circuit_breakers = circuit_breakers or LLMCircuitBreakers()
+        self._hedge_delay_s = hedge_delay_s if hedge_delay_s is not None else float(config_service.get("llm.hedging.delay_s", 20.0))
+        self._structured_output_enabled = str(config_service.get("llm.structured_output.enabled", "true")).lower() == "true"
+        # Models that rejected a response_format schema at runtime; they fall back to prompt-only JSON
+        self._structured_output_unsupported: set[str] = set()
+        self._response_formats: dict[type[Any], dict[str, Any]] = {}
+        self._cassette = cassette if cassette is not None else LLMCassette.from_config()
+        self._usage_sink = usage_sink
+
+    def _replays(self, params: LiteLLMParams) -> bool:
+        """Whether this request is answered from the cassette instead of the provider."""
+        if self._cassette is None or not self._cassette.replays:
+            return False
+        return self._cassette.settings.mode == CassetteMode.REPLAY or self._cassette.lookup(params) is not None
+
+    def _supports_structured_output(self, model_name: str) -> bool:
+        if not self._structured_output_enabled or model_name in self._structured_output_unsupported:
+            return False
+        try:
+            return bool(supports_response_schema(model=model_name))
+        except Exception:
+            return False
+
+    def _response_format(self, output_type: type[TJsonModel]) -> dict[str, Any]:
+        """JSON-schema response_format for an output model (cached per type, the schemas are large)."""
+        response_format = self._response_formats.get(output_type)
+        if response_format is None:
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": _SCHEMA_NAME_PATTERN.sub("_", output_type.__name__)[:64],
+                    "schema": output_type.model_json_schema(),
+                    # Decision schemas use optional fields and unions that strict mode rejects
+                    "strict": False,
+                },
+            }
+            self._response_formats[output_type] = response_format
+        return response_format
+
+    def _get_limiter(self, provider: LLMProvider, model_name: str, api_key: str, aws_credentials: dict[str, str] | None) -> ProviderRateLimiter:
+        """Limiter for the (provider, key, model) this request is billed against."""
+        secret = api_key or (aws_credentials or {}).get("aws_access_key_id", "")
+        return self._rate_limiter.get(provider.value, model_name, secret)
+
+    async def _limited_completion(self, limiter: ProviderRateLimiter, params: LiteLLMParams, breaker: CircuitBreaker | None = None) -> Any:
+        """Run a non-streaming completion inside the limiter, re-queueing on rate-limit errors.
+
+        When a circuit breaker is given, the provider latency and outcome of the call are recorded on it.
+        """
+        if self._cassette is not None and self._replays(params):
+            return await self._cassette.replay(params)
+
+        estimated_tokens = self._rate_limiter.estimate_tokens(params["messages"], params.get("max_tokens"))
+        attempt = 0
+        while True:
+            async with limiter.slot(estimated_tokens):
+                started = time.monotonic()
+                try:
+                    response = await self._call_provider(params, breaker)
+                except Exception as e:
+                    if not LLMRateLimiter.is_rate_limit_error(e):
+                        raise
+                    limiter.record_throttled(LLMRateLimiter.retry_after(e))
+                    attempt += 1
+                    if attempt > self._max_throttle_retries:
+                        raise
+                    continue
+
+            latency = time.monotonic() - started
+            if self._cassette is not None and self._cassette.records:
+                self._cassette.record(params, response, latency)
+            usage = getattr(response, "usage", None)
+            limiter.record_success(estimated_tokens, getattr(usage, "total_tokens", None))
+            return response
+
+    async def _call_provider(self, params: LiteLLMParams, breaker: CircuitBreaker | None) -> Any:
+        """Call the provider, holding the breaker's half-open probe only for the duration of the call.
+
+        The outcome is recorded on the breaker; a call that ends any other way (cancelled, client
+        error) releases the probe without counting against the provider.
+        """
+        if breaker is None:
+            return await acompletion(**params)
+        if not breaker.allow_request():
+            raise self._provider_unavailable(breaker)
+
+        started = time.monotonic()
+        recorded = False
+        try:
+            response = await acompletion(**params)
+            breaker.record_success(time.monotonic() - started)
+            recorded = True
+            return response
+        except Exception as e:
+            if LLMCircuitBreakers.is_provider_failure(e):
+                breaker.record_failure(time.monotonic() - started)
+                recorded = True
+            raise
+        finally:
+            if not recorded:
+                breaker.record_abandoned()
+
+    @staticmethod
+    def _provider_unavailable(breaker: CircuitBreaker) -> AppException:
+        return Errors.Llm.PROVIDER_UNAVAILABLE.create(
+            f"{breaker.provider}/{breaker.model} is temporarily unavailable, try again shortly", details={"provider": breaker.provider, "model": breaker.model}
+        )
 
     def _build_model_name(self, provider: LLMProvider, model: LLMModelType) -> str:
         """Build LiteLLM-compatible model name."""
@@ -73,7 +219,39 @@ class LiteLLMService:
         # This prevents the exception from bedrock the messages must contain at least one user message
         if len(messages) == 1:
             messages[0].role = MessageRole.USER
-        return [{"role": msg.role, "content": msg.content} for msg in messages]
+        return [self._prepare_message(msg) for msg in messages]
+
+    def _prepare_message(self, message: ChatMessage) -> LiteLLMMessage:
+        """Convert a single message, splitting a cacheable prefix into its own content block."""
+        prefix_length = message.cacheable_prefix_length
+        if prefix_length <= 0 or prefix_length > len(message.content):
+            return {"role": message.role, "content": message.content}
+
+        blocks: list[dict[str, Any]] = [{"type": "text", "text": message.content[:prefix_length], "cache_control": {"type": "ephemeral"}}]
+        if prefix_length < len(message.content):
+            blocks.append({"type": "text", "text": message.content[prefix_length:]})
+        return {"role": message.role, "content": blocks}
+
+    def _supports_cache_control(self, model_name: str) -> bool:
+        """Whether the provider needs explicit cache breakpoints (Anthropic, directly or via Bedrock).
+
+        OpenAI and Gemini cache repeated prompt prefixes automatically, so for them it is enough
+        that the stable part of the prompt comes first.
+        """
+        return model_name.startswith("anthropic/") or (model_name.startswith("bedrock/") and "anthropic." in model_name)
+
+    def _apply_prompt_caching(self, model_name: str, messages: list[LiteLLMMessage]) -> list[LiteLLMMessage]:
+        """Keep cache breakpoints for providers that support them, flatten content blocks for the rest."""
+        if self._supports_cache_control(model_name):
+            return messages
+
+        flattened: list[LiteLLMMessage] = []
+        for message in messages:
+            content = message["content"]
+            if isinstance(content, list):
+                message = {**message, "content": "".join(block["text"] for block in content)}
+            flattened.append(message)
+        return flattened
 
     def _build_request_params(
         self, model_name: str, messages: list[LiteLLMMessage], api_key: str, config: LiteLLMConfig | None = None, aws_credentials: dict[str, str] | None = None
@@ -89,7 +267,7 @@ class LiteLLMService:
         """
         params: LiteLLMParams = {
             "model": model_name,
-            "messages": messages,
+            "messages": self._apply_prompt_caching(model_name, messages),
         }
 
         # Handle AWS Bedrock credentials separately
@@ -325,8 +503,36 @@ class LiteLLMService:
 
         return "".join(result)
 
+    def _validate_json_content(self, raw_content: str, output_type: type[TJsonModel], model: LLMModelType) -> TJsonModel:
+        """Validate the response as-is (schema-constrained output is plain JSON), repairing it only if that fails."""
+        try:
+            return output_type.model_validate_json(raw_content)
+        except ValidationError:
+            llm_json_repairs.labels(model=model).inc()
+            return output_type.model_validate_json(self._extract_and_clean_json(raw_content))
+
+    def parse_json_output(self, raw_content: str, output_type: type[TJsonModel], model: LLMModelType) -> TJsonModel:
+        """Validate model output against ``output_type``, repairing slightly malformed JSON.
+
+        Raises:
+            AppException: INVALID_OUTPUT if the content cannot be turned into ``output_type``
+        """
+        try:
+            return self._validate_json_content(raw_content, output_type, model)
+        except Exception as e:
+            error_message = e.json() if isinstance(e, ValidationError) else str(e)
+            raise Errors.Agent.INVALID_OUTPUT.create(
+                f"You did not return valid JSON: {error_message}", details={"model": model, "raw_content": raw_content, "error": str(e)}
+            ) from e
+
     def _parse_response(
-        self, response: LiteLLMResponseProtocol, output_type: type[TJsonModel] | type[str], original_model: LLMModelType
+        self,
+        response: LiteLLMResponseProtocol,
+        output_type: type[TJsonModel] | type[str],
+        original_model: LLMModelType,
+        *,
+        usage: TokenUsage | None,
+        cost_usd: float | None,
     ) -> LiteLLMResponse[TJsonModel] | LiteLLMResponse[str]:
         """Parse LiteLLM response into our schema.
 
@@ -334,23 +540,15 @@ class LiteLLMService:
             response: Raw response from LiteLLM
             output_type: Expected output type
             original_model: The original model enum we sent (LiteLLM may return a different format)
+            usage: Token usage of the response (see _response_usage)
+            cost_usd: Cost of the response (see _response_usage)
         """
         choice = response.choices[0]
         message = choice.message
 
         content: TJsonModel | str | None = None
         if message.content:
-            if output_type is str:
-                content = message.content
-            else:
-                try:
-                    cleaned_json_str = self._extract_and_clean_json(message.content)
-                    content = output_type.model_validate_json(cleaned_json_str)  # type: ignore
-                except Exception as e:
-                    error_message = e.json() if isinstance(e, ValidationError) else str(e)
-                    raise Errors.Agent.INVALID_OUTPUT.create(
-                        f"You did not return valid JSON: {error_message}", details={"model": original_model, "raw_content": message.content, "error": str(e)}
-                    ) from e
+            content = message.content if output_type is str else self.parse_json_output(message.content, output_type, original_model)
 
         tool_calls: list[ToolCallResponse] | None = None
         if hasattr(message, "tool_calls") and message.tool_calls:
@@ -392,25 +590,6 @@ class LiteLLMService:
                 # If the finish reason is not in our enum, keep it as None
                 finish_reason = None
 
-        # Extract token usage information
-        usage: TokenUsage | None = None
-        if response.usage:
-            usage_data = response.usage
-            usage = TokenUsage(
-                prompt_tokens=getattr(usage_data, "prompt_tokens", 0),
-                completion_tokens=getattr(usage_data, "completion_tokens", 0),
-                total_tokens=getattr(usage_data, "total_tokens", 0),
-            )
-
-        # Calculate cost using LiteLLM's completion_cost function
-        cost_usd: float | None = None
-        if usage:
-            try:
-                cost_usd = completion_cost(completion_response=response)
-            except Exception as e:
-                logger.warning(f"Failed to calculate cost: {e!s}")
-                cost_usd = None
-
         return LiteLLMResponse(
             content=content,  # type: ignore
             tool_calls=tool_calls,
@@ -420,6 +599,105 @@ class LiteLLMService:
             cost_usd=cost_usd,
         )
 
+    @staticmethod
+    def _response_usage(response: LiteLLMResponseProtocol) -> tuple[TokenUsage | None, float | None]:
+        """Token usage and cost of a completion, independent of whether its content parses."""
+        if not response.usage:
+            return None, None
+        usage_data = response.usage
+        usage = TokenUsage(
+            prompt_tokens=getattr(usage_data, "prompt_tokens", 0),
+            completion_tokens=getattr(usage_data, "completion_tokens", 0),
+            total_tokens=getattr(usage_data, "total_tokens", 0),
+        )
+
+        # Calculate cost using LiteLLM's completion_cost function
+        try:
+            cost_usd = completion_cost(completion_response=response)
+        except Exception as e:
+            logger.warning(f"Failed to calculate cost: {e!s}")
+            cost_usd = None
+        return usage, cost_usd
+
+    @staticmethod
+    def _prompt_segments(messages: list[ChatMessage]) -> list[str]:
+        """Render the prompt as text split at message and cacheable-prefix boundaries.
+
+        The segments are stored and deduplicated separately, so e.g. the stable part of an agent's
+        system prompt is kept once however many turns send it.
+        """
+        segments: list[str] = []
+        for message in messages:
+            text = f"[{message.role.value}]\n{message.content}\n\n"
+            split = len(message.role.value) + 3 + message.cacheable_prefix_length if message.cacheable_prefix_length else 0
+            if 0 < split < len(text):
+                segments.extend((text[:split], text[split:]))
+            else:
+                segments.append(text)
+        return segments
+
+    @staticmethod
+    def _stream_token_usage(model_name: str, litellm_messages: list[LiteLLMMessage], output: str, reported: Any) -> TokenUsage:
+        """Token usage of a stream: as reported by the provider's final chunk, counted locally otherwise."""
+        if reported is not None:
+            return TokenUsage(
+                prompt_tokens=getattr(reported, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(reported, "completion_tokens", 0) or 0,
+                total_tokens=getattr(reported, "total_tokens", 0) or 0,
+            )
+        try:
+            prompt_tokens = token_counter(model=model_name, messages=litellm_messages)
+            completion_tokens = token_counter(model=model_name, text=output, count_response_tokens=True)
+        except Exception as e:
+            logger.warning(f"Failed to count streamed tokens: {e!s}")
+            return TokenUsage()
+        return TokenUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens)
+
+    @staticmethod
+    def _stream_cost(model_name: str, usage: TokenUsage) -> float | None:
+        try:
+            prompt_cost, completion_cost_usd = cost_per_token(model=model_name, prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+        except Exception as e:
+            logger.warning(f"Failed to calculate cost: {e!s}")
+            return None
+        return prompt_cost + completion_cost_usd
+
+    def _record_usage(
+        self,
+        provider: LLMProvider,
+        model: LLMModelType,
+        messages: list[ChatMessage],
+        output: str,
+        usage: TokenUsage | None,
+        cost_usd: float | None,
+        started: float,
+    ) -> None:
+        """Hand a finished call to the usage sink, attributed to the current LLMUsageScope (no-op outside one)."""
+        scope = LLMUsageScope.get_or_none()
+        if self._usage_sink is None or scope is None:
+            return
+        elapsed_s = time.monotonic() - started
+        usage = usage or TokenUsage()
+        try:
+            self._usage_sink(
+                LLMUsageCreate(
+                    **scope.model_dump(),
+                    provider=provider.value,
+                    model_used=str(model),
+                    cost_usd=cost_usd or 0.0,
+                    input_tokens=usage.prompt_tokens,
+                    output_tokens=usage.completion_tokens,
+                    total_tokens=usage.total_tokens,
+                    execution_time_ms=int(elapsed_s * 1000),
+                    input_prompt=self._prompt_segments(messages),
+                    output_response=output,
+                    created_at=get_now(),
+                )
+            )
+        except Exception:
+            # Usage capture must never fail the call it describes
+            logger.exception("Failed to record LLM usage", model=str(model), scenario=scope.scenario.value)
+
     @overload
     async def chat_completion(
         self,
@@ -430,6 +708,7 @@ class LiteLLMService:
         output_type: type[TJsonModel],
         config: LiteLLMConfig | None = None,
         aws_credentials: dict[str, str] | None = None,
+        fallback: LLMFallback | None = None,
     ) -> LiteLLMResponse[TJsonModel]: ...
 
     @overload
@@ -442,6 +721,7 @@ class LiteLLMService:
         output_type: type[str],
         config: LiteLLMConfig | None = None,
         aws_credentials: dict[str, str] | None = None,
+        fallback: LLMFallback | None = None,
     ) -> LiteLLMResponse[str]: ...
 
     async def chat_completion(
@@ -453,6 +733,7 @@ class LiteLLMService:
         output_type: type[TJsonModel] | type[str],
         config: LiteLLMConfig | None = None,
         aws_credentials: dict[str, str] | None = None,
+        fallback: LLMFallback | None = None,
     ) -> LiteLLMResponse[TJsonModel] | LiteLLMResponse[str]:
         """Generate a single chat completion response.
 
@@ -464,6 +745,7 @@ class LiteLLMService:
             output_type: Type of the output
             config: Optional configuration for the request
             aws_credentials: Optional AWS credentials dict for Bedrock (keys: aws_access_key_id, aws_secret_access_key, aws_region_name)
+            fallback: Optional model to hedge to when the primary is slower than its p95 latency or its circuit is open
 
         Returns:
             LiteLLM response with parsed content, or parsed Pydantic object if output_schema provided
@@ -471,18 +753,112 @@ class LiteLLMService:
         Raises:
             Exception: If the completion request fails
         """
+
+        def primary() -> Awaitable[LiteLLMResponse[Any]]:
+            return self._complete(provider, model, messages, api_key, output_type, config, aws_credentials)
+
+        if fallback is None or (fallback.provider, fallback.model) == (provider, model):
+            return await primary()
+
+        def secondary() -> Awaitable[LiteLLMResponse[Any]]:
+            return self._complete(fallback.provider, fallback.model, copy.deepcopy(messages), fallback.api_key, output_type, config, fallback.aws_credentials)
+
+        breaker = self._circuit_breakers.get(provider.value, self._build_model_name(provider, model))
+        hedge_delay = breaker.p95_latency() or self._hedge_delay_s
+        return await self._hedged_completion(primary, secondary, hedge_delay, provider, model)
+
+    async def _hedged_completion(
+        self,
+        primary: Callable[[], Awaitable[LiteLLMResponse[Any]]],
+        secondary: Callable[[], Awaitable[LiteLLMResponse[Any]]],
+        hedge_delay: float,
+        provider: LLMProvider,
+        model: LLMModelType,
+    ) -> LiteLLMResponse[Any]:
+        """Start the primary request and, if it has not answered within ``hedge_delay`` (or its
+        circuit is open), race it against the fallback. The first successful response wins.
+        """
+        primary_task = asyncio.create_task(primary())
+        done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+        if done:
+            error = primary_task.exception()
+            if error is None:
+                return primary_task.result()
+            if not AppException.is_(error, Errors.Llm.PROVIDER_UNAVAILABLE):
+                raise error
+
+        logger.info("Hedging LLM request to fallback model", provider=provider.value, model=model, hedge_delay_s=round(hedge_delay, 2))
+        llm_hedged_requests.labels(provider=provider.value, model=model).inc()
+        pending: set[asyncio.Task[LiteLLMResponse[Any]]] = {asyncio.create_task(secondary())}
+        if not primary_task.done():
+            pending.add(primary_task)
+
+        errors: list[BaseException] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    errors.append(error)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # Both failed: surface the primary's error, which is the one the caller asked about
+        primary_error = primary_task.exception() if primary_task.done() and not primary_task.cancelled() else None
+        raise primary_error or errors[0]
+
+    async def _complete(
+        self,
+        provider: LLMProvider,
+        model: LLMModelType,
+        messages: list[ChatMessage],
+        api_key: str,
+        output_type: type[TJsonModel] | type[str],
+        config: LiteLLMConfig | None,
+        aws_credentials: dict[str, str] | None,
+    ) -> LiteLLMResponse[Any]:
+        """Run a single completion against one provider/model, guarded by its circuit breaker."""
         try:
             model_name = self._build_model_name(provider, model)
+            breaker = self._circuit_breakers.get(provider.value, model_name)
+            if breaker.rejects_requests():
+                raise self._provider_unavailable(breaker)
+
             working_messages = self._prepare_messages(messages)
 
             params = self._build_request_params(model_name, working_messages, api_key, config, aws_credentials)
-
-            logger.info("Completion parameters", model=model_name, provider=provider.value, params=params)
-            raw_response = await acompletion(**params)
+            if output_type is not str and self._supports_structured_output(model_name):
+                params["response_format"] = self._response_format(cast(type[TJsonModel], output_type))
+
+            # The log processors rewrite nested dicts in place, so the cached schema is kept out of the log line
+            logged_params = {key: value for key, value in params.items() if key != "response_format"}
+            logger.info("Completion parameters", model=model_name, provider=provider.value, params=logged_params, structured_output="response_format" in params)
+            limiter = self._get_limiter(provider, model_name, api_key, aws_credentials)
+            replayed = self._replays(params)
+            started = time.monotonic()
+            try:
+                raw_response = await self._limited_completion(limiter, params, breaker)
+            except Exception as e:
+                if "response_format" not in params or getattr(e, "status_code", None) != 400:
+                    raise
+                # The model advertises schema support but rejected this one; stop sending it and rely on repair
+                logger.warning("Structured output rejected, falling back to prompt-only JSON", model=model_name, error=str(e))
+                self._structured_output_unsupported.add(model_name)
+                params.pop("response_format")
+                raw_response = await self._limited_completion(limiter, params, breaker)
 
             # Cast to protocol for type safety
+            response = cast(LiteLLMResponseProtocol, raw_response)
+            usage, cost_usd = self._response_usage(response)
+            # Recorded before parsing: a call whose output fails to parse was still billed
+            if not replayed:
+                self._record_usage(provider, model, messages, response.choices[0].message.content or "", usage, cost_usd, started)
+
             # Pass the original model enum to preserve type safety (LiteLLM may return a different format)
-            parsed_response = self._parse_response(cast(LiteLLMResponseProtocol, raw_response), output_type, model)
+            parsed_response = self._parse_response(response, output_type, model, usage=usage, cost_usd=cost_usd)
             logger.info("Completion generated successfully", content=parsed_response.content, tool_calls=parsed_response.tool_calls)
 
             return parsed_response
@@ -499,6 +875,7 @@ class LiteLLMService:
         api_key: str,
         config: LiteLLMConfig | None = None,
         aws_credentials: dict[str, str] | None = None,
+        output_type: type[TJsonModel] | None = None,
     ) -> AsyncGenerator[str]:
         """Stream chat completion response.
 
@@ -509,6 +886,7 @@ class LiteLLMService:
             api_key: API key for the provider (or empty string for AWS Bedrock)
             config: Optional configuration for the request
             aws_credentials: Optional AWS credentials dict for Bedrock (keys: aws_access_key_id, aws_secret_access_key, aws_region_name)
+            output_type: Model the streamed text should be JSON for; sent as a response schema where supported
 
         Yields:
             Streaming response chunks as strings
@@ -527,46 +905,95 @@ class LiteLLMService:
             stream_config.stream = True
 
             params = self._build_request_params(model_name, litellm_messages, api_key, stream_config, aws_credentials)
-
-            response = await acompletion(**params)
-
-            # Process streaming response with proper typing
-            # LiteLLM returns an async iterable when stream=True
-            # Cast to AsyncGenerator for proper typing
-            async_response = cast("AsyncGenerator[Any]", response)
-            chunk_count = 0
-            yielded_chars = 0
-            async for chunk in async_response:
-                chunk_protocol = cast("LiteLLMStreamChunkProtocol", chunk)
-                content = self._extract_streaming_content(chunk_protocol)
-                if content:
-                    yielded_chars += len(content)
-                    yield content
-                # Log first few chunks with no content for diagnostics (truncated)
-                elif chunk_count < 3:
-                    try:
-                        raw_preview = repr(chunk_protocol)
-                    except Exception:
-                        raw_preview = "<unrepr-able>"
-                    logger.debug(
-                        "Streaming chunk with no content",
+            if output_type is not None and self._supports_structured_output(model_name):
+                params["response_format"] = self._response_format(output_type)
+            if self._cassette is not None and self._replays(params):
+                content = await self._cassette.replay_content(params)
+                for start in range(0, len(content), _REPLAY_CHUNK_CHARS):
+                    yield content[start : start + _REPLAY_CHUNK_CHARS]
+                return
+
+            limiter = self._get_limiter(provider, model_name, api_key, aws_credentials)
+            estimated_tokens = self._rate_limiter.estimate_tokens(params["messages"], params.get("max_tokens"))
+            breaker = self._circuit_breakers.get(provider.value, model_name)
+            if breaker.rejects_requests():
+                raise self._provider_unavailable(breaker)
+
+            # The slot is held for the whole stream so long generations count against concurrency
+            async with limiter.slot(estimated_tokens):
+                started = time.monotonic()
+                try:
+                    # Time to the start of the stream is what reflects provider health here
+                    response = await self._call_provider(params, breaker)
+                except Exception as e:
+                    if LLMRateLimiter.is_rate_limit_error(e):
+                        limiter.record_throttled(LLMRateLimiter.retry_after(e))
+                    raise
+
+                # Process streaming response with proper typing
+                # LiteLLM returns an async iterable when stream=True
+                # Cast to AsyncGenerator for proper typing
+                async_response = cast("AsyncGenerator[Any]", response)
+                chunk_count = 0
+                yielded_chars = 0
+                recorded: list[str] | None = [] if self._cassette is not None and self._cassette.records else None
+                tracks_usage = self._usage_sink is not None and LLMUsageScope.get_or_none() is not None
+                streamed: list[str] = []
+                stream_usage: Any = None
+                failed = False
+                try:
+                    async for chunk in async_response:
+                        chunk_protocol = cast("LiteLLMStreamChunkProtocol", chunk)
+                        content = self._extract_streaming_content(chunk_protocol)
+                        stream_usage = getattr(chunk, "usage", None) or stream_usage
+                        if content:
+                            yielded_chars += len(content)
+                            if recorded is not None:
+                                recorded.append(content)
+                            if tracks_usage:
+                                streamed.append(content)
+                            yield content
+                        # Log first few chunks with no content for diagnostics (truncated)
+                        elif chunk_count < 3:
+                            try:
+                                raw_preview = repr(chunk_protocol)
+                            except Exception:
+                                raw_preview = "<unrepr-able>"
+                            logger.debug(
+                                "Streaming chunk with no content",
+                                provider=provider.value,
+                                model=model_name,
+                                index=chunk_count,
+                                raw=raw_preview[:1000],
+                            )
+                        chunk_count += 1
+                except BaseException as e:
+                    # A consumer that stops reading early (aclose) is not a failed stream
+                    failed = not isinstance(e, GeneratorExit)
+                    raise
+                finally:
+                    if not failed:
+                        limiter.record_success(estimated_tokens, None)
+                        if self._cassette is not None and recorded is not None:
+                            self._cassette.record_content(params, "".join(recorded), time.monotonic() - started)
+                    # Whatever was generated is billed, even if the consumer closed early or the stream broke
+                    if tracks_usage:
+                        output = "".join(streamed)
+                        usage = self._stream_token_usage(model_name, params["messages"], output, stream_usage)
+                        self._record_usage(provider, model, messages, output, usage, self._stream_cost(model_name, usage), started)
+
+                # Final diagnostics
+                if yielded_chars == 0:
+                    logger.warning(
+                        "Streaming completed with 0 content characters",
                         provider=provider.value,
                         model=model_name,
-                        index=chunk_count,
-                        raw=raw_preview[:1000],
+                        chunk_count=chunk_count,
+                        params={k: v for k, v in params.items() if k not in ("api_key", "response_format")},
                     )
-                chunk_count += 1
-
-            # Final diagnostics
-            if yielded_chars == 0:
-                logger.warning(
-                    "Streaming completed with 0 content characters",
-                    provider=provider.value,
-                    model=model_name,
-                    chunk_count=chunk_count,
-                    params={k: v for k, v in params.items() if k != "api_key"},
-                )
 
+        except AppException:
+            raise
         except Exception as e:
             logger.exception("Error in streaming chat completion")
             raise Exception(f"LiteLLM streaming completion failed: {e!s}") from e
@@ -0,0 +1,185 @@
+"""Record/replay of LLM completions for deterministic offline runs.
+
+In ``record`` mode every completion that reaches a provider is stored in a cassette directory,
+keyed by a hash of the normalized request (model, messages, sampling parameters, schemas and
+tools; never credentials). In ``replay`` mode completions are answered from the cassette without
+any network access, optionally after an injected latency so the turn pipeline can be benchmarked
+under realistic timing. ``replay_or_record`` replays what exists and records the rest.
+
+Each entry is a small JSON file (``<hash>.json``) so cassettes can be checked in and diffed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from litellm import ModelResponse
+
+from common.core.app_error import Errors
+from common.core.config_service import config_service
+from common.utils import JsonModel, get_logger
+
+logger = get_logger()
+
+# Request parameters that change what the model returns; everything else (credentials, stream flags) is ignored
+_KEY_PARAMS = ("model", "messages", "temperature", "top_p", "max_tokens", "max_completion_tokens", "response_format", "tools", "tool_choice")
+
+
+class CassetteMode(StrEnum):
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+    REPLAY_OR_RECORD = "replay_or_record"
+
+
+class LatencyMode(StrEnum):
+    NONE = "none"  # Replay at CPU speed
+    RECORDED = "recorded"  # Sleep for the latency observed when recording (times latency_scale)
+    LOGNORMAL = "lognormal"  # Sample from a log-normal distribution with the given mean and stddev
+
+
+class CassetteSettings(JsonModel):
+    """How completions are recorded and replayed."""
+
+    mode: CassetteMode = CassetteMode.OFF
+    path: str = ".llm_cassettes"
+    latency_mode: LatencyMode = LatencyMode.NONE
+    latency_scale: float = 1.0
+    latency_mean_s: float = 2.0
+    latency_stddev_s: float = 1.0
+    seed: int | None = None
+
+    @classmethod
+    def from_config(cls) -> CassetteSettings:
+        seed = config_service.get("llm.cassette.seed")
+        return cls(
+            mode=CassetteMode(str(config_service.get("llm.cassette.mode", CassetteMode.OFF)).lower()),
+            path=config_service.get("llm.cassette.path", ".llm_cassettes"),
+            latency_mode=LatencyMode(str(config_service.get("llm.cassette.latency_mode", LatencyMode.NONE)).lower()),
+            latency_scale=float(config_service.get("llm.cassette.latency_scale", 1.0)),
+            latency_mean_s=float(config_service.get("llm.cassette.latency_mean_s", 2.0)),
+            latency_stddev_s=float(config_service.get("llm.cassette.latency_stddev_s", 1.0)),
+            seed=int(seed) if seed is not None else None,
+        )
+
+
+class CassetteEntry(JsonModel):
+    """A recorded completion."""
+
+    key: str
+    model: str
+    response: dict[str, Any]
+    latency_s: float
+    recorded_at: float
+
+
+class LLMCassette:
+    """Cassette store backed by a directory of JSON files."""
+
+    def __init__(self, settings: CassetteSettings) -> None:
+        self.settings = settings
+        self.directory = Path(settings.path)
+        self._random = random.Random(settings.seed)  # noqa: S311 - latency jitter, not security
+        self._entries: dict[str, CassetteEntry | None] = {}
+
+    @classmethod
+    def from_config(cls) -> LLMCassette | None:
+        """Cassette configured for this process, or None when record/replay is off."""
+        settings = CassetteSettings.from_config()
+        return cls(settings) if settings.mode != CassetteMode.OFF else None
+
+    @property
+    def replays(self) -> bool:
+        return self.settings.mode in (CassetteMode.REPLAY, CassetteMode.REPLAY_OR_RECORD)
+
+    @property
+    def records(self) -> bool:
+        return self.settings.mode in (CassetteMode.RECORD, CassetteMode.REPLAY_OR_RECORD)
+
+    @staticmethod
+    def key(params: dict[str, Any]) -> str:
+        """Hash of the normalized request."""
+        normalized = {name: params[name] for name in _KEY_PARAMS if params.get(name) is not None}
+        normalized["messages"] = [_normalize_message(message) for message in params.get("messages", [])]
+        encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def lookup(self, params: dict[str, Any]) -> CassetteEntry | None:
+        key = self.key(params)
+        if key not in self._entries:
+            path = self.directory / f"{key}.json"
+            self._entries[key] = CassetteEntry.model_validate_json(path.read_bytes()) if path.exists() else None
+        return self._entries[key]
+
+    async def replay(self, params: dict[str, Any]) -> ModelResponse:
+        """Recorded response for the request, after the configured latency.
+
+        Raises:
+            AppException: Errors.Llm.CASSETTE_MISS if the request was never recorded
+        """
+        entry = self.lookup(params)
+        if entry is None:
+            raise Errors.Llm.CASSETTE_MISS.create(details={"key": self.key(params), "model": params.get("model"), "path": str(self.directory)})
+        await self._inject_latency(entry)
+        return ModelResponse(**entry.response)
+
+    async def replay_content(self, params: dict[str, Any]) -> str:
+        """Recorded text of the request, for streaming callers."""
+        response = await self.replay(params)
+        return response.choices[0].message.content or ""  # type: ignore[union-attr]
+
+    def record(self, params: dict[str, Any], response: Any, latency_s: float) -> None:
+        """Store a provider response; a failure to write never fails the completion."""
+        key = self.key(params)
+        try:
+            data = response.model_dump() if hasattr(response, "model_dump") else dict(response)
+            entry = CassetteEntry(key=key, model=str(params.get("model")), response=json.loads(json.dumps(data, default=str)), latency_s=latency_s, recorded_at=time.time())
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{key}.json").write_text(entry.to_json(pretty=True))
+            self._entries[key] = entry
+        except Exception:
+            logger.exception("Failed to record LLM cassette entry", key=key)
+
+    def record_content(self, params: dict[str, Any], content: str, latency_s: float) -> None:
+        """Store the text of a streamed completion as a regular response."""
+        response = {
+            "model": params.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        }
+        self.record(params, response, latency_s)
+
+    async def _inject_latency(self, entry: CassetteEntry) -> None:
+        match self.settings.latency_mode:
+            case LatencyMode.NONE:
+                return
+            case LatencyMode.RECORDED:
+                delay = entry.latency_s * self.settings.latency_scale
+            case LatencyMode.LOGNORMAL:
+                delay = self._sample_lognormal()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _sample_lognormal(self) -> float:
+        """Log-normal sample whose mean and stddev (in seconds) match the settings."""
+        mean, stddev = self.settings.latency_mean_s, self.settings.latency_stddev_s
+        if mean <= 0:
+            return 0.0
+        sigma_squared = math.log(1 + (stddev / mean) ** 2)
+        mu = math.log(mean) - sigma_squared / 2
+        return self._random.lognormvariate(mu, sigma_squared**0.5)
+
+
+def _normalize_message(message: dict[str, Any]) -> dict[str, Any]:
+    """Role and plain text of a message; cache-control blocks and whitespace differences do not change the key."""
+    content = message.get("content")
+    if isinstance(content, list):
+        content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return {"role": message.get("role"), "content": content.strip() if isinstance(content, str) else content}
@@ -0,0 +1,168 @@
+"""Circuit breakers for LLM providers.
+
+One breaker per (provider, model) watches a rolling window of recent calls. When too many of
+them fail with provider-side errors, or take longer than the slow-call threshold, the breaker
+opens and calls fail fast instead of waiting for their full timeout. After a cool-down a single
+probe call is let through (half-open); its outcome decides whether the breaker closes again.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from enum import StrEnum
+
+from prometheus_client import Counter
+
+from common.core.config_service import config_service
+from common.utils import JsonModel, get_logger
+
+logger = get_logger()
+
+llm_circuit_transitions = Counter("llm_circuit_transitions", "LLM circuit breaker state transitions", ["provider", "model", "state"])
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreakerSettings(JsonModel):
+    """Thresholds shared by all breakers."""
+
+    window_size: int = 20
+    min_calls: int = 10
+    failure_rate_threshold: float = 0.5
+    slow_call_threshold_s: float = 60.0
+    slow_call_rate_threshold: float = 0.5
+    open_duration_s: float = 30.0
+
+    @classmethod
+    def from_config(cls) -> CircuitBreakerSettings:
+        return cls(
+            window_size=int(config_service.get("llm.circuit_breaker.window_size", 20)),
+            min_calls=int(config_service.get("llm.circuit_breaker.min_calls", 10)),
+            failure_rate_threshold=float(config_service.get("llm.circuit_breaker.failure_rate_threshold", 0.5)),
+            slow_call_threshold_s=float(config_service.get("llm.circuit_breaker.slow_call_threshold_s", 60.0)),
+            slow_call_rate_threshold=float(config_service.get("llm.circuit_breaker.slow_call_rate_threshold", 0.5)),
+            open_duration_s=float(config_service.get("llm.circuit_breaker.open_duration_s", 30.0)),
+        )
+
+
+class CircuitBreaker:
+    """Rolling-window breaker for a single (provider, model)."""
+
+    def __init__(self, provider: str, model: str, settings: CircuitBreakerSettings) -> None:
+        self.provider = provider
+        self.model = model
+        self.settings = settings
+        self.state = CircuitState.CLOSED
+        # (succeeded, latency in seconds) of the most recent calls
+        self._outcomes: deque[tuple[bool, float]] = deque(maxlen=settings.window_size)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Whether a call may go to the provider now; in half-open state only one probe is allowed."""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.settings.open_duration_s:
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def rejects_requests(self) -> bool:
+        """Whether a call would be turned away now, without taking the half-open probe.
+
+        Used to fail fast before waiting for a rate-limiter slot; the probe itself is only taken
+        by ``allow_request`` right before the provider call.
+        """
+        if self.state == CircuitState.OPEN:
+            return time.monotonic() - self._opened_at < self.settings.open_duration_s
+        return self.state == CircuitState.HALF_OPEN and self._probe_in_flight
+
+    def record_success(self, latency_s: float) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = False
+            if latency_s < self.settings.slow_call_threshold_s:
+                self._outcomes.clear()
+                self._transition(CircuitState.CLOSED)
+            else:
+                self._open()
+            return
+
+        self._outcomes.append((True, latency_s))
+        self._evaluate()
+
+    def record_failure(self, latency_s: float) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = False
+            self._open()
+            return
+
+        self._outcomes.append((False, latency_s))
+        self._evaluate()
+
+    def record_abandoned(self) -> None:
+        """The call was cancelled or failed for a reason unrelated to provider health."""
+        self._probe_in_flight = False
+
+    def p95_latency(self) -> float | None:
+        """95th percentile latency of recent successful calls, once there is enough data."""
+        latencies = sorted(latency for succeeded, latency in self._outcomes if succeeded)
+        if len(latencies) < self.settings.min_calls:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def _evaluate(self) -> None:
+        if len(self._outcomes) < self.settings.min_calls:
+            return
+        total = len(self._outcomes)
+        failures = sum(1 for succeeded, _ in self._outcomes if not succeeded)
+        slow = sum(1 for succeeded, latency in self._outcomes if succeeded and latency >= self.settings.slow_call_threshold_s)
+        if failures / total >= self.settings.failure_rate_threshold or slow / total >= self.settings.slow_call_rate_threshold:
+            logger.warning(
+                "LLM circuit breaker opened",
+                provider=self.provider,
+                model=self.model,
+                failures=failures,
+                slow_calls=slow,
+                window=total,
+            )
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self.state:
+            self.state = state
+            llm_circuit_transitions.labels(provider=self.provider, model=self.model, state=state.value).inc()
+
+
+class LLMCircuitBreakers:
+    """Registry of breakers keyed by (provider, model)."""
+
+    def __init__(self, settings: CircuitBreakerSettings | None = None) -> None:
+        self.settings = settings or CircuitBreakerSettings.from_config()
+        self._breakers: dict[tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, provider: str, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get((provider, model))
+        if breaker is None:
+            breaker = CircuitBreaker(provider=provider, model=model, settings=self.settings)
+            self._breakers[(provider, model)] = breaker
+        return breaker
+
+    @staticmethod
+    def is_provider_failure(error: Exception) -> bool:
+        """Server errors, timeouts and connection failures count; client errors and rate limits do not."""
+        status_code = getattr(error, "status_code", None)
+        return not isinstance(status_code, int) or status_code >= 500 or status_code == 408
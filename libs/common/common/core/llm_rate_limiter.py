@@ -0,0 +1,290 @@
+"""Shared concurrency and rate limiting for LLM provider calls.
+
+Every call to a provider goes through a limiter keyed by (provider, api-key fingerprint, model).
+Each limiter combines an adaptive concurrency limit with optional request-per-minute and
+token-per-minute buckets. Rate-limit responses (429) halve the concurrency limit, slow the
+buckets down and pause the key until ``Retry-After`` has passed; successful calls grow the
+limit back one slot at a time (AIMD), so many games sharing one key converge on the
+provider's ceiling instead of retrying in lockstep.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from common.core.config_service import config_service
+from common.utils import JsonModel, get_logger
+from common.utils.utils import latency_buckets_2m
+
+logger = get_logger()
+
+llm_queue_wait = Histogram("llm_queue_wait", "Time LLM calls waited for a rate-limiter slot", ["provider", "model"], buckets=latency_buckets_2m)
+llm_throttled = Counter("llm_throttled", "LLM calls rejected by the provider with a rate-limit error", ["provider", "model"])
+llm_in_flight = Gauge("llm_in_flight", "LLM calls currently holding a rate-limiter slot", ["provider", "model"])
+
+# Rough chars-per-token ratio used to estimate prompt size before the provider reports usage
+_CHARS_PER_TOKEN = 4
+
+
+class RateLimitSettings(JsonModel):
+    """Limits applied to each (provider, key, model) combination."""
+
+    max_concurrency: int = 32
+    min_concurrency: int = 1
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    default_retry_after_s: float = 5.0
+    # Bucket rates never adapt below this fraction of the configured rate
+    min_rate_fraction: float = 0.25
+
+    @classmethod
+    def from_config(cls) -> RateLimitSettings:
+        rpm = config_service.get("llm.rate_limit.requests_per_minute")
+        tpm = config_service.get("llm.rate_limit.tokens_per_minute")
+        return cls(
+            max_concurrency=int(config_service.get("llm.rate_limit.max_concurrency", 32)),
+            requests_per_minute=int(rpm) if rpm else None,
+            tokens_per_minute=int(tpm) if tpm else None,
+            default_retry_after_s=float(config_service.get("llm.rate_limit.default_retry_after_s", 5.0)),
+        )
+
+
+class RateLimiterStats(JsonModel):
+    """Point-in-time view of a single limiter."""
+
+    provider: str
+    model: str
+    key_fingerprint: str
+    concurrency_limit: int
+    in_flight: int
+    waiting: int
+    requests: int
+    throttled: int
+    total_queue_wait_s: float
+    blocked_for_s: float
+
+
+class _TokenBucket:
+    """Per-minute budget refilled continuously; the rate can be scaled down and back up."""
+
+    def __init__(self, per_minute: int, min_fraction: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate_fraction = 1.0
+        self.min_fraction = min_fraction
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def rate_per_second(self) -> float:
+        return self.capacity * self.rate_fraction / 60.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` from the bucket and return how long to wait until it is covered."""
+        self._refill()
+        # A single request larger than the whole bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        self._tokens -= amount
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_second
+
+    def adjust(self, delta: float) -> None:
+        """Correct a reservation once the real size is known (positive delta consumes more)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - delta)
+
+    def slow_down(self) -> None:
+        self.rate_fraction = max(self.min_fraction, self.rate_fraction * 0.75)
+
+    def speed_up(self) -> None:
+        self.rate_fraction = min(1.0, self.rate_fraction + 0.05)
+
+
+class ProviderRateLimiter:
+    """Adaptive limiter for a single (provider, key, model) combination."""
+
+    def __init__(self, provider: str, model: str, key_fingerprint: str, settings: RateLimitSettings) -> None:
+        self.provider = provider
+        self.model = model
+        self.key_fingerprint = key_fingerprint
+        self.settings = settings
+        self._limit = settings.max_concurrency
+        self._in_flight = 0
+        self._waiting = 0
+        self._successes_since_change = 0
+        self._blocked_until = 0.0
+        self._condition = asyncio.Condition()
+        self._requests_bucket = _TokenBucket(settings.requests_per_minute, settings.min_rate_fraction) if settings.requests_per_minute else None
+        self._tokens_bucket = _TokenBucket(settings.tokens_per_minute, settings.min_rate_fraction) if settings.tokens_per_minute else None
+        self._requests = 0
+        self._throttled = 0
+        self._total_queue_wait_s = 0.0
+        self._labels = {"provider": provider, "model": model}
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """Wait for capacity, hold a concurrency slot for the duration of the call."""
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._in_flight < self._limit)
+                self._in_flight += 1
+        finally:
+            self._waiting -= 1
+
+        try:
+            await self._wait_for_budget(estimated_tokens)
+            waited = time.monotonic() - started
+            self._requests += 1
+            self._total_queue_wait_s += waited
+            llm_queue_wait.labels(**self._labels).observe(waited)
+            llm_in_flight.labels(**self._labels).inc()
+            try:
+                yield
+            finally:
+                llm_in_flight.labels(**self._labels).dec()
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    async def _wait_for_budget(self, estimated_tokens: int) -> None:
+        delay = max(0.0, self._blocked_until - time.monotonic())
+        if self._requests_bucket:
+            delay = max(delay, self._requests_bucket.reserve(1))
+        if self._tokens_bucket:
+            delay = max(delay, self._tokens_bucket.reserve(estimated_tokens))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_success(self, estimated_tokens: int, actual_tokens: int | None) -> None:
+        """Grow the concurrency limit additively and settle the token reservation."""
+        if self._tokens_bucket and actual_tokens is not None:
+            self._tokens_bucket.adjust(actual_tokens - estimated_tokens)
+
+        self._successes_since_change += 1
+        if self._successes_since_change >= self._limit:
+            self._successes_since_change = 0
+            for bucket in (self._requests_bucket, self._tokens_bucket):
+                if bucket:
+                    bucket.speed_up()
+            if self._limit < self.settings.max_concurrency:
+                self._set_limit(self._limit + 1)
+
+    def record_throttled(self, retry_after_s: float | None) -> float:
+        """Back off after a rate-limit response; returns how long the key is paused for."""
+        self._throttled += 1
+        llm_throttled.labels(**self._labels).inc()
+
+        pause = retry_after_s if retry_after_s is not None else self.settings.default_retry_after_s
+        self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        self._successes_since_change = 0
+        for bucket in (self._requests_bucket, self._tokens_bucket):
+            if bucket:
+                bucket.slow_down()
+        self._set_limit(max(self.settings.min_concurrency, self._limit // 2))
+
+        logger.warning(
+            "LLM provider rate limited, backing off",
+            provider=self.provider,
+            model=self.model,
+            key=self.key_fingerprint,
+            retry_after_s=pause,
+            concurrency_limit=self._limit,
+        )
+        return pause
+
+    def _set_limit(self, limit: int) -> None:
+        self._limit = limit
+        # A larger limit may admit waiters immediately; wake them up to re-check
+        if self._waiting:
+            asyncio.get_running_loop().create_task(self._notify_waiters())
+
+    async def _notify_waiters(self) -> None:
+        async with self._condition:
+            self._condition.notify_all()
+
+    def stats(self) -> RateLimiterStats:
+        return RateLimiterStats(
+            provider=self.provider,
+            model=self.model,
+            key_fingerprint=self.key_fingerprint,
+            concurrency_limit=self._limit,
+            in_flight=self._in_flight,
+            waiting=self._waiting,
+            requests=self._requests,
+            throttled=self._throttled,
+            total_queue_wait_s=round(self._total_queue_wait_s, 3),
+            blocked_for_s=round(max(0.0, self._blocked_until - time.monotonic()), 3),
+        )
+
+
+class LLMRateLimiter:
+    """Registry of per-(provider, key, model) limiters shared by all callers in the process."""
+
+    def __init__(self, settings: RateLimitSettings | None = None) -> None:
+        self.settings = settings or RateLimitSettings.from_config()
+        self._limiters: dict[tuple[str, str, str], ProviderRateLimiter] = {}
+
+    @staticmethod
+    def fingerprint(secret: str) -> str:
+        """Short stable identifier for an API key that does not reveal it."""
+        return hashlib.sha256(secret.encode()).hexdigest()[:12] if secret else "default"
+
+    def get(self, provider: str, model: str, secret: str) -> ProviderRateLimiter:
+        fingerprint = self.fingerprint(secret)
+        key = (provider, fingerprint, model)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = ProviderRateLimiter(provider=provider, model=model, key_fingerprint=fingerprint, settings=self.settings)
+            self._limiters[key] = limiter
+        return limiter
+
+    def stats(self) -> list[RateLimiterStats]:
+        return [limiter.stats() for limiter in self._limiters.values()]
+
+    @staticmethod
+    def estimate_tokens(messages: list[dict[str, Any]], max_tokens: int | None) -> int:
+        """Estimate prompt plus completion tokens for budget purposes."""
+        chars = 0
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str):
+                chars += len(content)
+            elif isinstance(content, list):
+                chars += sum(len(block.get("text", "")) for block in content if isinstance(block, dict))
+        return chars // _CHARS_PER_TOKEN + (max_tokens or 0)
+
+    @staticmethod
+    def retry_after(error: Exception) -> float | None:
+        """Retry-After from a provider error, in seconds, if it carries one."""
+        headers: Any = getattr(error, "headers", None)
+        if not headers:
+            response = getattr(error, "response", None)
+            headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            if value := headers.get("retry-after-ms"):
+                return float(value) / 1000
+            if value := headers.get("retry-after"):
+                return float(value)
+        except (TypeError, ValueError):
+            return None
+        return None
+
+    @staticmethod
+    def is_rate_limit_error(error: Exception) -> bool:
+        return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
@@ -0,0 +1,41 @@
+"""Attribution of LLM calls to the user, agent and game they are billed to.
+
+Callers that trigger LLM calls enter an ``LLMUsageScope``; ``LiteLLMService`` reads the scope of
+the current task and hands a usage record to its sink after each completion. Calls made outside
+a scope are not recorded.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextvars import ContextVar
+
+from common.ids import AgentVersionId, GameId, TestScenarioId, ToolId, UserId
+from common.utils import ContextVarManager, JsonModel, use_context_var
+from shared_db.models.llm_enums import LLMUsageScenario
+from shared_db.schemas.llm_usage import LLMUsageCreate
+
+# Receives each completed call's usage; must not block (LiteLLMService calls it inline)
+LLMUsageSink = Callable[[LLMUsageCreate], None]
+
+
+class LLMUsageScope(JsonModel):
+    """Who an LLM call is billed to and what it was made for."""
+
+    scenario: LLMUsageScenario
+    user_id: UserId
+    agent_version_id: AgentVersionId | None = None
+    game_id: GameId | None = None
+    tool_id: ToolId | None = None
+    test_scenario_id: TestScenarioId | None = None
+
+    def use(self) -> ContextVarManager[LLMUsageScope]:
+        """Attribute the LLM calls made inside the context to this scope."""
+        return use_context_var(_scope_var, self)
+
+    @staticmethod
+    def get_or_none() -> LLMUsageScope | None:
+        return _scope_var.get(None)
+
+
+_scope_var: ContextVar[LLMUsageScope] = ContextVar("llm_usage_scope")
@@ -4,6 +4,7 @@ import asyncio
 import os
 import time
 from collections.abc import Callable
+from contextlib import suppress
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any, override
 
@@ -28,6 +29,8 @@ if TYPE_CHECKING:
 _DEFAULT_VISIBILITY_TIMEOUT = timedelta(seconds=int(os.getenv("SQS_VISIBILITY_TIMEOUT", "60")))
 _DEFAULT_WAIT_TIME = timedelta(seconds=20)
 _DEFAULT_MAX_MESSAGES = 10
+# Pause before receiving again after a failed ReceiveMessage, so an outage is not hammered
+_RECEIVE_RETRY_DELAY = timedelta(seconds=1)
 
 messages_polled = Histogram("messages_polled", "Amount of SQS messages polled in a single request", ["name"], buckets=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
 messages_in_progress = Gauge("messages_in_progress", "Amount of SQS messages being handled at the moment", ["name"])
@@ -41,6 +44,11 @@ class SqsClientConfig(JsonModel):
     visibility_timeout: timedelta = _DEFAULT_VISIBILITY_TIMEOUT
     wait_time: timedelta = _DEFAULT_WAIT_TIME
     max_messages: int = _DEFAULT_MAX_MESSAGES
+    # When set, the poller keeps receiving while up to this many messages are being handled,
+    # instead of waiting for each received batch to finish
+    max_in_flight: int | None = None
+    # Keep extending a message's visibility while its handler runs, so long jobs are not redelivered
+    extend_visibility: bool = False
 
 
 class SqsMessage[T](JsonModel):
@@ -139,7 +147,10 @@ class SqsClient[T](Lifecycle):
         assert self._poll_handler, "Internal error: _poll_loop called without _poll_handler"
         while self._is_running:
             try:
-                await self.poll_and_handle(self._poll_handler)
+                if self._config.max_in_flight:
+                    await self.poll_and_dispatch(self._poll_handler, self._config.max_in_flight)
+                else:
+                    await self.poll_and_handle(self._poll_handler)
             except Exception as e:
                 logger.exception(f"{self._name_for_log} Error in poll loop!", exc_info=e)
 
@@ -155,35 +166,93 @@ class SqsClient[T](Lifecycle):
         wait_time = wait_time or self._config.wait_time
         max_messages = max_messages or self._config.max_messages
         while True:
-            response = await self._aws_manager.sqs_client.receive_message(
-                QueueUrl=self._config.queue_url,
-                VisibilityTimeout=int(visibility_timeout.total_seconds()),
-                WaitTimeSeconds=int(wait_time.total_seconds()),
-                MaxNumberOfMessages=max_messages,
-                AttributeNames=["All"],
-                MessageAttributeNames=["All"],
-            )
-            if not self._is_running or "Messages" not in response:
-                return
-
-            messages = response["Messages"]
-            self._messages_polled.observe(len(messages))
-            (logger.info if len(messages) >= 1 else logger.debug)(
-                f"{self._name_for_log} Polled {len(messages)} messages",
-                message_count=len(messages),
-            )
-
+            messages = await self._receive(visibility_timeout, wait_time, max_messages)
             if not messages:
                 return
             elif len(messages) == 1:
-                await self._handle(messages[0], handler)
+                await self._handle(messages[0], handler, visibility_timeout)
             elif len(messages) > 1:
-                _ = await asyncio.gather(*[self._handle(message, handler) for message in messages], return_exceptions=True)
+                _ = await asyncio.gather(*[self._handle(message, handler, visibility_timeout) for message in messages], return_exceptions=True)
 
             if not handle_all_available:
                 return
 
-    async def _handle(self, raw_message: MessageTypeDef, handler: Callable[[T, RequestContext], Awaitable[None]]) -> None:
+    async def poll_and_dispatch(
+        self,
+        handler: Callable[[T, RequestContext], Awaitable[Any]],
+        max_in_flight: int,
+    ) -> None:
+        """Receive messages whenever fewer than ``max_in_flight`` are being handled.
+
+        Unlike ``poll_and_handle``, a slow message does not hold back the rest of its batch:
+        new messages are received as soon as a slot frees up. Runs until the client stops;
+        messages still being handled are cancelled when the loop stops or is cancelled. A failed
+        receive is retried after a short pause and leaves the running handlers alone.
+        """
+        in_flight: set[asyncio.Task[None]] = set()
+        try:
+            while self._is_running:
+                if len(in_flight) >= max_in_flight:
+                    _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                try:
+                    messages = await self._receive(
+                        self._config.visibility_timeout,
+                        self._config.wait_time,
+                        min(self._config.max_messages, max_in_flight - len(in_flight)),
+                    )
+                except Exception:
+                    logger.exception(f"{self._name_for_log} Error receiving SQS messages!", in_flight=len(in_flight))
+                    await asyncio.sleep(_RECEIVE_RETRY_DELAY.total_seconds())
+                    continue
+                for message in messages:
+                    task = asyncio.create_task(self._handle(message, handler, self._config.visibility_timeout))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+        finally:
+            for task in in_flight:
+                _ = task.cancel()
+            _ = await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _receive(self, visibility_timeout: timedelta, wait_time: timedelta, max_messages: int) -> list[MessageTypeDef]:
+        response = await self._aws_manager.sqs_client.receive_message(
+            QueueUrl=self._config.queue_url,
+            VisibilityTimeout=int(visibility_timeout.total_seconds()),
+            WaitTimeSeconds=int(wait_time.total_seconds()),
+            MaxNumberOfMessages=max_messages,
+            AttributeNames=["All"],
+            MessageAttributeNames=["All"],
+        )
+        if not self._is_running or "Messages" not in response:
+            return []
+
+        messages = response["Messages"]
+        self._messages_polled.observe(len(messages))
+        (logger.info if len(messages) >= 1 else logger.debug)(
+            f"{self._name_for_log} Polled {len(messages)} messages",
+            message_count=len(messages),
+        )
+        return messages
+
+    async def _keep_visible(self, receipt_handle: str, visibility_timeout: timedelta) -> None:
+        """Extend a message's visibility every half timeout while it is being handled."""
+        while True:
+            await asyncio.sleep(visibility_timeout.total_seconds() / 2)
+            try:
+                _ = await self._aws_manager.sqs_client.change_message_visibility(
+                    QueueUrl=self._config.queue_url,
+                    ReceiptHandle=receipt_handle,
+                    VisibilityTimeout=int(visibility_timeout.total_seconds()),
+                )
+            except Exception:
+                logger.exception(f"{self._name_for_log} Error extending SQS message visibility!")
+
+    async def _handle(
+        self,
+        raw_message: MessageTypeDef,
+        handler: Callable[[T, RequestContext], Awaitable[None]],
+        visibility_timeout: timedelta | None = None,
+    ) -> None:
         with self._messages_in_progress.track_inprogress(), RequestContext.context() as request_context:
             assert "Body" in raw_message
 
@@ -192,6 +261,9 @@ class SqsClient[T](Lifecycle):
             start = time.perf_counter()
             error: Exception | None = None
             message: SqsMessage[T] | None = None
+            keep_visible: asyncio.Task[None] | None = None
+            if self._config.extend_visibility and "ReceiptHandle" in raw_message:
+                keep_visible = asyncio.create_task(self._keep_visible(raw_message["ReceiptHandle"], visibility_timeout or self._config.visibility_timeout))
             try:
                 # Instead of directly validating the model from json with .model_validate_json, first parse it into a python dict and then validate.
                 # This may seem redundant, but pydantic has issues with type unions when directly validating from json, but not from a python dict.
@@ -204,6 +276,11 @@ class SqsClient[T](Lifecycle):
                     # await SlackNotifier.instance().send_error_message(error=e, channel=channel)
                     pass
                 error = e
+            finally:
+                if keep_visible is not None:
+                    _ = keep_visible.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await keep_visible
 
             elapsed: float
             if not error or not should_retry_exception(error):
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Any
 from msgspec import Struct
 from pydantic import AnyHttpUrl, AnyUrl, EmailStr, Json
 from sqlalchemy import JSON, BigInteger, Date, DateTime, Dialect, MetaData, String, TypeDecorator
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.dialects.postgresql import JSONB as PG_JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import registry
@@ -18,6 +19,7 @@ from common.utils.tsid import TSID
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Dialect
+    from sqlalchemy.sql._typing import _DMLTableArgument  # pyright: ignore[reportPrivateUsage]
     from sqlalchemy.sql.schema import _NamingSchemaParameter as NamingSchemaParameter  # pyright: ignore[reportPrivateUsage]
     from sqlalchemy.types import TypeEngine
 
@@ -145,3 +147,14 @@ async def use_session(session: AsyncSession) -> AsyncGenerator[AsyncSession]:
     except Exception as e:
         await session.rollback()
         raise e
+
+
+def dialect_insert(session: AsyncSession, table: _DMLTableArgument) -> postgresql.Insert | sqlite.Insert:
+    """Create an INSERT construct for the session's dialect.
+
+    Both PostgreSQL and SQLite inserts support ``on_conflict_do_nothing`` / ``on_conflict_do_update``,
+    which lets callers write idempotent inserts that work in production and in SQLite tests alike.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
@@ -23,3 +23,5 @@ LLMIntegrationId = NewType("LLMIntegrationId", TSID)
 LLMUsageId = NewType("LLMUsageId", TSID)
 EventId = NewType("EventId", TSID)
 ErrorReportId = NewType("ErrorReportId", TSID)
+PositionEvaluationId = NewType("PositionEvaluationId", TSID)
+MoveNarrativeId = NewType("MoveNarrativeId", TSID)
@@ -0,0 +1,211 @@
+"""Incremental scanning of a JSON object streamed in chunks.
+
+The scanner follows the top level of a single JSON object as text arrives and reports each
+top-level field as soon as its value is complete, so callers can act on early fields while
+later ones are still being generated. Structural errors are reported as soon as they are
+seen instead of after the whole response has been received.
+
+Example usage:
+    partial = PartialJsonObject()
+    partial.feed('{"move": {"action": "call"}, "chatMess')  # -> ["move"]
+    partial.fields["move"]  # '{"action": "call"}'
+    partial.pending_string("chatMessage")  # None until its value has started
+"""
+
+from __future__ import annotations
+
+import json
+from enum import Enum, auto
+from typing import Any
+
+
+class MalformedJsonError(ValueError):
+    """The streamed text cannot be (the start of) a JSON object."""
+
+
+class _State(Enum):
+    BEFORE_OBJECT = auto()
+    EXPECT_KEY = auto()
+    IN_KEY = auto()
+    EXPECT_COLON = auto()
+    BEFORE_VALUE = auto()
+    IN_STRING_VALUE = auto()
+    IN_NESTED_VALUE = auto()
+    IN_SCALAR_VALUE = auto()
+    AFTER_VALUE = auto()
+    DONE = auto()
+
+
+_WHITESPACE = " \t\r\n"
+_SCALAR_START = "-0123456789tfn"
+
+
+class PartialJsonObject:
+    """Scanner for one streamed JSON object; feed it text chunks in order."""
+
+    def __init__(self, max_preamble_chars: int = 200) -> None:
+        """Initialize the scanner.
+
+        Args:
+            max_preamble_chars: Text allowed before the opening brace (e.g. a code fence) before the output counts as malformed
+        """
+        self.max_preamble_chars = max_preamble_chars
+        # Raw JSON text of every top-level value that is complete, by key
+        self.fields: dict[str, str] = {}
+        self._text = ""
+        self._pos = 0
+        self._state = _State.BEFORE_OBJECT
+        self._object_start = -1
+        self._object_end = -1
+        self._token_start = 0
+        self._key: str | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def complete(self) -> bool:
+        """Whether the closing brace of the object has been seen."""
+        return self._state == _State.DONE
+
+    @property
+    def object_text(self) -> str | None:
+        """The object without any surrounding text, once complete."""
+        return self._text[self._object_start : self._object_end] if self.complete else None
+
+    def value(self, key: str) -> Any:
+        """Decoded value of a completed field, or None."""
+        raw = self.fields.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def pending_string(self, key: str) -> str | None:
+        """Text received so far of a string field that is still being streamed."""
+        if self._state != _State.IN_STRING_VALUE or self._key != key:
+            return None
+        partial = self._text[self._token_start : self._pos]
+        # Drop a trailing incomplete escape sequence so the prefix decodes
+        for cut in range(min(6, len(partial)) + 1):
+            try:
+                return str(json.loads('"' + partial[: len(partial) - cut] + '"'))
+            except json.JSONDecodeError:
+                continue
+        return None
+
+    def feed(self, chunk: str) -> list[str]:
+        """Scan the next chunk of text.
+
+        Returns:
+            Keys whose values were completed by this chunk
+
+        Raises:
+            MalformedJsonError: If the text so far cannot be a JSON object
+        """
+        self._text += chunk
+        completed: list[str] = []
+        text = self._text
+        while self._pos < len(text) and self._state != _State.DONE:
+            char = text[self._pos]
+            state = self._state
+
+            if state == _State.BEFORE_OBJECT:
+                if char == "{":
+                    self._object_start = self._pos
+                    self._state = _State.EXPECT_KEY
+                elif self._pos >= self.max_preamble_chars:
+                    raise MalformedJsonError(f"No JSON object in the first {self.max_preamble_chars} characters")
+            elif state == _State.EXPECT_KEY:
+                if char == '"':
+                    self._token_start = self._pos
+                    self._escaped = False
+                    self._state = _State.IN_KEY
+                elif char == "}" and not self.fields and self._key is None:
+                    self._finish_object()
+                elif char not in _WHITESPACE:
+                    raise MalformedJsonError(f"Expected a key at position {self._pos}, got {char!r}")
+            elif state == _State.IN_KEY:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._key = self._decode(text[self._token_start : self._pos + 1])
+                    self._state = _State.EXPECT_COLON
+            elif state == _State.EXPECT_COLON:
+                if char == ":":
+                    self._state = _State.BEFORE_VALUE
+                elif char not in _WHITESPACE:
+                    raise MalformedJsonError(f"Expected ':' at position {self._pos}, got {char!r}")
+            elif state == _State.BEFORE_VALUE:
+                if char not in _WHITESPACE:
+                    self._token_start = self._pos
+                    if char == '"':
+                        self._escaped = False
+                        self._state = _State.IN_STRING_VALUE
+                        # The decoded prefix of a pending string starts after the quote
+                        self._token_start = self._pos + 1
+                    elif char in "{[":
+                        self._depth = 1
+                        self._in_string = False
+                        self._escaped = False
+                        self._state = _State.IN_NESTED_VALUE
+                    elif char in _SCALAR_START:
+                        self._state = _State.IN_SCALAR_VALUE
+                    else:
+                        raise MalformedJsonError(f"Unexpected value start at position {self._pos}: {char!r}")
+            elif state == _State.IN_STRING_VALUE:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    completed.append(self._complete_value(text[self._token_start - 1 : self._pos + 1]))
+            elif state == _State.IN_NESTED_VALUE:
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == "\\":
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        completed.append(self._complete_value(text[self._token_start : self._pos + 1]))
+            elif state == _State.IN_SCALAR_VALUE:
+                if char in _WHITESPACE or char in ",}":
+                    completed.append(self._complete_value(text[self._token_start : self._pos]))
+                    # Re-scan the delimiter as the character following the value
+                    continue
+            elif state == _State.AFTER_VALUE:
+                if char == ",":
+                    self._key = None
+                    self._state = _State.EXPECT_KEY
+                elif char == "}":
+                    self._finish_object()
+                elif char not in _WHITESPACE:
+                    raise MalformedJsonError(f"Expected ',' or '}}' at position {self._pos}, got {char!r}")
+
+            self._pos += 1
+        return completed
+
+    def _complete_value(self, raw: str) -> str:
+        self._decode(raw)
+        key = self._key or ""
+        self.fields[key] = raw
+        self._state = _State.AFTER_VALUE
+        return key
+
+    def _finish_object(self) -> None:
+        self._object_end = self._pos + 1
+        self._state = _State.DONE
+
+    @staticmethod
+    def _decode(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise MalformedJsonError(f"Invalid JSON value {raw[:80]!r}: {e.msg}") from e
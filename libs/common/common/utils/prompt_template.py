@@ -0,0 +1,185 @@
+"""Precompiled ``${{variable.path}}`` prompt templates.
+
+Agent instructions are rendered on every turn, so instead of scanning the template text
+each time it is compiled once into a render plan: literal chunks interleaved with
+pre-parsed variable paths. Paths are resolved directly against Pydantic models (by field
+name or camelCase alias), dicts and lists, so rendering never needs a full ``to_dict`` of
+the game state.
+
+Example usage:
+    template = compile_prompt_template("You have ${{chips}} chips, pot is ${{pot}}")
+    result = template.render(lambda root: {"chips": 900, "pot": 150}.get(root))
+    # Result: "You have 900 chips, pot is 150"
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+VARIABLE_PATTERN = re.compile(r"\$\{\{([^}]+)\}\}")
+
+# Sentinel for paths that do not resolve; distinct from a legitimately falsy value
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class PathSegment:
+    """One dot-separated step of a variable path, optionally indexed (``players[0]``)."""
+
+    key: str
+    index: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateVariable:
+    """A ``${{...}}`` reference with its path parsed at compile time."""
+
+    path: str
+    segments: tuple[PathSegment, ...]
+
+    @property
+    def placeholder(self) -> str:
+        """Text left in the output when the variable cannot be resolved."""
+        return f"${{{self.path}}}"
+
+
+@dataclass(frozen=True, slots=True)
+class PromptTemplate:
+    """Render plan of a template: literal strings and variables, in order."""
+
+    chunks: tuple[str | TemplateVariable, ...]
+
+    @property
+    def variables(self) -> list[str]:
+        """Variable paths referenced by the template, in order of appearance."""
+        return [chunk.path for chunk in self.chunks if isinstance(chunk, TemplateVariable)]
+
+    @property
+    def root_names(self) -> set[str]:
+        """First path segment of every variable."""
+        return {chunk.segments[0].key for chunk in self.chunks if isinstance(chunk, TemplateVariable) and chunk.segments}
+
+    def render(self, resolve_root: Callable[[str], Any]) -> str:
+        """Render the template.
+
+        Args:
+            resolve_root: Returns the object for a path's first segment, or None if unknown
+
+        Returns:
+            Rendered text; unresolved variables are left as their placeholder
+        """
+        parts: list[str] = []
+        for chunk in self.chunks:
+            if isinstance(chunk, str):
+                parts.append(chunk)
+                continue
+
+            value = resolve_path(resolve_root, chunk.segments) if chunk.segments else _MISSING
+            parts.append(chunk.placeholder if value is _MISSING or value is None else _format_value(value))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compile_prompt_template(template: str) -> PromptTemplate:
+    """Compile a template once; repeated calls with the same text return the cached plan."""
+    chunks: list[str | TemplateVariable] = []
+    position = 0
+    for match in VARIABLE_PATTERN.finditer(template):
+        if match.start() > position:
+            chunks.append(template[position : match.start()])
+        path = match.group(1).strip()
+        chunks.append(TemplateVariable(path=path, segments=_parse_path(path)))
+        position = match.end()
+    if position < len(template):
+        chunks.append(template[position:])
+    return PromptTemplate(chunks=tuple(chunks))
+
+
+def resolve_path(resolve_root: Callable[[str], Any], segments: Sequence[PathSegment]) -> Any:
+    """Walk pre-parsed path segments starting from the object returned for the first key."""
+    value: Any = _MISSING
+    for i, segment in enumerate(segments):
+        value = resolve_root(segment.key) if i == 0 else _lookup(value, segment.key)
+        if value is None or value is _MISSING:
+            return _MISSING
+        if segment.index is not None:
+            value = _index(value, segment.index)
+            if value is _MISSING:
+                return _MISSING
+    return value
+
+
+def get_field(value: Any, key: str) -> Any:
+    """Look up a single key on a model, mapping or custom-serialized model; None if absent."""
+    found = _lookup(value, key)
+    return None if found is _MISSING else found
+
+
+def _parse_path(path: str) -> tuple[PathSegment, ...]:
+    """Parse ``a.b[0].c`` into segments; malformed paths compile to no segments and never resolve."""
+    segments: list[PathSegment] = []
+    for part in path.split("."):
+        if "[" in part and part.endswith("]"):
+            key, _, index_str = part[:-1].partition("[")
+            try:
+                segments.append(PathSegment(key=key, index=int(index_str)))
+            except ValueError:
+                return ()
+        else:
+            segments.append(PathSegment(key=part))
+    return tuple(segments)
+
+
+def _lookup(value: Any, key: str) -> Any:
+    if isinstance(value, BaseModel):
+        model_type = type(value)
+        if _has_custom_serializer(model_type):
+            # The serialized shape differs from the fields; look the key up in what the prompt would see
+            return _lookup(to_jsonable_python(value, by_alias=True, exclude_none=True), key)
+        field_name = _field_names(model_type).get(key)
+        return getattr(value, field_name) if field_name is not None else _MISSING
+    if isinstance(value, Mapping):
+        if key in value:
+            return value[key]
+        # Non-string keys (e.g. enums) are compared in their serialized form
+        return next((item for k, item in value.items() if to_jsonable_python(k) == key), _MISSING)
+    return _MISSING
+
+
+def _index(value: Any, index: int) -> Any:
+    if isinstance(value, BaseModel) and _has_custom_serializer(type(value)):
+        value = to_jsonable_python(value, by_alias=True, exclude_none=True)
+    if isinstance(value, Sequence) and not isinstance(value, str) and 0 <= index < len(value):
+        return value[index]
+    return _MISSING
+
+
+@lru_cache(maxsize=512)
+def _field_names(model_type: type[BaseModel]) -> dict[str, str]:
+    """Map both field names and aliases to field names for a model class."""
+    names: dict[str, str] = {}
+    for name, field in model_type.model_fields.items():
+        names[name] = name
+        if field.alias:
+            names[field.alias] = name
+        if field.serialization_alias:
+            names[field.serialization_alias] = name
+    return names
+
+
+@lru_cache(maxsize=512)
+def _has_custom_serializer(model_type: type[BaseModel]) -> bool:
+    return bool(model_type.__pydantic_decorators__.model_serializers)
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, str | int | float | bool):
+        return str(value)
+    return str(to_jsonable_python(value, by_alias=True, exclude_none=True))
@@ -11,12 +11,13 @@ Example usage:
     # Result: "Player John has 1000 chips"
 """
 
-import re
+from functools import lru_cache
 from typing import Any
 
-from jinja2 import Environment, TemplateError, Undefined, UndefinedError
+from jinja2 import Environment, Template, TemplateError, Undefined, UndefinedError
 from pydantic import BaseModel
 
+from common.utils.prompt_template import VARIABLE_PATTERN, compile_prompt_template
 from common.utils.utils import get_logger
 
 logger = get_logger(__name__)
@@ -64,19 +65,8 @@ def substitute_template_variables(
         else:
             template_data = data or {}
 
-        # Convert ${{variable}} to {{variable}} for Jinja2
-        jinja_template_str = _convert_template_syntax(template)
-
-        # Create Jinja2 environment with appropriate settings
-        env = Environment(
-            # Don't auto-escape HTML since we're not rendering HTML
-            autoescape=False,
-            # Handle undefined variables based on strict mode
-            undefined=_StrictUndefined if strict else _SilentUndefined,
-        )
-
-        # Create and render template
-        jinja_template = env.from_string(jinja_template_str)
+        # Compiled templates are cached, so repeated renders of the same text skip parsing
+        jinja_template = _compile_template(template, strict)
         result = jinja_template.render(**template_data)
 
         logger.debug(f"Template substitution successful: {len(template)} chars -> {len(result)} chars")
@@ -101,6 +91,23 @@ def substitute_template_variables(
         return template
 
 
+@lru_cache(maxsize=2)
+def _get_environment(strict: bool) -> Environment:
+    """Shared Jinja2 environment for the given undefined-variable mode."""
+    return Environment(
+        # Don't auto-escape HTML since we're not rendering HTML
+        autoescape=False,
+        # Handle undefined variables based on strict mode
+        undefined=_StrictUndefined if strict else _SilentUndefined,
+    )
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str, strict: bool) -> Template:
+    """Convert ${{variable}} to {{variable}} and compile it once per template text and mode."""
+    return _get_environment(strict).from_string(_convert_template_syntax(template))
+
+
 def _convert_template_syntax(template: str) -> str:
     """Convert ${{variable}} syntax to {{variable}} for Jinja2.
 
@@ -112,8 +119,7 @@ def _convert_template_syntax(template: str) -> str:
     """
     # Replace ${{variable}} with {{variable}}
     # Use a more precise regex to avoid issues with nested braces
-    pattern = r"\$\{\{([^}]+)\}\}"
-    jinja_template = re.sub(pattern, r"{{\1}}", template)
+    jinja_template = VARIABLE_PATTERN.sub(r"{{\1}}", template)
 
     return jinja_template
 
@@ -155,9 +161,8 @@ def validate_template_variables(
         return True, [], []
 
     try:
-        # Extract all variable references from template
-        pattern = r"\$\{\{([^}]+)\}\}"
-        variable_refs = re.findall(pattern, template)
+        # Extract all variable references from the (cached) compiled template
+        variable_refs = compile_prompt_template(template).variables
 
         if not variable_refs:
             return True, [], []
@@ -172,13 +177,9 @@ def validate_template_variables(
         found_vars: list[str] = []
 
         for var_ref in variable_refs:
-            var_ref = var_ref.strip()
             try:
                 # Try to substitute just this variable to see if it exists
-                test_template = f"{{{{{var_ref}}}}}"
-                env = Environment(undefined=_StrictUndefined)
-                template_obj = env.from_string(test_template)
-                _ = template_obj.render(**data)
+                _ = _compile_template(f"${{{{{var_ref}}}}}", strict=True).render(**data)
                 found_vars.append(var_ref)
             except (TemplateError, UndefinedError):
                 missing_vars.append(var_ref)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import StrEnum
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, Literal, override
 
 import chess as _pychess
 from game_api import (
@@ -380,6 +380,17 @@ class ChessPossibleMove(JsonModel):
 class ChessPossibleMoves(BasePlayerPossibleMoves):
     possible_moves: list[ChessPossibleMove] = Field(default_factory=list)
 
+    @override
+    def allows(self, move: BasePlayerMoveData) -> bool:
+        if not isinstance(move, ChessMoveData):
+            return False
+        return any(
+            option.from_square == move.from_square
+            and option.to_square == move.to_square
+            and (move.promotion is None if not option.promotion else move.promotion in option.promotion)
+            for option in self.possible_moves
+        )
+
 
 # ----------------------------------
 # Events
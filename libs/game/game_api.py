@@ -284,6 +284,10 @@ class BasePlayerMoveData(JsonModel, ABC):
 class BasePlayerPossibleMoves(JsonModel, ABC):
     """Base player possible moves for all games."""
 
+    def allows(self, move: BasePlayerMoveData) -> bool:
+        """Quick check that a move is one of these options; the game env still validates it when applied."""
+        return True
+
 
 TConfig = TypeVar("TConfig", bound=BaseGameConfig)
 TState = TypeVar("TState", bound=BaseGameState)
@@ -453,6 +457,17 @@ class GameAnalysisHandler(Protocol):
         """
         ...
 
+    async def queue_game_analysis(self, game_id: GameId, game_type: GameType) -> None:
+        """Queue analysis of a whole game once it has finished.
+
+        Handlers that analyze moves live may treat this as a no-op.
+
+        Args:
+            game_id: The game ID
+            game_type: The type of game (chess, poker, etc.)
+        """
+        ...
+
 
 class GameEnv(ABC, Generic[TState, TPlayerView, TEvent, TPlayerMoveData, TConfig, TPossibleMoves]):  # noqa: UP046
     """Abstract base class for game-specific state updates."""
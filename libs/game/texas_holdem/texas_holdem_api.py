@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 from enum import IntEnum, StrEnum
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, Literal, override
 
 from game_api import (
     BaseAgentDecision,
@@ -490,6 +490,10 @@ class TexasHoldemPossibleMoves(BasePlayerPossibleMoves):
 
     possible_moves: list[TexasHoldemPossibleMove] = Field(..., description="List of possible moves")
 
+    @override
+    def allows(self, move: BasePlayerMoveData) -> bool:
+        return isinstance(move, TexasHoldemMoveData) and any(option.action == move.action for option in self.possible_moves)
+
 
 class TexasHoldemEventType(StrEnum):
     """Event types for Texas Hold'em events."""
@@ -0,0 +1,31 @@
+"""Add indexes for keyset pagination of game listings
+
+Revision ID: add_game_keyset_pagination_indexes
+Revises: add_game_event_archives_table
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_game_keyset_pagination_indexes"
+down_revision = "add_game_event_archives_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_game_players_user_game", "game_players", ["user_id", "game_id"])
+    op.create_index("idx_game_players_agent_version_game", "game_players", ["agent_version_id", "game_id"])
+    # Same ordering as the discovery listings: ORDER BY started_at DESC NULLS LAST, id DESC
+    op.create_index("idx_games_started_at_id", "games", [sa.text("started_at DESC NULLS LAST"), sa.text("id DESC")])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_games_started_at_id", table_name="games")
+    op.drop_index("idx_game_players_agent_version_game", table_name="game_players")
+    op.drop_index("idx_game_players_user_game", table_name="game_players")
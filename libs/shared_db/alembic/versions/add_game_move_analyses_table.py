@@ -0,0 +1,61 @@
+"""Add game_move_analyses index table
+
+Revision ID: add_game_move_analyses_table
+Revises: add_user_nickname_column
+Create Date: 2025-10-27 12:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+
+from common.utils.tsid import TSID
+
+# revision identifiers, used by Alembic.
+revision = "add_game_move_analyses_table"
+down_revision = "add_user_nickname_column"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "game_move_analyses",
+        sa.Column("id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("game_id", sa.BigInteger(), nullable=False),
+        sa.Column("move_number", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["game_id"], ["games.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("game_id", "move_number", name="uq_game_move_analyses_game_move"),
+    )
+
+    # Backfill the index from analysis events that were stored before this table existed
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, game_id, data FROM game_events WHERE type = 'MoveAnalysisEvent' ORDER BY id")).fetchall()
+    seen: set[tuple[int, int]] = set()
+    backfill: list[dict[str, Any]] = []
+    for event_id, game_id, data in rows:
+        payload = json.loads(data) if isinstance(data, str) else data
+        move_number = payload.get("turn")
+        if move_number is None or (game_id, move_number) in seen:
+            continue
+        seen.add((game_id, move_number))
+        backfill.append({"id": TSID.create().number, "game_id": game_id, "move_number": move_number, "event_id": event_id})
+
+    if backfill:
+        conn.execute(
+            sa.text("INSERT INTO game_move_analyses (id, game_id, move_number, event_id) VALUES (:id, :game_id, :move_number, :event_id)"),
+            backfill,
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("game_move_analyses")
@@ -0,0 +1,50 @@
+"""Store LLM usage prompt and response bodies by content
+
+Revision ID: add_llm_usage_contents_table
+Revises: add_game_keyset_pagination_indexes
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_llm_usage_contents_table"
+down_revision = "add_game_keyset_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_usage_contents",
+        sa.Column("hash", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("codec", sa.String(length=32), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False, comment="Length of the uncompressed text in bytes"),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    op.add_column("llm_usage", sa.Column("input_prompt_hashes", sa.JSON(), nullable=True, comment="Content hashes of the prompt segments, in order"))
+    op.add_column("llm_usage", sa.Column("output_response_hash", sa.String(length=64), nullable=True, comment="Content hash of the response"))
+    op.alter_column("llm_usage", "input_prompt", existing_type=sa.Text(), nullable=True)
+    op.alter_column("llm_usage", "output_response", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    # Bodies of rows written since the upgrade exist only compressed in llm_usage_contents and are not restored
+    op.execute(
+        """
+        UPDATE llm_usage SET input_prompt = '', output_response = ''
+        WHERE input_prompt IS NULL OR output_response IS NULL
+        """
+    )
+    op.alter_column("llm_usage", "output_response", existing_type=sa.Text(), nullable=False)
+    op.alter_column("llm_usage", "input_prompt", existing_type=sa.Text(), nullable=False)
+    op.drop_column("llm_usage", "output_response_hash")
+    op.drop_column("llm_usage", "input_prompt_hashes")
+    op.drop_table("llm_usage_contents")
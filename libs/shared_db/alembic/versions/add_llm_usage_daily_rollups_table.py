@@ -0,0 +1,55 @@
+"""Add daily LLM usage rollups and the provider of each call
+
+Revision ID: add_llm_usage_daily_rollups_table
+Revises: add_llm_usage_contents_table
+Create Date: 2026-10-18 16:00:00.000000
+
+Existing usage is folded into the rollups by backend/scripts/backfill_llm_usage_rollups.py.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_llm_usage_daily_rollups_table"
+down_revision = "add_llm_usage_contents_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("llm_usage", sa.Column("provider", sa.String(), nullable=True, comment="LLM provider the call was sent to (unset on older rows)"))
+    op.create_table(
+        "llm_usage_daily_rollups",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False, comment="UTC day of the calls"),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("agent_id", sa.BigInteger(), nullable=True),
+        sa.Column("agent_version_id", sa.BigInteger(), nullable=True),
+        sa.Column("provider", sa.String(), nullable=True),
+        sa.Column("model_used", sa.String(), nullable=False),
+        sa.Column("scenario", sa.String(), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("execution_time_ms", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_llm_usage_daily_rollups_user_day", "llm_usage_daily_rollups", ["user_id", "day"])
+    op.create_index("ix_llm_usage_daily_rollups_agent_day", "llm_usage_daily_rollups", ["agent_id", "day"])
+    op.create_index("ix_llm_usage_daily_rollups_agent_version_day", "llm_usage_daily_rollups", ["agent_version_id", "day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_usage_daily_rollups_agent_version_day", table_name="llm_usage_daily_rollups")
+    op.drop_index("ix_llm_usage_daily_rollups_agent_day", table_name="llm_usage_daily_rollups")
+    op.drop_index("ix_llm_usage_daily_rollups_user_day", table_name="llm_usage_daily_rollups")
+    op.drop_table("llm_usage_daily_rollups")
+    op.drop_column("llm_usage", "provider")
@@ -0,0 +1,38 @@
+"""Add move_narratives cache table
+
+Revision ID: add_move_narratives_table
+Revises: add_position_evaluations_table
+Create Date: 2025-10-29 12:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_move_narratives_table"
+down_revision = "add_position_evaluations_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "move_narratives",
+        sa.Column("id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("position_key", sa.String(length=100), nullable=False),
+        sa.Column("move_san", sa.String(length=10), nullable=False),
+        sa.Column("eval_bucket", sa.String(length=30), nullable=False),
+        sa.Column("locale", sa.String(length=10), nullable=False),
+        sa.Column("narrative", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("position_key", "move_san", "eval_bucket", "locale", name="uq_move_narratives_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("move_narratives")
@@ -0,0 +1,39 @@
+"""Add position_evaluations cache table
+
+Revision ID: add_position_evaluations_table
+Revises: add_game_move_analyses_table
+Create Date: 2025-10-28 12:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_position_evaluations_table"
+down_revision = "add_game_move_analyses_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "position_evaluations",
+        sa.Column("id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("position_key", sa.String(length=100), nullable=False),
+        sa.Column("engine_config", sa.String(length=50), nullable=False),
+        sa.Column("evaluation_cp", sa.Integer(), nullable=False),
+        sa.Column("mate", sa.Integer(), nullable=True),
+        sa.Column("best_move_uci", sa.String(length=10), nullable=True),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("position_key", "engine_config", name="uq_position_evaluations_position_config"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("position_evaluations")
@@ -1,22 +1,33 @@
 """Game CRUD operations with lease-based processing."""
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from enum import StrEnum
+from itertools import batched
 from typing import Any
 
 from game_api import BaseGameConfig, BaseGameEvent, BaseGameState, GameType
-from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy import and_, bindparam, delete, exists, func, or_, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from common.core.app_error import Errors
-from common.ids import AgentId, AgentVersionId, GameId, RequestId, UserId
+from common.db.db_utils import dialect_insert
+from common.ids import AgentId, AgentVersionId, GameEventId, GameId, UserId
 from common.utils.tsid import TSID
-from common.utils.utils import get_now
+from common.utils.utils import get_logger, get_now
 from shared_db.models.agent import Agent, AgentVersion
-from shared_db.models.game import Game, GameEvent, GamePlayer, MatchmakingStatus
+from shared_db.models.game import Game, GameEvent, GameEventArchive, GameMoveAnalysis, GamePlayer, MatchmakingStatus
 from shared_db.models.user import User, UserRole
+from shared_db.types.packed_json import CODEC_MSGPACK_ZSTD_V1, compress_msgpack, decompress_msgpack
+
+logger = get_logger()
+
+# Games in these states never receive new turns, so their events can be archived
+_ARCHIVABLE_STATUSES = (MatchmakingStatus.FINISHED, MatchmakingStatus.CANCELLED)
+# Event ids per DELETE, well under the bind parameter limit
+_ARCHIVE_DELETE_BATCH = 1000
 
 
 # Result of attempting to join a game atomically
@@ -26,11 +37,39 @@ class JoinResult(StrEnum):
     FULL = "full"
 
 
+# The hottest statements (polled every second per client, or run on every turn) are built once
+# with bind parameters instead of per call. Executing a prebuilt statement skips construction and
+# cache-key generation and hits SQLAlchemy's compiled cache (and asyncpg's prepared statement
+# cache) directly; see scripts/benchmark_hot_queries.py.
+_GAME_VERSION = select(Game.version).where(Game.id == bindparam("game_id"))
+_GAME_WITH_RELATIONS = (
+    select(Game)
+    .options(
+        selectinload(Game.game_players).joinedload(GamePlayer.agent_version).joinedload(AgentVersion.agent).joinedload(Agent.statistics),
+        selectinload(Game.game_players).joinedload(GamePlayer.user),
+        selectinload(Game.events),
+    )
+    .where(Game.id == bindparam("game_id"))
+)
+_GAME_WITH_RELATIONS_AT_VERSION = _GAME_WITH_RELATIONS.where(Game.version == bindparam("version"))
+_TIMED_OUT_GAMES = (
+    select(Game)
+    .options(
+        selectinload(Game.game_players).joinedload(GamePlayer.agent_version).joinedload(AgentVersion.agent),
+        selectinload(Game.game_players).joinedload(GamePlayer.user),
+        selectinload(Game.events),
+    )
+    .where(
+        Game.matchmaking_status == MatchmakingStatus.WAITING,
+        Game.waiting_deadline <= bindparam("now"),
+    )
+)
+
+
 class GameDAO:
     async def get_version(self, db: AsyncSession, game_id: GameId) -> int | None:
         """Get just the version number of a game (lightweight query for polling)."""
-        query = select(Game.version).filter(Game.id == game_id)
-        result = await db.execute(query)
+        result = await db.execute(_GAME_VERSION, {"game_id": game_id})
         return result.scalar_one_or_none()
 
     async def get_requesting_user_id(self, db: AsyncSession, game_id: GameId) -> UserId | None:
@@ -39,6 +78,12 @@ class GameDAO:
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_status(self, db: AsyncSession, game_id: GameId) -> MatchmakingStatus | None:
+        """Get just the matchmaking status of a game (lightweight query)."""
+        query = select(Game.matchmaking_status).filter(Game.id == game_id)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
     async def get_game_type(self, db: AsyncSession, game_id: GameId) -> GameType | None:
         """Get just the game_type of a game (lightweight query)."""
         query = select(Game.game_type).filter(Game.id == game_id)
@@ -47,29 +92,26 @@ class GameDAO:
 
     async def get_events(self, db: AsyncSession, game_id: GameId) -> list[GameEvent]:
         """Get all events for a game."""
-        query = select(GameEvent).filter(GameEvent.game_id == game_id).order_by(GameEvent.created_at)
+        query = select(GameEvent).filter(GameEvent.game_id == game_id).order_by(GameEvent.created_at, GameEvent.id)
         result = await db.execute(query)
-        return list(result.scalars().all())
-
-    async def get(self, db: AsyncSession, game_id: GameId, version: int | None = None, processing_request_id: RequestId | None = None) -> Game | None:
-        """Get a game by ID with eagerly loaded agent relationships and events."""
-        query = (
-            select(Game)
-            .options(
-                selectinload(Game.game_players).joinedload(GamePlayer.agent_version).joinedload(AgentVersion.agent).joinedload(Agent.statistics),
-                selectinload(Game.game_players).joinedload(GamePlayer.user),
-                selectinload(Game.events),
-            )
-            .filter(Game.id == game_id)
-        )
-
-        if version is not None:
-            query = query.filter(Game.version == version)
-        if processing_request_id is not None:
-            query = query.filter(Game.processing_request_id == processing_request_id)
+        return await self._with_archived_events(db, game_id, list(result.scalars().all()))
 
+    async def get_events_by_type(self, db: AsyncSession, game_id: GameId, event_type: str) -> list[GameEvent]:
+        """Get the events of one type for a game, in insertion order."""
+        query = select(GameEvent).filter(GameEvent.game_id == game_id, GameEvent.type == event_type).order_by(GameEvent.created_at, GameEvent.id)
         result = await db.execute(query)
-        return result.scalar_one_or_none()
+        return await self._with_archived_events(db, game_id, list(result.scalars().all()), event_type=event_type)
+
+    async def get(self, db: AsyncSession, game_id: GameId, version: int | None = None) -> Game | None:
+        """Get a game by ID with eagerly loaded agent relationships and events."""
+        if version is None:
+            result = await db.execute(_GAME_WITH_RELATIONS, {"game_id": game_id})
+        else:
+            result = await db.execute(_GAME_WITH_RELATIONS_AT_VERSION, {"game_id": game_id, "version": version})
+        game = result.scalar_one_or_none()
+        if game is not None:
+            await self._restore_archived_events(db, [game])
+        return game
 
     async def insert(
         self,
@@ -111,98 +153,39 @@ class GameDAO:
 
         return game
 
-    async def start_processing(
-        self,
-        db: AsyncSession,
-        request_id: RequestId,
-        game_id: GameId,
-        processing_timeout: timedelta,
-        heartbeat_timeout: timedelta,
-        expected_turn: int | None,
-    ) -> Game:
-        """Claim a game for processing by setting processing_started_at.
+    async def get_for_processing(self, db: AsyncSession, game_id: GameId, expected_turn: int | None) -> Game:
+        """Load a game for turn processing.
+
+        The caller must hold the game's processing lease (see shared_db.db.leases); this only
+        loads and validates, it writes nothing.
 
         Args:
             db: Database session
-            request_id: ID of the request to claim
-            game_id: ID of the game to claim
-            timeout_duration: Timeout duration for considering a processing lock stale
+            game_id: ID of the game to process
             expected_turn: Expected turn number for validation (optional)
 
         Returns:
-            Full Game object with updated processing_started_at and version
+            Full Game object
 
         Raises:
-            STILL_PROCESSING: If another worker claimed the game or game doesn't exist
+            NOT_FOUND: If the game doesn't exist
             TURN_ADVANCEMENT_CONFLICT: If turn number doesn't match (when expected_turn is provided)
         """
-        now = datetime.now(UTC)
-
-        where_clause = and_(
-            Game.id == game_id,
-            or_(
-                Game.processing_request_id.is_(None),  # Not being processed
-                Game.processing_started_at < now - processing_timeout,  # Processing took too long
-                Game.updated_at < now - heartbeat_timeout,  # Heartbeat expired
-            ),
-        )
-        if expected_turn is not None:
-            where_clause = and_(where_clause, Game.turn == expected_turn)
-
-        # Atomic update: claim the game if it's not being processed or the lock is stale
-        result = await db.execute(
-            update(Game)
-            .where(where_clause)
-            .values(
-                processing_started_at=now,
-                processing_request_id=request_id,
-                version=Game.version + 1,
-                updated_at=now,  # Initial heartbeat
-            )
-            .returning(Game.version)
-        )
-
-        row = result.fetchone()
-        if row is None:
-            # Check if game exists
-            existing_game = await self.get(db, game_id)
-            if not existing_game:
-                raise Errors.Game.NOT_FOUND.create(details={"game_id": game_id})
-
-            # Check if turn number mismatch (only when expected_turn is provided)
-            if expected_turn is not None and existing_game.turn != expected_turn:
-                raise Errors.Game.TURN_ADVANCEMENT_CONFLICT.create(
-                    message=f"Turn advancement conflict: expected {expected_turn}, current {existing_game.turn}",
-                    details={
-                        "game_id": game_id,
-                        "expected_turn": expected_turn,
-                        "current_turn": existing_game.turn,
-                    },
-                )
-
-            # Game is being processed by another active request
-            raise Errors.Game.ALREADY_PROCESSING.create(details={"game_id": game_id})
-
-        # Now fetch the full game with relationships
-        game = await self.get(db, game_id, processing_request_id=request_id, version=row.version)
+        game = await self.get(db, game_id)
         if not game:
-            raise Errors.Game.CONCURRENT_PROCESSING.create(details={"game_id": game_id, "expected_version": row.version})
-
-        return game
-
-    async def finish_processing(self, db: AsyncSession, request_id: RequestId, game_id: GameId) -> None:
-        """Release the processing lock on a game."""
-        _ = await db.execute(
-            update(Game)
-            .where(Game.id == game_id, Game.processing_started_at.isnot(None), Game.processing_request_id == request_id)
-            .values(
-                processing_started_at=None,
-                processing_request_id=None,
-                version=Game.version + 1,
+            raise Errors.Game.NOT_FOUND.create(details={"game_id": game_id})
+
+        if expected_turn is not None and game.turn != expected_turn:
+            raise Errors.Game.TURN_ADVANCEMENT_CONFLICT.create(
+                message=f"Turn advancement conflict: expected {expected_turn}, current {game.turn}",
+                details={
+                    "game_id": game_id,
+                    "expected_turn": expected_turn,
+                    "current_turn": game.turn,
+                },
             )
-        )
 
-        # Do not fail on concurrent processing, it means another worker is on it
+        return game
 
     async def update_game(self, db: AsyncSession, game: Game) -> None:
         """Update game state with optimistic concurrency control."""
@@ -322,7 +305,7 @@ class GameDAO:
             db: Database session
             user_id: User ID to filter games by
             env: Optional game environment filter
-            from_game_id: Get games after this game ID for cursor-based pagination
+            from_game_id: Keyset cursor; only games older than this game ID are returned
             limit: Maximum number of records to return
             only_active: If True, only return active games; if False, return all games
 
@@ -354,9 +337,9 @@ class GameDAO:
                 Game.matchmaking_status.in_([MatchmakingStatus.WAITING, MatchmakingStatus.IN_PROGRESS]),  # Exclude finished/cancelled games
             )
 
-        # Apply cursor-based pagination
+        # Apply cursor-based pagination (TSIDs are time-ordered, so older games have smaller IDs)
         if from_game_id:
-            query = query.filter(Game.id > from_game_id)
+            query = query.filter(Game.id < from_game_id)
 
         # Order by game ID descending for proper cursor pagination
         query = query.distinct(Game.id).order_by(Game.id.desc())
@@ -365,7 +348,9 @@ class GameDAO:
         query = query.limit(limit)
 
         result = await db.execute(query.execution_options(populate_existing=True))
-        return list(result.scalars().all())
+        games = list(result.scalars().all())
+        await self._restore_archived_events(db, games)
+        return games
 
     async def count_games_by_user(
         self,
@@ -392,6 +377,7 @@ class GameDAO:
         agent_id: AgentId,
         limit: int = 50,
         offset: int = 0,
+        before_game_id: GameId | None = None,
     ) -> list[Game]:
         """Get games where a specific agent participated.
 
@@ -401,7 +387,8 @@ class GameDAO:
             db: Database session
             agent_id: Agent ID to filter games by
             limit: Maximum number of records to return
-            offset: Number of records to skip
+            offset: Number of records to skip (legacy paging; ignored when before_game_id is given)
+            before_game_id: Keyset cursor; only games older than this game ID are returned
 
         Returns:
             List of games where the agent participated
@@ -422,10 +409,15 @@ class GameDAO:
             .distinct(Game.id)
             .order_by(Game.id.desc(), Game.created_at.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if before_game_id is not None:
+            query = query.where(Game.id < before_game_id)
+        elif offset:
+            query = query.offset(offset)
         result = await db.execute(query.execution_options(populate_existing=True))
-        return list(result.scalars().unique().all())
+        games = list(result.scalars().unique().all())
+        await self._restore_archived_events(db, games)
+        return games
 
     async def cancel_user_playgrounds_except(self, db: AsyncSession, user_id: UserId, exclude_game_id: GameId) -> None:
         """Cancel all playground games for a user except the specified one."""
@@ -585,11 +577,21 @@ class GameDAO:
         allowed_game_types: list[GameType],
         limit: int = 50,
         offset: int = 0,
+        before: tuple[datetime | None, GameId] | None = None,
     ) -> list[Game]:
         """Find public/spectatable games for discovery lists.
 
         Returns non-playground games matching provided statuses and allowed environments.
-        Ordered by most recently started, then by id desc.
+        Ordered by most recently started (never-started games last), then by id desc.
+
+        Args:
+            db: Database session
+            statuses: Matchmaking statuses to include
+            allowed_game_types: Game types to include
+            limit: Maximum number of games to return
+            offset: Legacy page offset, ignored when ``before`` is given
+            before: Keyset cursor as the (started_at, id) of the last game of the previous page;
+                takes precedence over the legacy ``offset``
         """
         if not statuses:
             return []
@@ -602,10 +604,19 @@ class GameDAO:
                     Game.matchmaking_status.in_(statuses),
                 )
             )
-            .order_by(Game.started_at.desc(), Game.id.desc())
+            .order_by(Game.started_at.desc().nulls_last(), Game.id.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if before is not None:
+            started_at, game_id = before
+            if started_at is None:
+                query = query.where(Game.started_at.is_(None), Game.id < game_id)
+            else:
+                query = query.where(
+                    or_(Game.started_at < started_at, and_(Game.started_at == started_at, Game.id < game_id), Game.started_at.is_(None)),
+                )
+        elif offset:
+            query = query.offset(offset)
         result = await db.execute(query)
         return list(result.scalars().all())
 
@@ -670,22 +681,7 @@ class GameDAO:
         Returns:
             List of games that have timed out
         """
-        query = (
-            select(Game)
-            .options(
-                selectinload(Game.game_players).joinedload(GamePlayer.agent_version).joinedload(AgentVersion.agent),
-                selectinload(Game.game_players).joinedload(GamePlayer.user),
-                selectinload(Game.events),
-            )
-            .filter(
-                and_(
-                    Game.matchmaking_status == MatchmakingStatus.WAITING,
-                    Game.waiting_deadline <= datetime.now(UTC),
-                )
-            )
-        )
-
-        result = await db.execute(query)
+        result = await db.execute(_TIMED_OUT_GAMES, {"now": datetime.now(UTC)})
         return list(result.scalars().all())
 
     async def get_user_waiting_game(
@@ -793,50 +789,25 @@ class GameDAO:
 
     async def add_events(self, db: AsyncSession, game_id: GameId, events: list[BaseGameEvent]) -> None:
         """Add game events to the database (no version bump)."""
-        from common.utils.utils import get_logger
-
-        logger = get_logger()
-
-        for event in events:
-            event_class_name = type(event).__name__
-
-            # Log reasoning events BEFORE serialization
-            if event_class_name == "AgentReasoningEvent":
-                # Check if event has tool_calls attribute
-                tool_calls_attr = getattr(event, "tool_calls", None)
-                logger.info(
-                    "Reasoning event BEFORE serialization",
-                    game_id=game_id,
-                    event_class_name=event_class_name,
-                    has_tool_calls_attr=tool_calls_attr is not None,
-                    tool_calls_attr_value=tool_calls_attr,
-                    tool_calls_count=len(tool_calls_attr) if tool_calls_attr else 0,
-                    event_repr=repr(event),
-                )
+        await self._insert_events(db, game_id, events)
 
-            event_data = event.to_dict(mode="json")
-
-            # Log reasoning events AFTER serialization
-            if event_class_name == "AgentReasoningEvent":
-                logger.info(
-                    "Reasoning event AFTER serialization",
-                    game_id=game_id,
-                    event_class_name=event_class_name,
-                    event_type_field=event_data.get("type"),
-                    has_tool_calls="tool_calls" in event_data or "toolCalls" in event_data,
-                    tool_calls_count=len(event_data.get("tool_calls", event_data.get("toolCalls", []))),
-                    event_data_keys=list(event_data.keys()),
-                    event_data=event_data,
-                )
+    async def _insert_events(self, db: AsyncSession, game_id: GameId, events: list[BaseGameEvent]) -> None:
+        """Serialize events in one pass and append them with a single multi-row INSERT.
 
-            game_event = GameEvent(
-                id=TSID.create(),
-                game_id=game_id,
-                type=event_class_name,
-                data=event_data,
-                created_at=get_now(),
-            )
-            db.add(game_event)
+        Rows bypass the ORM unit of work, so pending objects (e.g. a game created in the same
+        session) are flushed first to satisfy the foreign key.
+        """
+        if not events:
+            return
+
+        now = get_now()
+        rows = [
+            {"id": TSID.create(), "game_id": game_id, "type": type(event).__name__, "data": event.to_dict(mode="json"), "created_at": now} for event in events
+        ]
+        if db.new:
+            await db.flush()
+        _ = await db.execute(dialect_insert(db, GameEvent).values(rows))
+        logger.debug("Appended game events", game_id=game_id, event_count=len(rows), event_types=sorted({row["type"] for row in rows}))
 
     # --- Versioned mutation helpers (A2) ---
 
@@ -846,16 +817,144 @@ class GameDAO:
 
     async def add_events_without_bumping_version(self, db: AsyncSession, game_id: GameId, events: list[BaseGameEvent]) -> None:
         """Append events without bumping game version in one transaction."""
-        # Insert events without bumping version
-        for event in events:
-            game_event = GameEvent(
-                id=TSID.create(),
+        await self._insert_events(db, game_id, events)
+
+    # --- Event archive ---
+
+    async def archive_finished_game_events(self, db: AsyncSession, finished_before: datetime, limit: int = 100, level: int = 3) -> int:
+        """Move the events of games finished before the cutoff into per-game archive blobs.
+
+        Candidate games are locked with SKIP LOCKED so concurrent workers archive disjoint
+        batches. Events that reached an already archived game (e.g. a late move analysis) are
+        merged into its existing blob.
+
+        Returns:
+            Number of games archived.
+        """
+        candidates = (
+            select(Game.id)
+            .where(
+                Game.matchmaking_status.in_(_ARCHIVABLE_STATUSES),
+                Game.updated_at < finished_before,
+                exists().where(GameEvent.game_id == Game.id),
+            )
+            .order_by(Game.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        game_ids = list((await db.execute(candidates)).scalars().all())
+        if not game_ids:
+            return 0
+
+        rows_query = (
+            select(GameEvent.game_id, GameEvent.id, GameEvent.type, GameEvent.data, GameEvent.created_at)
+            .where(GameEvent.game_id.in_(game_ids))
+            .order_by(GameEvent.game_id, GameEvent.created_at, GameEvent.id)
+        )
+        rows_by_game: dict[GameId, list[list[Any]]] = {game_id: [] for game_id in game_ids}
+        archived_event_ids: list[GameEventId] = []
+        for game_id, event_id, event_type, data, created_at in (await db.execute(rows_query)).all():
+            rows_by_game[game_id].append([event_id.number, event_type, data, created_at.isoformat()])
+            archived_event_ids.append(event_id)
+
+        archives = await db.scalars(select(GameEventArchive).where(GameEventArchive.game_id.in_(game_ids)))
+        existing = {archive.game_id: archive for archive in archives}
+        event_count = archived_bytes = 0
+        for game_id, rows in rows_by_game.items():
+            archive = existing.get(game_id)
+            if archive is not None:
+                rows = [*decompress_msgpack(archive.payload), *rows]
+            payload = compress_msgpack(rows, level)
+            event_count += len(rows)
+            archived_bytes += len(payload)
+            if archive is None:
+                db.add(GameEventArchive(game_id=game_id, codec=CODEC_MSGPACK_ZSTD_V1, event_count=len(rows), payload=payload))
+            else:
+                archive.event_count = len(rows)
+                archive.payload = payload
+
+        await db.flush()
+        # Delete only what was read; an event committed since (e.g. a late analysis) waits for the next run
+        for event_ids in batched(archived_event_ids, _ARCHIVE_DELETE_BATCH, strict=False):
+            _ = await db.execute(delete(GameEvent).where(GameEvent.id.in_(event_ids)))
+        logger.info("Archived game events", games=len(game_ids), events=event_count, archived_bytes=archived_bytes)
+        return len(game_ids)
+
+    async def _read_archived_events(self, db: AsyncSession, game_ids: list[GameId]) -> dict[GameId, list[GameEvent]]:
+        """Archived events per game as detached GameEvent objects."""
+        result = await db.execute(select(GameEventArchive).where(GameEventArchive.game_id.in_(game_ids)))
+        return {
+            archive.game_id: [
+                GameEvent(id=TSID(event_id), game_id=archive.game_id, type=event_type, data=data, created_at=datetime.fromisoformat(created_at))
+                for event_id, event_type, data, created_at in decompress_msgpack(archive.payload)
+            ]
+            for archive in result.scalars()
+        }
+
+    async def _restore_archived_events(self, db: AsyncSession, games: list[Game]) -> None:
+        """Merge archived events into the loaded ``events`` of finished games.
+
+        The collection is set as committed state, so the archived objects are never flushed back
+        into ``game_events``.
+        """
+        finished = [game for game in games if game.matchmaking_status in _ARCHIVABLE_STATUSES]
+        if not finished:
+            return
+        archived = await self._read_archived_events(db, [game.id for game in finished])
+        for game in finished:
+            if game.id in archived:
+                merged = {event.id: event for event in [*archived[game.id], *game.events]}
+                set_committed_value(game, "events", sorted(merged.values(), key=lambda event: event.id))
+
+    async def _with_archived_events(self, db: AsyncSession, game_id: GameId, events: list[GameEvent], event_type: str | None = None) -> list[GameEvent]:
+        archived = (await self._read_archived_events(db, [game_id])).get(game_id)
+        if not archived:
+            return events
+        archived = [event for event in archived if event_type is None or event.type == event_type]
+        return sorted([*archived, *events], key=lambda event: (event.created_at, event.id))
+
+    async def has_move_analysis(self, db: AsyncSession, game_id: GameId, move_number: int) -> bool:
+        """Check whether a move has already been analyzed (single indexed lookup)."""
+        query = select(exists().where(GameMoveAnalysis.game_id == game_id, GameMoveAnalysis.move_number == move_number))
+        result = await db.execute(query)
+        return bool(result.scalar())
+
+    async def get_analyzed_move_numbers(self, db: AsyncSession, game_id: GameId) -> set[int]:
+        """Get the move numbers of a game that already have an analysis."""
+        query = select(GameMoveAnalysis.move_number).where(GameMoveAnalysis.game_id == game_id)
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
+    async def add_move_analysis(self, db: AsyncSession, game_id: GameId, move_number: int, event: BaseGameEvent) -> bool:
+        """Store a move analysis event exactly once per (game, move number).
+
+        The (game_id, move_number) unique constraint makes the insert idempotent: if another worker
+        already stored an analysis for this move, nothing is written.
+
+        Returns:
+            True if the analysis was stored, False if one already existed.
+        """
+        event_id = GameEventId(TSID.create())
+        stmt = (
+            dialect_insert(db, GameMoveAnalysis)
+            .values(id=TSID.create(), game_id=game_id, move_number=move_number, event_id=event_id)
+            .on_conflict_do_nothing(index_elements=[GameMoveAnalysis.game_id, GameMoveAnalysis.move_number])
+            .returning(GameMoveAnalysis.id)
+        )
+        result = await db.execute(stmt)
+        if result.scalar_one_or_none() is None:
+            return False
+
+        db.add(
+            GameEvent(
+                id=event_id,
                 game_id=game_id,
                 type=type(event).__name__,
                 data=event.to_dict(mode="json"),
                 created_at=get_now(),
             )
-            db.add(game_event)
+        )
+        return True
 
     async def find_old_waiting_games(self, db: AsyncSession, cutoff_time: datetime) -> list[Game]:
         """Find WAITING games created before cutoff_time."""
@@ -1,14 +1,19 @@
 """LLM Usage CRUD operations."""
 
-from datetime import datetime
+import hashlib
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.db.db_utils import dialect_insert
 from common.ids import AgentId, AgentVersionId, GameId, LLMUsageId, UserId
+from common.utils.tsid import TSID
+from common.utils.utils import get_now
 from shared_db.models.agent import AgentVersion
 from shared_db.models.llm_enums import LLMUsageScenario
-from shared_db.models.llm_usage import LLMUsage
+from shared_db.models.llm_usage import LLMUsage, LLMUsageContent, LLMUsageDailyRollup
 from shared_db.schemas.llm_usage import (
     AgentLLMCostSummary,
     LLMUsageByModel,
@@ -19,6 +24,83 @@ from shared_db.schemas.llm_usage import (
     LLMUsageStats,
     LLMUsageSummary,
 )
+from shared_db.types.packed_json import CODEC_UTF8_ZSTD_V1, compress_text, decompress_text
+
+# Additive columns of a daily rollup; averages are derived from them
+_ROLLUP_SUMS = ("calls", "cost_usd", "input_tokens", "output_tokens", "total_tokens", "execution_time_ms")
+
+_STATS_COLUMNS = tuple(func.coalesce(func.sum(getattr(LLMUsageDailyRollup, name)), 0).label(name) for name in _ROLLUP_SUMS)
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _rollup_row(
+    day: date,
+    user_id: UserId,
+    agent_id: AgentId | None,
+    agent_version_id: AgentVersionId | None,
+    provider: str | None,
+    model_used: str,
+    scenario: str,
+    **sums: Any,
+) -> dict[str, Any]:
+    key_parts = (day.isoformat(), user_id, agent_id, agent_version_id, provider, model_used, scenario)
+    key = hashlib.sha256("|".join("" if part is None else str(part) for part in key_parts).encode()).hexdigest()
+    return {
+        "key": key,
+        "day": day,
+        "user_id": user_id,
+        "agent_id": agent_id,
+        "agent_version_id": agent_version_id,
+        "provider": provider,
+        "model_used": model_used,
+        "scenario": scenario,
+        **{name: sums[name] or 0 for name in _ROLLUP_SUMS},
+    }
+
+
+def _utc_day(value: datetime) -> date:
+    return (value.astimezone(UTC) if value.tzinfo else value).date()
+
+
+def _filter_rollups(
+    query: Select[Any],
+    user_id: UserId | None,
+    agent_id: AgentId | None,
+    agent_version_id: AgentVersionId | None,
+    scenario: LLMUsageScenario | None,
+    start_date: datetime | None,
+    end_date: datetime | None,
+) -> Select[Any]:
+    if user_id:
+        query = query.where(LLMUsageDailyRollup.user_id == user_id)
+    if agent_id:
+        query = query.where(LLMUsageDailyRollup.agent_id == agent_id)
+    if agent_version_id:
+        query = query.where(LLMUsageDailyRollup.agent_version_id == agent_version_id)
+    if scenario:
+        query = query.where(LLMUsageDailyRollup.scenario == scenario.value)
+    if start_date:
+        query = query.where(LLMUsageDailyRollup.day >= _utc_day(start_date))
+    if end_date:
+        query = query.where(LLMUsageDailyRollup.day <= _utc_day(end_date))
+    return query
+
+
+def _stats(row: Row[Any]) -> LLMUsageStats:
+    calls = int(row.calls)
+    return LLMUsageStats(
+        total_calls=calls,
+        total_cost_usd=float(row.cost_usd),
+        total_tokens=int(row.total_tokens),
+        total_input_tokens=int(row.input_tokens),
+        total_output_tokens=int(row.output_tokens),
+        average_cost_per_call=float(row.cost_usd) / calls if calls else 0.0,
+        average_tokens_per_call=int(row.total_tokens) / calls if calls else 0.0,
+        average_execution_time_ms=int(row.execution_time_ms) / calls if calls else 0.0,
+    )
 
 
 class LLMUsageDAO:
@@ -31,31 +113,98 @@ class LLMUsageDAO:
 
     async def create(self, db: AsyncSession, usage: LLMUsageCreate) -> LLMUsageResponse:
         """Create a new LLM usage record."""
-        db_usage = LLMUsage(
-            user_id=usage.user_id,
-            agent_version_id=usage.agent_version_id,
-            scenario=usage.scenario.value,
-            model_used=usage.model_used,
-            cost_usd=usage.cost_usd,
-            input_tokens=usage.input_tokens,
-            output_tokens=usage.output_tokens,
-            total_tokens=usage.total_tokens,
-            execution_time_ms=usage.execution_time_ms,
-            input_prompt=usage.input_prompt,
-            output_response=usage.output_response,
-            game_id=usage.game_id,
-            tool_id=usage.tool_id,
-            test_scenario_id=usage.test_scenario_id,
-        )
-        db.add(db_usage)
-        await db.flush()
-        return LLMUsageResponse.model_validate(db_usage)
+        [usage_id] = await self.create_many(db, [usage])
+        response = await self.get(db, usage_id)
+        assert response is not None
+        return response
+
+    async def create_many(self, db: AsyncSession, usages: list[LLMUsageCreate], compression_level: int = 3) -> list[LLMUsageId]:
+        """Insert usage records with one multi-row INSERT, storing their prompt and response bodies by content.
+
+        Each distinct body is compressed and inserted once; bodies already stored (e.g. the system
+        prompt of an agent version that played earlier turns) are only referenced. The daily
+        rollups are updated in the same transaction.
+        """
+        if not usages:
+            return []
+
+        contents: dict[str, str] = {}
+        now = get_now()
+        rows: list[dict[str, Any]] = []
+        for usage in usages:
+            segments = [usage.input_prompt] if isinstance(usage.input_prompt, str) else usage.input_prompt
+            prompt_hashes = [_content_hash(segment) for segment in segments]
+            response_hash = _content_hash(usage.output_response)
+            contents.update(zip(prompt_hashes, segments, strict=True))
+            contents[response_hash] = usage.output_response
+            rows.append(
+                {
+                    "id": LLMUsageId(TSID.create()),
+                    "user_id": usage.user_id,
+                    "agent_version_id": usage.agent_version_id,
+                    "scenario": usage.scenario.value,
+                    "provider": usage.provider,
+                    "model_used": usage.model_used,
+                    "cost_usd": usage.cost_usd,
+                    "input_tokens": usage.input_tokens,
+                    "output_tokens": usage.output_tokens,
+                    "total_tokens": usage.total_tokens,
+                    "execution_time_ms": usage.execution_time_ms,
+                    "input_prompt_hashes": prompt_hashes,
+                    "output_response_hash": response_hash,
+                    "game_id": usage.game_id,
+                    "tool_id": usage.tool_id,
+                    "test_scenario_id": usage.test_scenario_id,
+                    # Buffered records are written later; they count towards the day the call was made
+                    "created_at": usage.created_at or now,
+                }
+            )
+
+        stored = set((await db.execute(select(LLMUsageContent.hash).where(LLMUsageContent.hash.in_(contents)))).scalars())
+        content_rows = [
+            {
+                "hash": content_hash,
+                "codec": CODEC_UTF8_ZSTD_V1,
+                "size": len(text.encode()),
+                "payload": compress_text(text, compression_level),
+                "created_at": now,
+            }
+            for content_hash, text in contents.items()
+            if content_hash not in stored
+        ]
+        if content_rows:
+            # Another writer may store the same body between the lookup and the insert
+            _ = await db.execute(dialect_insert(db, LLMUsageContent).values(content_rows).on_conflict_do_nothing(index_elements=[LLMUsageContent.hash]))
+        _ = await db.execute(dialect_insert(db, LLMUsage).values(rows))
+        await self._add_to_rollups(db, rows)
+        return [row["id"] for row in rows]
 
     async def get(self, db: AsyncSession, id: LLMUsageId) -> LLMUsageResponse | None:
-        """Get an LLM usage record by ID."""
+        """Get an LLM usage record by ID, with its prompt and response bodies."""
         result = await db.execute(select(LLMUsage).where(LLMUsage.id == id))
         usage = result.scalar_one_or_none()
-        return LLMUsageResponse.model_validate(usage) if usage else None
+        if usage is None:
+            return None
+
+        hashes = [*(usage.input_prompt_hashes or []), *([usage.output_response_hash] if usage.output_response_hash else [])]
+        bodies = await self._get_contents(db, hashes)
+        values = {column.key: getattr(usage, column.key) for column in LLMUsage.__table__.columns}
+        if usage.input_prompt_hashes is not None:
+            values["input_prompt"] = "".join(bodies[content_hash] for content_hash in usage.input_prompt_hashes)
+        if usage.output_response_hash is not None:
+            values["output_response"] = bodies[usage.output_response_hash]
+        return LLMUsageResponse.model_validate(values)
+
+    async def _get_contents(self, db: AsyncSession, hashes: list[str]) -> dict[str, str]:
+        if not hashes:
+            return {}
+        result = await db.execute(select(LLMUsageContent).where(LLMUsageContent.hash.in_(set(hashes))))
+        bodies: dict[str, str] = {}
+        for content in result.scalars():
+            if content.codec != CODEC_UTF8_ZSTD_V1:
+                raise ValueError(f"Unknown LLM usage content codec: {content.codec}")
+            bodies[content.hash] = decompress_text(content.payload)
+        return bodies
 
     async def get_by_user(
         self,
@@ -142,42 +291,12 @@ class LLMUsageDAO:
         start_date: datetime | None = None,
         end_date: datetime | None = None,
     ) -> LLMUsageStats:
-        """Get aggregated statistics for LLM usage."""
-        query = select(
-            func.count(LLMUsage.id).label("total_calls"),
-            func.sum(LLMUsage.cost_usd).label("total_cost_usd"),
-            func.sum(LLMUsage.total_tokens).label("total_tokens"),
-            func.sum(LLMUsage.input_tokens).label("total_input_tokens"),
-            func.sum(LLMUsage.output_tokens).label("total_output_tokens"),
-            func.avg(LLMUsage.cost_usd).label("average_cost_per_call"),
-            func.avg(LLMUsage.total_tokens).label("average_tokens_per_call"),
-            func.avg(LLMUsage.execution_time_ms).label("average_execution_time_ms"),
-        )
+        """Get aggregated statistics for LLM usage.
 
-        if user_id:
-            query = query.where(LLMUsage.user_id == user_id)
-        if agent_version_id:
-            query = query.where(LLMUsage.agent_version_id == agent_version_id)
-        if scenario:
-            query = query.where(LLMUsage.scenario == scenario.value)
-        if start_date:
-            query = query.where(LLMUsage.created_at >= start_date)
-        if end_date:
-            query = query.where(LLMUsage.created_at <= end_date)
-
-        result = await db.execute(query)
-        row = result.one()
-
-        return LLMUsageStats(
-            total_calls=row.total_calls or 0,
-            total_cost_usd=float(row.total_cost_usd or 0.0),
-            total_tokens=row.total_tokens or 0,
-            total_input_tokens=row.total_input_tokens or 0,
-            total_output_tokens=row.total_output_tokens or 0,
-            average_cost_per_call=float(row.average_cost_per_call or 0.0),
-            average_tokens_per_call=float(row.average_tokens_per_call or 0.0),
-            average_execution_time_ms=float(row.average_execution_time_ms or 0.0),
-        )
+        Answered from the daily rollups, so date bounds apply at (UTC) day granularity.
+        """
+        query = _filter_rollups(select(*_STATS_COLUMNS), user_id, None, agent_version_id, scenario, start_date, end_date)
+        return _stats((await db.execute(query)).one())
 
     async def get_cost_summary(
         self,
@@ -188,68 +307,35 @@ class LLMUsageDAO:
         end_date: datetime | None = None,
     ) -> LLMUsageCostSummary:
         """Get comprehensive cost summary with breakdowns by scenario and model."""
-        # Get overall stats
         overall_stats = await self.get_stats(db, user_id, agent_version_id, None, start_date, end_date)
 
-        # Get stats by scenario
-        by_scenario = []
-        for scenario in LLMUsageScenario:
-            scenario_stats = await self.get_stats(db, user_id, agent_version_id, scenario, start_date, end_date)
-            if scenario_stats.total_calls > 0:
-                by_scenario.append(LLMUsageByScenario(scenario=scenario, stats=scenario_stats))
-
-        # Get stats by model
-        query = select(LLMUsage.model_used).distinct()
-        if user_id:
-            query = query.where(LLMUsage.user_id == user_id)
-        if agent_version_id:
-            query = query.where(LLMUsage.agent_version_id == agent_version_id)
-        if start_date:
-            query = query.where(LLMUsage.created_at >= start_date)
-        if end_date:
-            query = query.where(LLMUsage.created_at <= end_date)
-
-        result = await db.execute(query)
-        models = result.scalars().all()
-
-        by_model = []
-        for model in models:
-            # Get stats for this specific model
-            model_query = select(
-                func.count(LLMUsage.id).label("total_calls"),
-                func.sum(LLMUsage.cost_usd).label("total_cost_usd"),
-                func.sum(LLMUsage.total_tokens).label("total_tokens"),
-                func.sum(LLMUsage.input_tokens).label("total_input_tokens"),
-                func.sum(LLMUsage.output_tokens).label("total_output_tokens"),
-                func.avg(LLMUsage.cost_usd).label("average_cost_per_call"),
-                func.avg(LLMUsage.total_tokens).label("average_tokens_per_call"),
-                func.avg(LLMUsage.execution_time_ms).label("average_execution_time_ms"),
-            ).where(LLMUsage.model_used == model)
-
-            if user_id:
-                model_query = model_query.where(LLMUsage.user_id == user_id)
-            if agent_version_id:
-                model_query = model_query.where(LLMUsage.agent_version_id == agent_version_id)
-            if start_date:
-                model_query = model_query.where(LLMUsage.created_at >= start_date)
-            if end_date:
-                model_query = model_query.where(LLMUsage.created_at <= end_date)
-
-            model_result = await db.execute(model_query)
-            model_row = model_result.one()
-
-            model_stats = LLMUsageStats(
-                total_calls=model_row.total_calls or 0,
-                total_cost_usd=float(model_row.total_cost_usd or 0.0),
-                total_tokens=model_row.total_tokens or 0,
-                total_input_tokens=model_row.total_input_tokens or 0,
-                total_output_tokens=model_row.total_output_tokens or 0,
-                average_cost_per_call=float(model_row.average_cost_per_call or 0.0),
-                average_tokens_per_call=float(model_row.average_tokens_per_call or 0.0),
-                average_execution_time_ms=float(model_row.average_execution_time_ms or 0.0),
-            )
-
-            by_model.append(LLMUsageByModel(model_used=model, stats=model_stats))
+        scenario_query = _filter_rollups(
+            select(LLMUsageDailyRollup.scenario, *_STATS_COLUMNS).group_by(LLMUsageDailyRollup.scenario),
+            user_id,
+            None,
+            agent_version_id,
+            None,
+            start_date,
+            end_date,
+        )
+        by_scenario = [
+            LLMUsageByScenario(scenario=LLMUsageScenario(row.scenario), stats=_stats(row))
+            for row in (await db.execute(scenario_query.order_by(LLMUsageDailyRollup.scenario))).all()
+        ]
+
+        model_query = _filter_rollups(
+            select(LLMUsageDailyRollup.model_used, *_STATS_COLUMNS).group_by(LLMUsageDailyRollup.model_used),
+            user_id,
+            None,
+            agent_version_id,
+            None,
+            start_date,
+            end_date,
+        )
+        by_model = [
+            LLMUsageByModel(model_used=row.model_used, stats=_stats(row))
+            for row in (await db.execute(model_query.order_by(LLMUsageDailyRollup.model_used))).all()
+        ]
 
         return LLMUsageCostSummary(
             user_id=user_id,
@@ -269,74 +355,99 @@ class LLMUsageDAO:
         end_date: datetime | None = None,
     ) -> AgentLLMCostSummary:
         """Get cost summary for all versions of an agent."""
-        # Get all agent version IDs for this agent
-        version_query = select(AgentVersion.id).where(AgentVersion.agent_id == agent_id)
-        version_result = await db.execute(version_query)
-        version_ids = [row[0] for row in version_result.all()]
-
-        if not version_ids:
-            # No versions, return empty summary
-            return AgentLLMCostSummary(
-                total_cost=0.0,
-                total_calls=0,
-                total_tokens=0,
-                avg_cost_per_call=0.0,
-                avg_execution_time_ms=0.0,
-                by_scenario=[],
-            )
-
-        # Build query for all versions
-        query = select(
-            func.count(LLMUsage.id).label("total_calls"),
-            func.sum(LLMUsage.cost_usd).label("total_cost"),
-            func.sum(LLMUsage.total_tokens).label("total_tokens"),
-            func.avg(LLMUsage.cost_usd).label("avg_cost_per_call"),
-            func.avg(LLMUsage.execution_time_ms).label("avg_execution_time_ms"),
-        ).where(LLMUsage.agent_version_id.in_(version_ids))
+        overall = _stats((await db.execute(_filter_rollups(select(*_STATS_COLUMNS), None, agent_id, None, None, start_date, end_date))).one())
+
+        scenario_query = _filter_rollups(
+            select(LLMUsageDailyRollup.scenario, *_STATS_COLUMNS).group_by(LLMUsageDailyRollup.scenario),
+            None,
+            agent_id,
+            None,
+            None,
+            start_date,
+            end_date,
+        )
+        by_scenario: list[dict[str, Any]] = []
+        for row in (await db.execute(scenario_query.order_by(LLMUsageDailyRollup.scenario))).all():
+            stats = _stats(row)
+            by_scenario.append({"scenario": row.scenario, "count": stats.total_calls, "total_cost": stats.total_cost_usd, "total_tokens": stats.total_tokens})
 
-        if start_date:
-            query = query.where(LLMUsage.created_at >= start_date)
-        if end_date:
-            query = query.where(LLMUsage.created_at <= end_date)
+        return AgentLLMCostSummary(
+            total_cost=overall.total_cost_usd,
+            total_calls=overall.total_calls,
+            total_tokens=overall.total_tokens,
+            avg_cost_per_call=overall.average_cost_per_call,
+            avg_execution_time_ms=overall.average_execution_time_ms,
+            by_scenario=by_scenario,
+        )
 
-        result = await db.execute(query)
-        row = result.one()
-
-        # Get stats by scenario
-        by_scenario = []
-        for scenario in LLMUsageScenario:
-            scenario_query = select(
-                func.count(LLMUsage.id).label("count"),
-                func.sum(LLMUsage.cost_usd).label("total_cost"),
+    async def rebuild_daily_rollups(self, db: AsyncSession, day: date) -> int:
+        """Recompute one day's rollups from the raw usage rows; returns the number of rollup rows.
+
+        Idempotent, so it backfills history written before the rollups existed and repairs a day
+        after manual changes to ``llm_usage``. Rebuilding the current day while usage is being
+        written can miss calls committed during the rebuild.
+        """
+        start = datetime.combine(day, time.min, tzinfo=UTC)
+        query = (
+            select(
+                LLMUsage.user_id,
+                AgentVersion.agent_id,
+                LLMUsage.agent_version_id,
+                LLMUsage.provider,
+                LLMUsage.model_used,
+                LLMUsage.scenario,
+                func.count(LLMUsage.id).label("calls"),
+                func.sum(LLMUsage.cost_usd).label("cost_usd"),
+                func.sum(LLMUsage.input_tokens).label("input_tokens"),
+                func.sum(LLMUsage.output_tokens).label("output_tokens"),
                 func.sum(LLMUsage.total_tokens).label("total_tokens"),
-            ).where(
-                LLMUsage.agent_version_id.in_(version_ids),
-                LLMUsage.scenario == scenario.value,
+                func.sum(LLMUsage.execution_time_ms).label("execution_time_ms"),
             )
-
-            if start_date:
-                scenario_query = scenario_query.where(LLMUsage.created_at >= start_date)
-            if end_date:
-                scenario_query = scenario_query.where(LLMUsage.created_at <= end_date)
-
-            scenario_result = await db.execute(scenario_query)
-            scenario_row = scenario_result.one()
-
-            if scenario_row.count and scenario_row.count > 0:
-                by_scenario.append(
-                    {
-                        "scenario": scenario.value,
-                        "count": scenario_row.count,
-                        "total_cost": float(scenario_row.total_cost or 0.0),
-                        "total_tokens": scenario_row.total_tokens or 0,
-                    }
-                )
-
-        return AgentLLMCostSummary(
-            total_cost=float(row.total_cost or 0.0),
-            total_calls=row.total_calls or 0,
-            total_tokens=row.total_tokens or 0,
-            avg_cost_per_call=float(row.avg_cost_per_call or 0.0),
-            avg_execution_time_ms=float(row.avg_execution_time_ms or 0.0),
-            by_scenario=by_scenario,
+            .outerjoin(AgentVersion, AgentVersion.id == LLMUsage.agent_version_id)
+            .where(LLMUsage.created_at >= start, LLMUsage.created_at < start + timedelta(days=1))
+            .group_by(LLMUsage.user_id, AgentVersion.agent_id, LLMUsage.agent_version_id, LLMUsage.provider, LLMUsage.model_used, LLMUsage.scenario)
+        )
+        rollups = [_rollup_row(day, **row._asdict()) for row in (await db.execute(query)).all()]
+
+        _ = await db.execute(delete(LLMUsageDailyRollup).where(LLMUsageDailyRollup.day == day))
+        if rollups:
+            _ = await db.execute(dialect_insert(db, LLMUsageDailyRollup).values(rollups))
+        return len(rollups)
+
+    async def _add_to_rollups(self, db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """Fold freshly inserted usage rows into their daily rollups with one upsert."""
+        version_ids = {row["agent_version_id"] for row in rows if row["agent_version_id"] is not None}
+        agent_ids: dict[AgentVersionId, AgentId] = {}
+        if version_ids:
+            result = await db.execute(select(AgentVersion.id, AgentVersion.agent_id).where(AgentVersion.id.in_(version_ids)))
+            agent_ids = dict(result.all())
+
+        rollups: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            rollup = _rollup_row(
+                _utc_day(row["created_at"]),
+                user_id=row["user_id"],
+                agent_id=agent_ids.get(row["agent_version_id"]),
+                agent_version_id=row["agent_version_id"],
+                provider=row["provider"],
+                model_used=row["model_used"],
+                scenario=row["scenario"],
+                calls=1,
+                **{name: row[name] for name in _ROLLUP_SUMS if name != "calls"},
+            )
+            existing = rollups.get(rollup["key"])
+            if existing is None:
+                rollups[rollup["key"]] = rollup
+            else:
+                for name in _ROLLUP_SUMS:
+                    existing[name] += rollup[name]
+
+        stmt = dialect_insert(db, LLMUsageDailyRollup)
+        stmt = stmt.values(
+            # A consistent row order keeps concurrent writers from deadlocking on each other's rollups
+            [rollups[key] for key in sorted(rollups)]
+        ).on_conflict_do_update(
+            index_elements=[LLMUsageDailyRollup.key],
+            set_={name: getattr(LLMUsageDailyRollup, name) + getattr(stmt.excluded, name) for name in _ROLLUP_SUMS} | {"updated_at": func.current_timestamp()},
         )
+        _ = await db.execute(stmt)
@@ -0,0 +1,43 @@
+"""DAO for cached chess move narratives."""
+
+from __future__ import annotations
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.db.db_utils import dialect_insert
+from common.utils.tsid import TSID
+from shared_db.models.move_narrative import MoveNarrative
+
+MoveNarrativeKey = tuple[str, str, str, str]
+
+
+class MoveNarrativeDAO:
+    """Data access object for the shared move-narrative cache."""
+
+    async def get_many(self, db: AsyncSession, keys: list[MoveNarrativeKey]) -> dict[MoveNarrativeKey, str]:
+        """Get the stored narratives for several keys in one query."""
+        if not keys:
+            return {}
+        result = await db.execute(
+            select(MoveNarrative.position_key, MoveNarrative.move_san, MoveNarrative.eval_bucket, MoveNarrative.locale, MoveNarrative.narrative).where(
+                tuple_(MoveNarrative.position_key, MoveNarrative.move_san, MoveNarrative.eval_bucket, MoveNarrative.locale).in_(keys)
+            )
+        )
+        return {(row.position_key, row.move_san, row.eval_bucket, row.locale): row.narrative for row in result}
+
+    async def save_many(self, db: AsyncSession, narratives: dict[MoveNarrativeKey, str]) -> None:
+        """Store narratives in one statement; keys that already exist keep their text."""
+        if not narratives:
+            return
+        stmt = (
+            dialect_insert(db, MoveNarrative)
+            .values(
+                [
+                    {"id": TSID.create(), "position_key": position_key, "move_san": move_san, "eval_bucket": eval_bucket, "locale": locale, "narrative": narrative}
+                    for (position_key, move_san, eval_bucket, locale), narrative in narratives.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[MoveNarrative.position_key, MoveNarrative.move_san, MoveNarrative.eval_bucket, MoveNarrative.locale])
+        )
+        await db.execute(stmt)
@@ -0,0 +1,50 @@
+"""DAO for cached chess position evaluations."""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.db.db_utils import dialect_insert
+from common.utils.tsid import TSID
+from shared_db.models.position_evaluation import PositionEvaluation
+
+
+class PositionEvaluationDAO:
+    """Data access object for the shared position-evaluation cache."""
+
+    async def get(self, db: AsyncSession, position_key: str, engine_config: str) -> PositionEvaluation | None:
+        """Get the stored evaluation of a position for an engine configuration."""
+        result = await db.execute(
+            select(PositionEvaluation).where(
+                PositionEvaluation.position_key == position_key,
+                PositionEvaluation.engine_config == engine_config,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def save(
+        self,
+        db: AsyncSession,
+        position_key: str,
+        engine_config: str,
+        evaluation_cp: int,
+        mate: int | None,
+        best_move_uci: str | None,
+        depth: int,
+    ) -> None:
+        """Store an evaluation; if another worker already stored this position, keep theirs."""
+        stmt = (
+            dialect_insert(db, PositionEvaluation)
+            .values(
+                id=TSID.create(),
+                position_key=position_key,
+                engine_config=engine_config,
+                evaluation_cp=evaluation_cp,
+                mate=mate,
+                best_move_uci=best_move_uci,
+                depth=depth,
+            )
+            .on_conflict_do_nothing(index_elements=[PositionEvaluation.position_key, PositionEvaluation.engine_config])
+        )
+        await db.execute(stmt)
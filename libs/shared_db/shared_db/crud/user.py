@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.ids import UserId
@@ -13,6 +13,10 @@ from shared_db.schemas.user import (
     UserUpdate,
 )
 
+# Run on every authenticated request (see get_current_user), so built once with bind parameters
+_USER_BY_COGNITO_SUB = select(User).where(User.cognito_sub == bindparam("cognito_sub"))
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
 
 class UserDAO:
     """Data Access Object for User operations.
@@ -48,7 +52,7 @@ class UserDAO:
 
     async def get_by_username(self, db: AsyncSession, username: str) -> UserResponse | None:
         """Get a user by username."""
-        result = await db.execute(select(User).where(User.username == username))
+        result = await db.execute(_USER_BY_USERNAME, {"username": username})
         user = result.scalar_one_or_none()
         return UserResponse.model_validate(user) if user else None
 
@@ -58,7 +62,7 @@ class UserDAO:
         cognito_sub: str,
     ) -> UserResponse | None:
         """Get a user by Cognito sub (user ID)."""
-        result = await db.execute(select(User).where(User.cognito_sub == cognito_sub))
+        result = await db.execute(_USER_BY_COGNITO_SUB, {"cognito_sub": cognito_sub})
         user = result.scalar_one_or_none()
         return UserResponse.model_validate(user) if user else None
 
@@ -3,17 +3,28 @@ import os
 from datetime import datetime
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase as _DeclarativeBase
 from sqlalchemy.orm import Mapped, mapped_column, sessionmaker
 from sqlalchemy.sql import func
 
 from common.core.config_service import ConfigService
 from common.db.db_utils import DateTimeUTC
+from shared_db.db.pools import DbPools, PoolStats, Workload
 
 # Initialize config service
 config_service = ConfigService()
 DATABASE_URL = config_service.get_database_url()
+REPLICA_DATABASE_URL = config_service.get_replica_database_url()
+
+
+def _to_async_url(url: str) -> str:
+    """Map a sync driver URL to its async driver."""
+    for sync_prefix, async_prefix in (("postgresql://", "postgresql+asyncpg://"), ("postgres://", "postgresql+asyncpg://"), ("sqlite://", "sqlite+aiosqlite://")):
+        if url.startswith(sync_prefix):
+            return async_prefix + url.removeprefix(sync_prefix)
+    return url
+
 
 # Convert database URL to async version
 async_database_url = DATABASE_URL
@@ -36,6 +47,7 @@ if config_service.is_testing() and DATABASE_URL.startswith("sqlite"):
         if not DATABASE_URL.startswith("sqlite+aiosqlite"):
             async_database_url = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
         engine = create_async_engine(async_database_url, connect_args={"check_same_thread": False}, pool_pre_ping=True, echo=False)
+    db_pools = DbPools.shared(engine)
 else:
     # Production/development database - convert to async if needed
     if DATABASE_URL.startswith("postgresql://"):
@@ -46,22 +58,44 @@ else:
     elif DATABASE_URL.startswith("sqlite://"):
         async_database_url = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
 
-    # Configure connection pool for long-polling support
-    # Increase pool size to handle multiple long-polling requests + background workers
-    engine = create_async_engine(
+    # One bounded pool per workload (see shared_db.db.pools). Long polling stays on the primary:
+    # waiters must see the commit that wakes them, which a lagging replica may not have yet.
+    # Read-only endpoints use the read replica (DATABASE_REPLICA_URL / database.replica_url)
+    # when one is configured, and the API pool otherwise.
+    db_pools = DbPools.create(
         async_database_url,
-        pool_size=20,  # Increased from default 5
-        max_overflow=30,  # Increased from default 10
-        pool_timeout=30,  # Wait up to 30 seconds for a connection
+        urls={Workload.READ_ONLY: _to_async_url(REPLICA_DATABASE_URL)} if REPLICA_DATABASE_URL else None,
         pool_pre_ping=True,  # Verify connections before using them
     )
+    engine = db_pools.engine(Workload.API)
+
+# Default (API) session factory; other workloads use session_factory(workload)
+AsyncSessionLocal = db_pools.sessions(Workload.API)
+# Game processing leases hold their advisory locks on connections from this engine's pool
+lease_engine = db_pools.engine(Workload.LEASE)
+# Read-only sessions; the primary's API pool when no replica is configured, so callers never special-case it
+replica_engine = db_pools.engine(Workload.READ_ONLY)
+ReadOnlyAsyncSessionLocal = db_pools.sessions(Workload.READ_ONLY)
+
+
+def session_factory(workload: Workload) -> async_sessionmaker[AsyncSession]:
+    """Session factory backed by the workload's own connection pool."""
+    return db_pools.sessions(workload)
+
+
+def pool_stats() -> list[PoolStats]:
+    """Wait-time and checkout-duration metrics of every workload pool."""
+    return db_pools.stats()
+
+
+async def dispose_pools() -> None:
+    """Close every workload pool, including the read replica's."""
+    await db_pools.dispose()
+
 
-AsyncSessionLocal = async_sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    expire_on_commit=False,
-    bind=engine,
-)
+def has_read_replica() -> bool:
+    """Whether read-only sessions are served by a separate replica."""
+    return replica_engine is not db_pools.engine(Workload.API)
 
 
 def get_sync_database_url() -> str:
@@ -0,0 +1,92 @@
+"""Per-game processing leases.
+
+A turn is processed by whichever worker holds the game's lease. Holding a lease writes nothing
+to the ``games`` row: on PostgreSQL it is a session-level advisory lock on a dedicated
+connection, released on exit or as soon as a crashed holder's connection drops. SQLite has no
+advisory locks, so there the lease is an in-process registry, which covers single-process
+development and test setups.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.core.app_error import Errors
+from common.ids import GameId
+from common.utils.utils import get_logger
+
+logger = get_logger()
+
+
+class GameLeases(ABC):
+    """Exclusive, non-blocking processing leases keyed by game."""
+
+    @abstractmethod
+    def hold(self, game_id: GameId) -> AbstractAsyncContextManager[None]:
+        """Hold the game's lease for the duration of the context.
+
+        Raises:
+            AppException: Errors.Game.ALREADY_PROCESSING if another holder has the lease
+        """
+
+
+class AdvisoryLockGameLeases(GameLeases):
+    """Leases backed by PostgreSQL session-level advisory locks.
+
+    The lock lives on its own connection rather than on the session's connection, because the
+    session may commit (and hand its connection back to the pool) in the middle of a turn. Those
+    connections come from a dedicated pool (``Workload.LEASE``), so a turn never needs two
+    connections from the pool its session draws from.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    @asynccontextmanager
+    async def hold(self, game_id: GameId) -> AsyncGenerator[None]:
+        key = game_id.number
+        async with self._engine.connect() as conn:
+            acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+            # Session-level locks survive the transaction; end it so the connection does not sit idle in one
+            await conn.commit()
+            if not acquired:
+                raise Errors.Game.ALREADY_PROCESSING.create(details={"game_id": game_id})
+            try:
+                yield
+            finally:
+                try:
+                    _ = await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                    await conn.commit()
+                except Exception:
+                    # Never return a connection that may still hold the lock to the pool
+                    logger.exception("Failed to release game lease, discarding connection", game_id=game_id)
+                    await conn.invalidate()
+
+
+class InProcessGameLeases(GameLeases):
+    """Leases held in this process only, for databases without advisory locks."""
+
+    def __init__(self) -> None:
+        self._held: set[GameId] = set()
+
+    @asynccontextmanager
+    async def hold(self, game_id: GameId) -> AsyncGenerator[None]:
+        if game_id in self._held:
+            raise Errors.Game.ALREADY_PROCESSING.create(details={"game_id": game_id})
+        self._held.add(game_id)
+        try:
+            yield
+        finally:
+            self._held.discard(game_id)
+
+
+def game_leases_for(engine: AsyncEngine) -> GameLeases:
+    """Lease implementation suited to the engine's database, holding locks on the engine's pool."""
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLockGameLeases(engine)
+    return InProcessGameLeases()
@@ -0,0 +1,256 @@
+"""Per-workload database connection pools.
+
+HTTP requests, long-poll waiters, turn processing and background workers each get their own
+bounded pool, so a burst in one workload (e.g. a long-poll storm) waits on its own pool instead
+of starving the others. Pool sizes are tuned in one place, through ``db.pools.<workload>.*``
+config keys, and every pool records checkout wait time and checkout duration.
+
+Every process opens its own pools, so a process can hold up to the sum of ``pool_size +
+max_overflow`` over all workloads (55 with the defaults, plus 10 on the read replica when one is
+configured). That total times the number of processes (API replicas x uvicorn workers, plus turn and
+background workers) must stay below Postgres ``max_connections`` (100 by default) minus its
+reserved connections; lower the per-workload settings, or put PgBouncer in front, for larger
+deployments.
+"""
+
+from __future__ import annotations
+
+import time
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import URL, event, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
+
+from common.core.config_service import config_service
+from common.utils import JsonModel
+from common.utils.utils import get_logger
+
+logger = get_logger()
+
+_CHECKED_OUT_AT = "checked_out_at"
+
+
+class Workload(StrEnum):
+    """Classes of database work that must not starve each other."""
+
+    API = "api"
+    LONG_POLL = "long_poll"
+    TURN_WORKER = "turn_worker"
+    BACKGROUND = "background"
+    # Connections parked holding a game's advisory lock for the length of a turn
+    LEASE = "lease"
+    # Read-only endpoints; only gets a pool of its own when given a URL (the read replica)
+    READ_ONLY = "read_only"
+
+
+class PoolSettings(JsonModel):
+    """Size and timeout of one workload's pool."""
+
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+
+    @classmethod
+    def from_config(cls, workload: Workload) -> PoolSettings:
+        default = _DEFAULT_SETTINGS[workload]
+        prefix = f"db.pools.{workload.value}"
+        return cls(
+            pool_size=int(config_service.get(f"{prefix}.pool_size", default.pool_size)),
+            max_overflow=int(config_service.get(f"{prefix}.max_overflow", default.max_overflow)),
+            pool_timeout=float(config_service.get(f"{prefix}.pool_timeout", default.pool_timeout)),
+        )
+
+
+# Per process: 20 + 10 + 10 + 5 + 10 = 55 connections at most, + 10 with a read replica (see the module docstring)
+_DEFAULT_SETTINGS: dict[Workload, PoolSettings] = {
+    Workload.API: PoolSettings(pool_size=10, max_overflow=10, pool_timeout=30),
+    # Long-poll waiters hold a connection for the whole wait; fail fast rather than queue for long
+    Workload.LONG_POLL: PoolSettings(pool_size=5, max_overflow=5, pool_timeout=5),
+    Workload.TURN_WORKER: PoolSettings(pool_size=5, max_overflow=5, pool_timeout=30),
+    Workload.BACKGROUND: PoolSettings(pool_size=2, max_overflow=3, pool_timeout=60),
+    # One connection per turn in progress, on top of the turn's own session connection
+    Workload.LEASE: PoolSettings(pool_size=5, max_overflow=5, pool_timeout=30),
+    Workload.READ_ONLY: PoolSettings(pool_size=5, max_overflow=5, pool_timeout=30),
+}
+
+# Workloads served by another workload's pool unless they are given a URL of their own
+_FALLBACK_WORKLOADS: dict[Workload, Workload] = {Workload.READ_ONLY: Workload.API}
+
+
+class PoolStats(JsonModel):
+    """Point-in-time view of a single workload pool."""
+
+    workload: str
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checkouts: int
+    timeouts: int
+    total_wait_s: float
+    max_wait_s: float
+    total_checkout_s: float
+    max_checkout_s: float
+
+
+class _PoolMetrics:
+    """Counters shared by a workload's pool and the pools it is recreated into."""
+
+    def __init__(self, workload: Workload, slow_wait_s: float) -> None:
+        self.workload = workload
+        self.slow_wait_s = slow_wait_s
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.total_checkout_s = 0.0
+        self.max_checkout_s = 0.0
+
+    def record_wait(self, wait_s: float) -> None:
+        self.checkouts += 1
+        self.total_wait_s += wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+        if wait_s >= self.slow_wait_s:
+            logger.warning("Slow database connection checkout", workload=self.workload.value, wait_s=round(wait_s, 3))
+
+    def record_checkin(self, checkout_s: float) -> None:
+        self.total_checkout_s += checkout_s
+        self.max_checkout_s = max(self.max_checkout_s, checkout_s)
+
+
+class _InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that times how long callers wait for a connection.
+
+    Subclassed per workload with ``metrics`` as a class attribute, so the counters survive
+    ``Pool.recreate()``, which builds the replacement pool from ``self.__class__``.
+    """
+
+    metrics: _PoolMetrics
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            logger.warning("Database pool exhausted", workload=self.metrics.workload.value, timeout_s=self.timeout())
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def _instrumented_pool_class(metrics: _PoolMetrics) -> type[_InstrumentedPool]:
+    return type(f"{_InstrumentedPool.__name__}[{metrics.workload.value}]", (_InstrumentedPool,), {"metrics": metrics})
+
+
+class DbPools:
+    """One engine, and so one bounded connection pool, per workload."""
+
+    def __init__(self, engines: dict[Workload, AsyncEngine]) -> None:
+        self._engines = engines
+        self._sessions = {
+            workload: async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine) for workload, engine in engines.items()
+        }
+
+    @classmethod
+    def create(cls, url: str, urls: dict[Workload, str] | None = None, **engine_kwargs: Any) -> DbPools:
+        """Create a pool per workload, sized from config.
+
+        Args:
+            url: Async database URL shared by all workloads
+            urls: Per-workload URL overrides, e.g. the read replica for READ_ONLY
+            engine_kwargs: Extra create_async_engine arguments shared by all pools
+        """
+        urls = urls or {}
+        slow_wait_s = float(config_service.get("db.pools.slow_wait_warn_s", 1.0))
+        engines: dict[Workload, AsyncEngine] = {}
+        max_connections = 0
+        for workload in Workload:
+            if workload in _FALLBACK_WORKLOADS and workload not in urls:
+                continue
+            settings = PoolSettings.from_config(workload)
+            max_connections += settings.pool_size + settings.max_overflow
+            engine = create_async_engine(
+                _with_statement_cache(urls.get(workload, url)),
+                poolclass=_instrumented_pool_class(_PoolMetrics(workload, slow_wait_s)),
+                pool_size=settings.pool_size,
+                max_overflow=settings.max_overflow,
+                pool_timeout=settings.pool_timeout,
+                **engine_kwargs,
+            )
+            _track_checkout_duration(engine)
+            engines[workload] = engine
+        for workload, fallback in _FALLBACK_WORKLOADS.items():
+            _ = engines.setdefault(workload, engines[fallback])
+        logger.info("Database pools created", max_connections=max_connections)
+        return cls(engines)
+
+    @classmethod
+    def shared(cls, engine: AsyncEngine) -> DbPools:
+        """All workloads on a single engine (SQLite and tests, where pooling is moot)."""
+        return cls(dict.fromkeys(Workload, engine))
+
+    def engine(self, workload: Workload) -> AsyncEngine:
+        return self._engines[workload]
+
+    def sessions(self, workload: Workload) -> async_sessionmaker[AsyncSession]:
+        """Session factory drawing connections from the workload's pool."""
+        return self._sessions[workload]
+
+    def stats(self) -> list[PoolStats]:
+        stats: list[PoolStats] = []
+        for workload, engine in self._engines.items():
+            pool = engine.pool
+            # Workloads sharing another workload's pool are reported under that workload
+            if not isinstance(pool, _InstrumentedPool) or pool.metrics.workload is not workload:
+                continue
+            metrics = pool.metrics
+            stats.append(
+                PoolStats(
+                    workload=workload.value,
+                    pool_size=pool.size(),
+                    max_overflow=pool._max_overflow,
+                    checked_out=pool.checkedout(),
+                    checkouts=metrics.checkouts,
+                    timeouts=metrics.timeouts,
+                    total_wait_s=metrics.total_wait_s,
+                    max_wait_s=metrics.max_wait_s,
+                    total_checkout_s=metrics.total_checkout_s,
+                    max_checkout_s=metrics.max_checkout_s,
+                )
+            )
+        return stats
+
+    async def dispose(self) -> None:
+        for engine in set(self._engines.values()):
+            await engine.dispose()
+
+
+def _with_statement_cache(url: str) -> URL:
+    """Size asyncpg's per-connection prepared statement cache (``db.prepared_statement_cache_size``).
+
+    Together with SQLAlchemy's compiled statement cache this lets the hot queries skip both
+    Python-side compilation and server-side parsing/planning after their first execution.
+    """
+    parsed = make_url(url)
+    if parsed.get_driver_name() != "asyncpg" or "prepared_statement_cache_size" in parsed.query:
+        return parsed
+    size = str(config_service.get("db.prepared_statement_cache_size", 500))
+    return parsed.update_query_dict({"prepared_statement_cache_size": size})
+
+
+def _track_checkout_duration(engine: AsyncEngine) -> None:
+    """Record how long each connection stays checked out of the engine's pool."""
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(_dbapi_connection: Any, record: ConnectionPoolEntry, _proxy: PoolProxiedConnection) -> None:
+        record.info[_CHECKED_OUT_AT] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(_dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        checked_out_at = record.info.pop(_CHECKED_OUT_AT, None)
+        pool = engine.pool
+        if checked_out_at is not None and isinstance(pool, _InstrumentedPool):
+            pool.metrics.record_checkin(time.perf_counter() - checked_out_at)
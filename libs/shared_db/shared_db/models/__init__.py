@@ -12,9 +12,11 @@ from shared_db.models.agent import (
     TestScenarioResult,
 )
 from shared_db.models.error_report import ErrorReport
-from shared_db.models.game import Game, GameEvent, GamePlayer
+from shared_db.models.game import Game, GameEvent, GameEventArchive, GameMoveAnalysis, GamePlayer
 from shared_db.models.llm_integration import LLMIntegration
-from shared_db.models.llm_usage import LLMUsage
+from shared_db.models.llm_usage import LLMUsage, LLMUsageContent, LLMUsageDailyRollup
+from shared_db.models.move_narrative import MoveNarrative
+from shared_db.models.position_evaluation import PositionEvaluation
 from shared_db.models.tool import Tool
 from shared_db.models.user import User
 
@@ -28,9 +30,15 @@ __all__ = [
     "ErrorReport",
     "Game",
     "GameEvent",
+    "GameEventArchive",
+    "GameMoveAnalysis",
     "GamePlayer",
     "LLMIntegration",
     "LLMUsage",
+    "LLMUsageContent",
+    "LLMUsageDailyRollup",
+    "MoveNarrative",
+    "PositionEvaluation",
     "TestScenario",
     "TestScenarioResult",
     "Tool",
@@ -7,7 +7,7 @@ from enum import StrEnum
 from typing import Any
 
 from game_api import GameType
-from sqlalchemy import JSON, Boolean, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy import JSON, Boolean, Enum, ForeignKey, Index, Integer, LargeBinary, String, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from common.db.db_utils import DateTimeUTC, DbTSID
@@ -17,6 +17,7 @@ from shared_db.db import Base
 from shared_db.models.agent import AgentVersion
 from shared_db.models.enum_utils import enum_values
 from shared_db.models.user import User
+from shared_db.types import PackedJSON
 
 
 class MatchmakingStatus(StrEnum):
@@ -68,6 +69,9 @@ class GamePlayer(Base):
         Index("idx_game_players_user_env_leave", "user_id", "env", "leave_time"),
         # Index for efficient access control checks (is user in this game?)
         Index("idx_game_players_game_user", "game_id", "user_id"),
+        # Keyset pagination of a user's / an agent version's games by game ID
+        Index("idx_game_players_user_game", "user_id", "game_id"),
+        Index("idx_game_players_agent_version_game", "agent_version_id", "game_id"),
         # Unique constraint to ensure one agent version per game
         # UniqueConstraint("game_id", "agent_version_id", name="unique_game_agent_version"), # FIXME: Disabled until playground moves out of db
     )
@@ -80,11 +84,45 @@ class GameEvent(Base):
     game_id: Mapped[GameId] = mapped_column(DbTSID(), ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True)
 
     type: Mapped[str] = mapped_column(String(100), nullable=False)
-    data: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    data: Mapped[dict[str, Any]] = mapped_column(PackedJSON(), nullable=False)
 
     game = relationship("Game", back_populates="events")
 
 
+class GameEventArchive(Base):
+    """Events of a long-finished game, moved out of ``game_events`` as one compressed blob.
+
+    Keeps the hot events table proportional to live games. ``payload`` holds the archived rows
+    (id, type, data, created_at) encoded with the codec named in ``codec``.
+    """
+
+    __tablename__ = "game_event_archives"
+
+    game_id: Mapped[GameId] = mapped_column(DbTSID(), ForeignKey("games.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    codec: Mapped[str] = mapped_column(String(32), nullable=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class GameMoveAnalysis(Base):
+    """Index of analyzed moves, one row per (game, move number).
+
+    The analysis payload itself is stored as a typed event in ``game_events`` so clients keep
+    reading it from the event stream. This table turns the "already analyzed?" check into a
+    single indexed lookup and makes analysis inserts idempotent via its unique constraint.
+    """
+
+    __tablename__ = "game_move_analyses"
+
+    id: Mapped[TSID] = mapped_column(DbTSID(), primary_key=True, autoincrement=False, default=TSID.create)
+    game_id: Mapped[GameId] = mapped_column(DbTSID(), ForeignKey("games.id", ondelete="CASCADE"), nullable=False)
+    move_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Not a foreign key: the index row is inserted first to claim the move, the event right after
+    event_id: Mapped[GameEventId] = mapped_column(DbTSID(), nullable=False)
+
+    __table_args__ = (UniqueConstraint("game_id", "move_number", name="uq_game_move_analyses_game_move"),)
+
+
 class Game(Base):
     __tablename__ = "games"
 
@@ -94,12 +132,13 @@ class Game(Base):
         Enum(GameType, native_enum=False, values_callable=enum_values),
         nullable=False,
     )
-    state: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    state: Mapped[dict[str, Any]] = mapped_column(PackedJSON(), nullable=False, default=dict)
     config: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
 
     # User who requested/created the game (for LLM integration lookup)
     requesting_user_id: Mapped[UserId] = mapped_column(DbTSID(), ForeignKey(User.id), nullable=False, index=True)
 
+    # No longer written: turn ownership is a lease (shared_db.db.leases), not a row update
     processing_started_at: Mapped[datetime | None] = mapped_column(DateTimeUTC(), nullable=True)
     processing_request_id: Mapped[RequestId | None] = mapped_column(DbTSID(), nullable=True)
     version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
@@ -124,3 +163,9 @@ class Game(Base):
     events = relationship("GameEvent", back_populates="game", cascade="all, delete-orphan", order_by="GameEvent.id")
     requesting_user = relationship(User)
     llm_usage = relationship("LLMUsage", back_populates="game")
+
+    __table_args__ = (
+        # Keyset pagination of discovery listings; matches their ORDER BY so pages are read straight
+        # off the index without a sort. SQLite can't index NULLS LAST, so it is only created on Postgres.
+        Index("idx_games_started_at_id", text("started_at DESC NULLS LAST"), text("id DESC")).ddl_if(dialect="postgresql"),
+    )
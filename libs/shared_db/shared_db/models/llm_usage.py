@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy import JSON, BigInteger, Date, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from common.db.db_utils import DateTimeUTC, DbTSID
-from common.ids import AgentVersionId, GameId, LLMUsageId, TestScenarioId, ToolId, UserId
+from common.ids import AgentId, AgentVersionId, GameId, LLMUsageId, TestScenarioId, ToolId, UserId
 from common.utils.tsid import TSID
 from shared_db.db import Base
 
@@ -23,8 +23,8 @@ class LLMUsage(Base):
     - State generation
     - Agent instructions generation
 
-    Each record includes the full prompt and response for debugging,
-    along with token usage and cost information.
+    Each record references the full prompt and response for debugging (stored once per distinct
+    body in ``llm_usage_contents``), along with token usage and cost information.
     """
 
     __tablename__ = "llm_usage"
@@ -47,6 +47,7 @@ class LLMUsage(Base):
     )
 
     # Model and cost information
+    provider: Mapped[str | None] = mapped_column(String, nullable=True, comment="LLM provider the call was sent to (unset on older rows)")
     model_used: Mapped[str] = mapped_column(String, nullable=False, comment="LLM model identifier (e.g., gpt-4, claude-3-5-sonnet)")
     cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, comment="Cost in USD for this API call")
 
@@ -58,9 +59,11 @@ class LLMUsage(Base):
     # Execution metadata
     execution_time_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="Time taken to execute the LLM call in milliseconds")
 
-    # Prompts (for debugging and analysis)
-    input_prompt: Mapped[str] = mapped_column(Text, nullable=False, comment="Full prompt sent to the LLM")
-    output_response: Mapped[str] = mapped_column(Text, nullable=False, comment="Full response received from the LLM")
+    # Prompts (for debugging and analysis). Bodies live in llm_usage_contents; the inline columns only hold older rows.
+    input_prompt: Mapped[str | None] = mapped_column(Text, nullable=True, comment="Full prompt sent to the LLM (rows written before content dedup)")
+    output_response: Mapped[str | None] = mapped_column(Text, nullable=True, comment="Full response received from the LLM (rows written before content dedup)")
+    input_prompt_hashes: Mapped[list[str] | None] = mapped_column(JSON, nullable=True, comment="Content hashes of the prompt segments, in order")
+    output_response_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, comment="Content hash of the response")
 
     # Optional context references
     game_id: Mapped[GameId | None] = mapped_column(DbTSID(), ForeignKey("games.id"), nullable=True, index=True)
@@ -91,3 +94,53 @@ class LLMUsage(Base):
             f"<LLMUsage(id={self.id}, user_id={self.user_id}, scenario={self.scenario}, "
             f"model={self.model_used}, cost=${self.cost_usd:.4f}, tokens={self.total_tokens})>"
         )
+
+
+class LLMUsageContent(Base):
+    """A prompt segment or response body, stored once however many calls sent or received it.
+
+    Keyed by the SHA-256 of the text, so repeated system prompts of the same agent version share a
+    row. ``payload`` holds the text encoded with the codec named in ``codec``.
+    """
+
+    __tablename__ = "llm_usage_contents"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(32), nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False, comment="Length of the uncompressed text in bytes")
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class LLMUsageDailyRollup(Base):
+    """Per-day LLM usage totals, updated in the same transaction as the usage rows they count.
+
+    One row per (day, user, agent, agent version, provider, model, scenario), so cost summaries
+    read a few rows per day instead of every call. Several key columns are nullable and NULLs
+    never conflict in a unique index, so the primary key is a digest of the key columns.
+    Averages are derived from the sums and ``calls``.
+    """
+
+    __tablename__ = "llm_usage_daily_rollups"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False, comment="UTC day of the calls")
+    user_id: Mapped[UserId] = mapped_column(DbTSID(), ForeignKey("users.id"), nullable=False)
+    # No foreign keys: totals outlive the agents and versions they were billed to, which can be deleted
+    agent_id: Mapped[AgentId | None] = mapped_column(DbTSID(), nullable=True)
+    agent_version_id: Mapped[AgentVersionId | None] = mapped_column(DbTSID(), nullable=True)
+    provider: Mapped[str | None] = mapped_column(String, nullable=True)
+    model_used: Mapped[str] = mapped_column(String, nullable=False)
+    scenario: Mapped[str] = mapped_column(String, nullable=False)
+
+    calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    execution_time_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_llm_usage_daily_rollups_user_day", "user_id", "day"),
+        Index("ix_llm_usage_daily_rollups_agent_day", "agent_id", "day"),
+        Index("ix_llm_usage_daily_rollups_agent_version_day", "agent_version_id", "day"),
+    )
@@ -0,0 +1,30 @@
+"""LLM move narratives for chess positions, shared across games."""
+
+from __future__ import annotations
+
+from sqlalchemy import String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from common.db.db_utils import DbTSID
+from common.ids import MoveNarrativeId
+from common.utils.tsid import TSID
+from shared_db.db import Base
+
+
+class MoveNarrative(Base):
+    """Cached LLM commentary for a move played from a position.
+
+    Keyed by the normalized FEN before the move, the move, a coarse bucket of the engine
+    evaluation and the narrative locale, so the same move in a popular line is described once.
+    """
+
+    __tablename__ = "move_narratives"
+
+    id: Mapped[MoveNarrativeId] = mapped_column(DbTSID(), primary_key=True, autoincrement=False, default=TSID.create)
+    position_key: Mapped[str] = mapped_column(String(100), nullable=False)
+    move_san: Mapped[str] = mapped_column(String(10), nullable=False)
+    eval_bucket: Mapped[str] = mapped_column(String(30), nullable=False)
+    locale: Mapped[str] = mapped_column(String(10), nullable=False)
+    narrative: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (UniqueConstraint("position_key", "move_san", "eval_bucket", "locale", name="uq_move_narratives_key"),)
@@ -0,0 +1,33 @@
+"""Engine evaluations of chess positions, shared across games."""
+
+from __future__ import annotations
+
+from sqlalchemy import Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from common.db.db_utils import DbTSID
+from common.ids import PositionEvaluationId
+from common.utils.tsid import TSID
+from shared_db.db import Base
+
+
+class PositionEvaluation(Base):
+    """Cached engine search result for a position under a given engine configuration.
+
+    ``position_key`` is the normalized FEN (no move clocks), so transpositions reached in
+    different games share a row. ``engine_config`` identifies the search limits that produced
+    the result; a deeper or differently tuned search gets its own row.
+    """
+
+    __tablename__ = "position_evaluations"
+
+    id: Mapped[PositionEvaluationId] = mapped_column(DbTSID(), primary_key=True, autoincrement=False, default=TSID.create)
+    position_key: Mapped[str] = mapped_column(String(100), nullable=False)
+    engine_config: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Scores are from White's point of view; mate scores are folded to +/-10000 in evaluation_cp
+    evaluation_cp: Mapped[int] = mapped_column(Integer, nullable=False)
+    mate: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    best_move_uci: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (UniqueConstraint("position_key", "engine_config", name="uq_position_evaluations_position_config"),)
@@ -16,17 +16,21 @@ class LLMUsageCreate(BaseModel):
     user_id: UserId = Field(..., description="User who triggered this LLM usage")
     agent_version_id: AgentVersionId | None = Field(default=None, description="Optional agent version (for agent moves)")
     scenario: LLMUsageScenario = Field(..., description="Type of LLM usage")
+    provider: str | None = Field(default=None, description="LLM provider the call was sent to")
     model_used: str = Field(..., description="LLM model identifier")
     cost_usd: float = Field(..., description="Cost in USD for this API call")
     input_tokens: int = Field(..., description="Number of tokens in the prompt")
     output_tokens: int = Field(..., description="Number of tokens in the completion")
     total_tokens: int = Field(..., description="Total tokens used")
     execution_time_ms: int = Field(..., description="Time taken to execute the LLM call in milliseconds")
-    input_prompt: str = Field(..., description="Full prompt sent to the LLM")
+    input_prompt: str | list[str] = Field(
+        ..., description="Full prompt sent to the LLM, or the prompt split into segments (e.g. per message) that are stored and deduplicated separately"
+    )
     output_response: str = Field(..., description="Full response received from the LLM")
     game_id: GameId | None = Field(default=None, description="Optional game ID (for agent moves)")
     tool_id: ToolId | None = Field(default=None, description="Optional tool ID (for tool generation)")
     test_scenario_id: TestScenarioId | None = Field(default=None, description="Optional test scenario ID")
+    created_at: datetime | None = Field(default=None, description="When the call finished; the time the record is written if omitted")
 
 
 class LLMUsageResponse(JsonModel):
@@ -38,6 +42,7 @@ class LLMUsageResponse(JsonModel):
     user_id: UserId
     agent_version_id: AgentVersionId | None
     scenario: str
+    provider: str | None = None
     model_used: str
     cost_usd: float
     input_tokens: int
@@ -61,6 +66,7 @@ class LLMUsageSummary(JsonModel):
     user_id: UserId
     agent_version_id: AgentVersionId | None
     scenario: str
+    provider: str | None = None
     model_used: str
     cost_usd: float
     total_tokens: int
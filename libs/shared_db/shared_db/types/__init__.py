@@ -1,6 +1,6 @@
 """Custom SQLAlchemy types for shared database models."""
 
+from shared_db.types.packed_json import PackedJSON
 from shared_db.types.pydantic_column import PydanticType
 
-__all__ = ["PydanticType"]
-
+__all__ = ["PackedJSON", "PydanticType"]
@@ -0,0 +1,146 @@
+"""Compact storage codec for large JSON columns.
+
+Game states and events are stored as verbose camelCase JSON. With the codec enabled
+(``db.packed_json.enabled``), values are written as msgpack compressed with zstd, inside a
+small tagged envelope in the same JSON column::
+
+    {"$codec": "msgpack+zstd/1", "data": "<base64 of the compressed bytes>"}
+
+Reads recognize the tag and decode; anything else is plain JSON and passes through unchanged,
+so packed and legacy rows can be read side by side and the codec can be toggled without a
+migration. Values are normalized to JSON builtins before packing, so a packed value decodes to
+exactly what the JSON column would have returned.
+"""
+
+from __future__ import annotations
+
+import base64
+import threading
+from typing import Any
+
+import msgspec
+import zstandard
+from sqlalchemy import JSON
+from sqlalchemy.types import TypeDecorator
+
+from common.core.config_service import config_service
+from common.utils.msgspec import decode_msgpack, default_serializer, encode_msgpack
+
+CODEC_TAG = "$codec"
+CODEC_MSGPACK_ZSTD_V1 = "msgpack+zstd/1"
+CODEC_UTF8_ZSTD_V1 = "utf8+zstd/1"
+
+# zstd contexts are expensive to create and not safe to share between threads
+_contexts = threading.local()
+
+
+def _compressor(level: int) -> zstandard.ZstdCompressor:
+    compressors: dict[int, zstandard.ZstdCompressor] = _contexts.__dict__.setdefault("compressors", {})
+    if level not in compressors:
+        compressors[level] = zstandard.ZstdCompressor(level=level)
+    return compressors[level]
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    if not hasattr(_contexts, "decompressor"):
+        _contexts.decompressor = zstandard.ZstdDecompressor()
+    return _contexts.decompressor
+
+
+def compress_msgpack(value: Any, level: int = 3) -> bytes:
+    """msgpack+zstd bytes of a value, normalized to JSON builtins first."""
+    return _compressor(level).compress(encode_msgpack(msgspec.to_builtins(value, enc_hook=default_serializer)))
+
+
+def decompress_msgpack(data: bytes) -> Any:
+    """Inverse of compress_msgpack."""
+    return decode_msgpack(_decompressor().decompress(data))
+
+
+def compress_text(value: str, level: int = 3) -> bytes:
+    """UTF-8 encoded, zstd compressed bytes of a string."""
+    return _compressor(level).compress(value.encode())
+
+
+def decompress_text(data: bytes) -> str:
+    """Inverse of compress_text."""
+    return _decompressor().decompress(data).decode()
+
+
+def pack_json(value: Any, level: int = 3, min_bytes: int = 0) -> Any:
+    """Encode a JSON-compatible value into a tagged msgpack+zstd envelope.
+
+    Values whose msgpack encoding is smaller than ``min_bytes`` gain little from compression and
+    are returned as plain JSON builtins instead.
+    """
+    builtins = msgspec.to_builtins(value, enc_hook=default_serializer)
+    encoded = encode_msgpack(builtins)
+    if len(encoded) < min_bytes:
+        return builtins
+    compressed = _compressor(level).compress(encoded)
+    return {CODEC_TAG: CODEC_MSGPACK_ZSTD_V1, "data": base64.b64encode(compressed).decode("ascii")}
+
+
+def unpack_json(stored: Any) -> Any:
+    """Decode a stored value; values without a codec tag are plain JSON and returned as is."""
+    if not isinstance(stored, dict) or CODEC_TAG not in stored:
+        return stored
+    codec = stored[CODEC_TAG]
+    if codec != CODEC_MSGPACK_ZSTD_V1:
+        raise ValueError(f"Unknown JSON column codec: {codec}")
+    return decompress_msgpack(base64.b64decode(stored["data"]))
+
+
+def packed_json_enabled() -> bool:
+    return str(config_service.get("db.packed_json.enabled", "false")).lower() == "true"
+
+
+def packed_json_level() -> int:
+    return int(config_service.get("db.packed_json.zstd_level", 3))
+
+
+def packed_json_min_bytes() -> int:
+    return int(config_service.get("db.packed_json.min_bytes", 512))
+
+
+class PackedJSON(TypeDecorator[Any]):
+    """JSON column that writes msgpack+zstd envelopes when the codec is enabled.
+
+    Usage:
+        class MyModel(Base):
+            state: Mapped[dict[str, Any]] = mapped_column(PackedJSON(), nullable=False)
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self, enabled: bool | None = None, level: int | None = None, min_bytes: int | None = None, *args: Any, **kwargs: Any) -> None:
+        """Initialize the PackedJSON type.
+
+        Args:
+            enabled: Whether writes are packed; None reads ``db.packed_json.enabled`` on first write
+            level: zstd compression level; None reads ``db.packed_json.zstd_level`` (default 3)
+            min_bytes: Smaller values stay plain JSON; None reads ``db.packed_json.min_bytes`` (default 512)
+            *args: Positional arguments passed to the JSON impl
+            **kwargs: Keyword arguments passed to the JSON impl
+        """
+        super().__init__(*args, **kwargs)
+        self.enabled = enabled
+        self.level = level
+        self.min_bytes = min_bytes
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        if self.enabled is None:
+            self.enabled = packed_json_enabled()
+        if not self.enabled:
+            return value
+        if self.level is None:
+            self.level = packed_json_level()
+        if self.min_bytes is None:
+            self.min_bytes = packed_json_min_bytes()
+        return pack_json(value, self.level, self.min_bytes)
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        return unpack_json(value)
@@ -10,6 +10,8 @@ from pydantic import BaseModel, TypeAdapter
 from sqlalchemy import JSON
 from sqlalchemy.types import TypeDecorator
 
+from shared_db.types.packed_json import pack_json, packed_json_enabled, packed_json_level, packed_json_min_bytes, unpack_json
+
 T = TypeVar("T", bound=BaseModel)
 
 
@@ -27,19 +29,37 @@ class PydanticType(TypeDecorator[T], Generic[T]):
             config: Mapped[ChessConfig] = mapped_column(PydanticType(ChessConfig))
             # For discriminated unions:
             event: Mapped[ChessEvent] = mapped_column(PydanticType(ChessEvent))
+            # Stored as msgpack+zstd when db.packed_json.enabled is set:
+            state: Mapped[ChessState] = mapped_column(PydanticType(ChessState, packed=True))
     """
 
     impl = JSON
     cache_ok = True
 
-    def __init__(self, pydantic_type: type[BaseModel] | Any, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        pydantic_type: type[BaseModel] | Any,
+        *args: Any,
+        packed: bool = False,
+        level: int | None = None,
+        min_bytes: int | None = None,
+        **kwargs: Any,
+    ) -> None:
         """Initialize the PydanticType.
-        
+
         Args:
             pydantic_type: The Pydantic model class or union type to use for serialization/deserialization
+            packed: Opt in to the msgpack+zstd codec (see shared_db.types.packed_json)
+            level: zstd compression level; None reads ``db.packed_json.zstd_level`` (default 3)
+            min_bytes: Smaller values stay plain JSON; None reads ``db.packed_json.min_bytes`` (default 512)
+            *args: Positional arguments passed to the JSON impl
+            **kwargs: Keyword arguments passed to the JSON impl
         """
         super().__init__(*args, **kwargs)
         self.pydantic_type = pydantic_type
+        self.packed = packed
+        self.level = level
+        self.min_bytes = min_bytes
         # Use TypeAdapter to handle both regular models and discriminated unions
         self.type_adapter = TypeAdapter(pydantic_type)
 
@@ -58,7 +78,14 @@ class PydanticType(TypeDecorator[T], Generic[T]):
 
         # Serialize with aliases (camelCase) for storage
         # Note: We store as camelCase in the database for consistency with API responses
-        return value.model_dump(mode="json", by_alias=True)
+        data = value.model_dump(mode="json", by_alias=True)
+        if not self.packed or not packed_json_enabled():
+            return data
+        if self.level is None:
+            self.level = packed_json_level()
+        if self.min_bytes is None:
+            self.min_bytes = packed_json_min_bytes()
+        return pack_json(data, self.level, self.min_bytes)
 
     def process_result_value(self, value: Any, dialect: Any) -> T | None:
         """Convert dict from database to Pydantic model.
@@ -74,5 +101,5 @@ class PydanticType(TypeDecorator[T], Generic[T]):
             return None
 
         # Deserialize using TypeAdapter (handles both regular models and discriminated unions)
-        return cast(T, self.type_adapter.validate_python(value))
+        return cast(T, self.type_adapter.validate_python(unpack_json(value)))
 